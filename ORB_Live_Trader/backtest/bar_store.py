@@ -0,0 +1,348 @@
+"""
+Columnar intraday bar storage for ORB universe parquet files.
+
+Legacy universes embed each candidate's 5-min bars as a JSON string in
+`bars_json`, so every backtest pays json.loads + pd.to_datetime per row.
+The columnar format stores the same bars as typed parquet list columns:
+
+    bar_t       list<int64>    wall-clock ET timestamp, ns since epoch (naive)
+    bar_open    list<double>
+    bar_high    list<double>
+    bar_low     list<double>
+    bar_close   list<double>
+    bar_volume  list<double>
+
+Prices stay float64 so backtests remain bit-identical to the JSON path
+(float32 would move stop/entry ties and EOD closes).
+
+`read_universe` returns the candidate frame plus a `UniverseBars` handle whose
+flat value buffers come straight out of Arrow (zero-copy); `UniverseBars.frame(i)`
+slices one candidate's bars by offsets. Legacy `bars_json` files still load.
+
+Usage (one-shot conversion of existing universe files, in place):
+    python ORB_Live_Trader/backtest/bar_store.py \\
+        --convert research_2021_sentiment_ROLLING24H/universe_sentiment_0.9.parquet
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+BACKTEST_DIR = Path(__file__).resolve().parent
+ORB_UNIVERSE_DIR = BACKTEST_DIR / "data" / "universe"
+
+BAR_COLUMNS = ("bar_t", "bar_open", "bar_high", "bar_low", "bar_close", "bar_volume")
+BAR_FIELDS = ("datetime", "open", "high", "low", "close", "volume")
+LEGACY_BARS_COLUMN = "bars_json"
+DATE_COLUMNS = ("date", "trade_date", "timestamp", "datetime", "day")  # same precedence as fast_backtest
+PARTITION_KEYS = ("year", "month")  # hive partition keys of universe dataset directories
+
+
+def bars_to_columns(bars: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Convert a day's 5-min bars into the columnar cell values for one universe row."""
+    dt = pd.to_datetime(bars["datetime"])
+    if getattr(dt.dt, "tz", None) is not None:
+        # Keep ET wall-clock time, same as the legacy '%Y-%m-%d %H:%M:%S' strings
+        dt = dt.dt.tz_localize(None)
+    # Legacy JSON truncated to whole seconds
+    t_ns = dt.dt.floor("s").to_numpy(dtype="datetime64[ns]").view("int64")
+    return {
+        "bar_t": t_ns,
+        "bar_open": bars["open"].to_numpy(dtype=np.float64),
+        "bar_high": bars["high"].to_numpy(dtype=np.float64),
+        "bar_low": bars["low"].to_numpy(dtype=np.float64),
+        "bar_close": bars["close"].to_numpy(dtype=np.float64),
+        "bar_volume": bars["volume"].to_numpy(dtype=np.float64),
+    }
+
+
+def bars_from_json(bars_data) -> pd.DataFrame:
+    """Decode a legacy bars_json cell (JSON string or compact list) to a bars frame."""
+    if isinstance(bars_data, str):
+        df = pd.DataFrame(json.loads(bars_data))
+    else:
+        df = pd.DataFrame(bars_data, columns=list(BAR_FIELDS))
+    df["datetime"] = pd.to_datetime(df["datetime"])
+    return df
+
+
+def _bars_frame(t_ns, open_, high, low, close, volume, with_time: bool = True) -> pd.DataFrame:
+    df = pd.DataFrame({
+        "datetime": np.asarray(t_ns, dtype=np.int64).view("datetime64[ns]"),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": volume,
+    })
+    if with_time:
+        df["time"] = df["datetime"].dt.time
+    return df
+
+
+class UniverseBars:
+    """Flat bar arrays for every row of a columnar universe, sliced via offsets.
+
+    Row i's bars live in [offsets[i], offsets[i + 1]) of each flat array.
+    """
+
+    def __init__(self, offsets: np.ndarray, t_ns: np.ndarray, open_: np.ndarray, high: np.ndarray,
+                 low: np.ndarray, close: np.ndarray, volume: np.ndarray):
+        self.offsets = offsets
+        self.t_ns = t_ns
+        self.open = open_
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_table(cls, table: pa.Table) -> "UniverseBars":
+        """Build from the bar_* list columns of an Arrow table (no per-row decoding)."""
+        lists = [table.column(c).combine_chunks() for c in BAR_COLUMNS]
+        offsets = lists[0].offsets.to_numpy()
+        first = int(offsets[0]) if len(offsets) else 0
+        offsets = offsets - first
+        flats = [_flat_values(arr) for arr in lists]
+        return cls(offsets, *flats)
+
+    def bounds(self, i: int) -> Tuple[int, int]:
+        return int(self.offsets[i]), int(self.offsets[i + 1])
+
+    def frame(self, i: int, with_time: bool = True) -> pd.DataFrame:
+        """Bars for row i, same schema as fast_backtest.deserialize_bars."""
+        lo, hi = self.bounds(i)
+        return _bars_frame(
+            self.t_ns[lo:hi], self.open[lo:hi], self.high[lo:hi],
+            self.low[lo:hi], self.close[lo:hi], self.volume[lo:hi],
+            with_time=with_time,
+        )
+
+
+def _flat_values(list_array: pa.ListArray) -> np.ndarray:
+    """Child values of a list array covering its offsets window, zero-copy where possible."""
+    offsets = list_array.offsets
+    start = offsets[0].as_py() if len(offsets) else 0
+    stop = offsets[-1].as_py() if len(offsets) else 0
+    values = list_array.values.slice(start, stop - start)
+    # Primitive arrays without nulls map straight onto the Arrow buffer
+    return values.to_numpy(zero_copy_only=False)
+
+
+def is_columnar(schema: pa.Schema) -> bool:
+    return all(c in schema.names for c in BAR_COLUMNS)
+
+
+def read_universe(path: Path, columns: Optional[List[str]] = None) -> Tuple[pd.DataFrame, Optional[UniverseBars]]:
+    """Read a universe parquet.
+
+    Returns:
+        (df, bars). For columnar files, bars is a UniverseBars and df carries a
+        `bar_row` column indexing into it. For legacy files, bars is None and df
+        keeps `bars_json`.
+    """
+    schema = pq.read_schema(path)
+    read_cols = None
+    if columns is not None:
+        read_cols = [c for c in columns if c in schema.names]
+        if is_columnar(schema):
+            read_cols += [c for c in BAR_COLUMNS if c not in read_cols]
+        elif LEGACY_BARS_COLUMN in schema.names and LEGACY_BARS_COLUMN not in read_cols:
+            read_cols.append(LEGACY_BARS_COLUMN)
+
+    table = pq.read_table(path, columns=read_cols)
+    if not is_columnar(table.schema):
+        return table.to_pandas(), None
+
+    bars = UniverseBars.from_table(table)
+    df = table.drop_columns(list(BAR_COLUMNS)).to_pandas()
+    df["bar_row"] = np.arange(len(df), dtype=np.int64)
+    return df, bars
+
+
+def _universe_dataset(path: Path) -> ds.Dataset:
+    return ds.dataset(path, format="parquet", partitioning="hive")
+
+
+def _date_array(field_type: pa.DataType, values) -> pa.Array:
+    """Dates as an Arrow array of the universe's date column type (date32, timestamp or string)."""
+    ts = pd.to_datetime(pd.Series(list(values), dtype=object))
+    if pa.types.is_date(field_type):
+        return pa.array(ts.dt.date, type=field_type)
+    if pa.types.is_timestamp(field_type):
+        if field_type.tz:
+            ts = ts.dt.tz_localize(field_type.tz)
+        return pa.array(ts, type=field_type)
+    return pa.array(ts.dt.strftime("%Y-%m-%d"), type=field_type)
+
+
+def _key_columns(schema: pa.Schema) -> Tuple[Optional[str], str]:
+    date_col = next((c for c in DATE_COLUMNS if c in schema.names), None)
+    ticker_col = "ticker" if "ticker" in schema.names else "symbol"
+    return date_col, ticker_col
+
+
+def scan_universe(
+    path: Path,
+    start_date: str = None,
+    end_date: str = None,
+    min_atr: float = None,
+    min_volume: float = None,
+    side: str = None,
+) -> pd.DataFrame:
+    """Candidate rows (no bar payloads) matching the filters, pushed down to the parquet scan.
+
+    Accepts a universe file or a year=/month= partitioned directory; row groups
+    and part files outside the date range are skipped. Pair with
+    load_candidate_bars once the rows to simulate are known.
+    """
+    dataset = _universe_dataset(path)
+    schema = dataset.schema
+    date_col, _ = _key_columns(schema)
+    names = [n for n in schema.names if n not in BAR_COLUMNS and n != LEGACY_BARS_COLUMN and n not in PARTITION_KEYS]
+
+    conds = []
+    if date_col and start_date:
+        conds.append(pc.field(date_col) >= _date_array(schema.field(date_col).type, [start_date])[0])
+    if date_col and end_date:
+        conds.append(pc.field(date_col) <= _date_array(schema.field(date_col).type, [end_date])[0])
+    if min_atr is not None:
+        conds.append(pc.field("atr_14") >= min_atr)
+    if min_volume is not None:
+        conds.append(pc.field("avg_volume_14") >= min_volume)
+    if side in ("long", "short"):
+        conds.append(pc.field("direction") == (1 if side == "long" else -1))
+    expr = None
+    for cond in conds:
+        expr = cond if expr is None else expr & cond
+
+    table = dataset.to_table(columns=names, filter=expr)
+    if Path(path).is_dir():
+        table = table.sort_by([(k, "ascending") for k in (date_col, "rvol_rank") if k in names])
+    return table.to_pandas()
+
+
+def load_candidate_bars(path: Path, df: pd.DataFrame) -> Tuple[pd.DataFrame, Optional[UniverseBars]]:
+    """Load bar payloads for just the given candidate rows (matched on trade date + ticker).
+
+    Returns (df, bars) shaped like read_universe: for columnar universes df gets
+    a `bar_row` into bars; for legacy files df gets `bars_json` and bars is None.
+    """
+    dataset = _universe_dataset(path)
+    schema = dataset.schema
+    date_col, ticker_col = _key_columns(schema)
+    df_date = "trade_date" if "trade_date" in df.columns else date_col
+    df_ticker = "ticker" if "ticker" in df.columns else ticker_col
+    columnar = is_columnar(schema)
+    payload = list(BAR_COLUMNS) if columnar else [LEGACY_BARS_COLUMN]
+
+    dates = pd.unique(pd.to_datetime(df[df_date]).dt.normalize())
+    tickers = pd.unique(df[df_ticker].astype(str))
+    date_type = schema.field(date_col).type
+    expr = pc.field(ticker_col).isin(pa.array(tickers, type=schema.field(ticker_col).type))
+    if pa.types.is_date(date_type):
+        expr &= pc.field(date_col).isin(_date_array(date_type, dates))
+    elif pa.types.is_timestamp(date_type) and len(dates):
+        # Timestamps may carry a time of day: bound by the day range instead of exact values
+        expr &= pc.field(date_col) >= _date_array(date_type, [min(dates)])[0]
+        expr &= pc.field(date_col) < _date_array(date_type, [max(dates) + pd.Timedelta(days=1)])[0]
+    table = dataset.to_table(columns=[date_col, ticker_col, *payload], filter=expr)
+
+    found = pd.MultiIndex.from_arrays([
+        pd.to_datetime(table.column(date_col).to_pandas()).dt.normalize(),
+        table.column(ticker_col).to_pandas().astype(str),
+    ])
+    wanted = pd.MultiIndex.from_arrays([
+        pd.to_datetime(df[df_date]).dt.normalize(),
+        df[df_ticker].astype(str),
+    ])
+    # Position of each candidate's stored row (first one if a key repeats)
+    lookup = pd.Series(np.arange(len(found), dtype=np.int64), index=found)
+    lookup = lookup[~lookup.index.duplicated()].reindex(wanted)
+    if lookup.isna().any():
+        raise KeyError(f"{path}: bars missing for {int(lookup.isna().sum())} candidate rows")
+    rows = lookup.to_numpy(dtype=np.int64)
+
+    df = df.reset_index(drop=True).copy()
+    if not columnar:
+        df[LEGACY_BARS_COLUMN] = table.column(LEGACY_BARS_COLUMN).take(rows).to_pylist()
+        return df, None
+    bars = UniverseBars.from_table(table.select(list(BAR_COLUMNS)).take(rows))
+    df["bar_row"] = np.arange(len(df), dtype=np.int64)
+    return df, bars
+
+
+def candidate_bars(row, bars: Optional[UniverseBars] = None, with_time: bool = True) -> pd.DataFrame:
+    """Bars for one universe row in either format."""
+    if bars is not None and "bar_row" in row:
+        return bars.frame(int(row["bar_row"]), with_time=with_time)
+    if all(c in row for c in BAR_COLUMNS):
+        return _bars_frame(*(row[c] for c in BAR_COLUMNS), with_time=with_time)
+    df = bars_from_json(row[LEGACY_BARS_COLUMN])
+    if with_time:
+        df["time"] = df["datetime"].dt.time
+    return df
+
+
+def convert_universe_file(src: Path, dst: Optional[Path] = None) -> int:
+    """Rewrite a legacy bars_json universe into the columnar format. Returns rows written."""
+    dst = dst or src
+    table = pq.read_table(src)
+    if is_columnar(table.schema):
+        print(f"  {src.name}: already columnar")
+        return 0
+    if LEGACY_BARS_COLUMN not in table.schema.names:
+        raise ValueError(f"{src} has neither {LEGACY_BARS_COLUMN} nor {BAR_COLUMNS}")
+
+    cells = {c: [] for c in BAR_COLUMNS}
+    for raw in table.column(LEGACY_BARS_COLUMN).to_pylist():
+        if raw is None:
+            for c in BAR_COLUMNS:
+                cells[c].append(None)
+            continue
+        cols = bars_to_columns(bars_from_json(raw))
+        for c in BAR_COLUMNS:
+            cells[c].append(cols[c])
+
+    out = table.drop_columns([LEGACY_BARS_COLUMN])
+    out = out.append_column("bar_t", pa.array(cells["bar_t"], type=pa.list_(pa.int64())))
+    for c in BAR_COLUMNS[1:]:
+        out = out.append_column(c, pa.array(cells[c], type=pa.list_(pa.float64())))
+
+    tmp = dst.with_suffix(dst.suffix + ".tmp")
+    pq.write_table(out, tmp)
+    tmp.replace(dst)
+    return out.num_rows
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert universe parquet files from bars_json to columnar bars")
+    ap.add_argument("--convert", nargs="+", required=True, help="Universe parquet filenames (relative to ORB universe dir) or paths")
+    ap.add_argument("--suffix", type=str, default=None, help="Write to <name><suffix>.parquet instead of overwriting")
+    args = ap.parse_args()
+
+    for name in args.convert:
+        src = ORB_UNIVERSE_DIR / name
+        if not src.exists():
+            src = Path(name)
+        if not src.exists():
+            print(f"Universe not found: {name}")
+            continue
+        dst = src.with_name(f"{src.stem}{args.suffix}.parquet") if args.suffix else src
+        rows = convert_universe_file(src, dst)
+        if rows:
+            print(f"  ✓ {src.name} -> {dst.name}: {rows:,} rows")
+
+
+if __name__ == "__main__":
+    main()
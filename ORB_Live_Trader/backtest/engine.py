@@ -11,6 +11,13 @@ import numpy as np
 from tqdm import tqdm
 import json
 
+try:
+    from .bar_store import candidate_bars, read_universe
+    from .sim_kernel import EXIT_STOP, bar_time_ns, find_entry_exit, ns_to_time, time_to_ns
+except ImportError:  # executed as a script
+    from bar_store import candidate_bars, read_universe
+    from sim_kernel import EXIT_STOP, bar_time_ns, find_entry_exit, ns_to_time, time_to_ns
+
 # Setup Paths relative to this file
 # ORB_Live_Trader/backtest/engine.py -> ORB_Live_Trader/ -> Project Root
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
@@ -22,6 +29,10 @@ ORB_RUNS_DIR = DATA_DIR / "backtest" / "orb" / "runs"
 ORB_RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
 OR_START = time(9, 30)
+OR_START_NS = time_to_ns(OR_START)
+
+# 'numpy' = array-scan kernel (default); 'loop' = legacy iterrows walk kept for parity checks
+SIM_ENGINES = ("numpy", "loop")
 
 # Position sizing defaults
 INITIAL_CAPITAL = 1500.0 
@@ -68,29 +79,94 @@ def simulate_trade(
     comm_min: float = 0.99,
     free_exits: bool = False,
     max_share_cap: int = None,
-    limit_retest: bool = False
+    limit_retest: bool = False,
+    engine: str = "numpy"
 ) -> dict:
-    """Simulate trade execution with stop, EOD exit, and spread costs."""
+    """Simulate trade execution with stop, EOD exit, and spread costs.
+
+    engine: 'numpy' (array-scan kernel, default) or 'loop' (legacy per-bar walk, for parity checks).
+    """
+    if engine not in SIM_ENGINES:
+        raise ValueError(f"Unknown sim engine: {engine} (expected one of {SIM_ENGINES})")
+
+    def get_execution_price(base_price, is_buy):
+        spread_amt = max(base_price * spread_pct, min_tick)
+        if is_buy:
+            return base_price + spread_amt
+        else:
+            return base_price - spread_amt
+
+    if engine == "loop":
+        fill = _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, get_execution_price)
+    else:
+        fill = _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, get_execution_price)
+
+    if not fill['entered']:
+        return {'entered': False, 'exit_reason': fill['exit_reason']}
+
+    return _build_trade_result(
+        bars, direction,
+        fill['entry_price'], fill['entry_time'],
+        fill['exit_price'], fill['exit_time'], fill['exit_reason'],
+        position_size=position_size,
+        leverage=leverage,
+        apply_leverage=apply_leverage,
+        max_pct_volume=max_pct_volume,
+        comm_share=comm_share,
+        comm_min=comm_min,
+        free_exits=free_exits,
+        max_share_cap=max_share_cap,
+    )
+
+def _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, get_execution_price) -> dict:
+    """Array-scan entry/exit detection (see sim_kernel.py)."""
+    t_ns = bar_time_ns(bars)
+    post_or = t_ns > OR_START_NS
+    if not post_or.any():
+        return {'entered': False, 'exit_reason': 'NO_BARS'}
+
+    high = bars['high'].to_numpy(dtype=float)[post_or]
+    low = bars['low'].to_numpy(dtype=float)[post_or]
+    t_post = t_ns[post_or]
+    entry_idx, exit_idx, reason = find_entry_exit(
+        high, low, t_post, direction, entry_level, stop_level,
+        limit_retest=limit_retest,
+    )
+    if entry_idx < 0:
+        return {'entered': False, 'exit_reason': reason}
+
+    if limit_retest:
+        entry_price = float(entry_level)
+    else:
+        entry_price = get_execution_price(entry_level, is_buy=(direction == 1))
+
+    if reason == EXIT_STOP:
+        exit_price = get_execution_price(stop_level, is_buy=(direction != 1))
+    else:
+        raw_close = float(bars['close'].to_numpy()[post_or][-1])
+        exit_price = get_execution_price(raw_close, is_buy=(direction != 1))
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': ns_to_time(t_post[entry_idx]),
+        'exit_price': exit_price,
+        'exit_time': ns_to_time(t_post[exit_idx]),
+        'exit_reason': reason,
+    }
+
+def _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, get_execution_price) -> dict:
+    """Legacy per-bar iterrows() walk. Kept for parity checks against the NumPy kernel."""
     trade_bars = bars[bars['time'] > OR_START].copy()
     if trade_bars.empty:
         return {'entered': False, 'exit_reason': 'NO_BARS'}
     
-    total_daily_volume = bars['volume'].sum()
-    max_allowed_shares = total_daily_volume * max_pct_volume
-    
     in_trade = False
     entry_price = None
     entry_time = None
     exit_price = None
     exit_time = None
     exit_reason = None
-    
-    def get_execution_price(base_price, is_buy):
-        spread_amt = max(base_price * spread_pct, min_tick)
-        if is_buy:
-            return base_price + spread_amt
-        else:
-            return base_price - spread_amt
 
     triggered = False
     for _, bar in trade_bars.iterrows():
@@ -142,7 +218,37 @@ def simulate_trade(
     
     if not in_trade:
         return {'entered': False, 'exit_reason': 'NO_ENTRY'}
-    
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': entry_time,
+        'exit_price': exit_price,
+        'exit_time': exit_time,
+        'exit_reason': exit_reason,
+    }
+
+def _build_trade_result(
+    bars: pd.DataFrame,
+    direction: int,
+    entry_price: float,
+    entry_time,
+    exit_price: float,
+    exit_time,
+    exit_reason: str,
+    position_size: float,
+    leverage: float,
+    apply_leverage: bool,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+) -> dict:
+    """Size the position and compute P&L/commission for a filled trade."""
+    total_daily_volume = bars['volume'].sum()
+    max_allowed_shares = total_daily_volume * max_pct_volume
+
     direction_sign = 1 if direction == 1 else -1
     price_move = (exit_price - entry_price) * direction_sign
     
@@ -218,14 +324,16 @@ def run_strategy(
     comm_min: float = 0.99,
     limit_retest: bool = False,
     sizing_mode: str = "equal",
-    risk_per_trade_pct: float = 0.01
+    risk_per_trade_pct: float = 0.01,
+    sim_engine: str = "numpy"
 ):
     """Run strategy on pre-built universe."""
     
     run_spread_pct = spread_pct if spread_pct is not None else SPREAD_PCT
 
     print(f"Loading universe: {universe_path}")
-    df_universe = pd.read_parquet(universe_path)
+    # Columnar universes return a UniverseBars handle; legacy files keep bars_json
+    df_universe, universe_bars = read_universe(universe_path)
 
     if 'date' in df_universe.columns and 'trade_date' not in df_universe.columns:
         df_universe = df_universe.rename(columns={'date': 'trade_date'})
@@ -302,7 +410,7 @@ def run_strategy(
         allocation_per_trade = allocation_pool / num_trades_today if num_trades_today > 0 else 0
         
         for _, row in day_df.iterrows():
-            bars = deserialize_bars(row['bars_json'])
+            bars = candidate_bars(row, universe_bars, with_time=(sim_engine == "loop"))
             
             entry_level = row['or_high'] if row['direction'] == 1 else row['or_low']
             atr_stop_dist = stop_atr_scale * row['atr_14']
@@ -338,7 +446,8 @@ def run_strategy(
                 comm_min=comm_min,
                 free_exits=free_exits,
                 max_share_cap=max_share_cap,
-                limit_retest=limit_retest
+                limit_retest=limit_retest,
+                engine=sim_engine
             )
             
             trade_pnl = sim.get('dollar_pnl', 0.0) or 0.0
@@ -406,6 +515,7 @@ def main():
     
     ap.add_argument('--start-date', type=str, default=None)
     ap.add_argument('--end-date', type=str, default=None)
+    ap.add_argument('--sim-engine', type=str, default='numpy', choices=list(SIM_ENGINES))
     
     args, unknown = ap.parse_known_args()
     
@@ -430,7 +540,8 @@ def main():
         leverage=args.leverage,
         stop_atr_scale=args.stop_atr_scale,
         start_date=args.start_date,
-        end_date=args.end_date
+        end_date=args.end_date,
+        sim_engine=args.sim_engine
     )
 
 if __name__ == "__main__":
@@ -18,6 +18,13 @@ import numpy as np
 from tqdm import tqdm
 import json
 
+try:
+    from .bar_store import candidate_bars, load_candidate_bars, scan_universe
+    from .sim_kernel import EXIT_STOP, bar_time_ns, find_entry_exit, ns_to_time, time_to_ns
+except ImportError:  # executed as a script
+    from bar_store import candidate_bars, load_candidate_bars, scan_universe
+    from sim_kernel import EXIT_STOP, bar_time_ns, find_entry_exit, ns_to_time, time_to_ns
+
 # Setup Paths
 BACKTEST_DIR = Path(__file__).resolve().parent
 DATA_DIR = BACKTEST_DIR / "data"
@@ -26,6 +33,10 @@ ORB_RUNS_DIR = DATA_DIR / "runs"
 ORB_RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
 OR_START = time(9, 30)
+OR_START_NS = time_to_ns(OR_START)
+
+# 'numpy' = array-scan kernel (default); 'loop' = legacy iterrows walk kept for parity checks
+SIM_ENGINES = ("numpy", "loop")
 
 # Defaults
 INITIAL_CAPITAL = 1500.0 
@@ -75,29 +86,95 @@ def simulate_trade(
     free_exits: bool = False,
     max_share_cap: int = None,
     limit_retest: bool = False,
-    entry_cutoff: time = None
+    entry_cutoff: time = None,
+    engine: str = "numpy"
 ) -> dict:
-    """Simulate trade execution with stop, EOD exit, and spread costs."""
+    """Simulate trade execution with stop, EOD exit, and spread costs.
+
+    engine: 'numpy' (array-scan kernel, default) or 'loop' (legacy per-bar walk, for parity checks).
+    """
+    if engine not in SIM_ENGINES:
+        raise ValueError(f"Unknown sim engine: {engine} (expected one of {SIM_ENGINES})")
+
+    def get_execution_price(base_price, is_buy):
+        spread_amt = max(base_price * spread_pct, min_tick)
+        if is_buy:
+            return base_price + spread_amt
+        else:
+            return base_price - spread_amt
+
+    if engine == "loop":
+        fill = _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price)
+    else:
+        fill = _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price)
+
+    if not fill['entered']:
+        return {'entered': False, 'exit_reason': fill['exit_reason']}
+
+    return _build_trade_result(
+        bars, direction,
+        fill['entry_price'], fill['entry_time'],
+        fill['exit_price'], fill['exit_time'], fill['exit_reason'],
+        position_size=position_size,
+        leverage=leverage,
+        apply_leverage=apply_leverage,
+        max_pct_volume=max_pct_volume,
+        comm_share=comm_share,
+        comm_min=comm_min,
+        free_exits=free_exits,
+        max_share_cap=max_share_cap,
+    )
+
+def _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price) -> dict:
+    """Array-scan entry/exit detection (see sim_kernel.py)."""
+    t_ns = bar_time_ns(bars)
+    post_or = t_ns > OR_START_NS
+    if not post_or.any():
+        return {'entered': False, 'exit_reason': 'NO_BARS'}
+
+    high = bars['high'].to_numpy(dtype=float)[post_or]
+    low = bars['low'].to_numpy(dtype=float)[post_or]
+    t_post = t_ns[post_or]
+    entry_idx, exit_idx, reason = find_entry_exit(
+        high, low, t_post, direction, entry_level, stop_level,
+        limit_retest=limit_retest,
+        cutoff_ns=time_to_ns(entry_cutoff) if entry_cutoff else None,
+    )
+    if entry_idx < 0:
+        return {'entered': False, 'exit_reason': reason}
+
+    if limit_retest:
+        entry_price = float(entry_level)
+    else:
+        entry_price = get_execution_price(entry_level, is_buy=(direction == 1))
+
+    if reason == EXIT_STOP:
+        exit_price = get_execution_price(stop_level, is_buy=(direction != 1))
+    else:
+        raw_close = float(bars['close'].to_numpy()[post_or][-1])
+        exit_price = get_execution_price(raw_close, is_buy=(direction != 1))
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': ns_to_time(t_post[entry_idx]),
+        'exit_price': exit_price,
+        'exit_time': ns_to_time(t_post[exit_idx]),
+        'exit_reason': reason,
+    }
+
+def _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price) -> dict:
+    """Legacy per-bar iterrows() walk. Kept for parity checks against the NumPy kernel."""
     trade_bars = bars[bars['time'] > OR_START].copy()
     if trade_bars.empty:
         return {'entered': False, 'exit_reason': 'NO_BARS'}
     
-    total_daily_volume = bars['volume'].sum()
-    max_allowed_shares = total_daily_volume * max_pct_volume
-    
     in_trade = False
     entry_price = None
     entry_time = None
     exit_price = None
     exit_time = None
     exit_reason = None
-    
-    def get_execution_price(base_price, is_buy):
-        spread_amt = max(base_price * spread_pct, min_tick)
-        if is_buy:
-            return base_price + spread_amt
-        else:
-            return base_price - spread_amt
 
     triggered = False
     for _, bar in trade_bars.iterrows():
@@ -155,7 +232,37 @@ def simulate_trade(
     
     if not in_trade:
         return {'entered': False, 'exit_reason': 'NO_ENTRY'}
-    
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': entry_time,
+        'exit_price': exit_price,
+        'exit_time': exit_time,
+        'exit_reason': exit_reason,
+    }
+
+def _build_trade_result(
+    bars: pd.DataFrame,
+    direction: int,
+    entry_price: float,
+    entry_time,
+    exit_price: float,
+    exit_time,
+    exit_reason: str,
+    position_size: float,
+    leverage: float,
+    apply_leverage: bool,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+) -> dict:
+    """Size the position and compute P&L/commission for a filled trade."""
+    total_daily_volume = bars['volume'].sum()
+    max_allowed_shares = total_daily_volume * max_pct_volume
+
     direction_sign = 1 if direction == 1 else -1
     price_move = (exit_price - entry_price) * direction_sign
     
@@ -232,12 +339,17 @@ def run_strategy(
     limit_retest: bool = False,
     sizing_mode: str = "equal",
     risk_per_trade_pct: float = 0.01,
-    entry_cutoff: str = None 
+    entry_cutoff: str = None,
+    sim_engine: str = "numpy"
 ):
     run_spread_pct = spread_pct if spread_pct is not None else SPREAD_PCT
 
     print(f"Loading universe: {universe_path}")
-    df_universe = pd.read_parquet(universe_path)
+    # Date/ATR/volume/side filters are pushed down to the parquet scan; bars are not read yet
+    df_universe = scan_universe(
+        universe_path, start_date=start_date, end_date=end_date,
+        min_atr=min_atr, min_volume=min_volume, side=side_filter,
+    )
 
     # Parse Entry Cutoff
     cutoff_time = None
@@ -297,6 +409,10 @@ def run_strategy(
     if df_filtered.empty:
         print("No candidates after filters.")
         return
+
+    # Bar payloads only for the Top-N rows that survived ranking.
+    # Columnar universes return a UniverseBars handle; legacy files keep bars_json
+    df_filtered, universe_bars = load_candidate_bars(universe_path, df_filtered)
     
     results = []
     equity_curve = []
@@ -336,7 +452,7 @@ def run_strategy(
         allocation_per_trade = allocation_pool / num_trades_today if num_trades_today > 0 else 0
         
         for _, row in day_df.iterrows():
-            bars = deserialize_bars(row['bars_json'])
+            bars = candidate_bars(row, universe_bars, with_time=(sim_engine == "loop"))
             
             entry_level = row['or_high'] if row['direction'] == 1 else row['or_low']
             atr_stop_dist = stop_atr_scale * row['atr_14']
@@ -374,7 +490,8 @@ def run_strategy(
                 free_exits=free_exits,
                 max_share_cap=max_share_cap,
                 limit_retest=limit_retest,
-                entry_cutoff=cutoff_time
+                entry_cutoff=cutoff_time,
+                engine=sim_engine
             )
             
             trade_pnl = sim.get('dollar_pnl', 0.0) or 0.0
@@ -425,7 +542,8 @@ def run_strategy(
     # Save Run Config with cutoff
     run_config = {
         "run_name": run_name,
-        "entry_cutoff": str(cutoff_time) if cutoff_time else None
+        "entry_cutoff": str(cutoff_time) if cutoff_time else None,
+        "sim_engine": sim_engine,
     }
     # ... (simplified)
 
@@ -452,6 +570,7 @@ def main():
     ap.add_argument('--leverage', type=float, default=LEVERAGE)
     ap.add_argument('--initial-capital', type=float, default=INITIAL_CAPITAL)
     ap.add_argument('--entry-cutoff', type=str, default=None, help='Entry cutoff time (HH:MM). Cancel orders if no entry by this time.')
+    ap.add_argument('--sim-engine', type=str, default='numpy', choices=list(SIM_ENGINES), help='Trade simulator: numpy kernel (default) or legacy loop (parity checks)')
     
     args = ap.parse_args()
     
@@ -478,7 +597,8 @@ def main():
         end_date=args.end_date,
         leverage=args.leverage,
         initial_capital=args.initial_capital,
-        entry_cutoff=args.entry_cutoff
+        entry_cutoff=args.entry_cutoff,
+        sim_engine=args.sim_engine
     )
 
 if __name__ == "__main__":
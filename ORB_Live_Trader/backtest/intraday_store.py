@@ -0,0 +1,455 @@
+"""
+Append-only per-symbol intraday bar store.
+
+Adding a day of bars used to mean reading the symbol's whole parquet file,
+concatenating, deduping and rewriting it, so each update cost the full file
+size in I/O. Here a write is one small part file, and parts are later merged
+into one file per year:
+
+    <root>/<SYMBOL>.parquet                                  legacy flat file (oldest data)
+    <root>/symbol=<SYMBOL>/year=<YYYY>/data.parquet           compacted year
+    <root>/symbol=<SYMBOL>/year=<YYYY>/part-<ns>-<pid>-<n>.parquet   appended parts
+
+Readers dedupe at read time. Sources rank flat file < data.parquet < parts
+(in write order), and the last row per timestamp wins. That matches the old
+concat + drop_duplicates(keep='last'). Years outside a requested range are
+not opened.
+
+The year of a row is its wall-clock year in the timestamp column's own
+timezone (ET for 5-min bars). compact_symbol rewrites only the years that
+have parts. With migrate=True it also splits the legacy flat file into years
+and removes it. Files are written under a temp name and renamed into place,
+so readers never see a partial file. A read that races a compaction (a part
+deleted between listing and opening) is retried.
+
+`Compactor` runs compactions on a background thread while writers keep
+appending.
+
+Usage (from the repo root):
+    python ORB_Live_Trader/backtest/intraday_store.py --root ORB_Live_Trader/data/bars/5min --stats
+    python ORB_Live_Trader/backtest/intraday_store.py --root ORB_Live_Trader/data/bars/5min --compact [--migrate] [--symbols AAPL MSFT]
+"""
+import argparse
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+TS_ALTERNATIVES = ("datetime", "timestamp", "date")
+DATA_FILE = "data.parquet"
+DEFAULT_MIN_PARTS = 8
+
+_part_seq = itertools.count()
+
+
+# --------------------------------------------------------------------------- layout
+
+def symbol_dir(root: Path, symbol: str) -> Path:
+    return Path(root) / f"symbol={symbol}"
+
+
+def flat_path(root: Path, symbol: str) -> Path:
+    return Path(root) / f"{symbol}.parquet"
+
+
+def has_bars(root: Path, symbol: str) -> bool:
+    """True when the symbol has a flat file or a store directory under `root`."""
+    return flat_path(root, symbol).exists() or symbol_dir(root, symbol).is_dir()
+
+
+def list_symbols(root: Path) -> List[str]:
+    """Symbols with data under `root` (store directories and flat files)."""
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    out = set()
+    for entry in os.scandir(root):
+        if entry.is_dir() and entry.name.startswith("symbol="):
+            out.add(entry.name.split("=", 1)[1])
+        elif entry.is_file() and entry.name.endswith(".parquet"):
+            out.add(entry.name[:-len(".parquet")])
+    return sorted(out)
+
+
+def _year_dirs(root: Path, symbol: str) -> Dict[int, Path]:
+    base = symbol_dir(root, symbol)
+    if not base.is_dir():
+        return {}
+    out = {}
+    for entry in os.scandir(base):
+        if entry.is_dir() and entry.name.startswith("year="):
+            try:
+                out[int(entry.name[5:])] = Path(entry.path)
+            except ValueError:
+                continue
+    return dict(sorted(out.items()))
+
+
+def _year_files(year_dir: Path) -> tuple[Optional[Path], List[Path]]:
+    """(data.parquet or None, parts in write order) of one year directory."""
+    data, parts = None, []
+    for entry in os.scandir(year_dir):
+        if entry.name == DATA_FILE:
+            data = Path(entry.path)
+        elif entry.name.startswith("part-") and entry.name.endswith(".parquet"):
+            parts.append(Path(entry.path))
+    return data, sorted(parts)
+
+
+def _files(root: Path, symbol: str, years: Optional[range] = None) -> List[Path]:
+    """All files of a symbol, lowest precedence first."""
+    files = []
+    flat = flat_path(root, symbol)
+    if flat.exists():
+        files.append(flat)
+    for year, year_dir in _year_dirs(root, symbol).items():
+        if years is not None and year not in years:
+            continue
+        data, parts = _year_files(year_dir)
+        files += ([data] if data else []) + parts
+    return files
+
+
+def version(root: Path, symbol: str) -> Optional[tuple]:
+    """Changes whenever any file of the symbol is added, replaced or removed (for cache keys)."""
+    out = []
+    for path in _files(root, symbol):
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            continue
+        out.append((path.name, st.st_mtime_ns, st.st_size))
+    return tuple(out) or None
+
+
+def part_counts(root: Path, symbol: str) -> Dict[int, int]:
+    """year -> number of uncompacted parts."""
+    return {year: len(_year_files(d)[1]) for year, d in _year_dirs(root, symbol).items()}
+
+
+def schema(root: Path, symbol: str) -> Optional[pa.Schema]:
+    """Arrow schema of the symbol's newest file (None when it has no data)."""
+    for path in reversed(_files(root, symbol)):
+        try:
+            return pq.read_schema(path)
+        except FileNotFoundError:
+            continue
+    return None
+
+
+# --------------------------------------------------------------------------- reading
+
+def _normalise(table: pa.Table, ts_col: str) -> pa.Table:
+    """Rename an alternative timestamp column to `ts_col` (files written under another name)."""
+    if ts_col in table.column_names:
+        return table
+    for alt in TS_ALTERNATIVES:
+        if alt in table.column_names:
+            names = [ts_col if n == alt else n for n in table.column_names]
+            return table.rename_columns(names)
+    return table
+
+
+def _read_file(path: Path, columns: Optional[Sequence[str]] = None, filters: Optional[list] = None) -> pa.Table:
+    """
+    One store file. Hive discovery is off: the symbol=/year= folders would
+    otherwise come back as dictionary columns clashing with the bars' own
+    string `symbol` column.
+    """
+    return pq.read_table(path, columns=columns, filters=filters, partitioning=None)
+
+
+def _bound(value, ts_type: pa.DataType) -> pa.Scalar:
+    ts = pd.Timestamp(value)
+    tz = getattr(ts_type, "tz", None)
+    if tz:
+        ts = ts.tz_localize(tz) if ts.tzinfo is None else ts.tz_convert(tz)
+    elif ts.tzinfo is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    return pa.scalar(ts, type=ts_type)
+
+
+def _align(tables: List[pa.Table], ts_col: str) -> List[pa.Table]:
+    """Cast every timestamp column to the newest file's type (unit / timezone may differ between writers)."""
+    target = tables[-1].schema.field(ts_col).type
+    out = []
+    for t in tables:
+        i = t.schema.get_field_index(ts_col)
+        if t.schema.field(i).type != target:
+            t = t.set_column(i, ts_col, t.column(i).cast(target))
+        out.append(t)
+    return out
+
+
+def dedupe(tables: List[pa.Table], ts_col: str) -> pa.Table:
+    """
+    One table sorted by `ts_col` with one row per timestamp; on duplicates
+    the row from the latest table (and the latest row within it) wins.
+    """
+    non_empty = [t for t in tables if t.num_rows]
+    if not non_empty:
+        return tables[-1] if tables else pa.table({ts_col: pa.array([], pa.timestamp("ns"))})
+    tables = non_empty
+    table = pa.concat_tables(_align(tables, ts_col), promote_options="permissive")
+    ts = table.column(ts_col)
+    if ts.null_count:
+        table = table.filter(pc.is_valid(ts))
+        ts = table.column(ts_col)
+    key = ts.cast(pa.int64()).to_numpy()
+    if len(tables) == 1 and (len(key) < 2 or (np.diff(key) > 0).all()):
+        return table
+    order = np.lexsort((-np.arange(len(key)), key))  # by time, latest row first within a timestamp
+    key = key[order]
+    first = np.ones(len(key), dtype=bool)
+    first[1:] = key[1:] != key[:-1]
+    return table.take(pa.array(order[first]))
+
+
+def read_table(
+    root: Path,
+    symbol: str,
+    ts_col: str = "datetime",
+    start=None,
+    end=None,
+    filters: Optional[list] = None,
+    columns: Optional[Sequence[str]] = None,
+) -> Optional[pa.Table]:
+    """
+    Deduped bars of one symbol, optionally limited to start <= ts <= end
+    (naive bounds are wall time in the column's timezone) and/or parquet
+    `filters`. None when the symbol has no data.
+    """
+    years = None
+    if start is not None or end is not None:
+        lo = (pd.Timestamp(start) - pd.Timedelta(days=1)).year if start is not None else 1
+        hi = (pd.Timestamp(end) + pd.Timedelta(days=1)).year if end is not None else 9999
+        years = range(lo, hi + 1)
+
+    for attempt in range(3):
+        files = _files(root, symbol, years)
+        if not files:
+            return None
+        try:
+            tables = [_normalise(_read_file(f, columns=columns, filters=filters), ts_col) for f in files]
+            break
+        except FileNotFoundError:
+            # A compaction replaced / removed files after we listed them
+            if attempt == 2:
+                raise
+            time.sleep(0.05)
+    tables = [t for t in tables if ts_col in t.column_names]
+    if not tables:
+        return None
+
+    table = dedupe(tables, ts_col)
+    if (start is not None or end is not None) and pa.types.is_timestamp(table.schema.field(ts_col).type):
+        ts = table.column(ts_col)
+        mask = None
+        if start is not None:
+            mask = pc.greater_equal(ts, _bound(start, ts.type))
+        if end is not None:
+            upper = pc.less_equal(ts, _bound(end, ts.type))
+            mask = upper if mask is None else pc.and_(mask, upper)
+        table = table.filter(mask)
+    return table
+
+
+def read_bars(root: Path, symbol: str, ts_col: str = "datetime", start=None, end=None, columns: Optional[Sequence[str]] = None) -> pd.DataFrame:
+    """read_table as a DataFrame (empty when the symbol has no data)."""
+    table = read_table(root, symbol, ts_col, start, end, columns=columns)
+    return table.to_pandas() if table is not None else pd.DataFrame()
+
+
+# --------------------------------------------------------------------------- writing
+
+def _write(table: pa.Table, path: Path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    pq.write_table(table, tmp, compression="snappy")
+    os.replace(tmp, path)
+
+
+def _years(table: pa.Table, ts_col: str) -> np.ndarray:
+    return pc.year(table.column(ts_col)).to_numpy(zero_copy_only=False)
+
+
+def append_bars(root: Path, symbol: str, df: pd.DataFrame, ts_col: str = "datetime") -> List[Path]:
+    """Write `df` as new part file(s), one per calendar year it touches; existing files are not read."""
+    if df is None or df.empty:
+        return []
+    if ts_col not in df.columns:
+        alt = next((a for a in TS_ALTERNATIVES if a in df.columns), None)
+        if alt is None:
+            raise ValueError(f"No timestamp column in bars for {symbol}")
+        df = df.rename(columns={alt: ts_col})
+    df = df.dropna(subset=[ts_col]).drop_duplicates(subset=[ts_col], keep="last").sort_values(ts_col)
+    if df.empty:
+        return []
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    years = _years(table, ts_col)
+    paths = []
+    for year in np.unique(years):
+        name = f"part-{time.time_ns():020d}-{os.getpid()}-{next(_part_seq):06d}.parquet"
+        path = symbol_dir(root, symbol) / f"year={int(year):04d}" / name
+        _write(table.filter(pa.array(years == year)), path)
+        paths.append(path)
+    return paths
+
+
+def _read_flat(root: Path, symbol: str, ts_col: str) -> Optional[pa.Table]:
+    path = flat_path(root, symbol)
+    if not path.exists():
+        return None
+    table = _normalise(_read_file(path), ts_col)
+    return table if ts_col in table.column_names else None
+
+
+def compact_symbol(root: Path, symbol: str, ts_col: str = "datetime", min_parts: int = 1, migrate: bool = False) -> dict:
+    """
+    Merge each year's parts (years with at least `min_parts`) into its data.parquet.
+    With `migrate`, the legacy flat file is split into the year files and removed.
+    Returns {"years", "parts", "rows", "bytes_written"}.
+    """
+    stats = {"years": 0, "parts": 0, "rows": 0, "bytes_written": 0}
+    flat = _read_flat(root, symbol, ts_col) if migrate else None
+    flat_years = _years(flat, ts_col) if flat is not None and flat.num_rows else np.array([], dtype=np.int64)
+    year_dirs = _year_dirs(root, symbol)
+
+    todo = {}
+    for year, year_dir in year_dirs.items():
+        data, parts = _year_files(year_dir)
+        if len(parts) >= min_parts or year in flat_years:
+            todo[year] = (data, parts)
+    for year in np.unique(flat_years):
+        todo.setdefault(int(year), (None, []))
+
+    for year, (data, parts) in sorted(todo.items()):
+        sources = []
+        if flat is not None and len(flat_years):
+            sources.append(flat.filter(pa.array(flat_years == year)))
+        sources += [_normalise(_read_file(p), ts_col) for p in ([data] if data else []) + parts]
+        merged = dedupe(sources, ts_col)
+        target = symbol_dir(root, symbol) / f"year={year:04d}" / DATA_FILE
+        _write(merged, target)
+        for p in parts:
+            p.unlink(missing_ok=True)
+        stats["years"] += 1
+        stats["parts"] += len(parts)
+        stats["rows"] += merged.num_rows
+        stats["bytes_written"] += target.stat().st_size
+
+    if migrate and flat is not None:
+        flat_path(root, symbol).unlink(missing_ok=True)
+    return stats
+
+
+class Compactor:
+    """
+    Background compaction while writers append.
+
+    submit(symbol) after a write; the worker thread compacts that symbol's
+    years once they hold `min_parts` parts. close() compacts whatever is still
+    queued and stops the thread.
+    """
+
+    def __init__(self, root: Path, ts_col: str = "datetime", min_parts: int = DEFAULT_MIN_PARTS, migrate: bool = False):
+        self.root = Path(root)
+        self.ts_col = ts_col
+        self.min_parts = min_parts
+        self.migrate = migrate
+        self.stats = {"symbols": 0, "years": 0, "parts": 0, "bytes_written": 0, "errors": 0}
+        self._queue: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._queued = set()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "Compactor":
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="bar-compactor", daemon=True)
+            self._thread.start()
+        return self
+
+    def submit(self, symbol: str):
+        with self._lock:
+            if symbol in self._queued:
+                return
+            self._queued.add(symbol)
+        self._queue.put(symbol)
+
+    def close(self) -> dict:
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        return self.stats
+
+    def __enter__(self) -> "Compactor":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self):
+        while True:
+            symbol = self._queue.get()
+            if symbol is None:
+                return
+            with self._lock:
+                self._queued.discard(symbol)
+            try:
+                result = compact_symbol(self.root, symbol, self.ts_col, self.min_parts, self.migrate)
+            except Exception as e:
+                logger.error(f"[{symbol}] Compaction failed: {e}")
+                self.stats["errors"] += 1
+                continue
+            if result["years"]:
+                self.stats["symbols"] += 1
+                for k in ("years", "parts", "bytes_written"):
+                    self.stats[k] += result[k]
+
+
+# --------------------------------------------------------------------------- CLI
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(description="Inspect / compact an intraday bar store")
+    ap.add_argument("--root", type=Path, required=True, help="Store root, e.g. data/processed/5min")
+    ap.add_argument("--symbols", nargs="*", default=None, help="Default: every symbol under --root")
+    ap.add_argument("--ts-col", default="datetime")
+    ap.add_argument("--compact", action="store_true", help="Merge parts into yearly files")
+    ap.add_argument("--migrate", action="store_true", help="Also split legacy flat <SYMBOL>.parquet files into years")
+    ap.add_argument("--min-parts", type=int, default=1)
+    ap.add_argument("--stats", action="store_true", help="Print part counts")
+    args = ap.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(message)s")
+    symbols = args.symbols or list_symbols(args.root)
+    if args.stats:
+        n_parts = {s: sum(part_counts(args.root, s).values()) for s in symbols}
+        flat = sum(flat_path(args.root, s).exists() for s in symbols)
+        print(f"{len(symbols)} symbols, {flat} legacy flat files, {sum(n_parts.values())} parts "
+              f"(max {max(n_parts.values(), default=0)} for one symbol)")
+    if args.compact:
+        with Compactor(args.root, args.ts_col, args.min_parts, args.migrate) as compactor:
+            for symbol in symbols:
+                compactor.submit(symbol)
+        s = compactor.stats
+        print(f"Compacted {s['symbols']} symbols: {s['parts']} parts into {s['years']} year files "
+              f"({s['bytes_written'] / 1e6:.1f} MB written, {s['errors']} errors)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -2,7 +2,7 @@
 Enrich Sentiment Universe (Backtest Pipeline)
 =============================================
 Takes the raw sentiment universe and enriches it with:
-1. 5-min Price Data (bars_json)
+1. 5-min Price Data (columnar bar_* lists, or legacy bars_json)
 2. Daily Metrics (ATR, AvgVol, Shares)
 
 Output: ORB_Live_Trader/backtest/data/backtest/orb/universe/research_2021_sentiment_ROLLING24H/universe_sentiment_0.9.parquet
@@ -17,6 +17,12 @@ from tqdm import tqdm
 from datetime import time, datetime, timedelta
 import json
 
+try:
+    from .. import bar_cache
+except ImportError:  # executed as a script: shared bar cache lives in backtest/
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    import bar_cache
+
 # Paths
 PIPELINE_DIR = Path(__file__).parent
 BACKTEST_DIR = PIPELINE_DIR.parent
@@ -42,32 +48,12 @@ OR_START = time(9, 30)
 OR_END = time(16, 0)
 
 def load_daily(symbol: str):
-    p = DATA_DIR_DAILY / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if 'date' not in df.columns or df.empty:
-            return None
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
-        return df
-    except Exception:
-        return None
+    # Cached per process (see bar_cache.py)
+    return bar_cache.load_daily(DATA_DIR_DAILY / f"{symbol}.parquet")
 
 def load_5min_full(symbol: str):
-    p = DATA_DIR_5MIN / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if df.empty or 'datetime' not in df.columns:
-            return None
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        df['date_et'] = df['datetime'].dt.date
-        df['time'] = df['datetime'].dt.time
-        return df
-    except Exception:
-        return None
+    # Cached per process, with date_et/time/day/minute precomputed (see bar_cache.py)
+    return bar_cache.load_5min(DATA_DIR_5MIN / f"{symbol}.parquet")
 
 def extract_or(bars: pd.DataFrame):
     or_row = bars[bars['time'] == OR_START]
@@ -100,6 +86,20 @@ def serialize_bars(bars: pd.DataFrame) -> str:
     bars_clean['datetime'] = bars_clean['datetime'].dt.strftime('%Y-%m-%d %H:%M:%S')
     return bars_clean.to_json(orient='records')
 
+def bars_to_columns(bars: pd.DataFrame) -> dict:
+    """Columnar bar cells (bar_t ns wall-clock ET + float64 OHLCV). Mirrors backtest/bar_store.py."""
+    dt = pd.to_datetime(bars['datetime'])
+    if getattr(dt.dt, 'tz', None) is not None:
+        dt = dt.dt.tz_localize(None)
+    return {
+        'bar_t': dt.dt.floor('s').to_numpy(dtype='datetime64[ns]').view('int64'),
+        'bar_open': bars['open'].to_numpy(dtype=np.float64),
+        'bar_high': bars['high'].to_numpy(dtype=np.float64),
+        'bar_low': bars['low'].to_numpy(dtype=np.float64),
+        'bar_close': bars['close'].to_numpy(dtype=np.float64),
+        'bar_volume': bars['volume'].to_numpy(dtype=np.float64),
+    }
+
 # -----------------------------------------------------------------------------
 # Core Logic
 # -----------------------------------------------------------------------------
@@ -143,6 +143,8 @@ def generate_base_universe(df_news, threshold, mode='rolling_24h'):
 def main():
     parser = argparse.ArgumentParser(description="Enrich sentiment universe")
     parser.add_argument('--mode', type=str, default='rolling_24h', choices=['rolling_24h', 'premarket'])
+    parser.add_argument('--bars-format', type=str, default='columnar', choices=['columnar', 'json'],
+                        help='Intraday bar storage: typed bar_* list columns (default) or legacy bars_json')
     args = parser.parse_args()
     
     if not INPUT_SCORED_NEWS.exists():
@@ -167,7 +169,8 @@ def main():
         base_df = generate_base_universe(df_raw, thresh, mode=args.mode)
         print(f"Candidates: {len(base_df)}")
         
-        base_df['bars_json'] = None
+        if args.bars_format == 'json':
+            base_df['bars_json'] = None
         base_df['atr_14'] = np.nan
         base_df['avg_volume_14'] = np.nan
         base_df['shares_outstanding'] = np.nan
@@ -220,7 +223,10 @@ def main():
                     rvol = (or_data['or_volume'] * 78.0) / avg_vol
                 
                 row_dict = row.to_dict()
-                row_dict['bars_json'] = serialize_bars(day_bars)
+                if args.bars_format == 'json':
+                    row_dict['bars_json'] = serialize_bars(day_bars)
+                else:
+                    row_dict.update(bars_to_columns(day_bars))
                 row_dict['atr_14'] = daily_row.get('atr_14', np.nan)
                 row_dict['avg_volume_14'] = daily_row.get('avg_volume_14', np.nan)
                 row_dict['shares_outstanding'] = daily_row.get('shares_outstanding', np.nan)
@@ -0,0 +1,111 @@
+"""
+NumPy trade-simulation kernel for the ORB fast backtester.
+
+Replaces the per-bar iterrows() walk with boolean-mask scans: the first
+breakout bar, the first retest bar and the first stop bar are each found with
+a single argmax over a mask. Semantics mirror the legacy loop exactly:
+- Breakout: enter on the first bar that touches the entry level.
+- Limit retest: the first touch only arms the order; entry fills on a later
+  bar that trades back through the level.
+- Entry cutoff: an unfilled (or still-armed) order is cancelled on the first
+  bar at/after the cutoff time.
+- Stops are only checked from the bar *after* entry; otherwise exit at EOD.
+"""
+from __future__ import annotations
+
+from datetime import time
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+NS_PER_SECOND = 1_000_000_000
+NS_PER_DAY = 86_400 * NS_PER_SECOND
+
+EXIT_STOP = "STOP_LOSS"
+EXIT_EOD = "EOD"
+NO_ENTRY = "NO_ENTRY"
+CUTOFF_CANCEL = "CUTOFF_CANCEL"
+
+
+def time_to_ns(t: time) -> int:
+    """Convert a wall-clock time to nanoseconds since midnight."""
+    seconds = t.hour * 3600 + t.minute * 60 + t.second
+    return seconds * NS_PER_SECOND + t.microsecond * 1000
+
+
+def ns_to_time(ns: int) -> time:
+    """Inverse of time_to_ns."""
+    seconds, rem = divmod(int(ns), NS_PER_SECOND)
+    minutes, second = divmod(seconds, 60)
+    hour, minute = divmod(minutes, 60)
+    return time(hour, minute, second, rem // 1000)
+
+
+def bar_time_ns(bars: pd.DataFrame) -> np.ndarray:
+    """Nanoseconds since midnight for each bar (int64, vectorised)."""
+    if "datetime" in bars.columns:
+        dt = bars["datetime"]
+        if not pd.api.types.is_datetime64_any_dtype(dt):
+            dt = pd.to_datetime(dt)
+        if getattr(dt.dt, "tz", None) is not None:
+            dt = dt.dt.tz_localize(None)
+        return dt.to_numpy(dtype="datetime64[ns]").view("int64") % NS_PER_DAY
+    return np.fromiter((time_to_ns(t) for t in bars["time"]), dtype=np.int64, count=len(bars))
+
+
+def first_true(mask: np.ndarray, start: int = 0) -> int:
+    """Index of the first True at or after `start`, or -1 if none."""
+    if start >= len(mask):
+        return -1
+    idx = int(np.argmax(mask[start:])) + start
+    return idx if mask[idx] else -1
+
+
+def find_entry_exit(
+    high: np.ndarray,
+    low: np.ndarray,
+    t_ns: np.ndarray,
+    direction: int,
+    entry_level: float,
+    stop_level: float,
+    limit_retest: bool = False,
+    cutoff_ns: Optional[int] = None,
+) -> Tuple[int, int, str]:
+    """Locate entry and exit bars on post-OR arrays.
+
+    Returns:
+        (entry_idx, exit_idx, reason). reason is STOP_LOSS or EOD when entered
+        (exit_idx is the last bar for EOD), otherwise NO_ENTRY/CUTOFF_CANCEL
+        with both indices -1.
+    """
+    n = len(high)
+    if direction == 1:
+        breakout = high >= entry_level
+        retest = low <= entry_level
+        stop_hit = low <= stop_level
+    elif direction == -1:
+        breakout = low <= entry_level
+        retest = high >= entry_level
+        stop_hit = high >= stop_level
+    else:
+        breakout = retest = stop_hit = np.zeros(n, dtype=bool)
+
+    if limit_retest:
+        trigger_idx = first_true(breakout)
+        entry_idx = first_true(retest, trigger_idx + 1) if trigger_idx >= 0 else -1
+    else:
+        entry_idx = first_true(breakout)
+
+    if cutoff_ns is not None:
+        cutoff_idx = first_true(t_ns >= cutoff_ns)
+        if cutoff_idx >= 0 and (entry_idx < 0 or cutoff_idx <= entry_idx):
+            return -1, -1, CUTOFF_CANCEL
+
+    if entry_idx < 0:
+        return -1, -1, NO_ENTRY
+
+    stop_idx = first_true(stop_hit, entry_idx + 1)
+    if stop_idx >= 0:
+        return entry_idx, stop_idx, EXIT_STOP
+    return entry_idx, n - 1, EXIT_EOD
@@ -2,15 +2,24 @@
 Unified Universe Generator
 Ported from enrich_sentiment_universe.py and build_universe.py
 """
+import os
 import sys
 import argparse
 import pandas as pd
 import numpy as np
 from pathlib import Path
 from tqdm import tqdm
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import time, datetime, timedelta
 import json
 
+try:
+    from . import bar_cache
+    from .bar_store import bars_to_columns
+except ImportError:  # executed as a script
+    import bar_cache
+    from bar_store import bars_to_columns
+
 # Setup Paths
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 DATA_DIR = PROJECT_ROOT / "data"
@@ -28,32 +37,12 @@ THRESHOLDS = [0.60, 0.70, 0.80, 0.90, 0.95]
 # -----------------------------------------------------------------------------
 
 def load_daily(symbol: str):
-    p = DATA_DIR_DAILY / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if 'date' not in df.columns or df.empty:
-            return None
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
-        return df
-    except Exception:
-        return None
+    # Cached per process (see bar_cache.py)
+    return bar_cache.load_daily(DATA_DIR_DAILY / f"{symbol}.parquet")
 
 def load_5min_full(symbol: str):
-    p = DATA_DIR_5MIN / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if df.empty or 'datetime' not in df.columns:
-            return None
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        df['date_et'] = df['datetime'].dt.date
-        df['time'] = df['datetime'].dt.time
-        return df
-    except Exception:
-        return None
+    # Cached per process, with date_et/time/day/minute precomputed (see bar_cache.py)
+    return bar_cache.load_5min(DATA_DIR_5MIN / f"{symbol}.parquet")
 
 def extract_or(bars: pd.DataFrame):
     or_row = bars[bars['time'] == OR_START]
@@ -128,9 +117,84 @@ def generate_base_universe(df_news, threshold, mode='rolling_24h'):
     universe = filtered.groupby(['trade_date', 'ticker'])['positive_score'].max().reset_index()
     return universe
 
+def enrich_ticker(ticker: str, rows: pd.DataFrame, bars_format: str = 'columnar') -> list:
+    """Enrich one ticker's candidate rows with OR metrics, daily metrics and the day's 5-min bars.
+
+    Candidates are joined to the daily frame in one merge and each day's bars
+    are a slice of the day-grouped 5-min frame. Returns (row_id, row_dict) pairs.
+    """
+    daily_df = load_daily(ticker)
+    bars_df = load_5min_full(ticker)
+    if daily_df is None or bars_df is None:
+        return []
+
+    # First daily row per calendar date, joined to all candidate dates at once
+    daily_df['date_obj'] = daily_df['date'].dt.date
+    daily_first = daily_df.drop_duplicates('date_obj').reset_index(drop=True)
+    trade_dates = [d.date() if isinstance(d, pd.Timestamp) else d for d in rows['trade_date']]
+    pos = pd.DataFrame({'date_obj': trade_dates}).merge(
+        daily_first[['date_obj']].reset_index().rename(columns={'index': 'daily_pos'}),
+        on='date_obj', how='left',
+    )['daily_pos'].to_numpy()
+
+    # Bars are grouped by ET day (bar_cache), so a day is one searchsorted slice
+    bar_day = bars_df['day'].to_numpy()
+    epoch_days = np.array([(d - datetime(1970, 1, 1).date()).days for d in trade_dates], dtype=np.int64)
+    lo = np.searchsorted(bar_day, epoch_days, 'left')
+    hi = np.searchsorted(bar_day, epoch_days, 'right')
+
+    out = []
+    for k, (row_id, row) in enumerate(rows.iterrows()):
+        if np.isnan(pos[k]) or lo[k] == hi[k]:
+            continue
+        daily_row = daily_first.iloc[int(pos[k])]
+        day_bars = bars_df.iloc[lo[k]:hi[k]].copy()
+        
+        or_data = extract_or(day_bars)
+        if not or_data:
+            continue
+        
+        direction = 0
+        if or_data['or_close'] > or_data['or_open']:
+            direction = 1
+        elif or_data['or_close'] < or_data['or_open']:
+            direction = -1
+
+        rvol = 0.0
+        avg_vol = daily_row.get('avg_volume_14', 0)
+        if avg_vol and avg_vol > 0:
+            rvol = (or_data['or_volume'] * 78.0) / avg_vol
+        
+        row_dict = row.to_dict()
+        if bars_format == 'json':
+            row_dict['bars_json'] = serialize_bars(day_bars)
+        else:
+            row_dict.update(bars_to_columns(day_bars))
+        row_dict['atr_14'] = daily_row.get('atr_14', np.nan)
+        row_dict['avg_volume_14'] = daily_row.get('avg_volume_14', np.nan)
+        row_dict['shares_outstanding'] = daily_row.get('shares_outstanding', np.nan)
+        
+        row_dict['or_open'] = or_data['or_open']
+        row_dict['or_high'] = or_data['or_high']
+        row_dict['or_low'] = or_data['or_low']
+        row_dict['or_close'] = or_data['or_close']
+        row_dict['or_volume'] = or_data['or_volume']
+        row_dict['direction'] = direction
+        row_dict['rvol'] = rvol
+        
+        row_dict['prev_close'] = daily_row.get('prev_close', daily_row.get('close', np.nan)) 
+        
+        out.append((row_id, row_dict))
+    return out
+
+
 def main():
     parser = argparse.ArgumentParser(description="Enrich sentiment universe")
     parser.add_argument('--mode', type=str, default='rolling_24h', choices=['rolling_24h', 'premarket'])
+    parser.add_argument('--bars-format', type=str, default='columnar', choices=['columnar', 'json'],
+                        help='Intraday bar storage: typed bar_* list columns (default) or legacy bars_json')
+    parser.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1),
+                        help='Ticker worker processes (default: CPU count - 1; 1 = in-process)')
     args = parser.parse_args()
     
     if not INPUT_SCORED_NEWS.exists():
@@ -149,82 +213,41 @@ def main():
     print(f"Loading Scored News: {INPUT_SCORED_NEWS.name}")
     df_raw = pd.read_parquet(INPUT_SCORED_NEWS)
     print(f"Loaded {len(df_raw)} news items.")
-    
+
+    # A (date, ticker) pair passes threshold t iff its max score > t, so every
+    # threshold's universe is a subset of the lowest one: enrich that once.
+    base_all = generate_base_universe(df_raw, min(THRESHOLDS), mode=args.mode)
+    if args.bars_format == 'json':
+        base_all['bars_json'] = None
+    base_all['atr_14'] = np.nan
+    base_all['avg_volume_14'] = np.nan
+    base_all['shares_outstanding'] = np.nan
+    base_all['prev_close'] = np.nan
+
+    tickers = base_all['ticker'].unique()
+    print(f"Enriching {len(base_all)} candidates across {len(tickers)} unique tickers (workers={args.workers})...")
+    groups = {ticker: rows for ticker, rows in base_all.groupby('ticker', sort=False)}
+    enriched = {}
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [executor.submit(enrich_ticker, t, groups[t], args.bars_format) for t in tickers]
+            for future in tqdm(as_completed(futures), total=len(futures)):
+                enriched.update(future.result())
+    else:
+        for ticker in tqdm(tickers):
+            enriched.update(enrich_ticker(ticker, groups[ticker], args.bars_format))
+
     for thresh in THRESHOLDS:
         print(f"\n--- Generating Universe for Threshold > {thresh} (Mode: {args.mode}) ---")
         
-        base_df = generate_base_universe(df_raw, thresh, mode=args.mode)
+        base_df = base_all[base_all['positive_score'] > thresh]
         print(f"Candidates: {len(base_df)}")
-        
-        base_df['bars_json'] = None
-        base_df['atr_14'] = np.nan
-        base_df['avg_volume_14'] = np.nan
-        base_df['shares_outstanding'] = np.nan
-        base_df['prev_close'] = np.nan
-        
-        tickers = base_df['ticker'].unique()
-        print(f"Processing {len(tickers)} unique tickers...")
-        
-        enriched_rows = []
-        
-        for ticker in tqdm(tickers):
-            daily_df = load_daily(ticker)
-            bars_df = load_5min_full(ticker)
-            
-            if daily_df is None or bars_df is None:
-                continue
-                
-            ticker_mask = base_df['ticker'] == ticker
-            ticker_rows = base_df[ticker_mask]
-            
-            for idx, row in ticker_rows.iterrows():
-                trade_date = row['trade_date']
-                if isinstance(trade_date, pd.Timestamp):
-                    trade_date = trade_date.date()
-                
-                daily_df['date_obj'] = pd.to_datetime(daily_df['date']).dt.date
-                daily_matches = daily_df[daily_df['date_obj'] == trade_date]
-                
-                if daily_matches.empty:
-                    continue
-                daily_row = daily_matches.iloc[0]
-                
-                day_bars = bars_df[bars_df['date_et'] == trade_date].copy()
-                if day_bars.empty:
-                    continue
-                
-                or_data = extract_or(day_bars)
-                if not or_data:
-                    continue
-                
-                direction = 0
-                if or_data['or_close'] > or_data['or_open']:
-                    direction = 1
-                elif or_data['or_close'] < or_data['or_open']:
-                    direction = -1
-
-                rvol = 0.0
-                avg_vol = daily_row.get('avg_volume_14', 0)
-                if avg_vol and avg_vol > 0:
-                    rvol = (or_data['or_volume'] * 78.0) / avg_vol
-                
-                row_dict = row.to_dict()
-                row_dict['bars_json'] = serialize_bars(day_bars)
-                row_dict['atr_14'] = daily_row.get('atr_14', np.nan)
-                row_dict['avg_volume_14'] = daily_row.get('avg_volume_14', np.nan)
-                row_dict['shares_outstanding'] = daily_row.get('shares_outstanding', np.nan)
-                
-                row_dict['or_open'] = or_data['or_open']
-                row_dict['or_high'] = or_data['or_high']
-                row_dict['or_low'] = or_data['or_low']
-                row_dict['or_close'] = or_data['or_close']
-                row_dict['or_volume'] = or_data['or_volume']
-                row_dict['direction'] = direction
-                row_dict['rvol'] = rvol
-                
-                row_dict['prev_close'] = daily_row.get('prev_close', daily_row.get('close', np.nan)) 
-                
-                enriched_rows.append(row_dict)
+
+        # Same row order as a per-threshold run: tickers by first appearance, then date
+        ticker_rank = {t: i for i, t in enumerate(base_df['ticker'].unique())}
+        row_ids = sorted((rid for rid in base_df.index if rid in enriched),
+                         key=lambda rid: (ticker_rank[base_all.at[rid, 'ticker']], rid))
+        enriched_rows = [enriched[rid] for rid in row_ids]
 
         if not enriched_rows:
             print(f"Warning: No valid rows enriched for threshold {thresh}")
@@ -4,7 +4,7 @@ Decouples logic from real-time execution for verification/simulation.
 """
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Tuple
 
 class Clock(ABC):
     @abstractmethod
@@ -15,6 +15,10 @@ class Clock(ABC):
     def sleep(self, seconds: float):
         pass
 
+    def idle(self, seconds: float):
+        """Poll-loop sleep while waiting for something to happen (simulated clocks may skip ahead)."""
+        self.sleep(seconds)
+
 class Broker(ABC):
     @abstractmethod
     def get_quote(self, symbol: str) -> Dict[str, float]:
@@ -36,6 +40,10 @@ class Broker(ABC):
         """Returns [{'symbol': str, 'qty': float, 'ref_number': str, ...}]"""
         pass
 
+    def get_snapshot(self) -> Tuple[List[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+        """Returns (positions, active_orders) in one round. Override when both can be read together."""
+        return self.get_positions(), self.get_active_orders()
+
     @abstractmethod
     def get_notifications(self) -> List[Dict[str, Any]]:
         """Returns [{'date': str, 'title': str, 'message': str}]"""
@@ -44,9 +44,11 @@ class TimedLiveClock(Clock):
         time_module.sleep(seconds)
 
 class TradeZeroBroker(Broker):
-    def __init__(self, tz_client, dry_run: bool = False):
+    def __init__(self, tz_client, dry_run: bool = False, position_max_age_sec: Optional[float] = None):
         self.client = tz_client
         self.dry_run = dry_run
+        # Cap on how long get_snapshot may serve the cached portfolio (None: client default)
+        self.position_max_age_sec = position_max_age_sec
         self._mock_positions = [] # Used only in dry_run mode
         self._mock_orders = []    # Used only in dry_run mode
         
@@ -129,11 +131,14 @@ class TradeZeroBroker(Broker):
             return f"TZ_{otype}_{symbol}_{int(datetime.now().timestamp())}"
         return ""
     
-    def get_positions(self) -> List[Dict[str, Any]]:
+    def get_positions(self, if_changed: bool = False, max_age_sec: Optional[float] = None) -> List[Dict[str, Any]]:
         if self.dry_run:
             return self._mock_positions
 
-        portfolio_df = self.client.get_portfolio()
+        if max_age_sec is None:
+            portfolio_df = self.client.get_portfolio(if_changed=if_changed)
+        else:
+            portfolio_df = self.client.get_portfolio(if_changed=if_changed, max_age_sec=max_age_sec)
         # Convert DF to list of dicts for generic Broker interface
         if isinstance(portfolio_df, pd.DataFrame) and not portfolio_df.empty:
             # TradeZero client.get_portfolio already returns standardized keys:
@@ -141,16 +146,24 @@ class TradeZeroBroker(Broker):
             return portfolio_df.to_dict('records')
         return []
 
-    def get_active_orders(self) -> List[Dict[str, Any]]:
+    def get_active_orders(self, if_changed: bool = False) -> List[Dict[str, Any]]:
         if self.dry_run:
             return [o for o in self._mock_orders if o['status'] == 'SUBMITTED']
         
-        orders_df = self.client.get_active_orders()
+        orders_df = self.client.get_active_orders(if_changed=if_changed)
         if orders_df is None: return None
         if isinstance(orders_df, pd.DataFrame) and not orders_df.empty:
             return orders_df.to_dict('records')
         return []
 
+    def get_snapshot(self):
+        # Session ticks: tables the page has not mutated since the last tick are served from
+        # the client's cache instead of being re-read (MutationObserver change feed). The snapshot
+        # leaves the orders tab showing, and a hidden portfolio tab may not re-render, so the
+        # portfolio cache is capped at position_max_age_sec (the session's poll interval)
+        positions = self.get_positions(if_changed=True, max_age_sec=self.position_max_age_sec)
+        return positions, self.get_active_orders(if_changed=True)
+
     def get_notifications(self) -> List[Dict[str, Any]]:
         if self.dry_run:
             return []
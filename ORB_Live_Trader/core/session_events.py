@@ -0,0 +1,181 @@
+"""
+Event-driven Session Engine
+One broker snapshot per tick (positions + active orders), diffed against the
+previous tick. Handlers subscribe to the resulting events instead of each
+re-querying the broker (every query is a DOM table scrape on TradeZero).
+
+Per tick, handlers run in this order:
+    position_updated   symbols whose position appeared or changed quantity
+    position_closed    symbols whose position disappeared (or went to 0)
+    order_added        orders that appeared on the broker's books
+    order_removed      orders that left the books (filled, cancelled, rejected)
+    snapshot           every tick (level checks against the shared snapshot)
+    timers             `every(seconds, ...)` handlers that are due (heartbeat, polling)
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from .execution import Clock, Broker
+
+POSITION_UPDATED = "position_updated"
+POSITION_CLOSED = "position_closed"
+ORDER_ADDED = "order_added"
+ORDER_REMOVED = "order_removed"
+SNAPSHOT = "snapshot"
+
+EVENT_ORDER = (POSITION_UPDATED, POSITION_CLOSED, ORDER_ADDED, ORDER_REMOVED)
+
+
+@dataclass
+class BrokerSnapshot:
+    taken_at: datetime
+    positions: List[Dict[str, Any]]
+    active_orders: Optional[List[Dict[str, Any]]]  # None when the order book could not be read
+
+    def position(self, symbol: str) -> Optional[Dict[str, Any]]:
+        return next((p for p in self.positions if p['symbol'] == symbol), None)
+
+    def position_symbols(self) -> set:
+        return {p['symbol'] for p in self.positions}
+
+    def order_refs(self) -> set:
+        return {o.get('ref_number') for o in self.active_orders or []}
+
+    def order_symbols(self) -> set:
+        return {o.get('symbol') for o in self.active_orders or []}
+
+
+@dataclass
+class SessionEvent:
+    kind: str
+    symbol: str
+    data: Dict[str, Any]  # current broker row; the last seen row for closed/removed
+    previous: Optional[Dict[str, Any]] = None
+
+
+def order_key(order: Dict[str, Any]):
+    """Stable identity of a broker order row across snapshots."""
+    ref = order.get('ref_number') or order.get('order_id')
+    if ref:
+        return ref
+    return (order.get('symbol'), str(order.get('side', '')), order.get('type'), order.get('price'), order.get('qty'))
+
+
+def diff_snapshots(prev: Optional[BrokerSnapshot], curr: BrokerSnapshot) -> List[SessionEvent]:
+    """Events that turn `prev` into `curr` (everything in `curr` is new when prev is None)."""
+    events = []
+    prev_pos = {p['symbol']: p for p in (prev.positions if prev else []) if float(p.get('qty', 0)) > 0}
+    curr_pos = {p['symbol']: p for p in curr.positions if float(p.get('qty', 0)) > 0}
+    for sym, p in curr_pos.items():
+        old = prev_pos.get(sym)
+        if old is None or float(old.get('qty', 0)) != float(p.get('qty', 0)):
+            events.append(SessionEvent(POSITION_UPDATED, sym, p, old))
+    for sym, old in prev_pos.items():
+        if sym not in curr_pos:
+            events.append(SessionEvent(POSITION_CLOSED, sym, old, old))
+
+    if curr.active_orders is not None:
+        prev_orders = {order_key(o): o for o in (prev.active_orders or [])} if prev else {}
+        curr_orders = {order_key(o): o for o in curr.active_orders}
+        for key, o in curr_orders.items():
+            if key not in prev_orders:
+                events.append(SessionEvent(ORDER_ADDED, o.get('symbol'), o))
+        for key, o in prev_orders.items():
+            if key not in curr_orders:
+                events.append(SessionEvent(ORDER_REMOVED, o.get('symbol'), o, o))
+    return events
+
+
+@dataclass
+class _Timer:
+    seconds: float
+    handler: Callable
+    last: float = 0.0
+    wake: bool = True
+
+
+class SessionEngine:
+    """
+    Drives a trading session from broker snapshots.
+
+    `poll_sec` is the time between ticks, i.e. the worst-case delay between a
+    fill on the broker and the fill handler reacting to it.
+    Handlers are called as handler(events, snapshot) with the tick's events of
+    their kind, in broker row order; timer and snapshot handlers get events=[].
+    """
+
+    def __init__(self, broker: Broker, clock: Clock, poll_sec: float = 5.0, origin: Optional[datetime] = None):
+        self.broker = broker
+        self.clock = clock
+        self.poll_sec = poll_sec
+        self.origin = origin
+        self.last_snapshot: Optional[BrokerSnapshot] = None
+        self._baseline: Optional[BrokerSnapshot] = None  # last snapshot with a readable order book
+        self._handlers: Dict[str, List[Callable]] = {}
+        self._timers: List[_Timer] = []
+        self.ticks = 0
+        self.events = 0
+        if hasattr(clock, 'add_wake_source'):
+            clock.add_wake_source(self.next_due)
+
+    def on(self, kind: str, handler: Callable):
+        self._handlers.setdefault(kind, []).append(handler)
+        return handler
+
+    def every(self, seconds: float, handler: Callable, wake: bool = True):
+        """
+        Run `handler` whenever `seconds` have passed since its last run (time measured from `origin`).
+        wake=False lets a skipping SimClock run past the timer's due time (for handlers with no effect in simulation).
+        """
+        self._timers.append(_Timer(seconds, handler, wake=wake))
+        return handler
+
+    def next_due(self, now: datetime) -> Optional[datetime]:
+        """Earliest due time of the waking timers (wake source for SimClock)."""
+        if self.origin is None:
+            return None
+        due = [self.origin + timedelta(seconds=t.last + t.seconds) for t in self._timers if t.wake]
+        return min(due) if due else None
+
+    def seed(self, positions: List[Dict[str, Any]]):
+        """Positions believed open before the first tick (restart recovery), so their closure emits events."""
+        self._baseline = BrokerSnapshot(self.clock.now(), [dict(p) for p in positions], None)
+
+    def take_snapshot(self) -> BrokerSnapshot:
+        positions, active_orders = self.broker.get_snapshot()
+        # Copy rows: brokers may hand out (and later mutate) their own position dicts
+        positions = [dict(p) for p in positions or []]
+        if active_orders is not None:
+            active_orders = [dict(o) for o in active_orders]
+        return BrokerSnapshot(self.clock.now(), positions, active_orders)
+
+    def tick(self) -> BrokerSnapshot:
+        snapshot = self.take_snapshot()
+        events = diff_snapshots(self._baseline, snapshot)
+        if snapshot.active_orders is None and self._baseline is not None:
+            # Order book unreadable this tick: diff the next one against the last known book
+            self._baseline = BrokerSnapshot(snapshot.taken_at, snapshot.positions, self._baseline.active_orders)
+        else:
+            self._baseline = snapshot
+        self.last_snapshot = snapshot
+        self.ticks += 1
+        self.events += len(events)
+
+        for kind in EVENT_ORDER:
+            batch = [e for e in events if e.kind == kind]
+            if batch:
+                for handler in self._handlers.get(kind, []):
+                    handler(batch, snapshot)
+        for handler in self._handlers.get(SNAPSHOT, []):
+            handler([], snapshot)
+
+        elapsed = (snapshot.taken_at - self.origin).total_seconds() if self.origin else self.ticks * self.poll_sec
+        for timer in self._timers:
+            if elapsed - timer.last >= timer.seconds:
+                timer.last = elapsed
+                timer.handler([], snapshot)
+        return snapshot
+
+    def wait(self):
+        self.clock.idle(self.poll_sec)
@@ -2,15 +2,29 @@
 Simulation Components for Verification
 """
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any
 from .execution import Clock, Broker
 import uuid
 
 class SimClock(Clock):
-    def __init__(self, start_time: datetime, time_step_sec: float = 60.0):
+    """
+    Simulated clock. `sleep` advances time by exactly the requested seconds.
+
+    With skip_idle=True, `idle` (the session loop's poll sleep) fast-forwards to
+    the first poll tick at or after the next time anything can change: the
+    earliest time reported by the wake sources (SimBroker fills, session engine
+    timers) or registered with `wake_at` (session boundaries). Poll ticks stay on
+    the same `seconds` grid, so every state transition happens at the same
+    simulated time as with fixed stepping; only the no-op ticks are dropped.
+    """
+    def __init__(self, start_time: datetime, time_step_sec: float = 60.0, skip_idle: bool = False):
         self._current_time = start_time
         self._time_step = time_step_sec
+        self.skip_idle = skip_idle
+        self._wake_sources: List[Callable[[datetime], Optional[datetime]]] = []
+        self._wake_times: List[datetime] = []
     
     def now(self) -> datetime:
         return self._current_time
@@ -22,10 +36,72 @@ class SimClock(Clock):
     def advance(self, seconds: float):
         self._current_time += timedelta(seconds=seconds)
 
+    def add_wake_source(self, source: Callable[[datetime], Optional[datetime]]):
+        """`source(now)` returns the next time after `now` at which its state can change (None: never)."""
+        self._wake_sources.append(source)
+
+    def wake_at(self, *times: datetime):
+        """Fixed times idle sleeps must not skip past (e.g. session phase boundaries)."""
+        self._wake_times = sorted(set(self._wake_times) | set(times))
+
+    def next_wake(self) -> Optional[datetime]:
+        now = self._current_time
+        candidates = [t for t in self._wake_times if t > now][:1]
+        for source in self._wake_sources:
+            t = source(now)
+            if t is not None and t > now:
+                candidates.append(t)
+        return min(candidates) if candidates else None
+
+    def idle(self, seconds: float):
+        if self.skip_idle and seconds > 0:
+            wake = self.next_wake()
+            step = timedelta(seconds=seconds)
+            if wake is not None and wake > self._current_time + step:
+                # First tick of the fixed `seconds` grid that is not before the wake time
+                self._current_time += step * -(-(wake - self._current_time) // step)
+                return
+        self.sleep(seconds)
+
+class BarIndex:
+    """
+    One symbol's bars as NumPy arrays, sorted by time.
+    `t` is int64 ns (UTC for tz-aware frames, wall clock for naive ones) so
+    lookups against the clock are a `searchsorted` instead of a frame mask.
+    """
+    def __init__(self, df: pd.DataFrame):
+        dt = pd.to_datetime(df['datetime'])
+        self.tz = dt.dt.tz
+        t = dt.to_numpy(dtype='datetime64[ns]').view('int64') if self.tz is None else dt.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy(dtype='datetime64[ns]').view('int64')
+        order = np.argsort(t, kind='stable')
+        self.t = t[order]
+        self.datetime = df['datetime'].iloc[order].reset_index(drop=True)
+        self.open = df['open'].to_numpy(dtype='float64')[order]
+        self.high = df['high'].to_numpy(dtype='float64')[order]
+        self.low = df['low'].to_numpy(dtype='float64')[order]
+        self.close = df['close'].to_numpy(dtype='float64')[order]
+        self.volume = df['volume'].to_numpy()[order]
+
+    def key(self, when: datetime) -> int:
+        ts = pd.Timestamp(when)
+        if self.tz is None:
+            return (ts.tz_localize(None) if ts.tz is not None else ts).value
+        return ts.value
+
+    def upto(self, when: datetime) -> int:
+        """Number of bars with datetime <= when."""
+        return int(np.searchsorted(self.t, self.key(when), side='right'))
+
+
 class SimBroker(Broker):
     def __init__(self, bars_data: Dict[str, pd.DataFrame], clock: SimClock, equity: float = 100000.0, buying_power: float = 600000.0):
         self.bars = bars_data.copy()
         self.clock = clock
+        # Pre-indexed bars; fills scan each order's bars from a cursor that only moves forward
+        self._index = {s: BarIndex(df) for s, df in self.bars.items() if df is not None and not df.empty}
+        self._cursors = {} # order_id -> first bar not yet checked for a fill
+        if isinstance(clock, SimClock):
+            clock.add_wake_source(self.next_fill_time)
         self.orders = []
         self.positions = [] # [{'symbol':, 'shares':, 'avg_price':}]
         self.completed_trades = [] # Track PNL for reporing
@@ -42,21 +118,17 @@ class SimBroker(Broker):
         now = self.clock.now()
         
         # Get latest bar before or at 'now'
-        df = self.bars.get(symbol)
-        if df is None or df.empty:
+        idx = self._index.get(symbol)
+        if idx is None:
             return {'last': 0, 'bid': 0, 'ask': 0, 'volume': 0}
         
-        # Assuming df has 'datetime' column and sorted
-        # Find latest bar <= now
-        # Efficient lookup needed? For now, simple masking
-        valid = df[df['datetime'] <= now]
-        if valid.empty:
+        n = idx.upto(now)
+        if n == 0:
             # Pre-market or no data yet? Return first bar's open? 
             # Or 0 to indicate no quote?
             return {'last': 0, 'bid': 0, 'ask': 0, 'volume': 0}
         
-        last_bar = valid.iloc[-1]
-        price = float(last_bar['close'])
+        price = float(idx.close[n - 1])
         
         # Simple spread simulation
         bid = price - 0.01
@@ -67,7 +139,7 @@ class SimBroker(Broker):
             'last_price': price, # Alias for PNL reporting
             'bid': bid,
             'ask': ask,
-            'volume': int(last_bar['volume'])
+            'volume': int(idx.volume[n - 1])
         }
     
     def place_order(self, symbol: str, side: str, order_type: str, quantity: float, price: Optional[float] = None) -> str:
@@ -103,8 +175,64 @@ class SimBroker(Broker):
     def get_notifications(self) -> List[Dict[str, Any]]:
         return []
 
+    def _match(self, order: Dict[str, Any], idx: BarIndex, start: int, end: int, now: datetime):
+        """(hit mask over bars [start:end], fill price of bar i) for one open order; (None, None) if it never fills."""
+        hit = None
+        fill_prices = None
+        # Check Limit Logic
+        if order['type'] == 'LIMIT':
+            limit_price = order['price']
+            if order['side'] == 'BUY':
+                # Buy Limit: Low <= Limit
+                hit = idx.low[start:end] <= limit_price
+            elif order['side'] == 'SELL':
+                # Sell Limit: High >= Limit
+                hit = idx.high[start:end] >= limit_price
+            fill_prices = lambda i: limit_price # Simplified greedy fill
+
+        elif order['type'] == 'STOP':
+            stop_trigger = order['price']
+            if order['side'] == 'BUY':
+                # Buy Stop: High >= Stop
+                hit = idx.high[start:end] >= stop_trigger
+                # Use max of open or stop_trigger for fill (slippage)
+                fill_prices = lambda i: max(idx.open[i], stop_trigger)
+            elif order['side'] == 'SELL' or order['side'] == 'SHORT':
+                # Sell/Short Stop: Low <= Stop
+                hit = idx.low[start:end] <= stop_trigger
+                fill_prices = lambda i: min(idx.open[i], stop_trigger)
+
+        elif order['type'] == 'MARKET':
+            hit = np.ones(end - start, dtype=bool)
+            # In simulation, market orders usually fill at the open of the current/next bar.
+            # If we're at the very end of the day, use the close of the current bar.
+            fill_prices = lambda i: idx.open[i] if idx.datetime.iloc[i] < now else idx.close[i]
+        return hit, fill_prices
+
+    def next_fill_time(self, after: datetime) -> Optional[datetime]:
+        """Time of the earliest bar after `after` on which an open order fills (wake source for SimClock)."""
+        best = None
+        for order in self.orders:
+            if order['status'] != 'SUBMITTED':
+                continue
+            idx = self._index.get(order['symbol'])
+            if idx is None:
+                continue
+            start = self._cursors.get(order['order_id'])
+            if start is None:
+                start = idx.upto(order['submitted_at'])
+            start = max(start, idx.upto(after))
+            hit, _ = self._match(order, idx, start, len(idx.t), after)
+            if hit is None or not hit.any():
+                continue
+            # Same offset convention as the bar keys, so the result keeps `after`'s type/tz
+            t = after + timedelta(microseconds=int(idx.t[start + int(np.argmax(hit))] - idx.key(after)) // 1000)
+            if best is None or t < best:
+                best = t
+        return best
+
     def _process_fills(self):
-        """Check open orders against price history up to now."""
+        """Check open orders against the bars that closed since the last check."""
         now = self.clock.now()
         
         for order in self.orders:
@@ -112,68 +240,37 @@ class SimBroker(Broker):
                 continue
             
             symbol = order['symbol']
-            df = self.bars.get(symbol)
-            if df is None:
+            idx = self._index.get(symbol)
+            if idx is None:
                 continue
                 
-            # Get bars between submitted_at and now
-            mask = (df['datetime'] > order['submitted_at']) & (df['datetime'] <= now)
-            relevant_bars = df[mask]
+            # Bars between submitted_at (exclusive) and now (inclusive), minus those already checked
+            start = self._cursors.get(order['order_id'])
+            if start is None:
+                start = idx.upto(order['submitted_at'])
+            end = idx.upto(now)
+            if end <= start:
+                continue
+            self._cursors[order['order_id']] = end
+            
+            hit, fill_prices = self._match(order, idx, start, end, now)
             
-            if relevant_bars.empty:
+            if hit is None or not hit.any():
                 continue
-                
-            # Iterate bars to check for fill
-            for _, bar in relevant_bars.iterrows():
-                filled = False
-                fill_price = 0.0
-                
-                # Check Limit Logic
-                if order['type'] == 'LIMIT':
-                    limit_price = order['price']
-                    if order['side'] == 'BUY':
-                        # Buy Limit: Low <= Limit
-                        if bar['low'] <= limit_price:
-                            filled = True
-                            fill_price = limit_price # Simplified greedy fill
-                    elif order['side'] == 'SELL':
-                        # Sell Limit: High >= Limit
-                        if bar['high'] >= limit_price:
-                            filled = True
-                            fill_price = limit_price
-                            
-                elif order['type'] == 'STOP':
-                    stop_trigger = order['price']
-                    if order['side'] == 'BUY':
-                        # Buy Stop: High >= Stop
-                        if bar['high'] >= stop_trigger:
-                            filled = True
-                            # Use max of open or stop_trigger for fill (slippage)
-                            fill_price = max(bar['open'], stop_trigger)
-                    elif order['side'] == 'SELL' or order['side'] == 'SHORT':
-                        # Sell/Short Stop: Low <= Stop
-                        if bar['low'] <= stop_trigger:
-                            filled = True
-                            fill_price = min(bar['open'], stop_trigger)
-
-                elif order['type'] == 'MARKET':
-                    filled = True
-                    # In simulation, market orders usually fill at the open of the current/next bar.
-                    # If we're at the very end of the day, use the close of the current bar.
-                    fill_price = bar['open'] if bar['datetime'] < now else bar['close']
-                
-                if filled:
-                    order['status'] = 'FILLED'
-                    order['fill_price'] = fill_price
-                    order['filled_at'] = bar['datetime']
-                    
-                    # Calculate Commission
-                    fees = max(order['qty'] * self.comm_share, self.comm_min)
-                    order['commission'] = fees
-                    self.total_fees += fees
-                    
-                    self._update_position(symbol, order['side'], order['qty'], fill_price)
-                    break 
+            i = start + int(np.argmax(hit))
+            fill_price = fill_prices(i)
+            
+            order['status'] = 'FILLED'
+            order['fill_price'] = fill_price
+            order['filled_at'] = idx.datetime.iloc[i]
+            self._cursors.pop(order['order_id'], None)
+            
+            # Calculate Commission
+            fees = max(order['qty'] * self.comm_share, self.comm_min)
+            order['commission'] = fees
+            self.total_fees += fees
+            
+            self._update_position(symbol, order['side'], order['qty'], fill_price)
 
     def _update_position(self, symbol, side, qty, price):
         # Find existing
@@ -11,6 +11,8 @@ PROJECT_ROOT = ORB_ROOT.parent
 sys.path.insert(0, str(PROJECT_ROOT))
 sys.path.insert(0, str(ORB_ROOT))
 
+from ORB_Live_Trader.backtest import intraday_store
+
 from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
@@ -27,8 +29,8 @@ def inspect_gral():
     # 1. Load Cached Data (Used by Live Sim)
     # The live sim merges bars into data/bars/5min/GRAL.parquet
     cached_path = ORB_ROOT / "data" / "bars" / "5min" / "GRAL.parquet"
-    if cached_path.exists():
-        df_cached = pd.read_parquet(cached_path)
+    if intraday_store.has_bars(cached_path.parent, "GRAL"):
+        df_cached = intraday_store.read_bars(cached_path.parent, "GRAL")
         # Filter for date
         if 'datetime' in df_cached.columns:
             df_cached['dt'] = pd.to_datetime(df_cached['datetime'])
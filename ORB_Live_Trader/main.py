@@ -5,6 +5,7 @@ Supports both Live Trading and Historical Verification.
 Usage:
   Live:   python ORB_Live_Trader/main.py
   Verify: python ORB_Live_Trader/main.py --verify --date 2021-02-22
+  Range:  python ORB_Live_Trader/main.py --verify-range 2025-01-02 2025-12-31 --trades <run>/simulated_trades.parquet
 """
 import sys
 import os
@@ -13,6 +14,9 @@ import pandas as pd
 import duckdb
 import pytz
 import json
+import tempfile
+import contextlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta, time as dt_time
 from typing import List, Optional
@@ -36,6 +40,7 @@ sys.path.insert(0, str(ORB_ROOT))
 from ORB_Live_Trader.core.execution import Clock, Broker
 from ORB_Live_Trader.core.simulation import SimClock, SimBroker
 from ORB_Live_Trader.core.live_impl import LiveClock, TradeZeroBroker
+from ORB_Live_Trader.core.session_events import SessionEngine, POSITION_UPDATED, POSITION_CLOSED, ORDER_REMOVED, SNAPSHOT
 
 # Backtest Utils
 from ORB_Live_Trader.backtest.engine import deserialize_bars
@@ -53,7 +58,7 @@ except ImportError:
 logs_dir = ORB_ROOT / "logs"
 logs_dir.mkdir(exist_ok=True)
 
-def setup_daily_logging(verify_date: str = None):
+def setup_daily_logging(verify_date: str = None, console: bool = True):
     """Configures a daily log file for trading review."""
     today_str = verify_date if verify_date else datetime.now().strftime("%Y-%m-%d")
     trading_dir = logs_dir / "trading"
@@ -74,9 +79,10 @@ def setup_daily_logging(verify_date: str = None):
     logger.addHandler(fh)
     
     # Console Handler
-    ch = logging.StreamHandler()
-    ch.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
-    logger.addHandler(ch)
+    if console:
+        ch = logging.StreamHandler()
+        ch.setFormatter(logging.Formatter('[%(asctime)s] [%(levelname)s] %(message)s', datefmt='%Y-%m-%d %H:%M:%S'))
+        logger.addHandler(ch)
     
     return logger
 
@@ -115,6 +121,12 @@ state_dir.mkdir(exist_ok=True)
 
 KILL_SWITCH_FILE = state_dir / "orb_kill_switch.lock"
 
+# Seconds between broker snapshots in the session loop (= max delay before reacting to a fill)
+DEFAULT_POLL_SEC = 5.0
+
+# Histogram buckets (upper bounds) for the time from OR close to each entry's acknowledgement
+ENTRY_LATENCY_BUCKETS_SEC = (0.25, 0.5, 1, 2, 5, 10, 30, 60)
+
 def check_kill_switch() -> bool:
     """Check if the manual kill switch is active."""
     return KILL_SWITCH_FILE.exists()
@@ -124,6 +136,22 @@ def activate_kill_switch(reason: str):
     log(f"!!! KILL SWITCH ACTIVATED !!! Reason: {reason}", level="CRITICAL")
     KILL_SWITCH_FILE.touch()
 
+def log_entry_latency(samples: List[tuple], clock: Clock):
+    """Logs the 09:35 entry burst: time from OR close to each order's acknowledgement, as a histogram."""
+    acks = sorted(ack for _, ack, _ in samples)
+    submits = sorted(sub for _, _, sub in samples)
+    buckets = []
+    for i, upper in enumerate(ENTRY_LATENCY_BUCKETS_SEC):
+        lower = ENTRY_LATENCY_BUCKETS_SEC[i - 1] if i else float('-inf')
+        n = sum(lower < a <= upper for a in acks)
+        if n:
+            buckets.append(f"<={upper:g}s:{n}")
+    n = sum(a > ENTRY_LATENCY_BUCKETS_SEC[-1] for a in acks)
+    if n:
+        buckets.append(f">{ENTRY_LATENCY_BUCKETS_SEC[-1]:g}s:{n}")
+    log(f"ENTRY BURST: {len(samples)} orders | last ack {acks[-1]:.1f}s after OR close | "
+        f"submit p50 {submits[len(submits) // 2] * 1000:.0f} ms, max {submits[-1] * 1000:.0f} ms | {' '.join(buckets)}", clock=clock)
+
 def safe_place_market_order(broker: Broker, symbol: str, side: str, shares: int, clock: Clock) -> Optional[str]:
     """
     Places a Market order with automatic fallback to Limit if rejected (R78).
@@ -177,10 +205,11 @@ def safe_place_buy_stop(broker: Broker, symbol: str, shares: int, stop_price: fl
         
     return order_id
 
-def safe_place_sell_stop(broker: Broker, symbol: str, shares: float, stop_price: float, clock: Clock) -> Optional[str]:
+def safe_place_sell_stop(broker: Broker, symbol: str, shares: float, stop_price: float, clock: Clock, existing: Optional[List[dict]] = None) -> Optional[str]:
     """
     Places a resting SELL STOP order on the broker's books.
     This protects the position even if the script crashes or loses connection.
+    `existing` is the current order book if the caller already has it (saves a broker round-trip).
     """
     # Only block BUYS? Actually, for sell stops, we want to allow them if they are for protection.
     # But if the user manually set a kill switch, they might want to stop ALL orders.
@@ -189,7 +218,8 @@ def safe_place_sell_stop(broker: Broker, symbol: str, shares: float, stop_price:
         log(f"ALERT: Placing protective STOP for {symbol} despite Kill Switch.", level="WARNING", clock=clock)
 
     # PREVENTION: Check if we already have a protective SELL STOP for this symbol
-    existing = broker.get_active_orders()
+    if existing is None:
+        existing = broker.get_active_orders()
     if existing:
         for o in existing:
             # Map side safely
@@ -214,12 +244,17 @@ def safe_place_sell_stop(broker: Broker, symbol: str, shares: float, stop_price:
 # Core Logic (Unified)
 # -----------------------------------------------------------------------------
 
-def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con: duckdb.DuckDBPyConnection = None, equity: float = 0, start_bp: float = 0):
+def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con: duckdb.DuckDBPyConnection = None, equity: float = 0, start_bp: float = 0, poll_sec: float = DEFAULT_POLL_SEC, state_file: Optional[Path] = None, entry_max_delay: Optional[float] = None, or_stream=None):
     """
     Main Event Loop:
     1. 09:30 - 09:35: Wait for OR Candle
     2. 09:35:05: Perform Refinement (Green Candles + Top 5 RVOL)
-    3. 09:35 - 16:00: Monitor Breakouts & Stops
+    3. 09:35 - 16:00: Monitor Breakouts & Stops (one broker snapshot every `poll_sec`,
+       handlers react to fill / stop-hit / missing-stop / rejection events)
+    `state_file` defaults to state/session_<date>.json (restart recovery).
+    `entry_max_delay`: entries not yet sent this many seconds after OR close are skipped (None = no cap).
+    `or_stream`: started OpeningRangeStream (live); the OR is then built from streamed minute bars and
+    ranked as soon as the 09:34 bars close instead of fetched over REST after 09:35.
     """
     et_tz = pytz.timezone("America/New_York")
     current_date = clock.now().date()
@@ -227,7 +262,7 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
     or_cutoff = et_tz.localize(datetime.combine(current_date, dt_time(9, 35)))
     market_close = et_tz.localize(datetime.combine(current_date, dt_time(15, 55)))
     
-    state_file = ORB_ROOT / "state" / f"session_{current_date}.json"
+    state_file = state_file or ORB_ROOT / "state" / f"session_{current_date}.json"
     
     active_orders = [] 
     open_positions = [] 
@@ -238,9 +273,6 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
     fills_tracker = {} # symbol -> {'entry_price': avg_price, 'shares': shares}
     
     refined_universe = None # DataFrame representing the final Top 5
-    last_audit_time = 0
-    last_heartbeat_time = 0
-    last_notif_time = 0
     notif_history = set() # Track seen notifications to avoid spam
 
     # --- DURABLE STATE RECOVERY (Restart-Safety) ---
@@ -329,6 +361,164 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                             p['stop_price'] = or_data['or_high'] - (0.05 * p['atr_14'])
                             log(f"RECOVERY: Reconstructed stop for {p['symbol']} @ {p['stop_price']:.4f}", clock=clock)
 
+    # Session Engine: one broker snapshot per tick, diffed into position/order events
+    engine = SessionEngine(broker, clock, poll_sec=poll_sec, origin=market_open)
+    engine.seed([{'symbol': p['symbol'], 'qty': p['shares']} for p in open_positions])
+    is_live = not isinstance(broker, SimBroker)
+    stop_placed_at = {} # symbol -> clock time of our last protective stop placement
+
+    def on_position_updated(events, snapshot):
+        """FILL WATCHER: a pending BUY STOP is filled once its full size shows up as a position."""
+        symbols = {e.symbol for e in events}
+        for order in list(active_orders):
+            if order['symbol'] not in symbols:
+                continue
+            pos = snapshot.position(order['symbol'])
+            if pos and pos.get('qty', 0) >= order['shares']:
+                # The browser 'Avg' col is mapped to 'avg_price' in our normalization
+                # If avg_price is missing or zero, we fallback to trigger price
+                fill_price = float(pos.get('avg_price', 0)) or order['stop_trigger']
+                log(f"FILLED: {order['symbol']} @ {fill_price}", clock=clock)
+                
+                fills_tracker[order['symbol']] = {'entry_price': fill_price, 'shares': order['shares']}
+                
+                # !!! NEW: PLACE BROKER-SIDE PROTECTIVE STOP IMMEDIATELY !!!
+                stop_id = safe_place_sell_stop(broker, order['symbol'], order['shares'], order['stop_price'], clock, existing=snapshot.active_orders)
+                stop_placed_at[order['symbol']] = clock.now()
+                
+                open_positions.append({
+                    'symbol': order['symbol'],
+                    'shares': order['shares'],
+                    'stop_price': order['stop_price'],
+                    'stop_order_id': stop_id,
+                    'atr_14': order.get('atr_14', 0.0),
+                    'or_high': order.get('or_high', 0.0),
+                    'repair_idx': 0
+                })
+                active_orders.remove(order)
+
+    def on_position_closed(events, snapshot):
+        """A monitored position left the broker's books: its resting stop was hit."""
+        nonlocal realized_pnl
+        symbols = {e.symbol for e in events}
+        for pos in list(open_positions):
+            if pos['symbol'] not in symbols:
+                continue
+            # Realized PNL Calculation (Assuming Stop Hit)
+            entry = fills_tracker.get(pos['symbol'])
+            if entry:
+                exit_price = pos['stop_price']
+                pnl = (exit_price - entry['entry_price']) * entry['shares']
+                realized_pnl += pnl
+                log(f"STOP HIT: {pos['symbol']} @ ~{exit_price}. Trade PNL: ${pnl:,.2f}", clock=clock)
+                del fills_tracker[pos['symbol']] # Handled
+            
+            open_positions.remove(pos)
+
+    def on_stop_missing(events, snapshot):
+        """STOP LOSS INTEGRITY REPAIR: every open position must have a resting stop on the books."""
+        if snapshot.active_orders is None:
+            return
+        active_refs = snapshot.order_refs()
+        for pos in open_positions:
+            if pos['symbol'] in stop_placed_at and stop_placed_at[pos['symbol']] >= snapshot.taken_at:
+                continue # Placed after this snapshot was taken; the next one will show it
+            if not pos['stop_order_id'] or pos['stop_order_id'] not in active_refs:
+                # If we had an ID but it's not in the books, previous attempt failed/rejected
+                if pos['stop_order_id']:
+                    log(f"ALERT: Previously placed stop {pos['stop_order_id']} for {pos['symbol']} vanished. Escalating repair...", level="WARNING", clock=clock)
+                    pos['repair_idx'] = pos.get('repair_idx', 0) + 1
+                
+                log(f"ALERT: Stop loss for {pos['symbol']} missing. Attempting tiered repair (Level {pos.get('repair_idx', 0)})...", level="WARNING", clock=clock)
+                
+                repair_success = False
+                # Tiered Repair Multipliers: 0.05, 0.08, 0.10, 0.15, 0.20
+                multipliers = [0.05, 0.08, 0.10, 0.15, 0.20]
+                
+                start_idx = pos.get('repair_idx', 0)
+                quote = broker.get_quote(pos['symbol'])
+                # Use BID for Sell Stop validation (more conservative/accurate than Last)
+                reference_price = float(quote.get('bid', 0)) or float(quote.get('last', 0)) or pos['stop_price']
+                
+                for i in range(start_idx, len(multipliers)):
+                    mult = multipliers[i]
+                    if pos.get('or_high', 0) > 0 and pos.get('atr_14', 0) > 0:
+                        new_stop = pos['or_high'] - (mult * pos['atr_14'])
+                        
+                        # PRICE SANITY CHECK: Only place stop if it's below current BID
+                        # R118 Error triggers if Stop >= Bid
+                        if reference_price <= new_stop + 0.01:
+                            log(f"REPAIR SKIP: Multiplier {mult}x ({new_stop:.4f}) is at/above current Bid ({reference_price}). Trying wider...", clock=clock)
+                            pos['repair_idx'] = i + 1
+                            continue
+
+                        log(f"TIERED REPAIR: Trying wider stop for {pos['symbol']} @ {new_stop:.4f} ({mult}x ATR)", clock=clock)
+                        new_id = safe_place_sell_stop(broker, pos['symbol'], pos['shares'], new_stop, clock, existing=snapshot.active_orders)
+                        if new_id:
+                            stop_placed_at[pos['symbol']] = clock.now()
+                            pos['stop_order_id'] = new_id
+                            pos['stop_price'] = new_stop
+                            pos['repair_idx'] = i # Maintain this index as current
+                            repair_success = True
+                            break
+                        else:
+                            # Immediate failure (UI error)? Increment index to try wider next time
+                            log(f"REPAIR FAIL: Placement failed for {new_stop:.4f}. Trying wider...", level="WARNING", clock=clock)
+                            pos['repair_idx'] = i + 1
+                    else:
+                        break 
+
+                if not repair_success:
+                    log(f"CRITICAL: All stop repairs failed for {pos['symbol']} or price already below 0.15 ATR. MARKET EXITING.", level="CRITICAL", clock=clock)
+                    safe_place_market_order(broker, pos['symbol'], 'SELL', pos['shares'], clock)
+                    # We don't remove from open_positions here; the EOD auditor will catch the 0 qty
+
+    def on_order_rejected(events, snapshot):
+        """An entry order that left the broker's books without a position was most likely REJECTED."""
+        if not active_orders or snapshot.active_orders is None:
+            return
+        symbols = {e.symbol for e in events} if events else {o['symbol'] for o in active_orders}
+        real_active = snapshot.order_symbols()
+        pos_symbols = snapshot.position_symbols()
+        for o in list(active_orders):
+            if o['symbol'] in symbols and o['symbol'] not in real_active and o['symbol'] not in pos_symbols:
+                log(f"ALERT: Order for {o['symbol']} vanished from broker books without being filled. Likely REJECTED.", level="ERROR", clock=clock)
+                # Remove from our tracking so we don't alert every minute
+                active_orders.remove(o)
+
+    def on_heartbeat(events, snapshot):
+        # Fetch official figures from TradeZero
+        acct = broker.get_account_summary()
+        log(f"HEARTBEAT: {len(active_orders)} Pending | {len(open_positions)} Open | TZ Day Realized: ${acct.get('day_realized', 0):,.2f} | TZ Day Total: ${acct.get('day_total', 0):,.2f} | TZ Fees: ${acct.get('est_comm_fees', 0):,.2f}", clock=clock)
+
+    def on_notifications(events, snapshot):
+        notifs = broker.get_notifications()
+        for n in notifs:
+            msg = n.get('message', '').upper()
+            # Use title+message to create a unique key
+            key = f"{n.get('title')}_{msg}"
+            if key not in notif_history:
+                notif_history.add(key)
+                if "REJECT" in msg or "ERROR" in msg or "R118" in msg:
+                    log(f"BROKER NOTIFICATION: {n.get('title')} - {n.get('message')}", level="WARNING", clock=clock)
+        
+        # Cross-reference check (catches orders that never showed up on the books)
+        if is_live:
+            on_order_rejected([], snapshot)
+
+    engine.on(POSITION_UPDATED, on_position_updated)
+    engine.on(POSITION_CLOSED, on_position_closed)
+    if is_live:
+        engine.on(SNAPSHOT, on_stop_missing)
+        engine.on(ORDER_REMOVED, on_order_rejected)
+    engine.every(300, on_heartbeat)
+    # Simulated notifications are always empty, so a skipping SimClock need not stop for them
+    engine.every(60, on_notifications, wake=is_live)
+    if isinstance(clock, SimClock):
+        clock.wake_at(market_open, or_cutoff, market_close)
+
+    last_saved_state = None
+
     # Main Loop
     while clock.now() < market_close:
         now = clock.now()
@@ -339,7 +529,7 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
             break
         
         if now < market_open:
-            clock.sleep(10)
+            clock.idle(10)
             continue
 
         # 1. WAIT FOR OPENING RANGE (09:30 - 09:35)
@@ -347,14 +537,15 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
             # Heartbeat if live to prevent timeout
             if not isinstance(broker, SimBroker):
                  pass # Subs handled by client
-            clock.sleep(5)
+            # With a stream, wake right at 09:35 (the 09:34 bar closes then) instead of up to 5s later
+            clock.idle(min(5, max(0.2, (or_cutoff - now).total_seconds())) if or_stream is not None else 5)
             continue
             
         # 2. REFINEMENT PHASE (Once at or after 09:35:01)
         if refined_universe is None:
             log("5-Min Opening Range Complete. Identifying Long Candidates...", clock=clock)
-            from ORB_Live_Trader.backtest.universe import extract_or
             from ORB_Live_Trader.pipeline.live_pipeline import fetch_opening_bars
+            from ORB_Live_Trader.pipeline.opening_range import rank_opening_range
             
             symbols = pool_df['symbol'].tolist()
             bars_map = {}
@@ -362,6 +553,12 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
             if isinstance(broker, SimBroker):
                 # Verification mode uses local bars
                 bars_map = {s: broker.bars.get(s) for s in symbols if s in broker.bars}
+            elif or_stream is not None:
+                # Live mode: OR built from streamed minute bars (REST for symbols the stream missed)
+                bars_map = or_stream.opening_bars(clock.now())
+                ready = or_stream.builder.ready_at
+                if ready is not None:
+                    log(f"OR stream complete {(ready - or_cutoff).total_seconds():+.2f}s from 09:35", clock=clock)
             else:
                 # Live mode fetches from Alpaca
                 live_bars_df = fetch_opening_bars(symbols, current_date)
@@ -369,40 +566,12 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                 for _, b_row in live_bars_df.iterrows():
                     bars_map[b_row['symbol']] = pd.DataFrame([b_row]).assign(time=dt_time(9, 30))
 
-            final_list = []
-            for _, row in pool_df.iterrows():
-                symbol = row['symbol']
-                bars = bars_map.get(symbol)
-                if bars is None: continue
-                
-                # MEMORY: Skip if we already acted on this symbol today
-                if symbol in triggered_symbols:
-                    continue
-                
-                or_data = extract_or(bars)
-                if not or_data: continue
-
-                # ONLY LONG: OR Close > OR Open
-                direction = 1 if or_data['or_close'] > or_data['or_open'] else -1
-                if direction != 1: continue 
-
-                # RVOL calculation
-                rvol = (or_data['or_volume'] * 78.0) / row['avg_volume_14'] if row['avg_volume_14'] > 0 else 0
-                
-                final_list.append({
-                    'symbol': symbol,
-                    'or_high': or_data['or_high'],
-                    'atr_14': row['atr_14'],
-                    'rvol': rvol,
-                    'stop_price': or_data['or_high'] - (0.05 * row['atr_14'])
-                })
-            
-            if not final_list:
+            # Green OR candles only, Top 5 by RVOL (skips symbols we already acted on today)
+            df_refined = rank_opening_range(pool_df, bars_map, skip=triggered_symbols, top_n=5)
+            if df_refined.empty:
                 log("No symbols showed a Green Candle (Long setup). Finishing session.", clock=clock)
                 return
 
-            df_refined = pd.DataFrame(final_list)
-            df_refined = df_refined.sort_values('rvol', ascending=False).head(5)
             refined_universe = df_refined
             
             log(f"Selection Complete. Monitoring Top {len(refined_universe)} RVOL Green Candles.", clock=clock)
@@ -420,6 +589,9 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
             
             log(f"Sizing Model: EQUAL-ALLOCATION (Backtest Truth) | Target: ${bp_limit_per_trade:,.2f} per trade", clock=clock)
             
+            # Prepare every entry first (sizing, quote, order type), then submit them back to back,
+            # so no quote fetch or sizing step sits between one order and the next
+            entries = []
             for _, row in refined_universe.iterrows():
                 # Equal Allocation Model (Matches Backtest Strategy 1)
                 shares = bp_limit_per_trade / row['or_high']
@@ -430,12 +602,9 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                 
                 log(f"Sizing {row['symbol']}: EQUAL-ALLOC. ${bp_limit_per_trade:,.2f} / {row['or_high']:.2f} -> {shares} shares", clock=clock)
                 
-                order_id = None
+                kind = 'STOP'
                 if row['symbol'] in existing_symbols:
-                    # Recovery Logic
-                    match = next(o for o in existing_orders if o['symbol'] == row['symbol'])
-                    order_id = match.get('ref_number', f"REC_{row['symbol']}")
-                    log(f"RECOVERY: Using existing order for {row['symbol']} (Ref: {order_id})", clock=clock)
+                    kind = 'RECOVERY'
                 else:
                     # IMMEDIATE BREAKOUT CHECK: Fetch current Ask to avoid R118 (Stop < Market)
                     quote = broker.get_quote(row['symbol'])
@@ -443,10 +612,29 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                     
                     if curr_ask >= row['or_high'] and curr_ask > 0:
                         log(f"IMMEDIATE BREAKOUT DETECTED: {row['symbol']} Ask ({curr_ask}) >= Trigger ({row['or_high']}). Using MARKET BUY.", level="WARNING", clock=clock)
+                        kind = 'MARKET'
+                entries.append((row, shares, kind))
+
+            entry_latency = [] # (symbol, seconds from OR close to ack, submit call seconds)
+            for row, shares, kind in entries:
+                if entry_max_delay and (clock.now() - or_cutoff).total_seconds() > entry_max_delay:
+                    log(f"ENTRY WINDOW CLOSED: Skipping {row['symbol']} ({entry_max_delay:.0f}s after OR close).", level="WARNING", clock=clock)
+                    continue
+
+                order_id = None
+                submit_started = time_module.perf_counter()
+                if kind == 'RECOVERY':
+                    # Recovery Logic
+                    match = next(o for o in existing_orders if o['symbol'] == row['symbol'])
+                    order_id = match.get('ref_number', f"REC_{row['symbol']}")
+                    log(f"RECOVERY: Using existing order for {row['symbol']} (Ref: {order_id})", clock=clock)
+                else:
+                    if kind == 'MARKET':
                         # We use safe_place_market_order which handles R78 rejections too
                         order_id = safe_place_market_order(broker, row['symbol'], 'BUY', shares, clock)
                     else:
                         order_id = safe_place_buy_stop(broker, row['symbol'], shares, row['or_high'], clock)
+                    entry_latency.append((row['symbol'], (clock.now() - or_cutoff).total_seconds(), time_module.perf_counter() - submit_started))
                 
                 if order_id:
                     active_orders.append({
@@ -461,149 +649,17 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                     })
                     triggered_symbols.add(row['symbol'])
 
-        # 3. FILL WATCHER & STOP MONITORING (09:35 - 16:00)
-        # We no longer monitor for breakouts manually. 
-        # We only monitor to see when our BUY STOPS get filled.
-        current_positions = broker.get_positions()
-        
-        for order in list(active_orders):
-            pos = next((p for p in current_positions if p['symbol'] == order['symbol']), None)
-            if pos and pos.get('qty', 0) >= order['shares']:
-                # The browser 'Avg' col is mapped to 'avg_price' in our normalization
-                # If avg_price is missing or zero, we fallback to trigger price
-                fill_price = float(pos.get('avg_price', 0)) or order['stop_trigger']
-                log(f"FILLED: {order['symbol']} @ {fill_price}", clock=clock)
-                
-                fills_tracker[order['symbol']] = {'entry_price': fill_price, 'shares': order['shares']}
-                
-                # !!! NEW: PLACE BROKER-SIDE PROTECTIVE STOP IMMEDIATELY !!!
-                stop_id = safe_place_sell_stop(broker, order['symbol'], order['shares'], order['stop_price'], clock)
-                
-                open_positions.append({
-                    'symbol': order['symbol'],
-                    'shares': order['shares'],
-                    'stop_price': order['stop_price'],
-                    'stop_order_id': stop_id,
-                    'atr_14': order.get('atr_14', 0.0),
-                    'or_high': order.get('or_high', 0.0),
-                    'repair_idx': 0
-                })
-                active_orders.remove(order)
+            if entry_latency:
+                log_entry_latency(entry_latency, clock)
 
-        # 4. MONITORING & AUDITING (09:35 - 15:55)
-        # --- STOP LOSS INTEGRITY REPAIR ---
-        if not isinstance(broker, SimBroker):
-            active_list = broker.get_active_orders()
-            if active_list is not None:
-                active_refs = {o.get('ref_number') for o in active_list}
-                for pos in open_positions:
-                    if not pos['stop_order_id'] or pos['stop_order_id'] not in active_refs:
-                        # If we had an ID but it's not in the books, previous attempt failed/rejected
-                        if pos['stop_order_id']:
-                            log(f"ALERT: Previously placed stop {pos['stop_order_id']} for {pos['symbol']} vanished. Escalating repair...", level="WARNING", clock=clock)
-                            pos['repair_idx'] = pos.get('repair_idx', 0) + 1
-                        
-                        log(f"ALERT: Stop loss for {pos['symbol']} missing. Attempting tiered repair (Level {pos.get('repair_idx', 0)})...", level="WARNING", clock=clock)
-                        
-                        repair_success = False
-                        # Tiered Repair Multipliers: 0.05, 0.08, 0.10, 0.15, 0.20
-                        multipliers = [0.05, 0.08, 0.10, 0.15, 0.20]
-                        
-                        start_idx = pos.get('repair_idx', 0)
-                        quote = broker.get_quote(pos['symbol'])
-                        # Use BID for Sell Stop validation (more conservative/accurate than Last)
-                        reference_price = float(quote.get('bid', 0)) or float(quote.get('last', 0)) or pos['stop_price']
-                        
-                        for i in range(start_idx, len(multipliers)):
-                            mult = multipliers[i]
-                            if pos.get('or_high', 0) > 0 and pos.get('atr_14', 0) > 0:
-                                new_stop = pos['or_high'] - (mult * pos['atr_14'])
-                                
-                                # PRICE SANITY CHECK: Only place stop if it's below current BID
-                                # R118 Error triggers if Stop >= Bid
-                                if reference_price <= new_stop + 0.01:
-                                    log(f"REPAIR SKIP: Multiplier {mult}x ({new_stop:.4f}) is at/above current Bid ({reference_price}). Trying wider...", clock=clock)
-                                    pos['repair_idx'] = i + 1
-                                    continue
-    
-                                log(f"TIERED REPAIR: Trying wider stop for {pos['symbol']} @ {new_stop:.4f} ({mult}x ATR)", clock=clock)
-                                new_id = safe_place_sell_stop(broker, pos['symbol'], pos['shares'], new_stop, clock)
-                                if new_id:
-                                    pos['stop_order_id'] = new_id
-                                    pos['stop_price'] = new_stop
-                                    pos['repair_idx'] = i # Maintain this index as current
-                                    repair_success = True
-                                    break
-                                else:
-                                    # Immediate failure (UI error)? Increment index to try wider next time
-                                    log(f"REPAIR FAIL: Placement failed for {new_stop:.4f}. Trying wider...", level="WARNING", clock=clock)
-                                    pos['repair_idx'] = i + 1
-                            else:
-                                break 
-    
-                        if not repair_success:
-                            log(f"CRITICAL: All stop repairs failed for {pos['symbol']} or price already below 0.15 ATR. MARKET EXITING.", level="CRITICAL", clock=clock)
-                            safe_place_market_order(broker, pos['symbol'], 'SELL', pos['shares'], clock)
-                            # We don't remove from open_positions here; the EOD auditor will catch the 0 qty
 
-        for pos in list(open_positions):
-            broker_pos = next((p for p in current_positions if p['symbol'] == pos['symbol']), None)
-            # Standardized Broker interface uses 'qty'
-            if not broker_pos or float(broker_pos.get('qty', 0)) <= 0:
-                # Realized PNL Calculation (Assuming Stop Hit)
-                entry = fills_tracker.get(pos['symbol'])
-                if entry:
-                    exit_price = pos['stop_price']
-                    pnl = (exit_price - entry['entry_price']) * entry['shares']
-                    realized_pnl += pnl
-                    log(f"STOP HIT: {pos['symbol']} @ ~{exit_price}. Trade PNL: ${pnl:,.2f}", clock=clock)
-                    del fills_tracker[pos['symbol']] # Handled
-                
-                open_positions.remove(pos)
-
-        # 5. Heartbeat (Every 5 minutes)
-        if (now - market_open).total_seconds() - last_heartbeat_time >= 300:
-            last_heartbeat_time = (now - market_open).total_seconds()
-            # Fetch official figures from TradeZero
-            acct = broker.get_account_summary()
-            log(f"HEARTBEAT: {len(active_orders)} Pending | {len(open_positions)} Open | TZ Day Realized: ${acct.get('day_realized', 0):,.2f} | TZ Day Total: ${acct.get('day_total', 0):,.2f} | TZ Fees: ${acct.get('est_comm_fees', 0):,.2f}", clock=clock)
-
-        # 6. Rejection Polling (Every 60s)
-        if (now - market_open).total_seconds() - last_notif_time >= 60:
-            last_notif_time = (now - market_open).total_seconds()
-            notifs = broker.get_notifications()
-            for n in notifs:
-                msg = n.get('message', '').upper()
-                # Use title+message to create a unique key
-                key = f"{n.get('title')}_{msg}"
-                if key not in notif_history:
-                    notif_history.add(key)
-                    if "REJECT" in msg or "ERROR" in msg or "R118" in msg:
-                        log(f"BROKER NOTIFICATION: {n.get('title')} - {n.get('message')}", level="WARNING", clock=clock)
-            
-            # Cross-reference check: If an active order is no longer in broker's books
-            # but we didn't see a fill or manual cancel, it was likely rejected.
-            if not isinstance(broker, SimBroker) and active_orders:
-                real_list = broker.get_active_orders()
-                if real_list is not None:
-                    real_active = {o['symbol'] for o in real_list}
-                    for o in list(active_orders):
-                        if o['symbol'] not in real_active:
-                            # Double check positions to ensure it didn't just fill in this split second
-                            pos_symbols = {p['symbol'] for p in broker.get_positions()}
-                            if o['symbol'] not in pos_symbols:
-                                log(f"ALERT: Order for {o['symbol']} vanished from broker books without being filled. Likely REJECTED.", level="ERROR", clock=clock)
-                                # Remove from our tracking so we don't alert every minute
-                                active_orders.remove(o)
-
-        # 7. Stop Auditor (Every 60s)
-        if (now - market_open).total_seconds() - last_audit_time >= 60:
-            last_audit_time = (now - market_open).total_seconds()
-            pass 
-
-        clock.sleep(5) 
+        # 3. FILL WATCHER, STOP MONITORING & AUDITING (09:35 - 15:55)
+        # One broker snapshot per tick; fills, stop hits, stop integrity, rejections
+        # and the heartbeat all react to its events instead of re-querying the broker.
+        engine.tick()
+        engine.wait()
         
-        # Persistence
+        # Persistence (only rewritten when the session state changed)
         try:
             state = {
                 'active_orders': active_orders,
@@ -612,11 +668,16 @@ def run_trading_session(clock: Clock, broker: Broker, pool_df: pd.DataFrame, con
                 'realized_pnl': realized_pnl,
                 'triggered_symbols': list(triggered_symbols)
             }
-            with open(state_file, 'w') as f:
-                json.dump(state, f)
+            state_json = json.dumps(state)
+            if state_json != last_saved_state:
+                with open(state_file, 'w') as f:
+                    f.write(state_json)
+                last_saved_state = state_json
         except Exception as e:
             pass # Silent failure for persistence to avoid loop crashes
 
+    log(f"Session engine: {engine.ticks} broker snapshots, {engine.events} events", clock=clock)
+
     # EOD Cleanup: Use Market-On-Close (MOC) orders for reliable flattening
     log("EOD Reached (15:55 ET) - Submitting Market-On-Close orders for all positions...", clock=clock)
     
@@ -745,7 +806,7 @@ def generate_initial_pool(candidates_df: pd.DataFrame, target_date: datetime.dat
 # Verification Mode Setup
 # -----------------------------------------------------------------------------
 
-def run_verification(target_date: str):
+def run_verification(target_date: str, poll_sec: float = DEFAULT_POLL_SEC, skip_idle: bool = True):
     log(f"Verifying {target_date}...")
     t_date = datetime.strptime(target_date, "%Y-%m-%d").date()
     
@@ -772,12 +833,12 @@ def run_verification(target_date: str):
     # Setup Sim
     et_tz = pytz.timezone("America/New_York")
     start_time = et_tz.localize(datetime.combine(t_date, dt_time(9, 30)))
-    clock = SimClock(start_time, time_step_sec=5)
+    clock = SimClock(start_time, time_step_sec=5, skip_idle=skip_idle)
     broker = SimBroker(my_bars, clock)
     
     # Run
     acc = broker.get_account_info()
-    run_trading_session(clock, broker, df_pool, equity=acc['equity'], start_bp=acc['buying_power'])
+    run_trading_session(clock, broker, df_pool, equity=acc['equity'], start_bp=acc['buying_power'], poll_sec=poll_sec)
     
     # 3. Cache Data for Inspection (Transparency Upgrade)
     # Aligning with User Request: Single file per ticker in bot's data store
@@ -811,11 +872,180 @@ def run_verification(target_date: str):
             fee_str = f"| Fee: ${o.get('commission', 0.0):.2f}"
             log(f"{o['submitted_at'].time()} {o['symbol']} {o['side']} {o['status']} @ {o.get('fill_price')} {fee_str}", clock=clock)
 
+# -----------------------------------------------------------------------------
+# Verification Range Mode (parallel multi-day replay + parity report)
+# -----------------------------------------------------------------------------
+
+VERIFICATION_DIR = logs_dir / "verification"
+PARITY_PRICE_TOL = 0.01 # $ difference still counted as the same fill
+
+def load_day_candidates(t_date) -> pd.DataFrame:
+    """Scored candidates for one date: the persisted daily sentiment file, else a fresh pipeline run."""
+    from ORB_Live_Trader.pipeline.live_pipeline import sentiment_dir
+    sentiment_path = sentiment_dir / f"daily_{t_date}.parquet"
+    if sentiment_path.exists():
+        return pd.read_parquet(sentiment_path)
+    return pipeline.run_pipeline(t_date)
+
+def session_trades(broker: SimBroker, t_date) -> List[dict]:
+    """Round trips from a finished SimBroker session (open positions are marked at the last bar close)."""
+    trades = []
+    filled = [o for o in broker.orders if o['status'] == 'FILLED']
+    for entry in (o for o in filled if o['side'] == 'BUY'):
+        exit_order = next((o for o in filled if o['side'] == 'SELL' and o['symbol'] == entry['symbol'] and o['filled_at'] >= entry['filled_at']), None)
+        if exit_order is not None:
+            exit_price, exit_time, exit_reason = exit_order['fill_price'], exit_order['filled_at'], exit_order['type']
+        else:
+            exit_price, exit_time, exit_reason = broker.get_quote(entry['symbol'])['last'], None, 'EOD'
+        trades.append({
+            'trade_date': t_date,
+            'ticker': entry['symbol'],
+            'shares': entry['qty'],
+            'entry_price': float(entry['fill_price']),
+            'entry_time': entry['filled_at'].strftime('%H:%M'),
+            'exit_price': float(exit_price),
+            'exit_time': exit_time.strftime('%H:%M') if exit_time is not None else None,
+            'exit_reason': exit_reason,
+            'gross_pnl': (float(exit_price) - float(entry['fill_price'])) * entry['qty'],
+        })
+    return trades
+
+def replay_day(target_date: str, pool_df: pd.DataFrame, day_bars: dict, poll_sec: float = DEFAULT_POLL_SEC, skip_idle: bool = True) -> dict:
+    """
+    Replays one date through SimClock/SimBroker (worker process entry point).
+    Session output goes to logs/trading/trading_<date>.log only; restart state lives in a temp dir.
+    """
+    global trading_logger
+    trading_logger = setup_daily_logging(target_date, console=False)
+    t_date = datetime.strptime(target_date, "%Y-%m-%d").date()
+    
+    et_tz = pytz.timezone("America/New_York")
+    start_time = et_tz.localize(datetime.combine(t_date, dt_time(9, 30)))
+    clock = SimClock(start_time, time_step_sec=5, skip_idle=skip_idle)
+    broker = SimBroker(day_bars, clock)
+    acc = broker.get_account_info()
+    
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        run_trading_session(clock, broker, pool_df, equity=acc['equity'], start_bp=acc['buying_power'],
+                            poll_sec=poll_sec, state_file=Path(tmp) / f"session_{t_date}.json")
+    
+    return {
+        'date': t_date,
+        'trades': session_trades(broker, t_date),
+        'gross_pnl': sum(t['pnl'] for t in broker.completed_trades),
+        'fees': broker.total_fees,
+    }
+
+def build_parity_report(replay_trades: pd.DataFrame, bt_trades: Optional[pd.DataFrame], dates: List) -> pd.DataFrame:
+    """One row per (date, ticker) traded by either side, with a parity status per row."""
+    key = ['trade_date', 'ticker']
+    cols = ['entry_price', 'exit_price', 'exit_reason']
+    live = replay_trades[key + cols] if not replay_trades.empty else pd.DataFrame(columns=key + cols)
+    if bt_trades is None:
+        bt = pd.DataFrame(columns=key + cols)
+    else:
+        bt = bt_trades.assign(trade_date=pd.to_datetime(bt_trades['trade_date']).dt.date)
+        bt = bt[bt['trade_date'].isin(set(dates)) & bt['entry_price'].notna()][key + cols]
+    report = live.merge(bt, on=key, how='outer', suffixes=('_live', '_bt'), indicator=True)
+    
+    entry_ok = (report['entry_price_live'] - report['entry_price_bt']).abs() <= PARITY_PRICE_TOL
+    exit_ok = (report['exit_price_live'] - report['exit_price_bt']).abs() <= PARITY_PRICE_TOL
+    report['status'] = 'PRICE_DIFF'
+    report.loc[entry_ok & exit_ok, 'status'] = 'MATCH'
+    report.loc[report['_merge'] == 'left_only', 'status'] = 'LIVE_ONLY'
+    report.loc[report['_merge'] == 'right_only', 'status'] = 'BACKTEST_ONLY'
+    return report.drop(columns='_merge').sort_values(key).reset_index(drop=True)
+
+def write_parity_report(report: pd.DataFrame, day_results: List[dict], start: str, end: str, compared: bool = True) -> Path:
+    VERIFICATION_DIR.mkdir(parents=True, exist_ok=True)
+    stem = f"verify_range_{start}_{end}"
+    report.to_parquet(VERIFICATION_DIR / f"{stem}.parquet", index=False)
+    
+    counts = report['status'].value_counts()
+    gross = sum(r['gross_pnl'] for r in day_results)
+    fees = sum(r['fees'] for r in day_results)
+    lines = [
+        f"# Verification Range {start} to {end}",
+        "",
+        f"- Days replayed: {len(day_results)}",
+        f"- Replay trades: {int((report['entry_price_live'].notna()).sum())}",
+        f"- Gross PNL: ${gross:,.2f} | Fees: ${fees:,.2f} | Net: ${gross - fees:,.2f}",
+        "",
+        "| Status | Count |",
+        "|--------|-------|",
+    ]
+    lines += [f"| {status} | {int(counts.get(status, 0))} |" for status in ('MATCH', 'PRICE_DIFF', 'LIVE_ONLY', 'BACKTEST_ONLY')]
+    mismatches = report[report['status'] != 'MATCH']
+    if not compared:
+        lines += ["", "No backtest trades given (--trades); every replay trade is LIVE_ONLY."]
+    elif not mismatches.empty:
+        lines += ["", "## Mismatches", "", mismatches.to_string(index=False)]
+    report_path = VERIFICATION_DIR / f"{stem}.md"
+    report_path.write_text("\n".join(lines) + "\n", encoding='utf-8')
+    return report_path
+
+def run_verification_range(start: str, end: str, trades_file: Optional[str] = None, workers: Optional[int] = None, poll_sec: float = DEFAULT_POLL_SEC, skip_idle: bool = True):
+    """
+    Replays every business day in [start, end] through the live session code in parallel
+    and writes one parity report against the backtest trades (simulated_trades.parquet).
+    """
+    from ORB_Live_Trader.backtest.universe import load_5min_full
+    
+    dates = [d.date() for d in pd.bdate_range(start, end)]
+    log(f"Verifying {len(dates)} business days {start} -> {end}...")
+    
+    # 1. Candidates + watchlist per day (the parent process owns the pipeline)
+    pools = {}
+    for t_date in dates:
+        raw_candidates = load_day_candidates(t_date)
+        if raw_candidates.empty:
+            continue
+        df_pool = generate_initial_pool(raw_candidates, t_date)
+        if not df_pool.empty:
+            pools[t_date] = df_pool
+    log(f"{len(pools)} days with a non-empty watchlist.")
+    
+    # 2. Load each symbol's 5-min bars once for the whole range, then slice per day
+    symbols = sorted({s for df_pool in pools.values() for s in df_pool['symbol']})
+    full_bars = {s: load_5min_full(s) for s in symbols}
+    day_jobs = []
+    for t_date, df_pool in pools.items():
+        day_bars = {}
+        for s in df_pool['symbol']:
+            bars = full_bars.get(s)
+            if bars is not None:
+                day_bars[s] = bars[bars['date_et'] == t_date].copy()
+        day_jobs.append((str(t_date), df_pool, day_bars))
+    log(f"Preloaded 5min bars for {len(symbols)} symbols.")
+    
+    # 3. Replay days in parallel (each worker has its own SimClock/SimBroker)
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    day_results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(replay_day, d, p, b, poll_sec, skip_idle): d for d, p, b in day_jobs}
+        for fut in as_completed(futures):
+            try:
+                day_results.append(fut.result())
+            except Exception as e:
+                log(f"Replay failed for {futures[fut]}: {e}", level="ERROR")
+    day_results.sort(key=lambda r: r['date'])
+    
+    # 4. Parity report
+    replay_trades = pd.DataFrame([t for r in day_results for t in r['trades']])
+    bt_trades = pd.read_parquet(trades_file) if trades_file else None
+    report = build_parity_report(replay_trades, bt_trades, [r['date'] for r in day_results])
+    report_path = write_parity_report(report, day_results, start, end, compared=bt_trades is not None)
+    
+    counts = report['status'].value_counts()
+    log(f"Replayed {len(day_results)} days | {len(replay_trades)} trades | MATCH {int(counts.get('MATCH', 0))} / {len(report)}")
+    log(f"Parity report: {report_path}")
+    return report
+
 # -----------------------------------------------------------------------------
 # Live Mode Setup
 # -----------------------------------------------------------------------------
 
-def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None):
+def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None, poll_sec: float = DEFAULT_POLL_SEC, entry_max_delay: Optional[float] = None):
     """
     Executes a real-time trading session.
     """
@@ -855,6 +1085,17 @@ def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None)
     log(f"Watchlist Subscribed: {len(pool_df)} symbols")
     log(f"Watchlist: {pool_df['symbol'].tolist()}")
 
+    # Stream the opening range now, before the (slow) TradeZero login, so the 09:30 minute is not missed
+    or_stream = None
+    if not is_historical:
+        from ORB_Live_Trader.pipeline.opening_range import OpeningRangeStream
+        or_stream = OpeningRangeStream(
+            pool_df['symbol'].tolist(), today,
+            rest_minute_bars=pipeline.fetch_minute_bars,
+            rest_opening_bars=pipeline.fetch_opening_bars,
+        )
+        or_stream.start()
+
     # 3. Setup Live Components
     tz_headless = not gui
     if dry_run:
@@ -881,7 +1122,7 @@ def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None)
             password=os.getenv("TRADEZERO_PASSWORD"),
             headless=tz_headless
         )
-        temp_broker = TradeZeroBroker(real_tz, dry_run=dry_run)
+        temp_broker = TradeZeroBroker(real_tz, dry_run=dry_run, position_max_age_sec=poll_sec)
         
         # Always use real account data as the base
         acc = temp_broker.get_account_info()
@@ -921,7 +1162,7 @@ def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None)
             broker = temp_broker
 
         # 4. Start Trading Session
-        run_trading_session(clock, broker, pool_df, equity=equity, start_bp=real_bp)
+        run_trading_session(clock, broker, pool_df, equity=equity, start_bp=real_bp, poll_sec=poll_sec, entry_max_delay=entry_max_delay, or_stream=or_stream)
 
         # 5. Session PNL Reporting (Audit Trail)
         if isinstance(broker, SimBroker) or dry_run:
@@ -948,35 +1189,48 @@ def run_live(dry_run: bool = False, gui: bool = True, date_override: str = None)
 
     except Exception as e:
         log(f"Critical Live Session Error: {e}", level="ERROR")
+    finally:
+        if or_stream is not None:
+            or_stream.stop()
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--verify", action="store_true", help="Run in historical verification mode")
     parser.add_argument("--date", type=str, help="Target date for verification (YYYY-MM-DD)")
+    parser.add_argument("--verify-range", nargs=2, metavar=("START", "END"), help="Replay every business day in [START, END] in parallel and write a parity report")
+    parser.add_argument("--trades", type=str, help="Backtest simulated_trades.parquet to compare --verify-range replays against")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes for --verify-range (default: CPU count - 1)")
     parser.add_argument("--dry-run", action="store_true", help="Simulate orders in live mode (no real money)")
     parser.add_argument("--headless", action="store_true", help="Run browser in headless mode (Invisible)")
+    parser.add_argument("--poll-sec", type=float, default=DEFAULT_POLL_SEC, help="Seconds between broker snapshots (max fill reaction time)")
+    parser.add_argument("--entry-max-delay", type=float, default=None, help="Live: skip entries not yet sent this many seconds after the 09:35 OR close")
+    parser.add_argument("--fixed-step", action="store_true", help="Verification: poll every --poll-sec of simulated time instead of skipping to the next bar/timer event")
     args = parser.parse_args()
     
     # Default GUI to True, but allow --headless to turn it off
     use_gui = not args.headless
     
-    if args.verify:
+    if args.verify_range:
+        global trading_logger
+        start, end = args.verify_range
+        trading_logger = setup_daily_logging(f"verify_{start}_{end}")
+        run_verification_range(start, end, trades_file=args.trades, workers=args.workers, poll_sec=args.poll_sec, skip_idle=not args.fixed_step)
+    elif args.verify:
         if not args.date:
             print("Error: --date YYYY-MM-DD required for verification mode.")
             return
             
         # Re-configure logger for the specific verification date
-        global trading_logger
         trading_logger = setup_daily_logging(args.date)
         
-        run_verification(args.date)
+        run_verification(args.date, poll_sec=args.poll_sec, skip_idle=not args.fixed_step)
     else:
         # Live Session: Default logger is already setup for today
         if args.date:
             trading_logger = setup_daily_logging(args.date)
             
-        run_live(dry_run=args.dry_run, gui=use_gui, date_override=args.date)
+        run_live(dry_run=args.dry_run, gui=use_gui, date_override=args.date, poll_sec=args.poll_sec, entry_max_delay=args.entry_max_delay)
 
 
 if __name__ == "__main__":
@@ -25,6 +25,8 @@ from alpaca.data.requests import NewsRequest, StockBarsRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 from transformers import BertTokenizer, BertForSequenceClassification
 
+from ORB_Live_Trader.backtest import intraday_store
+
 # -----------------------------------------------------------------------------
 # Configuration & Paths
 # -----------------------------------------------------------------------------
@@ -48,7 +50,13 @@ min5_bot_dir.mkdir(parents=True, exist_ok=True)
 
 def persist_incremental_bars(df: pd.DataFrame, master_path: Path, timestamp_col: str = 'timestamp'):
     """
-    Merges new bars into an existing master file for a symbol in the bot's data store.
+    Appends new bars for a symbol to the bot's data store.
+
+    `master_path` (<dir>/<SYMBOL>.parquet) names the symbol. The bars are written as a
+    new part file in the append-only store next to it (backtest/intraday_store.py), so
+    nothing already stored is read or rewritten; an existing master file is still read
+    as the oldest data and duplicates resolve at read time (newest wins). Parts are
+    folded into yearly files once a year has DEFAULT_MIN_PARTS of them.
     """
     if df.empty: return
     
@@ -66,23 +74,12 @@ def persist_incremental_bars(df: pd.DataFrame, master_path: Path, timestamp_col:
             log(f"Warning: No timestamp column found in incoming df for {master_path.name}")
             return
 
-    if master_path.exists():
-        try:
-            existing_df = pd.read_parquet(master_path)
-            # Schema Alignment: Ensure existing also uses the requested timestamp_col
-            alts = ['timestamp', 'date', 'datetime']
-            for a in alts:
-                if a in existing_df.columns and a != timestamp_col:
-                    existing_df = existing_df.rename(columns={a: timestamp_col})
-            
-            combined = pd.concat([existing_df, df]).drop_duplicates(subset=[timestamp_col])
-            combined = combined.sort_values(timestamp_col)
-            combined.to_parquet(master_path, index=False)
-        except Exception as e:
-            log(f"Warning: Failed to merge into {master_path.name}: {e}. Overwriting.")
-            df.to_parquet(master_path, index=False)
-    else:
-        df.to_parquet(master_path, index=False)
+    root, symbol = master_path.parent, master_path.stem
+    try:
+        intraday_store.append_bars(root, symbol, df, ts_col=timestamp_col)
+        intraday_store.compact_symbol(root, symbol, timestamp_col, min_parts=intraday_store.DEFAULT_MIN_PARTS)
+    except Exception as e:
+        log(f"Warning: Failed to append bars for {master_path.name}: {e}")
 
 # Load environment variables
 from dotenv import load_dotenv
@@ -349,6 +346,38 @@ def fetch_opening_bars(symbols: List[str], target_date: datetime.date) -> pd.Dat
         log(f"ERROR fetching bars: {e}")
         return pd.DataFrame()
 
+def fetch_minute_bars(symbols: List[str], target_date: datetime.date, start_time: dt_time, end_time: dt_time) -> pd.DataFrame:
+    """
+    Fetch 1-min bars starting between start_time and end_time (inclusive, ET) for a list of symbols.
+    Returns a DataFrame with [symbol, timestamp, open, high, low, close, volume]
+    """
+    if not ALPACA_KEY or not ALPACA_SECRET:
+        log("ERROR: Alpaca Credentials missing")
+        return pd.DataFrame()
+
+    client = StockHistoricalDataClient(ALPACA_KEY, ALPACA_SECRET)
+
+    et_tz = pytz.timezone("America/New_York")
+    start_dt = et_tz.localize(datetime.combine(target_date, start_time))
+    end_dt = et_tz.localize(datetime.combine(target_date, end_time)) + timedelta(minutes=1)
+
+    request_params = StockBarsRequest(
+        symbol_or_symbols=symbols,
+        timeframe=TimeFrame(1, TimeFrameUnit.Minute),
+        start=start_dt,
+        end=end_dt,
+        adjustment='raw'
+    )
+
+    try:
+        df = client.get_stock_bars(request_params).df
+        if df.empty:
+            return pd.DataFrame()
+        return df.reset_index()
+    except Exception as e:
+        log(f"ERROR fetching minute bars: {e}")
+        return pd.DataFrame()
+
 def fetch_technical_metrics(symbols: List[str], target_date: datetime.date) -> pd.DataFrame:
     """
     Fetch daily bars for the last 30 days to calculate ATR_14 and AvgVolume_14.
@@ -0,0 +1,420 @@
+"""
+Streaming Opening Range Builder
+===============================
+Builds the 09:30-09:35 opening range from 1-minute bars as they stream in,
+instead of fetching the finished 5-minute bar over REST after 09:35.
+
+    feed (Alpaca websocket | parquet replay) --on_bar--> OpeningRangeBuilder
+                                                          |  minute bars per symbol (09:30..09:34)
+                                                          v
+                                    ready as soon as every symbol's 09:34 bar is in
+                                    (or `grace_sec` after 09:35, whichever is first)
+
+OpeningRangeStream ties a feed to the builder for the session:
+- start(): subscribes the candidate pool; minutes that closed before the subscription
+  started are backfilled over REST (1-min bars) so a late start still sees 09:30
+- opening_bars(): waits for readiness and returns {symbol: one-row 09:30 5-min bar}, the
+  same shape the REST path produced; if the stream is incomplete by 09:35 + grace the
+  missing minutes are backfilled over REST, and symbols with no bars at all fall back to
+  the REST 5-min fetch
+- ranked(): Top-N green-candle candidates by RVOL (rank_opening_range)
+
+Replay (offline): ParquetMinuteBarFeed pushes minute bars from parquet through the same
+builder, and `python -m ORB_Live_Trader.pipeline.opening_range --replay <parquet> --date D`
+checks the streamed OR against 5-minute bars resampled from the same data.
+"""
+import os
+import threading
+import time as time_module
+from datetime import datetime, date, time as dt_time, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+import pytz
+
+ET = pytz.timezone("America/New_York")
+OR_MINUTES = [dt_time(9, 30 + i) for i in range(5)]  # 09:30 .. 09:34 minute bars make the 5-min OR
+LAST_OR_MINUTE = OR_MINUTES[-1]
+
+# on_bar(symbol, bar_start (tz-aware), open, high, low, close, volume)
+BarHandler = Callable[[str, datetime, float, float, float, float, float], None]
+
+
+def log(msg: str):
+    print(f"[OR-STREAM] {msg}", flush=True)
+
+
+class OpeningRangeBuilder:
+    """Per-symbol minute bars of the opening range; thread-safe (feeds call on_bar from their own thread)."""
+
+    def __init__(self, symbols: List[str], session_date: date, grace_sec: float = 2.0):
+        self.symbols = list(dict.fromkeys(symbols))
+        self.session_date = session_date
+        self.or_close = ET.localize(datetime.combine(session_date, dt_time(9, 35)))
+        self.grace_sec = grace_sec
+        self._minutes: Dict[str, Dict[dt_time, tuple]] = {s: {} for s in self.symbols}
+        self._lock = threading.Lock()
+        self._complete = threading.Event()  # every symbol has its 09:34 bar
+        self.ready_at: Optional[datetime] = None
+        self.bars_seen = 0
+
+    def on_bar(self, symbol: str, start: datetime, open_: float, high: float, low: float, close: float, volume: float):
+        """Add one minute bar (bars outside 09:30-09:34 or for other symbols are ignored; repeats replace)."""
+        minutes = self._minutes.get(symbol)
+        if minutes is None:
+            return
+        start_et = start.astimezone(ET) if start.tzinfo else ET.localize(start)
+        if start_et.date() != self.session_date:
+            return
+        minute = start_et.time().replace(second=0, microsecond=0)
+        if minute not in OR_MINUTES:
+            return
+        with self._lock:
+            minutes[minute] = (float(open_), float(high), float(low), float(close), float(volume))
+            self.bars_seen += 1
+            if not self._complete.is_set() and all(LAST_OR_MINUTE in m for m in self._minutes.values()):
+                self.ready_at = datetime.now(ET)
+                self._complete.set()
+
+    def is_complete(self) -> bool:
+        return self._complete.is_set()
+
+    def wait(self, timeout: Optional[float]) -> bool:
+        """Block until every symbol's 09:34 bar arrived (True) or `timeout` seconds passed (False)."""
+        return self._complete.wait(timeout)
+
+    def opening_range(self, symbol: str) -> Optional[dict]:
+        """OR of `symbol` from the minute bars received so far (None when it has none)."""
+        with self._lock:
+            bars = [self._minutes[symbol][m] for m in OR_MINUTES if m in self._minutes.get(symbol, {})]
+        if not bars:
+            return None
+        return {
+            'or_open': bars[0][0],
+            'or_high': max(b[1] for b in bars),
+            'or_low': min(b[2] for b in bars),
+            'or_close': bars[-1][3],
+            'or_volume': sum(b[4] for b in bars),
+        }
+
+    def missing_minutes(self, before: datetime) -> Dict[str, List[dt_time]]:
+        """OR minutes that closed before `before` and have no bar yet, per symbol."""
+        closed = [m for m in OR_MINUTES
+                  if ET.localize(datetime.combine(self.session_date, m)) + timedelta(minutes=1) <= before]
+        with self._lock:
+            gaps = {s: [m for m in closed if m not in self._minutes[s]] for s in self.symbols}
+        return {s: g for s, g in gaps.items() if g}
+
+    def opening_bars(self) -> Dict[str, pd.DataFrame]:
+        """{symbol: one-row 5-min bar at 09:30} in the shape extract_or() reads (symbols with bars only)."""
+        out = {}
+        for symbol in self.symbols:
+            rng = self.opening_range(symbol)
+            if rng is None:
+                continue
+            out[symbol] = pd.DataFrame([{
+                'symbol': symbol,
+                'datetime': ET.localize(datetime.combine(self.session_date, OR_MINUTES[0])),
+                'open': rng['or_open'],
+                'high': rng['or_high'],
+                'low': rng['or_low'],
+                'close': rng['or_close'],
+                'volume': rng['or_volume'],
+                'time': OR_MINUTES[0],
+            }])
+        return out
+
+
+def rank_opening_range(pool_df: pd.DataFrame, bars_map: Dict[str, pd.DataFrame], skip: Optional[set] = None, top_n: int = 5) -> pd.DataFrame:
+    """
+    Top-N long candidates: green OR candle (close > open), ranked by RVOL.
+    RVOL = or_volume * 78 / avg_volume_14; stop = or_high - 5% of ATR-14.
+    """
+    from ORB_Live_Trader.backtest.universe import extract_or
+
+    skip = skip or set()
+    final_list = []
+    for _, row in pool_df.iterrows():
+        symbol = row['symbol']
+        bars = bars_map.get(symbol)
+        if bars is None:
+            continue
+        # MEMORY: Skip if we already acted on this symbol today
+        if symbol in skip:
+            continue
+
+        or_data = extract_or(bars)
+        if not or_data:
+            continue
+
+        # ONLY LONG: OR Close > OR Open
+        direction = 1 if or_data['or_close'] > or_data['or_open'] else -1
+        if direction != 1:
+            continue
+
+        # RVOL calculation
+        rvol = (or_data['or_volume'] * 78.0) / row['avg_volume_14'] if row['avg_volume_14'] > 0 else 0
+
+        final_list.append({
+            'symbol': symbol,
+            'or_high': or_data['or_high'],
+            'atr_14': row['atr_14'],
+            'rvol': rvol,
+            'stop_price': or_data['or_high'] - (0.05 * row['atr_14'])
+        })
+    if not final_list:
+        return pd.DataFrame()
+    return pd.DataFrame(final_list).sort_values('rvol', ascending=False).head(top_n)
+
+
+# -----------------------------------------------------------------------------
+# Feeds
+# -----------------------------------------------------------------------------
+
+class AlpacaMinuteBarFeed:
+    """Alpaca market-data websocket, minute bars for `symbols`, run on a daemon thread."""
+
+    def __init__(self, api_key: Optional[str] = None, secret_key: Optional[str] = None, feed: Optional[str] = None):
+        self.api_key = api_key or os.getenv("ALPACA_API_KEY")
+        self.secret_key = secret_key or os.getenv("ALPACA_SECRET_KEY")
+        self.feed = (feed or os.getenv("ALPACA_DATA_FEED") or "sip").lower()
+        self._stream = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, symbols: List[str], on_bar: BarHandler):
+        from alpaca.data.enums import DataFeed
+        from alpaca.data.live import StockDataStream
+
+        self._stream = StockDataStream(self.api_key, self.secret_key, feed=DataFeed(self.feed))
+
+        async def handle(bar):
+            on_bar(bar.symbol, bar.timestamp, bar.open, bar.high, bar.low, bar.close, bar.volume)
+
+        self._stream.subscribe_bars(handle, *symbols)
+        self._thread = threading.Thread(target=self._run, name="or-stream", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            self._stream.run()
+        except Exception as e:
+            log(f"Websocket stopped: {e}")
+
+    def stop(self):
+        if self._stream is not None:
+            try:
+                self._stream.stop()
+            except Exception:
+                pass
+
+
+class ParquetMinuteBarFeed:
+    """
+    Replays 1-minute bars from parquet (one file with a `symbol` column, or a directory of
+    <SYMBOL>.parquet files) for `session_date`, in timestamp order.
+
+    pace=0 pushes everything at once; pace=1.0 replays in real time from the first bar
+    (each bar is delivered when its minute has closed), pace=60 a minute per second.
+    """
+
+    def __init__(self, path, session_date: date, pace: float = 0.0):
+        self.path = Path(path)
+        self.session_date = session_date
+        self.pace = pace
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def load(self, symbols: List[str]) -> pd.DataFrame:
+        if self.path.is_dir():
+            frames = []
+            for s in symbols:
+                f = self.path / f"{s}.parquet"
+                if f.exists():
+                    frames.append(pd.read_parquet(f).assign(symbol=s))
+            df = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        else:
+            df = pd.read_parquet(self.path)
+        if df.empty:
+            return df
+        ts_col = next(c for c in ('timestamp', 'datetime', 'ts', 'date') if c in df.columns)
+        ts = pd.to_datetime(df[ts_col])
+        ts = ts.dt.tz_localize(ET) if ts.dt.tz is None else ts.dt.tz_convert(ET)
+        df = df.assign(start=ts)
+        df = df[df['symbol'].isin(symbols) & (df['start'].dt.date == self.session_date)]
+        return df.sort_values('start', kind='stable')
+
+    def start(self, symbols: List[str], on_bar: BarHandler):
+        bars = self.load(symbols)
+        if self.pace <= 0:
+            self._push(bars, on_bar)
+            return
+        self._thread = threading.Thread(target=self._push, args=(bars, on_bar), name="or-replay", daemon=True)
+        self._thread.start()
+
+    def _push(self, bars: pd.DataFrame, on_bar: BarHandler):
+        origin = time_module.monotonic()
+        first = bars['start'].iloc[0] if not bars.empty else None
+        for r in bars.itertuples(index=False):
+            if self.pace > 0:
+                due = ((r.start - first).total_seconds() + 60) / self.pace
+                if self._stop.wait(max(0.0, due - (time_module.monotonic() - origin))):
+                    return
+            on_bar(r.symbol, r.start.to_pydatetime(), r.open, r.high, r.low, r.close, r.volume)
+
+    def stop(self):
+        self._stop.set()
+
+
+# -----------------------------------------------------------------------------
+# Session wrapper
+# -----------------------------------------------------------------------------
+
+class OpeningRangeStream:
+    """
+    Builder + feed for one session, with REST fallbacks.
+
+    rest_minute_bars(symbols, session_date, start_time, end_time) -> DataFrame of 1-min bars
+        [symbol, timestamp, open, high, low, close, volume] (backfill of minutes missed before start())
+    rest_opening_bars(symbols, session_date) -> DataFrame of 09:30 5-min bars with a `symbol`
+        column (fetch_opening_bars; used for symbols the stream never delivered)
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        session_date: date,
+        feed=None,
+        rest_minute_bars: Optional[Callable] = None,
+        rest_opening_bars: Optional[Callable] = None,
+        grace_sec: float = 2.0,
+    ):
+        self.builder = OpeningRangeBuilder(symbols, session_date, grace_sec=grace_sec)
+        self.feed = feed if feed is not None else AlpacaMinuteBarFeed()
+        self.rest_minute_bars = rest_minute_bars
+        self.rest_opening_bars = rest_opening_bars
+        self.started_at: Optional[datetime] = None
+        self.stream_ok = False
+        self.rest_symbols: List[str] = []
+
+    @property
+    def symbols(self) -> List[str]:
+        return self.builder.symbols
+
+    def start(self, now: Optional[datetime] = None):
+        """Subscribe (never raises: a failed subscription leaves the REST fallback)."""
+        self.started_at = now or datetime.now(ET)
+        try:
+            self.feed.start(self.symbols, self.builder.on_bar)
+            self.stream_ok = True
+            log(f"Subscribed to minute bars for {len(self.symbols)} symbols")
+        except Exception as e:
+            log(f"Stream subscription failed ({e}); the opening range will come from REST")
+        self.backfill(self.started_at)
+
+    def backfill(self, before: datetime):
+        """Fetch over REST the OR minutes that closed before `before` and have not been received."""
+        gaps = self.builder.missing_minutes(before)
+        if not gaps or self.rest_minute_bars is None:
+            return
+        missing = sorted({m for g in gaps.values() for m in g})
+        try:
+            df = self.rest_minute_bars(sorted(gaps), self.builder.session_date, missing[0], missing[-1])
+        except Exception as e:
+            log(f"Minute-bar backfill failed: {e}")
+            return
+        for r in (df if df is not None else pd.DataFrame()).itertuples(index=False):
+            self.builder.on_bar(r.symbol, pd.Timestamp(r.timestamp).to_pydatetime(), r.open, r.high, r.low, r.close, r.volume)
+        log(f"Backfilled {len(df) if df is not None else 0} minute bars for {len(gaps)} symbols")
+
+    def wait_ready(self, now: datetime) -> bool:
+        """Wait (at most until OR close + grace, measured from `now`) for every symbol's 09:34 bar."""
+        deadline = (self.builder.or_close - now).total_seconds() + self.builder.grace_sec
+        return self.builder.wait(max(0.0, deadline))
+
+    def opening_bars(self, now: datetime) -> Dict[str, pd.DataFrame]:
+        """
+        Wait for readiness, then the OR bar per symbol. When some 09:34 bars never came (thin
+        names print no bar for a minute without trades, or the socket dropped) the missing
+        minutes are backfilled over REST once; symbols with no bars at all use the REST 5-min bar.
+        """
+        complete = self.wait_ready(now) if self.stream_ok else False
+        if not complete:
+            self.backfill(self.builder.or_close)
+        bars_map = self.builder.opening_bars()
+        self.rest_symbols = [s for s in self.symbols if s not in bars_map]
+        if self.rest_symbols and self.rest_opening_bars is not None:
+            rest_df = self.rest_opening_bars(self.rest_symbols, self.builder.session_date)
+            for _, b_row in (rest_df if rest_df is not None else pd.DataFrame()).iterrows():
+                bars_map[b_row['symbol']] = pd.DataFrame([b_row]).assign(time=dt_time(9, 30))
+        log(f"Opening range: {len(bars_map) - len([s for s in self.rest_symbols if s in bars_map])} symbols streamed"
+            f"{' (all 09:34 bars in)' if complete else ''}, {len(self.rest_symbols)} via REST")
+        return bars_map
+
+    def ranked(self, pool_df: pd.DataFrame, now: datetime, skip: Optional[set] = None, top_n: int = 5) -> pd.DataFrame:
+        return rank_opening_range(pool_df, self.opening_bars(now), skip=skip, top_n=top_n)
+
+    def stop(self):
+        self.feed.stop()
+
+
+# -----------------------------------------------------------------------------
+# Offline check: streamed OR vs 5-min bars resampled from the same minute data
+# -----------------------------------------------------------------------------
+
+def replay_check(path, session_date: date, pool_df: Optional[pd.DataFrame] = None, top_n: int = 5) -> dict:
+    """Replay minute bars from `path` through the builder and compare each OR with a pandas 5-min resample."""
+    feed = ParquetMinuteBarFeed(path, session_date)
+    minutes = feed.load(pool_df['symbol'].tolist()) if pool_df is not None else None
+    if minutes is None:
+        whole = pd.read_parquet(path) if Path(path).is_file() else None
+        symbols = sorted(whole['symbol'].unique()) if whole is not None else [p.stem for p in Path(path).glob("*.parquet")]
+        minutes = feed.load(symbols)
+    symbols = sorted(minutes['symbol'].unique()) if not minutes.empty else []
+
+    stream = OpeningRangeStream(symbols, session_date, feed=feed)
+    started = time_module.perf_counter()
+    stream.start(now=ET.localize(datetime.combine(session_date, dt_time(9, 29))))
+    bars_map = stream.builder.opening_bars()
+    build_ms = (time_module.perf_counter() - started) * 1000
+
+    mismatches = []
+    window = minutes[(minutes['start'].dt.time >= OR_MINUTES[0]) & (minutes['start'].dt.time <= LAST_OR_MINUTE)]
+    for symbol, g in window.groupby('symbol'):
+        expected = (g['open'].iloc[0], g['high'].max(), g['low'].min(), g['close'].iloc[-1], g['volume'].sum())
+        got = bars_map.get(symbol)
+        got = tuple(got.iloc[0][['open', 'high', 'low', 'close', 'volume']]) if got is not None else None
+        if got is None or any(abs(a - b) > 1e-9 for a, b in zip(expected, got)):
+            mismatches.append({'symbol': symbol, 'expected': expected, 'streamed': got})
+
+    result = {'symbols': len(symbols), 'with_or': len(bars_map), 'mismatches': mismatches,
+              'bars_seen': stream.builder.bars_seen, 'build_ms': round(build_ms, 1)}
+    if pool_df is not None:
+        result['top'] = rank_opening_range(pool_df, bars_map, top_n=top_n)
+    return result
+
+
+def main():
+    import argparse
+
+    ap = argparse.ArgumentParser(description="Replay minute bars through the streaming opening-range builder")
+    ap.add_argument("--replay", required=True, help="Minute-bar parquet (with a symbol column) or a directory of <SYMBOL>.parquet")
+    ap.add_argument("--date", required=True, help="Session date YYYY-MM-DD")
+    ap.add_argument("--pool", help="Candidate pool parquet [symbol, atr_14, avg_volume_14] to rank (e.g. data/sentiment/daily_<date>.parquet)")
+    ap.add_argument("--top-n", type=int, default=5)
+    args = ap.parse_args()
+
+    session_date = datetime.strptime(args.date, "%Y-%m-%d").date()
+    pool_df = pd.read_parquet(args.pool) if args.pool else None
+    result = replay_check(args.replay, session_date, pool_df, args.top_n)
+    print(f"{result['with_or']}/{result['symbols']} symbols with an OR from {result['bars_seen']} minute bars "
+          f"in {result['build_ms']} ms; mismatches vs 5-min resample: {len(result['mismatches'])}")
+    for m in result['mismatches']:
+        print(f"  {m['symbol']}: expected {m['expected']} streamed {m['streamed']}")
+    if 'top' in result:
+        print(result['top'].to_string(index=False) if not result['top'].empty else "No green opening ranges.")
+    return 1 if result['mismatches'] else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
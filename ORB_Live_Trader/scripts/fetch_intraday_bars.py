@@ -196,7 +196,7 @@ def cleanup_old_folders(retention_days: int = 30):
     deleted_count = 0
     
     for folder in BARS_5MIN_DIR.glob("*"):
-        if not folder.is_dir():
+        if not folder.is_dir() or folder.name.startswith("symbol="):  # symbol=XYZ: per-symbol bar store
             continue
         
         try:
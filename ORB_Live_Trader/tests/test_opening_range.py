@@ -0,0 +1,100 @@
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+from ORB_Live_Trader.pipeline.opening_range import ET, OpeningRangeStream, ParquetMinuteBarFeed
+
+SESSION = date(2024, 3, 5)
+
+
+def _at(hh, mm, ss=0):
+    return ET.localize(datetime.combine(SESSION, time(hh, mm, ss)))
+
+
+def make_minutes(symbols, seed=0):
+    """1-min bars 09:25-09:44 for each symbol, plus the previous day's 09:30 bar."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for symbol in symbols:
+        price = rng.uniform(5, 50)
+        stamps = [_at(9, 30) - pd.Timedelta(days=1)] + list(pd.date_range(_at(9, 25), _at(9, 44), freq="1min"))
+        for ts in stamps:
+            o, c = price, price + rng.normal(0, 0.1)
+            rows.append({"symbol": symbol, "timestamp": ts, "open": o, "high": max(o, c) + 0.02,
+                         "low": min(o, c) - 0.02, "close": c, "volume": float(rng.integers(100, 5_000))})
+            price = c
+    return pd.DataFrame(rows)
+
+
+def resampled_or(minutes):
+    """The 09:30 5-min bar per symbol, as pandas resamples it."""
+    out = {}
+    for symbol, g in minutes.groupby("symbol"):
+        five = g.set_index("timestamp").resample("5min").agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"})
+        out[symbol] = tuple(five.loc[_at(9, 30)])
+    return out
+
+
+class FakeRest:
+    def __init__(self, minutes):
+        self.minutes = minutes
+        self.minute_calls, self.opening_calls = [], []
+
+    def minute_bars(self, symbols, session_date, start, end):
+        self.minute_calls.append((list(symbols), start, end))
+        t = self.minutes["timestamp"].dt.time
+        return self.minutes[self.minutes["symbol"].isin(symbols) & (t >= start) & (t <= end)]
+
+    def opening_bars(self, symbols, session_date):
+        self.opening_calls.append(list(symbols))
+        return pd.DataFrame([{"symbol": s, "datetime": _at(9, 30), "open": 1.0, "high": 1.2, "low": 0.9,
+                              "close": 1.1, "volume": 1_000.0} for s in symbols])
+
+
+def _or_tuple(bars):
+    return tuple(bars.iloc[0][["open", "high", "low", "close", "volume"]])
+
+
+def test_streamed_or_matches_resample_with_shuffled_repeated_and_missing_bars(tmp_path):
+    minutes = make_minutes(["AAA", "BBB", "CCC"])
+    missing = (minutes["symbol"] == "BBB") & (minutes["timestamp"] == _at(9, 34))
+    streamed = minutes[~missing]
+    streamed = pd.concat([streamed, streamed.sample(15, random_state=1)])  # repeats
+    streamed = streamed.sample(frac=1.0, random_state=2)  # arrival order shuffled
+    streamed.to_parquet(tmp_path / "minutes.parquet", index=False)
+
+    rest = FakeRest(minutes)
+    stream = OpeningRangeStream(["AAA", "BBB", "CCC", "DDD"], SESSION,
+                                feed=ParquetMinuteBarFeed(tmp_path / "minutes.parquet", SESSION),
+                                rest_minute_bars=rest.minute_bars, rest_opening_bars=rest.opening_bars, grace_sec=0.0)
+    stream.start(now=_at(9, 29))
+    assert rest.minute_calls == []  # nothing had closed before the subscription
+    assert not stream.builder.is_complete()
+    assert stream.builder.missing_minutes(_at(9, 35)) == {"BBB": [time(9, 34)], "DDD": [time(9, 30 + i) for i in range(5)]}
+
+    bars_map = stream.opening_bars(now=_at(9, 35, 5))
+    assert rest.minute_calls == [(["BBB", "DDD"], time(9, 30), time(9, 34))]
+    assert stream.rest_symbols == ["DDD"] and rest.opening_calls == [["DDD"]]  # no minute bars at all: REST 5-min bar
+    expected = resampled_or(minutes)
+    for symbol in ("AAA", "BBB", "CCC"):
+        assert np.allclose(_or_tuple(bars_map[symbol]), expected[symbol]), symbol
+    assert bars_map["BBB"].iloc[0]["time"] == time(9, 30)
+
+
+def test_late_start_backfills_the_minutes_that_already_closed(tmp_path):
+    minutes = make_minutes(["AAA", "BBB"], seed=3)
+    late = minutes[minutes["timestamp"] >= _at(9, 32)]  # the socket only sees bars from 09:32 on
+    late.to_parquet(tmp_path / "minutes.parquet", index=False)
+
+    rest = FakeRest(minutes)
+    stream = OpeningRangeStream(["AAA", "BBB"], SESSION, feed=ParquetMinuteBarFeed(tmp_path / "minutes.parquet", SESSION),
+                                rest_minute_bars=rest.minute_bars, grace_sec=0.0)
+    stream.start(now=_at(9, 32, 20))
+
+    assert rest.minute_calls == [(["AAA", "BBB"], time(9, 30), time(9, 31))]
+    assert stream.builder.is_complete() and stream.builder.missing_minutes(_at(9, 35)) == {}
+    bars_map = stream.opening_bars(now=_at(9, 35))
+    expected = resampled_or(minutes)
+    assert all(np.allclose(_or_tuple(bars_map[s]), expected[s]) for s in ("AAA", "BBB"))
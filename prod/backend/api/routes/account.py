@@ -4,6 +4,7 @@ Account API endpoints.
 from fastapi import APIRouter, HTTPException
 
 from execution.alpaca_client import get_alpaca_client
+from execution.broker_worker import broker_call
 from shared.schemas import AccountResponse
 
 router = APIRouter()
@@ -14,7 +15,7 @@ async def get_account():
     """Get Alpaca account information."""
     try:
         client = get_alpaca_client()
-        account = client.get_account()
+        account = await broker_call(client.get_account)
         
         return AccountResponse(
             equity=float(account.equity),
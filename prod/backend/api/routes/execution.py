@@ -8,7 +8,8 @@ from datetime import datetime
 from zoneinfo import ZoneInfo
 from typing import Optional
 
-from execution.order_executor import get_executor, flatten_eod, calculate_position_size
+from execution.order_executor import flatten_eod, calculate_position_size, get_executor
+from execution.broker_worker import broker_call
 from core.config import settings
 
 
@@ -46,7 +47,7 @@ async def place_test_order(request: TestOrderRequest):
         }
     
     # Calculate position size
-    sizing = calculate_position_size(request.entry_price, request.stop_price)
+    sizing = await broker_call(calculate_position_size, request.entry_price, request.stop_price)
     
     if sizing["shares"] < 1:
         return {
@@ -55,9 +56,8 @@ async def place_test_order(request: TestOrderRequest):
             "sizing": sizing,
         }
     
-    executor = get_executor()
-    
-    result = executor.place_entry_order(
+    result = await broker_call(
+        "place_entry_order",
         symbol=request.symbol.upper(),
         side="LONG",
         shares=sizing["shares"],
@@ -84,7 +84,7 @@ async def place_order(request: OrderRequest):
     Uses fixed 2x leverage from settings.
     """
     # Calculate position size
-    sizing = calculate_position_size(request.entry_price, request.stop_price)
+    sizing = await broker_call(calculate_position_size, request.entry_price, request.stop_price)
     
     if sizing["shares"] < 1:
         return {
@@ -93,9 +93,8 @@ async def place_order(request: OrderRequest):
             "sizing": sizing,
         }
     
-    executor = get_executor()
-    
-    result = executor.place_entry_order(
+    result = await broker_call(
+        "place_entry_order",
         symbol=request.symbol.upper(),
         side=request.side.upper(),
         shares=sizing["shares"],
@@ -119,7 +118,7 @@ async def get_position_sizing(
     
     Useful for previewing trade size before placing.
     """
-    sizing = calculate_position_size(entry_price, stop_price)
+    sizing = await broker_call(calculate_position_size, entry_price, stop_price)
     
     return {
         "entry_price": entry_price,
@@ -137,8 +136,7 @@ async def get_position_sizing(
 @router.get("/orders")
 async def get_open_orders():
     """Get all open orders on Alpaca."""
-    executor = get_executor()
-    orders = executor.get_open_orders()
+    orders = await broker_call("get_open_orders")
     return {
         "count": len(orders),
         "orders": orders,
@@ -148,16 +146,14 @@ async def get_open_orders():
 @router.delete("/orders")
 async def cancel_all_orders():
     """Cancel all open orders."""
-    executor = get_executor()
-    result = executor.cancel_all_orders()
+    result = await broker_call("cancel_all_orders")
     return result
 
 
 @router.get("/positions")
 async def get_positions():
     """Get all open positions."""
-    executor = get_executor()
-    positions = executor.get_positions()
+    positions = await broker_call("get_positions")
     
     total_pnl = sum(p["unrealized_pnl"] for p in positions)
     total_value = sum(p["market_value"] for p in positions)
@@ -173,16 +169,14 @@ async def get_positions():
 @router.delete("/positions/{symbol}")
 async def close_position(symbol: str):
     """Close a single position."""
-    executor = get_executor()
-    result = executor.close_position(symbol.upper())
+    result = await broker_call("close_position", symbol.upper())
     return result
 
 
 @router.delete("/positions")
 async def close_all_positions():
     """Close all positions (manual EOD flatten)."""
-    executor = get_executor()
-    result = executor.close_all_positions()
+    result = await broker_call("close_all_positions")
     return result
 
 
@@ -192,24 +186,23 @@ async def flatten_end_of_day():
     End-of-day flatten: Cancel all orders and close all positions.
     Typically called at 3:55 PM ET.
     """
-    result = flatten_eod()
+    result = await broker_call(flatten_eod)
     return result
 
 
 @router.get("/account")
 async def get_account():
     """Get Alpaca account information."""
-    executor = get_executor()
-    account = executor.get_account()
+    account = await broker_call("get_account")
     return account
 
 
 @router.get("/kill-switch")
 async def get_kill_switch_status():
     """Check kill switch status."""
-    executor = get_executor()
+    # The kill switch is a flag file: read it here rather than queueing behind broker commands
     return {
-        "active": executor.is_kill_switch_active(),
+        "active": get_executor().is_kill_switch_active(),
         "timestamp": datetime.now(ET).isoformat(),
     }
 
@@ -218,13 +211,14 @@ async def get_kill_switch_status():
 async def activate_kill_switch():
     """Activate kill switch - stops all new orders."""
     executor = get_executor()
-    
-    # Cancel all open orders immediately
-    executor.cancel_all_orders()
-    
-    # Activate kill switch
+
+    # Activate kill switch first: the flag file blocks new orders even while the cancel
+    # below waits behind a queued broker command (entry burst, re-login)
     success = executor.activate_kill_switch()
-    
+
+    # Cancel all open orders
+    await broker_call("cancel_all_orders")
+
     return {
         "status": "activated" if success else "failed",
         "active": executor.is_kill_switch_active(),
@@ -237,7 +231,7 @@ async def deactivate_kill_switch():
     """Deactivate kill switch - resumes trading."""
     executor = get_executor()
     success = executor.deactivate_kill_switch()
-    
+
     return {
         "status": "deactivated" if success else "failed",
         "active": executor.is_kill_switch_active(),
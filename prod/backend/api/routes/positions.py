@@ -5,6 +5,7 @@ from fastapi import APIRouter, HTTPException
 from typing import List
 
 from execution.alpaca_client import get_alpaca_client
+from execution.broker_worker import broker_call
 from shared.schemas import PositionResponse
 
 router = APIRouter()
@@ -16,7 +17,7 @@ async def get_open_positions():
     try:
         # Get live positions from Alpaca
         client = get_alpaca_client()
-        alpaca_positions = client.get_all_positions()
+        alpaca_positions = await broker_call(client.get_all_positions)
         
         # Convert to response format
         positions = []
@@ -42,7 +43,7 @@ async def get_position(ticker: str):
     """Get specific position by ticker."""
     try:
         client = get_alpaca_client()
-        pos = client.get_open_position(ticker)
+        pos = await broker_call(client.get_open_position, ticker)
         
         return PositionResponse(
             ticker=pos.symbol,
@@ -63,7 +64,7 @@ async def close_position(ticker: str):
     """Manually close a position."""
     try:
         client = get_alpaca_client()
-        order = client.close_position(ticker)
+        order = await broker_call(client.close_position, ticker)
         
         return {
             "status": "success",
@@ -89,13 +89,12 @@ async def generate_signals(request: GenerateSignalsRequest):
     Requires scanner to be run first (/api/scanner/run).
     """
     from services.signal_engine import run_signal_generation
-    from execution.order_executor import get_executor
+    from execution.broker_worker import broker_call
     
     # Get account equity if not provided
     account_equity = request.account_equity
     if account_equity is None:
-        executor = get_executor()
-        account = executor.get_account()
+        account = await broker_call("get_account")
         account_equity = account.get("equity", 100000)
     
     result = await run_signal_generation(
@@ -116,12 +115,11 @@ async def execute_signals(request: ExecuteSignalsRequest):
     Otherwise, executes all pending signals.
     """
     from services.signal_engine import get_pending_signals
+    from execution.broker_worker import broker_call
     from execution.order_executor import get_executor
     
-    executor = get_executor()
-    
-    # Check kill switch
-    if executor.is_kill_switch_active():
+    # Check kill switch (a flag file: not queued behind broker commands)
+    if get_executor().is_kill_switch_active():
         return {
             "status": "blocked",
             "reason": "Kill switch is active",
@@ -145,7 +143,7 @@ async def execute_signals(request: ExecuteSignalsRequest):
     results = []
     for signal in pending:
         from services.signal_engine import calculate_position_size
-        account = executor.get_account()
+        account = await broker_call("get_account")
 
         shares = calculate_position_size(
             entry_price=float(signal["entry_price"]),
@@ -154,7 +152,8 @@ async def execute_signals(request: ExecuteSignalsRequest):
         )
 
         if shares > 0:
-            result = executor.place_entry_order(
+            result = await broker_call(
+                "place_entry_order",
                 symbol=str(signal["symbol"]).upper(),
                 side=str(signal["side"]).upper(),
                 shares=int(shares),
@@ -97,6 +97,32 @@ async def get_scheduler_status():
     }
 
 
+@router.get("/broker-worker")
+async def get_broker_worker_status():
+    """Broker worker queue depth and per-command latency (queue wait + run time)."""
+    from execution.broker_worker import get_broker_worker
+
+    return get_broker_worker().stats()
+
+
+@router.get("/tradezero-sessions")
+async def get_tradezero_sessions():
+    """Warm TradeZero session pool: per-session age, last health check, leases and re-logins."""
+    if (getattr(settings, "EXECUTION_BROKER", "") or "").lower() != "tradezero":
+        return {"running": False, "reason": "not_tradezero"}
+    from execution.tradezero.session_pool import get_session_pool
+
+    return get_session_pool().stats()
+
+
+@router.get("/market-data")
+async def get_market_data_stats():
+    """Shared market data hub: cache sizes, TTLs, upstream calls vs cache hits, /ws/live subscribers."""
+    from services.market_data_hub import get_market_data_hub
+
+    return get_market_data_hub().stats()
+
+
 @router.post("/scheduler/trigger-sync")
 async def trigger_data_sync():
     """
@@ -156,9 +182,10 @@ async def flatten_all_positions():
     - End of day manual flatten
     """
     from execution.order_executor import flatten_eod
+    from execution.broker_worker import broker_call
     
     try:
-        result = flatten_eod()
+        result = await broker_call(flatten_eod)
         return {
             "status": "success",
             "message": "All positions flattened",
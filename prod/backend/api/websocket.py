@@ -4,10 +4,11 @@ WebSocket endpoint for real-time updates.
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from typing import List
 import asyncio
+import contextlib
 import json
 import logging
 
-from execution.alpaca_client import get_alpaca_client
+from services.market_data_hub import get_market_data_hub
 
 logger = logging.getLogger(__name__)
 
@@ -54,56 +55,28 @@ async def websocket_live_updates(websocket: WebSocket):
     - Account balance changes
     - New trade fills
     - Signal alerts
+
+    Every client reads the market data hub's shared snapshot: positions and
+    account are polled once per interval however many clients are connected.
     """
     await manager.connect(websocket)
     
     try:
-        while True:
-            # Get current positions and account
-            try:
-                client = get_alpaca_client()
-                
-                # Fetch positions
-                positions = client.get_all_positions()
-                positions_data = [
-                    {
-                        "ticker": pos.symbol,
-                        "side": "LONG" if float(pos.qty) > 0 else "SHORT",
-                        "shares": abs(int(pos.qty)),
-                        "entry_price": float(pos.avg_entry_price),
-                        "current_price": float(pos.current_price),
-                        "pnl": float(pos.unrealized_pl),
-                        "pnl_pct": float(pos.unrealized_plpc) * 100
-                    }
-                    for pos in positions
-                ]
-                
-                # Fetch account
-                account = client.get_account()
-                account_data = {
-                    "equity": float(account.equity),
-                    "cash": float(account.cash),
-                    "buying_power": float(account.buying_power),
-                    "day_pnl": float(account.equity) - float(account.last_equity)
-                }
-                
-                # Send update
+        async with contextlib.aclosing(get_market_data_hub().live_updates()) as updates:
+            async for snapshot in updates:
+                if snapshot["error"]:
+                    await websocket.send_json({
+                        "type": "error",
+                        "message": snapshot["error"]
+                    })
+                    continue
+
                 await websocket.send_json({
                     "type": "update",
                     "timestamp": asyncio.get_event_loop().time(),
-                    "positions": positions_data,
-                    "account": account_data
+                    "positions": snapshot["positions"],
+                    "account": snapshot["account"]
                 })
-                
-            except Exception as e:
-                logger.error(f"Error fetching data: {e}")
-                await websocket.send_json({
-                    "type": "error",
-                    "message": str(e)
-                })
-            
-            # Wait 1 second before next update
-            await asyncio.sleep(1)
             
     except WebSocketDisconnect:
         manager.disconnect(websocket)
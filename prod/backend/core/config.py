@@ -57,6 +57,9 @@ class Settings(BaseSettings):
     DUCKDB_PATH: str = str(_BACKEND_ROOT / "data" / "duckdb_local.db")
     # DuckDB file used for *trading state* (signals/opening ranges). Keep separate from market-data DuckDB.
     DUCKDB_STATE_PATH: str = str(_BACKEND_ROOT / "data" / "trading_state.duckdb")
+    # The state store keeps one connection per process; it is closed after this many idle seconds so
+    # scripts can open the file while the API runs (DuckDB allows one writing process). 0 = keep it open.
+    DUCKDB_STATE_IDLE_CLOSE_SEC: float = 5.0
     PARQUET_BASE_PATH: str = str(_DATA_ROOT / "processed")
     DELTA_BASE_PATH: str = str(_DATA_ROOT / "deltas")
 
@@ -98,6 +101,9 @@ class Settings(BaseSettings):
     TRADEZERO_DRY_RUN: bool = False
     TRADEZERO_LOCATE_MAX_PPS: float = 0.05  # max $/share for short locates
     TRADEZERO_DEFAULT_EQUITY: float = 100000.0  # used if we cannot read equity from UI
+    TRADEZERO_POOL_SIZE: int = 2  # logged-in browser sessions kept warm (1 in use + 1 spare)
+    TRADEZERO_SESSION_MAX_AGE_MIN: float = 480.0  # fresh re-login once a session is this old (> 09:25-16:00)
+    TRADEZERO_HEALTH_CHECK_SEC: float = 60.0  # DOM probe interval for idle sessions
     
     # Safety / Testing
     # If > 0, overrides actual broker buying power. Use this to CAP exposure on testing days.
@@ -114,6 +120,15 @@ class Settings(BaseSettings):
     RISK_PER_TRADE_PCT: float = 0.01      # Default risk per trade (overridden by strategy)
     MAX_POSITION_DOLLAR_LIMIT: float = 25000.0 # Hard cap on position value (safety)
 
+    # 09:35 entry burst (execution/entry_pipeline.py)
+    ENTRY_SUBMIT_WORKERS: int = 4         # parallel entry submissions where the broker allows it
+    ENTRY_MAX_DELAY_SEC: float = 0.0      # skip entries not yet sent N s after OR close (0 = no cap)
+
+    # Shared market data (services/market_data_hub.py)
+    MARKET_DATA_QUOTE_TTL_SEC: float = 2.0   # latest quotes older than this are re-fetched
+    MARKET_DATA_BAR_TTL_SEC: float = 30.0    # minute bars refreshed (incrementally) after this
+    MARKET_DATA_LIVE_POLL_SEC: float = 1.0   # positions + account poll for /ws/live (one poll for all clients)
+
     # System
     KILL_SWITCH_FILE: str = ".stop_trading"
 
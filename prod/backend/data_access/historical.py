@@ -14,6 +14,7 @@ import glob
 import duckdb
 import pandas as pd
 from core.config import settings
+from scripts.ORB import intraday_store
 
 
 DB_PATH = settings.DUCKDB_PATH
@@ -42,6 +43,8 @@ def query_symbol_range(symbol: str, start_ts: datetime, end_ts: datetime, interv
 
     This function looks for parquet files under `data/processed/<interval>/symbol=<symbol>/year=.../month=.../day=...`.
     If multiple day partitions are requested, it scans the matching files.
+    Without day partitions it reads the per-symbol bar store (`symbol=<symbol>/year=<YYYY>/` parts and
+    yearly files plus the flat `<symbol>.parquet`, see scripts/ORB/intraday_store.py).
     """
     con = _connect()
     # Build wildcard path for the date range (inclusive)
@@ -61,16 +64,16 @@ def query_symbol_range(symbol: str, start_ts: datetime, end_ts: datetime, interv
         files.extend([os.path.abspath(fp) for fp in glob.glob(p)])
 
     if not files:
-        # Flat-file fallback
-        flat_path = os.path.join(PARQUET_BASE, interval, f"{symbol}.parquet")
-        if not os.path.exists(flat_path):
+        # Bar store / flat-file fallback (e.g. DataPipeline writes: data/processed/5min/<SYMBOL>.parquet)
+        store_root = os.path.join(PARQUET_BASE, interval)
+        if not intraday_store.has_bars(store_root, symbol):
             # Some pipelines may uppercase symbols on disk
-            flat_path = os.path.join(PARQUET_BASE, interval, f"{symbol.upper()}.parquet")
-        if not os.path.exists(flat_path):
+            symbol = symbol.upper()
+        if not intraday_store.has_bars(store_root, symbol):
             return pd.DataFrame()
 
         try:
-            df = pd.read_parquet(flat_path)
+            df = intraday_store.read_bars(store_root, symbol, ts_col="timestamp", start=start_ts, end=end_ts)
         except Exception:
             return pd.DataFrame()
 
@@ -133,18 +136,5 @@ def list_available_symbols(interval: str = '1min') -> List[str]:
     if not os.path.exists(base):
         return []
 
-    # Prefer partitioned layout: data/processed/<interval>/symbol=XYZ/...
-    symbols: list[str] = []
-    for item in os.listdir(base):
-        if item.startswith('symbol='):
-            symbols.append(item.split('=')[1])
-
-    if symbols:
-        return symbols
-
-    # Fallback: flat layout: data/processed/<interval>/XYZ.parquet
-    out: list[str] = []
-    for item in os.listdir(base):
-        if item.lower().endswith('.parquet'):
-            out.append(os.path.splitext(item)[0])
-    return out
+    # Partitioned layout (data/processed/<interval>/symbol=XYZ/...) and flat files (XYZ.parquet)
+    return intraday_store.list_symbols(base)
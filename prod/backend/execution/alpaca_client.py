@@ -15,6 +15,7 @@ from alpaca.data.timeframe import TimeFrame
 from core.config import settings
 
 _client = None
+_data_client = None
 
 
 def get_alpaca_client() -> TradingClient:
@@ -32,8 +33,13 @@ def get_alpaca_client() -> TradingClient:
 
 
 def get_data_client() -> StockHistoricalDataClient:
-    """Get Alpaca data client for historical data."""
-    return StockHistoricalDataClient(
-        api_key=settings.ALPACA_API_KEY,
-        secret_key=settings.ALPACA_API_SECRET
-    )
+    """Get or create Alpaca data client singleton (shared by the scanner and the market data hub)."""
+    global _data_client
+    
+    if _data_client is None:
+        _data_client = StockHistoricalDataClient(
+            api_key=settings.ALPACA_API_KEY,
+            secret_key=settings.ALPACA_API_SECRET
+        )
+    
+    return _data_client
@@ -0,0 +1,174 @@
+"""
+Broker worker thread for the order executor.
+
+The executors are synchronous: alpaca-py does blocking HTTP round-trips and
+TradeZero drives a Selenium browser (which must not be used from two threads
+at once). Async scheduler jobs and API routes used to call them straight from
+the event loop, freezing the API and /ws/live for the length of every broker
+call. Instead they put commands on this worker's queue and await the result;
+one daemon thread runs the commands in FIFO order against `get_executor()`.
+
+    from execution.broker_worker import broker_call
+
+    account = await broker_call("get_account")
+    result = await broker_call("place_entry_order", symbol="AAPL", side="LONG", ...)
+    result = await broker_call(flatten_eod)   # any callable also runs on the worker
+
+Per-command latency (time queued + time running) is kept for `stats()` and
+served at GET /api/system/broker-worker.
+"""
+import asyncio
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Callable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+Command = Union[str, Callable[..., Any]]
+
+SLOW_COMMAND_SEC = 5.0  # log commands that run longer than this
+LATENCY_SAMPLES = 256  # recent run times kept per command for percentiles
+
+
+class _CommandStats:
+    """Latency counters for one command name."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.wait_total = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+        self.recent = deque(maxlen=LATENCY_SAMPLES)
+
+    def record(self, wait: float, run: float, ok: bool):
+        self.count += 1
+        self.errors += 0 if ok else 1
+        self.wait_total += wait
+        self.run_total += run
+        self.run_max = max(self.run_max, run)
+        self.recent.append(run)
+
+    def as_dict(self) -> dict:
+        recent = sorted(self.recent)
+
+        def pct(q: float) -> float:
+            return round(recent[min(len(recent) - 1, int(q * len(recent)))] * 1000, 1) if recent else 0.0
+
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "avg_wait_ms": round(self.wait_total / self.count * 1000, 1) if self.count else 0.0,
+            "avg_run_ms": round(self.run_total / self.count * 1000, 1) if self.count else 0.0,
+            "p50_run_ms": pct(0.50),
+            "p95_run_ms": pct(0.95),
+            "max_run_ms": round(self.run_max * 1000, 1),
+        }
+
+
+def _get_executor():
+    # Imported on first command: the executor module pulls in the broker SDKs
+    from execution.order_executor import get_executor
+
+    return get_executor()
+
+
+class BrokerWorker:
+    """Single thread that owns every call into the broker executor."""
+
+    def __init__(self, executor_factory: Callable[[], Any] = _get_executor, name: str = "broker-worker"):
+        self.executor_factory = executor_factory
+        self.name = name
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._stats: dict[str, _CommandStats] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        with self._lock:
+            if self.running:
+                return
+            self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+            self._thread.start()
+        logger.info("Broker worker started")
+
+    def stop(self, timeout: float = 5.0):
+        """Finish the queued commands, then stop the thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None:
+            return
+        self._queue.put(None)
+        thread.join(timeout)
+        logger.info("Broker worker stopped")
+
+    def submit(self, command: Command, *args, **kwargs) -> Future:
+        """Queue `command` (an executor method name or a callable) and return its Future."""
+        future: Future = Future()
+        if threading.current_thread() is self._thread:
+            # Already on the worker (a command calling back in): queueing would deadlock
+            self._execute(command, args, kwargs, future, time.perf_counter())
+            return future
+        if not self.running:
+            self.start()
+        self._queue.put((command, args, kwargs, future, time.perf_counter()))
+        return future
+
+    async def call(self, command: Command, *args, **kwargs) -> Any:
+        """Run `command` on the worker thread and await its result (exceptions propagate)."""
+        return await asyncio.wrap_future(self.submit(command, *args, **kwargs))
+
+    def stats(self) -> dict:
+        with self._lock:
+            commands = {name: s.as_dict() for name, s in self._stats.items()}
+        return {"running": self.running, "queue_depth": self._queue.qsize(), "commands": commands}
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            self._execute(*item)
+
+    def _execute(self, command: Command, args: tuple, kwargs: dict, future: Future, enqueued: float):
+        if not future.set_running_or_notify_cancel():
+            return
+        name = command if isinstance(command, str) else getattr(command, "__name__", repr(command))
+        started = time.perf_counter()
+        ok = True
+        try:
+            fn = getattr(self.executor_factory(), command) if isinstance(command, str) else command
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            ok = False
+            future.set_exception(e)
+        run = time.perf_counter() - started
+        with self._lock:
+            self._stats.setdefault(name, _CommandStats()).record(started - enqueued, run, ok)
+        if run > SLOW_COMMAND_SEC:
+            logger.warning("Slow broker command %s: %.1fs", name, run)
+
+
+# Process-wide worker (started with the API, or lazily on first use)
+_worker: Optional[BrokerWorker] = None
+
+
+def get_broker_worker() -> BrokerWorker:
+    """Get or create the broker worker singleton."""
+    global _worker
+    if _worker is None:
+        _worker = BrokerWorker()
+    return _worker
+
+
+async def broker_call(command: Command, *args, **kwargs) -> Any:
+    """Await `command` on the shared broker worker (see module docstring)."""
+    return await get_broker_worker().call(command, *args, **kwargs)
@@ -0,0 +1,195 @@
+"""
+Entry pipeline for the 09:35 burst.
+
+Placing the Top-N entries one signal at a time interleaved sizing, validation
+and (on TradeZero) a wait of up to 60 s for each entry to fill before the next
+order was even started, so the last order could land minutes after the opening
+range closed. Here the burst is split in two:
+
+1. prepare_entries()  sizing + validation for every signal up front, no broker calls
+2. submit_entries()   the prepared orders go out back to back (in parallel when
+                      the broker allows it); each acknowledgement is timed
+
+SubmitLatency keeps, per order, the time from the burst origin (OR close) to
+the acknowledgement and the submit call's own duration, plus a bucketed
+histogram, so the time from OR close to the last order acknowledged can be
+measured and capped (ENTRY_MAX_DELAY_SEC).
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+from zoneinfo import ZoneInfo
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = (250, 500, 1000, 2000, 5000, 10000, 30000, 60000)
+
+
+@dataclass(frozen=True)
+class EntryOrder:
+    """One fully prepared entry (sized and validated)."""
+    symbol: str
+    side: str
+    shares: int
+    entry_price: float
+    stop_price: float
+    signal_id: Optional[int] = None
+
+    def as_kwargs(self) -> dict:
+        return asdict(self)
+
+
+@dataclass
+class SubmitLatency:
+    """Per-order submit latency for one entry burst."""
+    origin: datetime
+    samples: list = field(default_factory=list)  # (symbol, ms since origin at ack, submit call ms, status)
+
+    def record(self, symbol: str, acked_at: datetime, submit_sec: float, status: str):
+        self.samples.append((symbol, (acked_at - self.origin).total_seconds() * 1000, submit_sec * 1000, status))
+
+    def histogram(self) -> dict:
+        counts = {f"<={b}ms": 0 for b in LATENCY_BUCKETS_MS}
+        counts[f">{LATENCY_BUCKETS_MS[-1]}ms"] = 0
+        for _, since_origin, _, _ in self.samples:
+            bucket = next((b for b in LATENCY_BUCKETS_MS if since_origin <= b), None)
+            counts[f"<={bucket}ms" if bucket is not None else f">{LATENCY_BUCKETS_MS[-1]}ms"] += 1
+        return counts
+
+    def summary(self) -> dict:
+        since_origin = sorted(s[1] for s in self.samples)
+        submit = sorted(s[2] for s in self.samples)
+
+        def pct(values: list, q: float) -> float:
+            return round(values[min(len(values) - 1, int(q * len(values)))], 1) if values else 0.0
+
+        return {
+            "origin": self.origin.isoformat(),
+            "orders": len(self.samples),
+            "last_ack_ms": round(since_origin[-1], 1) if since_origin else 0.0,
+            "first_ack_ms": round(since_origin[0], 1) if since_origin else 0.0,
+            "submit_p50_ms": pct(submit, 0.50),
+            "submit_p95_ms": pct(submit, 0.95),
+            "submit_max_ms": round(submit[-1], 1) if submit else 0.0,
+            "histogram": self.histogram(),
+            "per_order": [
+                {"symbol": sym, "ack_ms": round(ack, 1), "submit_ms": round(sub, 1), "status": status}
+                for sym, ack, sub, status in self.samples
+            ],
+        }
+
+
+def prepare_entries(
+    signals: list[dict],
+    equity: float,
+    max_position_value: float,
+    size: Callable[..., int],
+) -> tuple[list[EntryOrder], list[dict]]:
+    """
+    Size and validate every pending signal before anything is submitted.
+
+    `size` is the sizing function (signal_engine.calculate_position_size).
+    Returns (orders, skipped); skipped rows carry symbol + reason.
+
+    A second signal for a symbol stays in `orders` as a fallback: submit_entries
+    only sends it if the earlier order for that symbol was not submitted.
+    """
+    orders: list[EntryOrder] = []
+    skipped: list[dict] = []
+    for signal in signals:
+        symbol = str(signal["symbol"]).upper().strip()
+        side = str(signal["side"]).upper().strip()
+        if side not in {"LONG", "SHORT"}:
+            skipped.append({"symbol": symbol, "reason": f"unsupported side {side}"})
+            continue
+        # Note: max_position_value is derived from buying_power (already leveraged)
+        # So we pass leverage=1.0 to avoid double-leveraging
+        shares = size(
+            entry_price=float(signal["entry_price"]),
+            stop_price=float(signal["stop_price"]),
+            account_equity=equity,
+            max_position_value=max_position_value,
+            leverage=1.0,
+        )
+        if shares <= 0:
+            skipped.append({"symbol": symbol, "reason": "calculated 0 shares"})
+            continue
+        orders.append(EntryOrder(
+            symbol=symbol,
+            side=side,
+            shares=int(shares),
+            entry_price=float(signal["entry_price"]),
+            stop_price=float(signal["stop_price"]),
+            signal_id=signal.get("id"),
+        ))
+    return orders, skipped
+
+
+def submit_entries(
+    orders: list[EntryOrder],
+    submit: Callable[[EntryOrder], dict],
+    workers: int = 1,
+    origin: Optional[datetime] = None,
+    max_delay_sec: float = 0.0,
+) -> tuple[list[dict], SubmitLatency]:
+    """
+    Submit prepared orders and time each acknowledgement.
+
+    `submit(order)` returns the executor's result dict. workers > 1 submits in
+    parallel (only for brokers whose client is thread-safe). Orders not yet
+    started `max_delay_sec` after `origin` are skipped (0 = no cap).
+
+    The first order for each symbol goes out in the burst; a later order for the
+    same symbol is only sent (in a follow-up round) once the earlier one came
+    back without status "submitted", otherwise its result is status "duplicate".
+    Results come back in the order of `orders`.
+    """
+    origin = origin or datetime.now(ET)
+    latency = SubmitLatency(origin)
+
+    def run(order: EntryOrder) -> dict:
+        if max_delay_sec > 0 and (datetime.now(ET) - origin).total_seconds() > max_delay_sec:
+            return {"status": "skipped", "symbol": order.symbol, "reason": f"entry window of {max_delay_sec:.0f}s after OR close exceeded"}
+        started = time.perf_counter()
+        try:
+            result = submit(order)
+        except Exception as e:
+            result = {"status": "error", "symbol": order.symbol, "reason": str(e)}
+        latency.record(order.symbol, datetime.now(ET), time.perf_counter() - started, str(result.get("status")))
+        return result
+
+    def run_all(batch: list[EntryOrder]) -> list[dict]:
+        if workers > 1 and len(batch) > 1:
+            with ThreadPoolExecutor(max_workers=min(workers, len(batch))) as pool:
+                return list(pool.map(run, batch))
+        return [run(o) for o in batch]
+
+    fallbacks: dict[str, list[int]] = {}
+    for i, order in enumerate(orders):
+        fallbacks.setdefault(order.symbol, []).append(i)
+    results: list[Optional[dict]] = [None] * len(orders)
+    batch = [indexes.pop(0) for indexes in fallbacks.values()]
+    while batch:
+        retry = []
+        for i, result in zip(batch, run_all([orders[i] for i in batch])):
+            results[i] = result
+            pending = fallbacks[orders[i].symbol]
+            if pending and result.get("status") != "submitted":
+                retry.append(pending.pop(0))
+        batch = retry
+    for i, result in enumerate(results):
+        if result is None:
+            results[i] = {"status": "duplicate", "symbol": orders[i].symbol, "reason": "already submitted for this symbol"}
+
+    summary = latency.summary()
+    logger.info(
+        "Entry burst: %d orders, last ack %.0f ms after OR close (submit p50 %.0f ms, max %.0f ms)",
+        summary["orders"], summary["last_ack_ms"], summary["submit_p50_ms"], summary["submit_max_ms"],
+    )
+    return results, latency
@@ -31,6 +31,7 @@ from alpaca.trading.enums import (
 )
 from core.config import settings, get_strategy_config
 from execution.alpaca_client import get_alpaca_client
+from execution.entry_pipeline import EntryOrder, submit_entries
 
 
 ET = ZoneInfo("America/New_York")
@@ -229,6 +230,27 @@ class OrderExecutor:
                 "symbol": symbol,
             }
     
+    def place_entry_orders(
+        self,
+        orders: list[EntryOrder],
+        origin: Optional[datetime] = None,
+        max_delay_sec: float = 0.0,
+    ) -> dict:
+        """
+        Submit a prepared entry burst (see execution/entry_pipeline.py).
+        
+        Alpaca orders are independent HTTP calls, so they go out in parallel
+        (ENTRY_SUBMIT_WORKERS at a time).
+        """
+        results, latency = submit_entries(
+            orders,
+            lambda o: self.place_entry_order(**o.as_kwargs()),
+            workers=settings.ENTRY_SUBMIT_WORKERS,
+            origin=origin,
+            max_delay_sec=max_delay_sec,
+        )
+        return {"results": results, "latency": latency.summary()}
+    
     def place_stop_loss_order(
         self,
         symbol: str,
@@ -31,8 +31,23 @@ from selenium.common.exceptions import (
 from webdriver_manager.chrome import ChromeDriverManager
 from termcolor import colored
 
+from execution.tradezero.tables import (
+    ACTIVE_ORDERS_HEADERS,
+    ACTIVE_ORDERS_TABLE,
+    INACTIVE_ORDERS_HEADERS,
+    INACTIVE_ORDERS_TABLE,
+    PORTFOLIO_TABLE,
+    TableChangeFeed,
+    has_rows,
+    parse_active_orders,
+    parse_inactive_orders,
+    parse_portfolio,
+    read_table,
+)
+
 # Constants
 DEFAULT_TZ_HOME_URL = 'https://standard.tradezeroweb.us/'
+TABLE_CACHE_MAX_AGE_SEC = 30.0  # if_changed reads still re-read a table at least this often
 
 class Order(Enum):
     BUY = 'buy'
@@ -84,6 +99,8 @@ class TradeZero:
         
         self.driver = webdriver.Chrome(service=service, options=options)
         self.driver.get(self.home_url)
+        self._table_feed: Optional[TableChangeFeed] = None
+        self._table_cache: dict = {}  # table id -> (change feed stamp, read time, DataFrame)
 
         # Debug: when enabled, write DOM/CSS snapshots to repo-root logs/.
         self._debug_dump_dom = (os.getenv("TZ_DEBUG_DUMP", "0").strip().lower() in {"1", "true", "yes"})
@@ -174,6 +191,52 @@ class TradeZero:
         except Exception:
             return False
 
+    def probe_session(self) -> dict:
+        """Cheap liveness check: one script round-trip, no waits.
+
+        `healthy` is True when the page is loaded, the order ticket is present and
+        no login form is showing (i.e. the session has not been logged out).
+        """
+        try:
+            state = self.driver.execute_script(
+                "return {"
+                "ready: document.readyState,"
+                "panel: !!document.getElementById('trading-order-input-symbol'),"
+                "login: !!(document.getElementById('login') || document.querySelector(\"input[type='password']\")),"
+                "url: location.href};"
+            ) or {}
+        except Exception as e:
+            return {"healthy": False, "error": str(e)}
+        state["healthy"] = (
+            str(state.get("ready") or "").lower() == "complete" and bool(state.get("panel")) and not state.get("login")
+        )
+        return state
+
+    def relogin(self, fresh: bool = False) -> bool:
+        """Reload the portal and log in again in the same browser (no new Chrome).
+
+        fresh=True drops the cookies first, forcing a full login + MFA so the new
+        session starts its expiry clock now. Returns True when the session probes healthy.
+        """
+        try:
+            if fresh:
+                self.driver.delete_all_cookies()
+            self.driver.get(self.home_url)
+            self._wait_document_ready(timeout_s=20.0)
+            self._wait_for_any(
+                [
+                    (By.ID, "trading-order-input-symbol"),
+                    (By.ID, "login"),
+                    (By.CSS_SELECTOR, "input[type='password']"),
+                ],
+                timeout_s=30.0,
+            )
+        except Exception as e:
+            print(f"Relogin navigation error: {e}")
+        if not self.probe_session().get("healthy"):
+            self.login()
+        return bool(self.probe_session().get("healthy"))
+
     def _dump_ui_snapshot(self, reason: str) -> None:
         """Write HTML + best-effort CSS + diagnostics for selector debugging.
 
@@ -1142,144 +1205,87 @@ class TradeZero:
             self._dump_ui_snapshot(f"moc_order_error_{symbol}")
             return False
 
-    def get_portfolio(self):
-        """Get current portfolio as DataFrame."""
-        try:
-            # Ensure Portfolio tab is active
-            self._safe_click(By.ID, "portfolio-tab-op-1", retries=1)
-            try:
-                WebDriverWait(self.driver, 6).until(
-                    lambda d: d.find_elements(By.CSS_SELECTOR, "#opTable-1 tbody tr")
-                    or d.find_elements(By.XPATH, '//*[@id="opTable-1"]/tbody/tr/td')
-                )
-            except Exception:
-                time.sleep(0.5)
-            
-            # Check if empty
-            try:
-                empty_msg = self.driver.find_element(By.XPATH, '//*[@id="opTable-1"]/tbody/tr/td').text
-                if "no open positions" in empty_msg.lower():
-                    return pd.DataFrame()
-            except:
-                pass
+    def _read_table(
+        self,
+        table_id: str,
+        header_selector: Optional[str] = None,
+        use_text: bool = True,
+        timeout_s: float = 6.0,
+    ) -> Optional[dict]:
+        """Read a table with one execute_script call, polling (one call per poll) until rows appear."""
+        end = time.time() + timeout_s
+        while True:
+            scrape = read_table(self.driver, table_id, header_selector, use_text)
+            if has_rows(scrape) or time.time() >= end:
+                return scrape
+            time.sleep(0.25)
 
-            table = self.driver.find_element(By.ID, "opTable-1")
-            
-            for _ in range(3): # Retry loop for stale elements
-                try:
-                    rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                    out = []
-                    for r in rows:
-                        tds = r.find_elements(By.CSS_SELECTOR, "td")
-                        if not tds or len(tds) < 3: continue
-                        
-                        # Empty-state row
-                        if "no open positions" in (tds[0].text or "").lower():
-                            return pd.DataFrame()
+    def watch_tables(self) -> TableChangeFeed:
+        """Change feed for the portfolio / order tables (installs a MutationObserver on first use)."""
+        if self._table_feed is None:
+            self._table_feed = TableChangeFeed(self.driver)
+        return self._table_feed
+
+    def _cached_table(self, table_id: str, max_age_sec: float = TABLE_CACHE_MAX_AGE_SEC) -> Optional[pd.DataFrame]:
+        """The last read of `table_id` if the change feed saw no mutation since (and it is not too old)."""
+        cached = self._table_cache.get(table_id)
+        feed = self.watch_tables()
+        if cached is None:
+            feed.stamps()  # make sure the observer is installed before the first read
+            return None
+        stamp, read_at, df = cached
+        if time.time() - read_at > max_age_sec or not feed.unchanged(table_id, stamp):
+            return None
+        return df.copy()
 
-                        def _safe_float(txt):
-                            try:
-                                return float(txt.replace(",", "").replace("$", "").strip())
-                            except:
-                                return 0.0
+    def _remember_table(self, table_id: str, scrape: Optional[dict], df: Optional[pd.DataFrame]) -> None:
+        stamp = (scrape or {}).get("stamp")
+        if df is None or stamp is None:
+            self._table_cache.pop(table_id, None)
+        else:
+            self._table_cache[table_id] = (stamp, time.time(), df.copy())
 
-                        symbol = (tds[0].text or "").strip().upper()
-                        if not symbol: continue
+    def get_portfolio(self, if_changed: bool = False, max_age_sec: float = TABLE_CACHE_MAX_AGE_SEC):
+        """Get current portfolio as DataFrame.
 
-                        qty = _safe_float(tds[2].text)
-                        
-                        # FILTER: Only include actual open positions
-                        if qty <= 0: continue
-
-                        last_price = _safe_float(tds[3].text) if len(tds) >= 4 else 0.0
-                        avg_price = _safe_float(tds[4].text) if len(tds) >= 5 else 0.0
-                        pnl_dollar = _safe_float(tds[6].text) if len(tds) >= 7 else 0.0
-
-                        out.append({
-                            "symbol": symbol, 
-                            "qty": qty, 
-                            "last_price": last_price,
-                            "avg_price": avg_price,
-                            "unrealized_pnl": pnl_dollar
-                        })
-                    return pd.DataFrame(out)
-                except Exception:
-                    time.sleep(1)
-                    table = self.driver.find_element(By.ID, "opTable-1")
-            
-            return pd.DataFrame() # Fallback
+        if_changed=True returns the previous result without touching the tab when the
+        table has not changed since (see watch_tables) and was read at most
+        `max_age_sec` ago. A hidden tab may not re-render, so its observer can miss
+        changes: callers that must see fills promptly pass their poll interval.
+        """
+        try:
+            if if_changed:
+                cached = self._cached_table(PORTFOLIO_TABLE, max_age_sec)
+                if cached is not None:
+                    return cached
+
+            # Ensure Portfolio tab is active
+            self._safe_click(By.ID, "portfolio-tab-op-1", retries=1)
+            scrape = self._read_table(PORTFOLIO_TABLE)
+            df = pd.DataFrame(parse_portfolio(scrape)) if scrape is not None else None
+            if if_changed:
+                self._remember_table(PORTFOLIO_TABLE, scrape, df)
+            return df
         except Exception as e:
             print(f"Error reading portfolio: {e}")
             return None
 
-    def get_active_orders(self):
-        """Get active orders as DataFrame."""
+    def get_active_orders(self, if_changed: bool = False, max_age_sec: float = TABLE_CACHE_MAX_AGE_SEC):
+        """Get active orders as DataFrame (if_changed / max_age_sec: see get_portfolio)."""
         try:
+            if if_changed:
+                cached = self._cached_table(ACTIVE_ORDERS_TABLE, max_age_sec)
+                if cached is not None:
+                    return cached
+
             # Click Active Orders tab
             self._safe_click(By.ID, "portfolio-tab-ao-1", retries=1)
-            # Give the table time to populate; headless mode can be slower.
-            try:
-                WebDriverWait(self.driver, 6).until(
-                    lambda d: d.find_elements(By.XPATH, '//*[@id="aoTable-1"]/tbody/tr[@order-id]')
-                    or d.find_elements(By.XPATH, '//*[@id="aoTable-1"]/tbody/tr/td')
-                )
-            except Exception:
-                time.sleep(0.5)
-            
-            # Check if empty
-            orders = self.driver.find_elements(By.XPATH, '//*[@id="aoTable-1"]/tbody/tr[@order-id]')
-            if not orders:
-                return pd.DataFrame()
-
-            table = self.driver.find_element(By.ID, "aoTable-1")
-
             # Header cells live in the sibling header table within the tab container.
-            headers: list[str] = []
-            try:
-                header_cells = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "#portfolio-content-tab-ao-1 table.table-1 thead tr th",
-                )
-                headers = [((h.get_attribute("textContent") or "").strip() or f"col_{i}") for i, h in enumerate(header_cells)]
-            except Exception:
-                headers = []
-
-            for _ in range(3): # Retry loop
-                try:
-                    rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-                    out = []
-                    for r in rows:
-                        order_id = (r.get_attribute("order-id") or "").strip()
-                        tds = r.find_elements(By.CSS_SELECTOR, "td")
-                        if not tds or len(tds) == 1: continue
-
-                        cell_texts = [((td.get_attribute("textContent") or "").strip()) for td in tds]
-
-                        row_dict = {}
-                        if headers and len(headers) == len(cell_texts):
-                            row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
-                        
-                        symbol = (tds[2].get_attribute("textContent") or "").strip().upper() if len(tds) >= 3 else ""
-                        
-                        qty_txt = (tds[4].get_attribute("textContent") or "").replace(",", "").strip() if len(tds) >= 5 else "0"
-                        try:
-                            qty = float(qty_txt)
-                        except:
-                            qty = 0.0
-
-                        # Always include stable fields.
-                        row_dict.update({"ref_number": order_id, "symbol": symbol, "qty": qty})
-                        # Explicitly map side for the bot
-                        side_key = next((k for k in row_dict.keys() if 'side' in k.lower()), "side")
-                        row_dict['side'] = row_dict.get(side_key, "")
-                        
-                        out.append(row_dict)
-                    return pd.DataFrame(out)
-                except Exception:
-                    time.sleep(1)
-                    table = self.driver.find_element(By.ID, "aoTable-1")
-            
-            return pd.DataFrame()
+            scrape = self._read_table(ACTIVE_ORDERS_TABLE, ACTIVE_ORDERS_HEADERS, use_text=False)
+            df = pd.DataFrame(parse_active_orders(scrape))
+            if if_changed:
+                self._remember_table(ACTIVE_ORDERS_TABLE, scrape, df)
+            return df
         except Exception as e:
             print(f"Error reading active orders: {e}")
             return None
@@ -1288,76 +1294,8 @@ class TradeZero:
         """Get inactive orders (filled/cancelled/rejected) as DataFrame."""
         try:
             self._safe_click(By.ID, "portfolio-tab-io-1", retries=1)
-            try:
-                WebDriverWait(self.driver, 6).until(
-                    lambda d: d.find_elements(By.XPATH, '//*[@id="ioTable-1"]/tbody/tr')
-                    or d.find_elements(By.XPATH, '//*[@id="ioTable-1"]/tbody/tr/td')
-                )
-            except Exception:
-                time.sleep(0.5)
-
-            rows_any = self.driver.find_elements(By.XPATH, '//*[@id="ioTable-1"]/tbody/tr')
-            if not rows_any:
-                return pd.DataFrame()
-
-            table = self.driver.find_element(By.ID, "ioTable-1")
-
-            headers: list[str] = []
-            try:
-                header_cells = self.driver.find_elements(
-                    By.CSS_SELECTOR,
-                    "#portfolio-content-tab-io-1 table.table-1 thead tr th",
-                )
-                headers = [((h.text or "").strip() or f"col_{i}") for i, h in enumerate(header_cells)]
-            except Exception:
-                headers = []
-
-            rows = table.find_elements(By.CSS_SELECTOR, "tbody tr")
-
-            out: list[dict] = []
-            for r in rows:
-                order_id = (r.get_attribute("order-id") or "").strip()
-                tds = r.find_elements(By.CSS_SELECTOR, "td")
-                if not tds:
-                    continue
-
-                # Empty-state row (single message cell)
-                if len(tds) == 1:
-                    msg = (tds[0].text or "").strip().lower()
-                    if msg:
-                        # Most likely an empty-state message.
-                        return pd.DataFrame()
-                    continue
-
-                cell_texts = [((td.text or "").strip()) for td in tds]
-
-                row_dict: dict[str, str] = {}
-                if headers and len(headers) == len(cell_texts):
-                    row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
-                elif headers and len(headers) < len(cell_texts):
-                    row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
-                    for j in range(len(headers), len(cell_texts)):
-                        row_dict[f"col_{j}"] = cell_texts[j]
-                else:
-                    row_dict = {f"col_{i}": cell_texts[i] for i in range(len(cell_texts))}
-
-                symbol = ""
-                if len(tds) >= 3:
-                    symbol = (tds[2].text or "").strip().upper()
-
-                qty_txt = ""
-                if len(tds) >= 5:
-                    qty_txt = tds[4].text or ""
-                qty_txt = qty_txt.replace(",", "").strip()
-                try:
-                    qty = float(qty_txt)
-                except Exception:
-                    qty = 0.0
-
-                row_dict.update({"ref_number": order_id, "symbol": symbol, "qty": qty})
-                out.append(row_dict)
-
-            return pd.DataFrame(out)
+            scrape = self._read_table(INACTIVE_ORDERS_TABLE, INACTIVE_ORDERS_HEADERS)
+            return pd.DataFrame(parse_inactive_orders(scrape))
         except Exception as e:
             print(f"Error reading inactive orders: {e}")
             return None
@@ -9,6 +9,8 @@ from typing import Optional
 
 from core.config import settings
 from execution.tradezero.client import TradeZero, Order, TIF
+from execution.tradezero.session_pool import TradeZeroSession, get_session_pool
+from execution.entry_pipeline import EntryOrder, submit_entries
 from services.signal_engine import update_signal_status
 from db.models import OrderStatus
 from state.duckdb_store import DuckDBStateStore
@@ -45,9 +47,17 @@ class TradeZeroExecutor:
         # without Selenium login/credentials. We only require credentials when we intend
         # to place real orders.
         self.client: Optional[TradeZero] = None
+        self._session: Optional[TradeZeroSession] = None
 
     def _get_client(self) -> TradeZero:
-        if self.client is not None:
+        """The executor's session, leased from the warm pool and kept for its lifetime.
+
+        Each call probes the held session when a health check is due; a dead or
+        expiring session is swapped for a warm spare (see session_pool.ensure_fresh).
+        """
+        if self._session is not None:
+            self._session = get_session_pool().ensure_fresh(self._session)
+            self.client = self._session.client
             return self.client
 
         has_creds = bool(settings.TRADEZERO_USERNAME and settings.TRADEZERO_PASSWORD)
@@ -56,15 +66,24 @@ class TradeZeroExecutor:
                 "TradeZero credentials missing. Set TRADEZERO_USERNAME and TRADEZERO_PASSWORD in .env"
             )
 
-        self.client = TradeZero(
-            user_name=settings.TRADEZERO_USERNAME,
-            password=settings.TRADEZERO_PASSWORD,
-            headless=bool(settings.TRADEZERO_HEADLESS),
-            home_url=getattr(settings, "TRADEZERO_HOME_URL", None),
-            mfa_secret=getattr(settings, "TRADEZERO_MFA_SECRET", None),
-        )
+        self._session = get_session_pool().acquire()
+        self.client = self._session.client
         return self.client
 
+    def refresh_session(self, horizon_sec: float = 0.0) -> dict:
+        """Make sure the held session is healthy and will not hit its max age within `horizon_sec`.
+
+        Run ahead of the trading window (pre-market check) so any re-login happens then,
+        not during the entry burst.
+        """
+        if self.dry_run:
+            return {"status": "skipped", "dry_run": True}
+        self._get_client()
+        if horizon_sec > 0:
+            self._session = get_session_pool().ensure_fresh(self._session, horizon_sec=horizon_sec)
+            self.client = self._session.client
+        return {"status": "ready", "session": self._session.as_dict()}
+
     def _activate_kill_switch(self, reason: str) -> None:
         logger.error("Activating kill switch: %s", reason)
         if not self.activate_kill_switch():
@@ -85,30 +104,53 @@ class TradeZeroExecutor:
         Safety: If a position exists but we cannot place a stop, we activate the kill
         switch and flatten positions.
         """
+        return self._try_place_protective_stops_after_entries(
+            [(symbol, entry_side, quantity, stop_price, signal_id)],
+            max_wait_seconds=max_wait_seconds,
+            poll_interval_seconds=poll_interval_seconds,
+        )
+
+    def _try_place_protective_stops_after_entries(
+        self,
+        entries: list[tuple],
+        max_wait_seconds: float = 60.0,
+        poll_interval_seconds: float = 1.0,
+    ) -> bool:
+        """Same as above for several entries (symbol, entry_side, quantity, stop_price, signal_id)
+        sharing one wait window: positions are polled once per interval for all of them.
+        """
         if self.dry_run:
             return True
-        client = self._get_client()
 
         deadline = time.time() + max_wait_seconds
-        position = None
-        while time.time() < deadline:
+        pending = {str(e[0]).upper(): e for e in entries}
+        while pending and time.time() < deadline:
             try:
-                positions = self.get_positions()
-                for p in positions:
-                    if p["symbol"].upper() == symbol.upper() and p["qty"] != 0:
-                        position = p
-                        break
+                held = {p["symbol"].upper() for p in self.get_positions() if p["qty"] != 0}
             except Exception:
-                position = None
+                held = set()
 
-            if position is not None:
-                break
-            time.sleep(poll_interval_seconds)
+            for key in [k for k in pending if k in held]:
+                symbol, entry_side, quantity, stop_price, signal_id = pending.pop(key)
+                if not self._place_protective_stop(symbol, entry_side, quantity, stop_price, signal_id):
+                    return False
 
-        if position is None:
-            # Not filled yet (or positions not readable). We'll rely on later safety checks / EOD flatten.
-            return True
+            if pending:
+                time.sleep(poll_interval_seconds)
+
+        # Entries still pending are not filled yet (or positions not readable).
+        # We'll rely on later safety checks / EOD flatten.
+        return True
 
+    def _place_protective_stop(
+        self,
+        symbol: str,
+        entry_side: str,
+        quantity: int,
+        stop_price: float,
+        signal_id: Optional[int] = None,
+    ) -> bool:
+        client = self._get_client()
         try:
             entry_side_norm = entry_side.lower().strip()
             if entry_side_norm in {"buy", "long"}:
@@ -137,9 +179,10 @@ class TradeZeroExecutor:
             return False
 
     def __del__(self):
+        # Hand the session back to the pool (still logged in) instead of quitting Chrome
         try:
-            if self.client is not None:
-                self.client.exit()
+            if self._session is not None:
+                get_session_pool().release(self._session)
         except Exception:
             pass
 
@@ -305,7 +348,12 @@ class TradeZeroExecutor:
         entry_price: float,
         stop_price: float,
         signal_id: Optional[int] = None,
+        protect: bool = True,
     ) -> dict:
+        """Submit one STOP entry. protect=True then waits (up to 60 s) for the fill and
+        attaches the protective stop; place_entry_orders passes False and protects the
+        whole burst afterwards.
+        """
         if self.is_kill_switch_active():
             if signal_id:
                 update_signal_status(
@@ -418,13 +466,14 @@ class TradeZeroExecutor:
                     status=OrderStatus.PENDING,
                     order_id=f"TZ:{symbol}:{datetime.now().isoformat()}",
                 )
-            self._try_place_protective_stop_after_entry(
-                symbol=symbol,
-                entry_side=side_norm,
-                quantity=shares,
-                stop_price=float(stop_price),
-                signal_id=signal_id,
-            )
+            if protect:
+                self._try_place_protective_stop_after_entry(
+                    symbol=symbol,
+                    entry_side=side_norm,
+                    quantity=shares,
+                    stop_price=float(stop_price),
+                    signal_id=signal_id,
+                )
         else:
             if signal_id:
                 update_signal_status(
@@ -443,6 +492,34 @@ class TradeZeroExecutor:
             reason=None if ok else "TradeZero stop entry order failed",
         ).__dict__
 
+    def place_entry_orders(
+        self,
+        orders: list[EntryOrder],
+        origin: Optional[datetime] = None,
+        max_delay_sec: float = 0.0,
+    ) -> dict:
+        """Submit a prepared entry burst (see execution/entry_pipeline.py).
+
+        All entries go out back to back in the one browser tab, then protective stops
+        are attached to whichever entries fill within a single shared wait window
+        (instead of waiting up to 60 s for each fill before submitting the next entry).
+        """
+        results, latency = submit_entries(
+            orders,
+            lambda o: self.place_entry_order(**o.as_kwargs(), protect=False),
+            workers=1,  # one Selenium session: UI automation must stay sequential
+            origin=origin,
+            max_delay_sec=max_delay_sec,
+        )
+        submitted = [
+            (o.symbol, o.side, o.shares, o.stop_price, o.signal_id)
+            for o, r in zip(orders, results)
+            if r.get("status") == "submitted"
+        ]
+        if submitted:
+            self._try_place_protective_stops_after_entries(submitted)
+        return {"results": results, "latency": latency.summary()}
+
     def ensure_protective_stops(self) -> dict:
         """Ensure any filled positions have a protective stop submitted.
 
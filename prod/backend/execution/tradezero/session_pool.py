@@ -0,0 +1,361 @@
+"""
+Warm TradeZero session pool.
+
+Starting a TradeZero client launches Chrome, logs in (with MFA) and waits for
+the trading panel: tens of seconds, and it used to happen on first use, i.e.
+right when an order had to go out. The pool keeps logged-in sessions warm
+instead and hands them out through a lease:
+
+    from execution.tradezero.session_pool import get_session_pool
+
+    pool = get_session_pool()
+    pool.start()                      # warm up + keep warm in the background
+
+    with pool.lease() as tz:          # a logged-in TradeZero client
+        tz.get_portfolio()
+
+A background thread checks idle sessions every TRADEZERO_HEALTH_CHECK_SEC with
+a single execute_script probe (TradeZero.probe_session), logs dead sessions
+back in inside the same browser, and re-logs sessions in with a fresh login
+once they are TRADEZERO_SESSION_MAX_AGE_MIN old, before the portal expires
+them. Long-held leases (the executor on the broker worker keeps one) are
+probed on use through `ensure_fresh`, which swaps in a warm spare when the
+held session is dead or due for re-login.
+
+Selenium drivers are not thread-safe: a session is only ever touched by its
+lease holder or, while idle, by the maintenance thread.
+"""
+import atexit
+import itertools
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, Optional
+
+from core.config import settings
+from execution.tradezero.client import TradeZero
+
+logger = logging.getLogger(__name__)
+
+_session_ids = itertools.count(1)
+
+# A horizon longer than a session can live is clamped so that a session logged in
+# within this long still satisfies it (otherwise every call would re-login again)
+FRESH_LOGIN_SLACK_SEC = 300.0
+
+
+@dataclass
+class TradeZeroSession:
+    """One logged-in client plus the bookkeeping the pool needs."""
+    client: TradeZero
+    id: int = field(default_factory=lambda: next(_session_ids))
+    logged_in_at: float = field(default_factory=time.monotonic)
+    last_checked: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    relogins: int = 0
+    leased: bool = False
+    busy: bool = False  # being checked / re-logged in by the maintenance thread
+
+    def age_sec(self) -> float:
+        return time.monotonic() - self.logged_in_at
+
+    def as_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "age_min": round(self.age_sec() / 60, 1),
+            "checked_sec_ago": round(time.monotonic() - self.last_checked, 1),
+            "leases": self.leases,
+            "relogins": self.relogins,
+            "leased": self.leased,
+            "busy": self.busy,
+        }
+
+
+def _default_factory() -> TradeZero:
+    if not (settings.TRADEZERO_USERNAME and settings.TRADEZERO_PASSWORD):
+        raise ValueError(
+            "TradeZero credentials missing. Set TRADEZERO_USERNAME and TRADEZERO_PASSWORD in .env"
+        )
+    return TradeZero(
+        user_name=settings.TRADEZERO_USERNAME,
+        password=settings.TRADEZERO_PASSWORD,
+        headless=bool(settings.TRADEZERO_HEADLESS),
+        home_url=getattr(settings, "TRADEZERO_HOME_URL", None),
+        mfa_secret=getattr(settings, "TRADEZERO_MFA_SECRET", None),
+    )
+
+
+class TradeZeroSessionPool:
+    """Keeps up to `size` logged-in TradeZero sessions warm and leases them out."""
+
+    def __init__(
+        self,
+        factory: Callable[[], TradeZero] = _default_factory,
+        size: Optional[int] = None,
+        max_age_sec: Optional[float] = None,
+        check_interval_sec: Optional[float] = None,
+    ):
+        self.factory = factory
+        self.size = max(1, int(size if size is not None else settings.TRADEZERO_POOL_SIZE))
+        self.max_age_sec = float(
+            max_age_sec if max_age_sec is not None else settings.TRADEZERO_SESSION_MAX_AGE_MIN * 60
+        )
+        self.check_interval_sec = float(
+            check_interval_sec if check_interval_sec is not None else settings.TRADEZERO_HEALTH_CHECK_SEC
+        )
+        self._sessions: list[TradeZeroSession] = []
+        self._starting = 0  # sessions being created outside the lock
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cold_starts = 0
+        self._cold_start_sec = 0.0
+
+    # ------------------------------------------------------------------ lifecycle
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Warm the pool and keep it warm from a daemon thread (returns immediately)."""
+        with self._cond:
+            if self.running:
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._maintain, name="tradezero-pool", daemon=True)
+            self._thread.start()
+        logger.info("TradeZero session pool started (size=%d)", self.size)
+
+    def warm(self) -> int:
+        """Create sessions until the pool is full (blocking); returns the number created."""
+        created = 0
+        while self._reserve_slot():
+            if self._create() is None:
+                break
+            created += 1
+        return created
+
+    def close(self):
+        """Stop the maintenance thread and quit every browser."""
+        self._stop.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5.0)
+        with self._cond:
+            sessions, self._sessions = self._sessions, []
+            self._cond.notify_all()
+        for s in sessions:
+            self._quit(s)
+        if sessions:
+            logger.info("TradeZero session pool closed (%d sessions)", len(sessions))
+
+    # ------------------------------------------------------------------ leasing
+
+    def acquire(self, timeout: Optional[float] = None) -> TradeZeroSession:
+        """
+        Take a warm session (probed first if it has not been checked recently).
+
+        Creates one inline only when the pool has no idle session, none starting
+        and room to grow (a cold start); otherwise waits up to `timeout` for a
+        release or a start to finish.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._cond:
+                session = self._take_idle()
+                # A session already starting will be ready sooner than a second cold start
+                grow = session is None and not self._starting and self._reserve_slot_locked()
+                if session is None and not grow:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No TradeZero session free within {timeout:.1f}s")
+                    self._cond.wait(remaining)
+                    continue
+            if grow:
+                session = self._create(leased=True)
+                if session is None:
+                    raise RuntimeError("TradeZero session could not be started")
+                return session
+            if self._check_due(session) and not self._check(session):
+                self._recover(session)
+                if session not in self._sessions:
+                    continue
+            return session
+
+    def release(self, session: TradeZeroSession):
+        with self._cond:
+            session.leased = False
+            self._cond.notify_all()
+
+    @contextmanager
+    def lease(self, timeout: Optional[float] = None) -> Iterator[TradeZero]:
+        """`with pool.lease() as tz:` - a logged-in client for the duration of the block."""
+        session = self.acquire(timeout)
+        try:
+            yield session.client
+        except Exception:
+            # A failing caller may have left the page broken: check before anyone else gets it
+            session.last_checked = 0.0
+            raise
+        finally:
+            self.release(session)
+
+    def ensure_fresh(self, session: TradeZeroSession, horizon_sec: float = 0.0) -> TradeZeroSession:
+        """
+        For long-held leases: probe `session` when due and, if it is dead or would
+        reach the max age within `horizon_sec`, hand it back for background repair
+        and return a warm spare that lasts the horizon (or repair it inline when
+        there is no such spare).
+        """
+        horizon_sec = min(horizon_sec, max(0.0, self.max_age_sec - FRESH_LOGIN_SLACK_SEC))
+
+        def lasts(s: TradeZeroSession) -> bool:
+            return s.age_sec() + horizon_sec < self.max_age_sec
+
+        due_relogin = not lasts(session)
+        if not due_relogin and (not self._check_due(session) or self._check(session)):
+            return session
+        with self._cond:
+            spare = self._take_idle(lasts)
+            if spare is not None:
+                session.leased = False
+                if not due_relogin:
+                    session.last_checked = 0.0
+                self._cond.notify_all()
+        if spare is not None:
+            logger.info(
+                "TradeZero session %d %s; switching to warm session %d",
+                session.id, "due for re-login" if due_relogin else "unhealthy", spare.id,
+            )
+            return spare
+        self._recover(session, fresh=due_relogin)
+        if session in self._sessions:
+            return session
+        return self.acquire()
+
+    def stats(self) -> dict:
+        with self._cond:
+            sessions = [s.as_dict() for s in self._sessions]
+        return {
+            "running": self.running,
+            "size": self.size,
+            "sessions": sessions,
+            "cold_starts": self._cold_starts,
+            "avg_cold_start_sec": round(self._cold_start_sec / self._cold_starts, 1) if self._cold_starts else 0.0,
+        }
+
+    # ------------------------------------------------------------------ internals
+
+    def _take_idle(self, accept: Optional[Callable[[TradeZeroSession], bool]] = None) -> Optional[TradeZeroSession]:
+        # Oldest-checked last: prefer sessions the maintenance thread has just verified
+        idle = [s for s in self._sessions if not s.leased and not s.busy and (accept is None or accept(s))]
+        if not idle:
+            return None
+        session = max(idle, key=lambda s: s.last_checked)
+        session.leased = True
+        session.leases += 1
+        return session
+
+    def _reserve_slot_locked(self) -> bool:
+        if len(self._sessions) + self._starting >= self.size:
+            return False
+        self._starting += 1
+        return True
+
+    def _reserve_slot(self) -> bool:
+        with self._cond:
+            return self._reserve_slot_locked()
+
+    def _create(self, leased: bool = False) -> Optional[TradeZeroSession]:
+        """Cold start one session into a reserved slot."""
+        started = time.perf_counter()
+        try:
+            client = self.factory()
+        except Exception as e:
+            logger.error("TradeZero session start failed: %s", e)
+            client = None
+        took = time.perf_counter() - started
+        with self._cond:
+            self._starting -= 1
+            session = None
+            if client is not None:
+                session = TradeZeroSession(client, leased=leased, leases=int(leased))
+                self._sessions.append(session)
+                self._cold_starts += 1
+                self._cold_start_sec += took
+            self._cond.notify_all()
+        if session is not None:
+            logger.info("TradeZero session %d started in %.1fs", session.id, took)
+            if not self._check(session):
+                logger.warning("TradeZero session %d not healthy after start", session.id)
+        return session
+
+    def _check_due(self, session: TradeZeroSession) -> bool:
+        return time.monotonic() - session.last_checked >= self.check_interval_sec
+
+    def _check(self, session: TradeZeroSession) -> bool:
+        probe = session.client.probe_session()
+        session.last_checked = time.monotonic()
+        if not probe.get("healthy"):
+            logger.warning("TradeZero session %d failed health probe: %s", session.id, probe)
+        return bool(probe.get("healthy"))
+
+    def _recover(self, session: TradeZeroSession, fresh: bool = False):
+        """Log `session` back in inside its browser; drop it if that fails."""
+        if session.client.relogin(fresh=fresh):
+            session.relogins += 1
+            session.last_checked = time.monotonic()
+            if fresh:
+                session.logged_in_at = time.monotonic()
+            logger.info("TradeZero session %d re-logged in%s", session.id, " (fresh)" if fresh else "")
+            return
+        logger.error("TradeZero session %d could not be re-logged in; discarding it", session.id)
+        with self._cond:
+            if session in self._sessions:
+                self._sessions.remove(session)
+            self._cond.notify_all()
+        self._quit(session)
+
+    def _quit(self, session: TradeZeroSession):
+        try:
+            session.client.exit()
+        except Exception:
+            pass
+
+    def _maintain(self):
+        while not self._stop.is_set():
+            self.warm()
+            with self._cond:
+                candidates = [s for s in self._sessions if not s.leased and not s.busy]
+                for s in candidates:
+                    s.busy = True
+            try:
+                for s in candidates:
+                    if self._stop.is_set():
+                        break
+                    if s.age_sec() >= self.max_age_sec:
+                        self._recover(s, fresh=True)
+                    elif self._check_due(s) and not self._check(s):
+                        self._recover(s)
+            finally:
+                with self._cond:
+                    for s in candidates:
+                        s.busy = False
+                    self._cond.notify_all()
+            self._stop.wait(min(self.check_interval_sec, 30.0))
+
+
+# Process-wide pool (started with the API, or lazily on first lease)
+_pool: Optional[TradeZeroSessionPool] = None
+
+
+def get_session_pool() -> TradeZeroSessionPool:
+    """Get or create the TradeZero session pool singleton."""
+    global _pool
+    if _pool is None:
+        _pool = TradeZeroSessionPool()
+        atexit.register(_pool.close)  # quit the browsers when a script exits
+    return _pool
@@ -0,0 +1,194 @@
+"""
+Single round-trip extraction of the TradeZero portfolio / order tables.
+
+Reading a table through WebDriver elements costs one round-trip per
+find_elements call and per cell text (hundreds per table, more when a stale
+row forces a retry). Here each table is read by one execute_script call that
+returns plain JSON:
+
+    {"headers": ["Time", "Side", ...], "rows": [{"order_id": "123", "cells": ["09:35:01", ...]}, ...]}
+
+and the parse_* functions turn that into the rows TradeZero.get_portfolio /
+get_active_orders / get_inactive_orders have always returned. This module has
+no Selenium import so the parsing can be tested offline.
+
+TableChangeFeed installs a MutationObserver that bumps a per-table version
+whenever a watched table's DOM changes, so callers can skip re-reading tables
+that have not changed (one round-trip for all versions).
+"""
+from typing import Any, Optional
+
+# Table ids and their header rows (headers live in a sibling table of the tab container)
+PORTFOLIO_TABLE = "opTable-1"
+ACTIVE_ORDERS_TABLE = "aoTable-1"
+INACTIVE_ORDERS_TABLE = "ioTable-1"
+ACTIVE_ORDERS_HEADERS = "#portfolio-content-tab-ao-1 table.table-1 thead tr th"
+INACTIVE_ORDERS_HEADERS = "#portfolio-content-tab-io-1 table.table-1 thead tr th"
+
+# arguments: table id, header selector (or null), use innerText (Selenium's .text) instead of textContent.
+# `stamp` is the change feed's [observer token, table version] at read time (null when not watching).
+READ_TABLE_JS = """
+const [tableId, headerSel, useText] = arguments;
+const table = document.getElementById(tableId);
+if (!table) return null;
+const cell = el => ((useText ? el.innerText : el.textContent) || '').trim();
+const headers = headerSel ? Array.from(document.querySelectorAll(headerSel), (h, i) => cell(h) || ('col_' + i)) : [];
+const rows = Array.from(table.querySelectorAll('tbody tr'), tr => ({
+    order_id: (tr.getAttribute('order-id') || '').trim(),
+    cells: Array.from(tr.querySelectorAll('td'), cell),
+}));
+const feed = window.__tzTables;
+const stamp = feed && tableId in feed.versions ? [feed.token, feed.versions[tableId]] : null;
+return {headers: headers, rows: rows, stamp: stamp};
+"""
+
+# arguments: table ids to watch. Returns the stamps {table id: [token, version]}; safe to call repeatedly.
+WATCH_TABLES_JS = """
+const ids = arguments[0];
+if (!window.__tzTables) {
+    const state = {token: Date.now() + ':' + Math.random(), versions: {}};
+    const touches = (el, m) => el.contains(m.target)
+        || Array.from(m.addedNodes).concat(Array.from(m.removedNodes)).some(n => n === el || (n.contains && n.contains(el)));
+    state.observer = new MutationObserver(mutations => {
+        for (const id of Object.keys(state.versions)) {
+            const el = document.getElementById(id);
+            if (el && mutations.some(m => touches(el, m))) state.versions[id] += 1;
+        }
+    });
+    state.observer.observe(document.body, {
+        childList: true, subtree: true, characterData: true, attributes: true, attributeFilter: ['order-id'],
+    });
+    window.__tzTables = state;
+}
+const state = window.__tzTables;
+for (const id of ids) if (!(id in state.versions)) state.versions[id] = 0;
+return Object.fromEntries(Object.entries(state.versions).map(([id, v]) => [id, [state.token, v]]));
+"""
+
+def read_table(driver, table_id: str, header_selector: Optional[str] = None, use_text: bool = True) -> Optional[dict]:
+    """One execute_script round-trip; None when the table is not in the DOM."""
+    return driver.execute_script(READ_TABLE_JS, table_id, header_selector, use_text)
+
+
+def _safe_float(txt: str) -> float:
+    try:
+        return float(str(txt).replace(",", "").replace("$", "").strip())
+    except Exception:
+        return 0.0
+
+
+def _qty(txt: str) -> float:
+    try:
+        return float(str(txt).replace(",", "").strip())
+    except Exception:
+        return 0.0
+
+
+def has_rows(scrape: Optional[dict], with_order_id: bool = False) -> bool:
+    """True when the scrape has any body row (with an order-id attribute, if asked)."""
+    rows = (scrape or {}).get("rows") or []
+    return any(r.get("order_id") for r in rows) if with_order_id else bool(rows)
+
+
+def parse_portfolio(scrape: Optional[dict]) -> list[dict]:
+    """Open positions (qty > 0) as {symbol, qty, last_price, avg_price, unrealized_pnl}."""
+    rows = (scrape or {}).get("rows") or []
+    first = rows[0].get("cells") if rows else None
+    if first and "no open positions" in first[0].lower():
+        return []
+    out: list[dict] = []
+    for row in rows:
+        tds = row.get("cells") or []
+        if len(tds) < 3:
+            continue
+        # Empty-state row
+        if "no open positions" in tds[0].lower():
+            return []
+        symbol = tds[0].strip().upper()
+        if not symbol:
+            continue
+        qty = _safe_float(tds[2])
+        # Only include actual open positions
+        if qty <= 0:
+            continue
+        out.append({
+            "symbol": symbol,
+            "qty": qty,
+            "last_price": _safe_float(tds[3]) if len(tds) >= 4 else 0.0,
+            "avg_price": _safe_float(tds[4]) if len(tds) >= 5 else 0.0,
+            "unrealized_pnl": _safe_float(tds[6]) if len(tds) >= 7 else 0.0,
+        })
+    return out
+
+
+def _order_row(headers: list[str], row: dict, extra_columns: bool) -> dict[str, Any]:
+    cells = row.get("cells") or []
+    if headers and len(headers) == len(cells):
+        row_dict: dict[str, Any] = dict(zip(headers, cells))
+    elif extra_columns and headers and len(headers) < len(cells):
+        row_dict = dict(zip(headers, cells))
+        row_dict.update({f"col_{j}": cells[j] for j in range(len(headers), len(cells))})
+    elif extra_columns:
+        row_dict = {f"col_{i}": c for i, c in enumerate(cells)}
+    else:
+        row_dict = {}
+
+    symbol = cells[2].strip().upper() if len(cells) >= 3 else ""
+    qty = _qty(cells[4]) if len(cells) >= 5 else 0.0
+    row_dict.update({"ref_number": row.get("order_id") or "", "symbol": symbol, "qty": qty})
+    return row_dict
+
+
+def parse_active_orders(scrape: Optional[dict]) -> list[dict]:
+    """Working orders keyed by header, plus ref_number / symbol / qty / side."""
+    if not has_rows(scrape, with_order_id=True):
+        return []
+    headers = scrape.get("headers") or []
+    out: list[dict] = []
+    for row in scrape["rows"]:
+        if len(row.get("cells") or []) <= 1:
+            continue
+        row_dict = _order_row(headers, row, extra_columns=False)
+        # Explicitly map side for the bot
+        side_key = next((k for k in row_dict.keys() if "side" in k.lower()), "side")
+        row_dict["side"] = row_dict.get(side_key, "")
+        out.append(row_dict)
+    return out
+
+
+def parse_inactive_orders(scrape: Optional[dict]) -> list[dict]:
+    """Filled / cancelled / rejected orders keyed by header, plus ref_number / symbol / qty."""
+    headers = (scrape or {}).get("headers") or []
+    out: list[dict] = []
+    for row in (scrape or {}).get("rows") or []:
+        cells = row.get("cells") or []
+        if not cells:
+            continue
+        # Empty-state row (single message cell)
+        if len(cells) == 1:
+            if cells[0].strip():
+                return []
+            continue
+        out.append(_order_row(headers, row, extra_columns=True))
+    return out
+
+
+class TableChangeFeed:
+    """
+    Per-table DOM change counters kept by a MutationObserver in the page.
+
+    stamps() returns {table id: [observer token, version]} in one round-trip
+    (installing the observer when the page has none, e.g. after a reload, which
+    yields a new token). A table is unchanged since a read_table() call when its
+    stamp equals the scrape's "stamp".
+    """
+
+    def __init__(self, driver, table_ids: tuple = (PORTFOLIO_TABLE, ACTIVE_ORDERS_TABLE, INACTIVE_ORDERS_TABLE)):
+        self.driver = driver
+        self.table_ids = list(table_ids)
+
+    def stamps(self) -> dict:
+        return self.driver.execute_script(WATCH_TABLES_JS, self.table_ids) or {}
+
+    def unchanged(self, table_id: str, stamp) -> bool:
+        return stamp is not None and list(self.stamps().get(table_id) or []) == list(stamp)
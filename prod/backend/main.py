@@ -22,6 +22,8 @@ from api.routes import positions, account, trades, signals, metrics, system, exe
 from api.websocket import router as ws_router
 from core.config import settings
 from services.scheduler import start_scheduler, stop_scheduler
+from execution.broker_worker import get_broker_worker
+from state.duckdb_store import close_shared_connections
 
 # Configure logging
 log_dir = Path(__file__).parent / "logs"
@@ -59,6 +61,18 @@ async def lifespan(app: FastAPI):
         Base.metadata.create_all(bind=engine)
         logger.info("Database tables created")
     
+    # Broker calls from jobs/routes run on this thread, off the event loop
+    get_broker_worker().start()
+
+    # TradeZero: log in now and keep the sessions warm, so no order waits on Chrome + MFA
+    broker = (getattr(settings, "EXECUTION_BROKER", "alpaca") or "alpaca").lower().strip()
+    tz_pool = None
+    if broker == "tradezero" and not settings.TRADEZERO_DRY_RUN and settings.TRADEZERO_USERNAME:
+        from execution.tradezero.session_pool import get_session_pool
+
+        tz_pool = get_session_pool()
+        tz_pool.start()
+
     # Start EOD scheduler
     start_scheduler()
     logger.info("EOD scheduler started")
@@ -74,6 +88,10 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     stop_scheduler()
+    get_broker_worker().stop()
+    if tz_pool is not None:
+        tz_pool.close()
+    close_shared_connections()
     logger.info("Shutting down ORB Trading System")
 
 
@@ -1,7 +1,14 @@
 """
 Alpaca data fetcher for ORB pipeline.
 Fetches daily + 5-min bars for all symbols in parallel.
-Premium Alpaca subscription = no rate limits.
+
+fetch_all_symbols groups symbols into multi-symbol requests (batch_fetch.py):
+rate-limited, decoded straight to Arrow and resumable per symbol from a
+checkpoint. batched=False keeps the old one-request-per-symbol path.
+
+5-min bars go to the append-only bar store (scripts/ORB/intraday_store.py):
+each write is a new part file holding only the fetched rows, and a background
+compactor folds parts into yearly files while the fetch runs.
 """
 import logging
 from pathlib import Path
@@ -14,13 +21,29 @@ from alpaca.data.historical import StockHistoricalDataClient
 from alpaca.data.requests import StockBarsRequest, StockLatestBarRequest
 from alpaca.data.timeframe import TimeFrame, TimeFrameUnit
 
+try:
+    from ..ORB import intraday_store
+except ImportError:  # run as the top-level DataPipeline package (cwd scripts/)
+    from ORB import intraday_store
+
+from .batch_fetch import (
+    AdaptiveRateLimiter,
+    AlpacaBarsClient,
+    BatchBarFetcher,
+    FetchCheckpoint,
+    plan_requests,
+    resume_ranges,
+    to_5min_frame,
+    to_daily_frame,
+)
 from .config import (
     ALPACA_API_KEY,
     ALPACA_SECRET_KEY,
     ALPACA_BASE_URL,
+    ALPACA_DATA_URL,
     FETCH_CONFIG,
+    FIVE_MIN_DIR,
     get_symbol_daily_path,
-    get_symbol_5min_path,
 )
 from .validators import DataValidator
 
@@ -47,6 +70,7 @@ class AlpacaFetcher:
             "total_rows_daily": 0,
             "total_rows_5min": 0,
         }
+        self.compactor: Optional[intraday_store.Compactor] = None
 
     def get_last_available_date(self) -> str:
         """
@@ -68,12 +92,13 @@ class AlpacaFetcher:
             logger.warning(f"Could not determine last available date: {e}, using yesterday")
             return (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
 
-    def get_fetch_range(self, symbol: str, start_date: Optional[str] = None) -> Tuple[str, str]:
+    def get_fetch_range(self, symbol: str, start_date: Optional[str] = None, end_date: Optional[str] = None) -> Tuple[str, str]:
         """
         Determine date range to fetch for a symbol.
         If parquet exists, start from last date in file.
         """
-        end_date = self.get_last_available_date()
+        if end_date is None:
+            end_date = self.get_last_available_date()
         
         # If parquet exists, start from last date in file
         daily_path = get_symbol_daily_path(symbol)
@@ -228,36 +253,26 @@ class AlpacaFetcher:
             return False
 
     def write_5min_bars(self, symbol: str, df_new: pd.DataFrame) -> bool:
-        """Append or create 5-min bars parquet file."""
+        """
+        Append 5-min bars to the symbol's bar store as a new part file.
+        Existing bars are not read or rewritten; duplicates are resolved at read time.
+        """
         if df_new.empty:
             return True
         
-        filepath = get_symbol_5min_path(symbol)
-        
         try:
-            # Load existing data if exists
-            if filepath.exists():
-                df_existing = pd.read_parquet(filepath)
-                # Deduplicate by datetime
-                df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-                df_combined = df_combined.drop_duplicates(subset=['datetime'], keep='last')
-            else:
-                df_combined = df_new
-            
-            # Drop rows with NaN datetime (malformed Alpaca data or corrupt parquets)
-            df_combined = df_combined.dropna(subset=['datetime'])
+            # Drop rows with NaN datetime (malformed Alpaca data)
+            df_new = df_new.dropna(subset=['datetime'])
             
-            # Sort by datetime
-            df_combined = df_combined.sort_values('datetime').reset_index(drop=True)
+            # Validate before writing (only the new rows are in memory)
+            DataValidator.validate_bars(df_new, symbol, frequency='5min')
             
-            # Write parquet
-            df_combined.to_parquet(filepath, index=False, compression='snappy')
-            
-            # Validate post-write
-            DataValidator.post_write_check(filepath, symbol, frequency='5min')
+            parts = intraday_store.append_bars(FIVE_MIN_DIR, symbol, df_new, ts_col='datetime')
+            if self.compactor is not None:
+                self.compactor.submit(symbol)
             
             rows_written = len(df_new)
-            logger.debug(f"[{symbol}] Wrote {rows_written} 5-min bars to {filepath.name}")
+            logger.debug(f"[{symbol}] Wrote {rows_written} 5-min bars to {len(parts)} part file(s)")
             
             self.fetch_stats["total_rows_5min"] += rows_written
             return True
@@ -295,14 +310,106 @@ class AlpacaFetcher:
             self.fetch_stats["failed"] += 1
             return False
 
-    def fetch_all_symbols(self, symbols: List[str], max_workers: Optional[int] = None) -> Dict:
+    def plan_batched_fetch(self, symbols: List[str], checkpoint: FetchCheckpoint, end_date: Optional[str] = None) -> List:
+        """
+        Multi-symbol requests covering `symbols` for both frequencies.
+        Each frequency resumes from the checkpoint when its parquet exists, else
+        from the daily parquet's last date (as get_fetch_range does).
+        """
+        end_date = end_date or self.get_last_available_date()
+        ranges = {symbol: self.get_fetch_range(symbol, end_date=end_date) for symbol in symbols}
+        tasks = []
+        wanted = set()
+        has_data = {
+            "daily": lambda symbol: get_symbol_daily_path(symbol).exists(),
+            "5min": lambda symbol: intraday_store.has_bars(FIVE_MIN_DIR, symbol),
+        }
+        for frequency in ("daily", "5min"):
+            resumed = resume_ranges(ranges, frequency, checkpoint, has_data=has_data[frequency])
+            wanted.update(s for s, (start, end) in resumed.items() if start < end)
+            tasks += plan_requests(
+                resumed,
+                frequency,
+                bars_per_request=FETCH_CONFIG["bars_per_request"],
+                max_symbols=FETCH_CONFIG["max_symbols_per_request"],
+            )
+        self.fetch_stats["skipped"] += len(set(symbols) - wanted)
+        return tasks
+
+    def _write_batched(self, frequency: str, symbol: str, table) -> bool:
+        if table.num_rows == 0:
+            logger.debug(f"[{symbol}] No {frequency} data returned")
+            return True
+        if frequency == "daily":
+            return self.write_daily_bars(symbol, to_daily_frame(symbol, table))
+        return self.write_5min_bars(symbol, to_5min_frame(symbol, table))
+
+    def fetch_all_batched(self, symbols: List[str], max_workers: Optional[int] = None) -> Dict:
+        """Fetch all symbols with multi-symbol requests (see batch_fetch.py)."""
+        self.fetch_stats["total_symbols"] = len(symbols)
+        checkpoint = FetchCheckpoint(FETCH_CONFIG["checkpoint_path"])
+        tasks = self.plan_batched_fetch(symbols, checkpoint)
+        logger.info(f"Starting batched fetch for {len(symbols)} symbols: {len(tasks)} requests "
+                    f"({max_workers or FETCH_CONFIG['fetch_workers']} workers)")
+
+        client = AlpacaBarsClient(
+            ALPACA_API_KEY,
+            ALPACA_SECRET_KEY,
+            data_url=ALPACA_DATA_URL,
+            feed=FETCH_CONFIG["data_feed"],
+            limiter=AdaptiveRateLimiter(FETCH_CONFIG["requests_per_minute"]),
+            max_retries=FETCH_CONFIG["max_retries"],
+            retry_delay=FETCH_CONFIG["retry_delay_seconds"],
+            timeout=FETCH_CONFIG["timeout_seconds"],
+        )
+        try:
+            runner = BatchBarFetcher(client, self._write_batched, checkpoint, workers=max_workers or FETCH_CONFIG["fetch_workers"])
+            stats = runner.run(tasks)
+        finally:
+            client.close()
+
+        failed = {symbol for _, symbol in stats.failed}
+        fetched = {symbol for task in tasks for symbol in task.symbols}
+        self.fetch_stats["failed"] += len(failed)
+        self.fetch_stats["successful"] += len(fetched - failed)
+        self.fetch_stats["requests"] = stats.requests
+        self.fetch_stats["throttled"] = stats.throttled
+
+        logger.info(f"\n{'='*80}")
+        logger.info(f"Fetch complete: {self.fetch_stats['successful']} successful, "
+                   f"{self.fetch_stats['failed']} failed, {self.fetch_stats['skipped']} skipped")
+        logger.info(f"Requests: {stats.requests:,} ({stats.pages:,} pages, {stats.retries} retries, "
+                   f"{stats.throttled} throttled) | {stats.bars_per_sec:,.0f} bars/s")
+        logger.info(f"Daily rows: {self.fetch_stats['total_rows_daily']:,} | "
+                   f"5-min rows: {self.fetch_stats['total_rows_5min']:,}")
+        logger.info(f"{'='*80}")
+        return self.fetch_stats
+
+    def fetch_all_symbols(self, symbols: List[str], max_workers: Optional[int] = None, batched: Optional[bool] = None) -> Dict:
         """
         Fetch all symbols in parallel.
         
         Args:
             symbols: List of symbols to fetch
-            max_workers: Number of parallel threads (default: 5 for premium Alpaca)
+            max_workers: Number of parallel threads (default: 5 per-symbol, FETCH_CONFIG["fetch_workers"] batched)
+            batched: Multi-symbol requests (default: FETCH_CONFIG["batched"])
         """
+        if batched is None:
+            batched = FETCH_CONFIG["batched"]
+        
+        self.compactor = intraday_store.Compactor(FIVE_MIN_DIR, min_parts=FETCH_CONFIG["compact_min_parts"]).start()
+        try:
+            if batched:
+                return self.fetch_all_batched(symbols, max_workers)
+            return self.fetch_all_per_symbol(symbols, max_workers)
+        finally:
+            compacted = self.compactor.close()
+            self.compactor = None
+            logger.info(f"Compacted {compacted['parts']} 5-min part files of {compacted['symbols']} symbols "
+                       f"into yearly files ({compacted['errors']} errors)")
+
+    def fetch_all_per_symbol(self, symbols: List[str], max_workers: Optional[int] = None) -> Dict:
+        """Fetch all symbols with one request per symbol per frequency (the pre-batching path)."""
         if max_workers is None:
             max_workers = 5  # Premium Alpaca can handle 5 parallel requests
         
@@ -0,0 +1,538 @@
+"""
+Batched multi-symbol bar fetch for the ORB pipeline.
+
+AlpacaFetcher used to send one StockBarsRequest per symbol per frequency, so a
+daily + 5-min refresh of the universe was thousands of round-trips. Here:
+
+1. plan: symbols sharing a fetch range are grouped into multi-symbol requests,
+   sized by their expected bar count (trading days x bars per day) so each
+   request is about `bars_per_request` bars. A symbol that alone exceeds that
+   (a full 5-min backfill) gets a request of its own.
+2. fetch: requests go to GET /v2/stocks/bars on a small thread pool. Every
+   page (next_page_token) takes a token from an adaptive token bucket that
+   halves its rate on 429s and creeps back up after a run of successes.
+   5xx / transport errors are retried with backoff.
+3. decode: the JSON bars of each page become per-symbol Arrow record batches
+   (no per-bar DataFrame rows). Alpaca returns bars ordered by symbol, so a
+   symbol is complete once a later symbol shows up (or the request ends); it
+   is then handed to the writer as one Arrow table.
+4. checkpoint: after a symbol's bars are written, (frequency, symbol) -> end
+   of the fetched range is recorded in a JSON file, so an interrupted run
+   resumes per symbol instead of refetching everything.
+
+Ranges are half-open, [start, end) at 00:00 UTC, as the per-symbol path sent
+them through alpaca-py.
+
+This module only needs httpx and pyarrow (no alpaca-py, no pipeline config),
+so the offline benchmark (scripts/bench_alpaca_fetch.py) can drive it against
+a local fake server.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+logger = logging.getLogger(__name__)
+# httpx logs every request at INFO; one line per page would drown the sync log
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+TIMEFRAMES = {"daily": "1Day", "5min": "5Min"}
+# 5-min bars cover the extended session (04:00-20:00 ET); most symbols have fewer
+BARS_PER_DAY = {"daily": 1, "5min": 192}
+PAGE_LIMIT = 10_000  # Alpaca's max bars per page (across all symbols of the request)
+DEFAULT_BARS_PER_REQUEST = 2 * PAGE_LIMIT
+DEFAULT_MAX_SYMBOLS = 200  # keeps the query string well under URL length limits
+
+BAR_SCHEMA = pa.schema([
+    ("timestamp", pa.timestamp("ns", tz="UTC")),
+    ("open", pa.float64()),
+    ("high", pa.float64()),
+    ("low", pa.float64()),
+    ("close", pa.float64()),
+    ("volume", pa.float64()),
+    ("trade_count", pa.float64()),
+    ("vwap", pa.float64()),
+])
+_BAR_KEYS = [("o", "open"), ("h", "high"), ("l", "low"), ("c", "close"), ("v", "volume"), ("n", "trade_count"), ("vw", "vwap")]
+
+
+class FetchError(Exception):
+    """Raised when a request still fails after all retries."""
+    pass
+
+
+# --------------------------------------------------------------------------- planning
+
+@dataclass
+class FetchTask:
+    """One multi-symbol bars request (all of its pages)."""
+
+    frequency: str
+    symbols: List[str]
+    start: str  # YYYY-MM-DD, inclusive
+    end: str  # YYYY-MM-DD, exclusive
+    expected_bars: int
+
+
+def expected_bars(frequency: str, start: str, end: str) -> int:
+    """Upper estimate of the bars one symbol has in [start, end)."""
+    days = int(np.busday_count(start, end)) if start < end else 0
+    return days * BARS_PER_DAY[frequency]
+
+
+def plan_requests(
+    ranges: Dict[str, Tuple[str, str]],
+    frequency: str,
+    bars_per_request: int = DEFAULT_BARS_PER_REQUEST,
+    max_symbols: int = DEFAULT_MAX_SYMBOLS,
+) -> List[FetchTask]:
+    """
+    Group symbols -> (start, end) into requests of about `bars_per_request`
+    expected bars (and at most `max_symbols` symbols). Only symbols with the same
+    range share a request; empty ranges (start >= end) are left out.
+    """
+    by_range: Dict[Tuple[str, str], List[str]] = {}
+    for symbol, (start, end) in ranges.items():
+        if start < end:
+            by_range.setdefault((start, end), []).append(symbol)
+
+    tasks = []
+    for (start, end), symbols in sorted(by_range.items()):
+        per_symbol = max(1, expected_bars(frequency, start, end))
+        per_request = max(1, min(max_symbols, bars_per_request // per_symbol))
+        symbols = sorted(symbols)
+        for i in range(0, len(symbols), per_request):
+            chunk = symbols[i:i + per_request]
+            tasks.append(FetchTask(frequency, chunk, start, end, per_symbol * len(chunk)))
+    # Largest first so a long single-symbol backfill does not end up last on the pool
+    tasks.sort(key=lambda t: t.expected_bars, reverse=True)
+    return tasks
+
+
+def resume_ranges(
+    ranges: Dict[str, Tuple[str, str]],
+    frequency: str,
+    checkpoint: "FetchCheckpoint",
+    has_data: Callable[[str], bool] = lambda symbol: True,
+) -> Dict[str, Tuple[str, str]]:
+    """
+    `ranges` with each start moved to the end already checkpointed for the symbol
+    (only while `has_data(symbol)`: a deleted parquet is fetched again from scratch).
+    A checkpoint older than the range start (the parquet was advanced by another
+    run since) never moves the start back.
+    """
+    out = {}
+    for symbol, (start, end) in ranges.items():
+        done = checkpoint.get(frequency, symbol)
+        out[symbol] = (max(done, start) if done and has_data(symbol) else start, end)
+    return out
+
+
+# --------------------------------------------------------------------------- rate limiting
+
+class AdaptiveRateLimiter:
+    """
+    Token bucket shared by all fetch threads.
+
+    Starts at `rate_per_min`; a 429 halves the rate (not below `min_rate_per_min`)
+    and pauses everyone until Retry-After / X-RateLimit-Reset. After
+    `recover_after` successful requests in a row the rate grows by 10% again,
+    up to `rate_per_min`. When X-RateLimit-Remaining runs low the bucket also
+    waits for the window reset instead of running into the 429.
+    """
+
+    def __init__(self, rate_per_min: float, burst: Optional[int] = None, min_rate_per_min: Optional[float] = None, recover_after: int = 20):
+        self.max_rate = rate_per_min / 60.0
+        self.min_rate = (min_rate_per_min or max(1.0, rate_per_min / 20)) / 60.0
+        self.rate = self.max_rate
+        self.capacity = float(burst or max(1, min(50, int(self.max_rate))))
+        self.recover_after = recover_after
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._streak = 0
+        self._lock = threading.Lock()
+        self.throttled = 0
+        self.waited_sec = 0.0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        started = time.monotonic()
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now >= self._paused_until:
+                    self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        self.waited_sec += now - started
+                        return
+                    wait = (1.0 - self._tokens) / self.rate
+                else:
+                    wait = self._paused_until - now
+            time.sleep(min(wait, 1.0))
+
+    def on_success(self, limit: Optional[int] = None, remaining: Optional[int] = None, reset_in: Optional[float] = None):
+        """Record a successful response (X-RateLimit-* values when the server sent them)."""
+        with self._lock:
+            self._streak += 1
+            if self._streak >= self.recover_after and self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate * 1.1)
+                self._streak = 0
+            if limit and remaining is not None and reset_in and remaining <= max(1, limit // 20):
+                self._pause(reset_in)
+
+    def on_throttle(self, retry_after: Optional[float] = None):
+        """Record a 429: halve the rate and hold all threads for `retry_after` seconds."""
+        with self._lock:
+            self.throttled += 1
+            self._streak = 0
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._tokens = 0.0
+            self._pause(retry_after if retry_after is not None else 1.0 / self.rate)
+
+    def _pause(self, seconds: float):
+        now = time.monotonic()
+        self._paused_until = max(self._paused_until, now + max(0.0, seconds))
+        self._updated = max(self._updated, self._paused_until)
+
+    def snapshot(self) -> dict:
+        return {
+            "rate_per_min": round(self.rate * 60, 1),
+            "throttled": self.throttled,
+            "waited_sec": round(self.waited_sec, 3),
+        }
+
+
+# --------------------------------------------------------------------------- decoding
+
+def decode_bars(bars: List[dict]) -> pa.RecordBatch:
+    """Alpaca bar objects ({t, o, h, l, c, v, n, vw}) -> one record batch in BAR_SCHEMA."""
+    columns = [pa.array([b["t"] for b in bars], pa.string()).cast(BAR_SCHEMA.field("timestamp").type)]
+    for key, _ in _BAR_KEYS:
+        columns.append(pa.array([b.get(key) for b in bars], pa.float64()))
+    return pa.RecordBatch.from_arrays(columns, schema=BAR_SCHEMA)
+
+
+def bars_table(batches: List[pa.RecordBatch]) -> pa.Table:
+    return pa.Table.from_batches(batches, schema=BAR_SCHEMA)
+
+
+def to_daily_frame(symbol: str, table: pa.Table) -> pd.DataFrame:
+    """Bars table -> the frame fetch_daily_bars returns: [date (UTC midnight), symbol, open..volume]."""
+    df = table.select(["timestamp", "open", "high", "low", "close", "volume"]).to_pandas()
+    df.insert(0, "date", df.pop("timestamp").dt.normalize())
+    df.insert(1, "symbol", symbol)
+    return df
+
+
+def to_5min_frame(symbol: str, table: pa.Table) -> pd.DataFrame:
+    """Bars table -> the frame fetch_5min_bars returns: [datetime (ET), symbol, open..vwap]."""
+    df = table.to_pandas()
+    df.insert(0, "datetime", df.pop("timestamp").dt.tz_convert("America/New_York"))
+    df.insert(1, "symbol", symbol)
+    return df.dropna(subset=["datetime"])
+
+
+# --------------------------------------------------------------------------- checkpoint
+
+class FetchCheckpoint:
+    """
+    (frequency, symbol) -> end date already fetched and written, in a JSON file.
+
+    Saved atomically (temp file + rename), at most every `save_interval_sec`
+    while a run is going and on flush(); losing the last second of progress
+    only means refetching a few symbols, which the writers dedupe.
+    """
+
+    def __init__(self, path: Optional[Path], save_interval_sec: float = 1.0):
+        self.path = Path(path) if path else None
+        self.save_interval_sec = save_interval_sec
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._saved_at = 0.0
+        self._done: Dict[str, Dict[str, str]] = {}
+        if self.path and self.path.exists():
+            try:
+                self._done = json.loads(self.path.read_text())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable fetch checkpoint {self.path}: {e}")
+
+    def get(self, frequency: str, symbol: str) -> Optional[str]:
+        with self._lock:
+            return self._done.get(frequency, {}).get(symbol)
+
+    def mark(self, frequency: str, symbol: str, end: str):
+        with self._lock:
+            self._done.setdefault(frequency, {})[symbol] = end
+            self._dirty = True
+            if time.monotonic() - self._saved_at >= self.save_interval_sec:
+                self._save()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty:
+                self._save()
+
+    def _save(self):
+        if self.path is None:
+            self._dirty = False
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps(self._done, sort_keys=True))
+        os.replace(tmp, self.path)
+        self._dirty = False
+        self._saved_at = time.monotonic()
+
+
+# --------------------------------------------------------------------------- HTTP client
+
+def _retry_after(response: httpx.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    reset = response.headers.get("X-RateLimit-Reset")
+    if reset:
+        try:
+            return max(0.0, float(reset) - time.time())
+        except ValueError:
+            pass
+    return None
+
+
+def _int_header(response: httpx.Response, name: str) -> Optional[int]:
+    try:
+        return int(response.headers[name])
+    except (KeyError, ValueError):
+        return None
+
+
+class AlpacaBarsClient:
+    """Minimal keep-alive client for Alpaca's multi-symbol historical bars endpoint."""
+
+    def __init__(
+        self,
+        api_key: str,
+        secret_key: str,
+        data_url: str = "https://data.alpaca.markets",
+        feed: Optional[str] = None,
+        adjustment: str = "raw",
+        limiter: Optional[AdaptiveRateLimiter] = None,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+        timeout: float = 30.0,
+        page_limit: int = PAGE_LIMIT,
+        max_connections: int = 10,
+    ):
+        self.feed = feed
+        self.adjustment = adjustment
+        self.limiter = limiter
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.page_limit = page_limit
+        self.http = httpx.Client(
+            base_url=data_url.rstrip("/"),
+            headers={"APCA-API-KEY-ID": api_key, "APCA-API-SECRET-KEY": secret_key, "Accept": "application/json"},
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.bytes = 0
+
+    def close(self):
+        self.http.close()
+
+    def get_page(self, task: FetchTask, page_token: Optional[str] = None) -> dict:
+        """One page of `task`: {"bars": {symbol: [...]}, "next_page_token": ...}; retried on 429 / 5xx / network errors."""
+        params = {
+            "symbols": ",".join(task.symbols),
+            "timeframe": TIMEFRAMES[task.frequency],
+            "start": f"{task.start}T00:00:00Z",
+            "end": f"{task.end}T00:00:00Z",
+            "limit": self.page_limit,
+            "adjustment": self.adjustment,
+        }
+        if self.feed:
+            params["feed"] = self.feed
+        if page_token:
+            params["page_token"] = page_token
+
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            with self._lock:
+                self.requests += 1
+                if attempt:
+                    self.retries += 1
+            try:
+                response = self.http.get("/v2/stocks/bars", params=params)
+            except httpx.TransportError as e:
+                error = f"{type(e).__name__}: {e}"
+                delay = self.retry_delay * 2 ** attempt
+            else:
+                if response.status_code == 200:
+                    with self._lock:
+                        self.bytes += len(response.content)
+                    if self.limiter is not None:
+                        self.limiter.on_success(
+                            _int_header(response, "X-RateLimit-Limit"),
+                            _int_header(response, "X-RateLimit-Remaining"),
+                            _retry_after(response),
+                        )
+                    return response.json()
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code == 429:
+                    delay = _retry_after(response)
+                    if self.limiter is not None:
+                        self.limiter.on_throttle(delay)
+                        delay = 0.0  # the limiter holds the next acquire()
+                    elif delay is None:
+                        delay = self.retry_delay
+                elif response.status_code >= 500:
+                    delay = self.retry_delay * 2 ** attempt
+                else:
+                    raise FetchError(f"{task.frequency} {task.symbols[0]}..({len(task.symbols)}): {error}")
+            if attempt < self.max_retries:
+                logger.debug(f"Retrying {task.frequency} request ({error}) in {delay:.1f}s")
+                time.sleep(delay)
+        raise FetchError(f"{task.frequency} {task.symbols[0]}..({len(task.symbols)}) failed after {self.max_retries} retries: {error}")
+
+
+# --------------------------------------------------------------------------- runner
+
+@dataclass
+class BatchFetchStats:
+    """Counters and timings of one batched fetch run."""
+
+    tasks: int = 0
+    symbols: int = 0
+    symbols_written: int = 0
+    symbols_failed: int = 0
+    pages: int = 0
+    requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    bars: int = 0
+    bytes: int = 0
+    elapsed_sec: float = 0.0
+    failed: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def bars_per_sec(self) -> float:
+        return self.bars / self.elapsed_sec if self.elapsed_sec else 0.0
+
+    def as_dict(self) -> dict:
+        out = asdict(self)
+        out.pop("failed")
+        out.update(elapsed_sec=round(self.elapsed_sec, 3), bars_per_sec=round(self.bars_per_sec, 1))
+        return out
+
+
+# Writer: (frequency, symbol, bars table) -> True when stored; the symbol is checkpointed only then
+SymbolWriter = Callable[[str, str, pa.Table], bool]
+
+
+class BatchBarFetcher:
+    """Runs planned FetchTasks on a thread pool, handing each completed symbol to `writer`."""
+
+    def __init__(self, client: AlpacaBarsClient, writer: SymbolWriter, checkpoint: Optional[FetchCheckpoint] = None, workers: int = 4):
+        self.client = client
+        self.writer = writer
+        self.checkpoint = checkpoint or FetchCheckpoint(None)
+        self.workers = workers
+        self.stats = BatchFetchStats()
+        self._lock = threading.Lock()
+
+    def run(self, tasks: Iterable[FetchTask]) -> BatchFetchStats:
+        tasks = list(tasks)
+        started = time.perf_counter()
+        requests0, retries0, bytes0 = self.client.requests, self.client.retries, self.client.bytes
+        throttled0 = self.client.limiter.throttled if self.client.limiter else 0
+        self.stats.tasks += len(tasks)
+        self.stats.symbols += sum(len(t.symbols) for t in tasks)
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, self.workers), thread_name_prefix="bar-fetch") as pool:
+                futures = {pool.submit(self._run_task, task): task for task in tasks}
+                for i, future in enumerate(as_completed(futures)):
+                    task = futures[future]
+                    try:
+                        future.result()
+                    except Exception as e:
+                        logger.error(f"[{task.frequency}] Request for {len(task.symbols)} symbols failed: {e}")
+                    if (i + 1) % 50 == 0 or i + 1 == len(tasks):
+                        logger.info(f"[{i + 1}/{len(tasks)} requests] {self.stats.symbols_written} symbols written, {self.stats.bars:,} bars")
+        finally:
+            self.checkpoint.flush()
+            self.stats.requests += self.client.requests - requests0
+            self.stats.retries += self.client.retries - retries0
+            self.stats.bytes += self.client.bytes - bytes0
+            if self.client.limiter:
+                self.stats.throttled += self.client.limiter.throttled - throttled0
+            self.stats.elapsed_sec += time.perf_counter() - started
+        return self.stats
+
+    def _run_task(self, task: FetchTask):
+        pending: Dict[str, List[pa.RecordBatch]] = {}
+        remaining = set(task.symbols)
+        page_token = None
+        try:
+            while True:
+                page = self.client.get_page(task, page_token)
+                bars = page.get("bars") or {}
+                with self._lock:
+                    self.stats.pages += 1
+                    self.stats.bars += sum(len(v) for v in bars.values())
+                for symbol, symbol_bars in bars.items():
+                    if symbol_bars:
+                        pending.setdefault(symbol, []).append(decode_bars(symbol_bars))
+                page_token = page.get("next_page_token")
+                if not page_token:
+                    break
+                # Bars come sorted by symbol: everything before the page's last symbol is complete
+                last = max(bars) if bars else None
+                for symbol in sorted(s for s in remaining if last is not None and s < last):
+                    self._finish(task, symbol, pending.pop(symbol, []))
+                    remaining.discard(symbol)
+        except Exception:
+            with self._lock:
+                self.stats.symbols_failed += len(remaining)
+                self.stats.failed.extend((task.frequency, s) for s in sorted(remaining))
+            raise
+        for symbol in sorted(remaining):
+            self._finish(task, symbol, pending.pop(symbol, []))
+
+    def _finish(self, task: FetchTask, symbol: str, batches: List[pa.RecordBatch]):
+        try:
+            ok = self.writer(task.frequency, symbol, bars_table(batches))
+        except Exception as e:
+            logger.error(f"[{symbol}] Failed to write {task.frequency} bars: {e}")
+            ok = False
+        with self._lock:
+            if ok:
+                self.stats.symbols_written += 1
+            else:
+                self.stats.symbols_failed += 1
+                self.stats.failed.append((task.frequency, symbol))
+        if ok:
+            self.checkpoint.mark(task.frequency, symbol, task.end)
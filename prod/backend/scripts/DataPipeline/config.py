@@ -31,6 +31,7 @@ for path in [DATA_RAW, DAILY_DIR, FIVE_MIN_DIR, DATA_DELTAS, UNIVERSES_DIR, BACK
 ALPACA_API_KEY = os.getenv("ALPACA_API_KEY", "")
 ALPACA_SECRET_KEY = os.getenv("ALPACA_API_SECRET", "")
 ALPACA_BASE_URL = os.getenv("ALPACA_BASE_URL", "https://api.alpaca.markets")
+ALPACA_DATA_URL = os.getenv("ALPACA_DATA_URL", "https://data.alpaca.markets")
 
 # ===== DATABASE =====
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///orb.db")
@@ -43,6 +44,14 @@ FETCH_CONFIG = {
     "retry_delay_seconds": 5,
     "timeout_seconds": 30,
     "start_date": "2021-01-01",  # Full historical backfill
+    "batched": True,  # Multi-symbol requests (batch_fetch.py) instead of one request per symbol
+    "bars_per_request": 20_000,  # Target expected bars per multi-symbol request (2 pages)
+    "max_symbols_per_request": 200,
+    "fetch_workers": 4,  # Concurrent multi-symbol requests
+    "requests_per_minute": int(os.getenv("ALPACA_REQUESTS_PER_MINUTE", "1000")),  # Token bucket ceiling (adapts down on 429)
+    "data_feed": os.getenv("ALPACA_DATA_FEED") or None,  # None = account default
+    "checkpoint_path": DATA_ROOT / "checkpoints" / "alpaca_fetch.json",  # Per-symbol resume state
+    "compact_min_parts": 8,  # Merge a year's 5-min part files once it has this many (intraday_store.py)
 }
 
 # ===== ENRICHMENT SETTINGS =====
@@ -52,6 +61,9 @@ ENRICHMENT_CONFIG = {
     "min_price": 5.0,  # Minimum price filter
     "min_atr": 0.50,  # Minimum ATR filter
     "min_volume": 1_000_000,  # Minimum daily volume
+    "workers": int(os.getenv("ENRICHMENT_WORKERS", "0")) or os.cpu_count() or 1,  # Processes (1 = in-process)
+    "symbols_per_task": 50,  # Symbols handed to a worker at a time
+    "state_path": DATA_ROOT / "checkpoints" / "enrichment_state.json",  # Trailing indicator state per symbol
 }
 
 # ===== VALIDATION SETTINGS =====
@@ -111,7 +123,7 @@ def get_symbol_daily_path(symbol: str) -> Path:
     return DAILY_DIR / f"{symbol}.parquet"
 
 def get_symbol_5min_path(symbol: str) -> Path:
-    """Get path to 5-min parquet file for a symbol."""
+    """Get path to the legacy flat 5-min parquet file for a symbol (new bars go to the bar store, ORB/intraday_store.py)."""
     return FIVE_MIN_DIR / f"{symbol}.parquet"
 
 def get_all_symbols() -> List[str]:
@@ -183,12 +183,16 @@ class DailySyncOrchestrator:
                 "successful": stats["successful"],
                 "failed": stats["failed"],
                 "rows_processed": stats["total_rows_processed"],
+                "rows_computed": stats["rows_computed"],
+                "incremental": stats["incremental"],
             }
             
             logger.info(f"\n[OK] Enrichment complete ({duration:.1f}s)")
             logger.info(f"  Successful: {stats['successful']}")
             logger.info(f"  Failed: {stats['failed']}")
             logger.info(f"  Rows processed: {stats['total_rows_processed']:,}")
+            logger.info(f"  Rows computed: {stats['rows_computed']:,} "
+                        f"({stats['incremental']} incremental, {stats['unchanged']} unchanged, {stats['full']} full)")
             
             return True
         
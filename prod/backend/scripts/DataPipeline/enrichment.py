@@ -2,13 +2,29 @@
 Data enrichment pipeline for ORB.
 Adds shares_outstanding, computes TR/ATR14, filter flags.
 Writes enhanced parquets and updates database.
+
+Symbols are enriched in worker processes (ENRICHMENT_CONFIG["workers"]).
+After a symbol is enriched its trailing indicator state (last close, the
+last 13 TR and volume values, row count, shares fingerprint) is saved to
+ENRICHMENT_CONFIG["state_path"]. On the next run only the rows the fetcher
+appended since then are computed, continuing the rolling windows from that
+state; the values are identical to a full recompute. A symbol whose file no
+longer matches its state (rows revised, new shares reports) is recomputed in
+full.
 """
+import json
 import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from numpy.lib.stride_tricks import sliding_window_view
 
 from .config import (
     DAILY_DIR,
@@ -21,22 +37,52 @@ from .validators import DataValidator
 
 logger = logging.getLogger(__name__)
 
+METRIC_COLUMNS = ['tr', 'atr_14', 'avg_volume_14']
+
 
 class SharesEnricher:
     """Adds shares_outstanding from historical shares data."""
 
-    def __init__(self):
+    def __init__(self, shares_file: Optional[Path] = None):
         """Load historical shares data."""
-        shares_file = SHARES_CONFIG["raw_file"]
+        shares_file = Path(shares_file or SHARES_CONFIG["raw_file"])
         if not shares_file.exists():
             logger.warning(f"Shares file not found: {shares_file}")
             self.df_shares = pd.DataFrame()
         else:
             self.df_shares = pd.read_parquet(shares_file)
             logger.info(f"Loaded {len(self.df_shares)} share records")
+        # Report dates parsed once (normalised like the trade dates they are matched to), rows indexed by symbol
+        self._rows = {}
+        self._reports = {}  # symbol -> (report days, shares), sorted on first use
+        if not self.df_shares.empty:
+            days = pd.to_datetime(self.df_shares['date']).dt.normalize().dt.tz_localize(None)
+            self._report_days = days.to_numpy(dtype='datetime64[ns]')
+            self._report_shares = self.df_shares['shares_outstanding'].to_numpy(dtype=np.float64)
+            self._rows = self.df_shares.groupby('symbol').indices
+
+    def symbol_reports(self, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        """A symbol's report dates (naive datetime64, ascending) and shares outstanding."""
+        if symbol not in self._reports:
+            rows = self._rows.get(symbol)
+            if rows is None:
+                self._reports[symbol] = (np.array([], dtype='datetime64[ns]'), np.array([], dtype=np.float64))
+            else:
+                days, shares = self._report_days[rows], self._report_shares[rows]
+                keep = ~np.isnat(days)
+                order = np.argsort(days[keep], kind='stable')
+                self._reports[symbol] = (days[keep][order], shares[keep][order])
+        return self._reports[symbol]
+
+    def shares_key(self, symbol: str) -> str:
+        """Fingerprint of a symbol's shares reports; changes when reports are added or revised."""
+        days, shares = self.symbol_reports(symbol)
+        if not len(days):
+            return "0"
+        return f"{len(days)}:{days[-1]}:{shares.sum()!r}"
 
     def enrich_symbol(self, symbol: str, df: pd.DataFrame) -> pd.DataFrame:
-        """Add shares_outstanding to daily data for a symbol."""
+        """Add shares_outstanding to daily data for a symbol (a whole file or only its new rows)."""
         # Only skip if column exists AND has significant non-null data (>80% filled)
         if self.df_shares.empty:
             return df
@@ -50,30 +96,22 @@ class SharesEnricher:
         
         try:
             # Get shares for this symbol
-            df_sym_shares = self.df_shares[self.df_shares['symbol'] == symbol].copy()
-            if df_sym_shares.empty:
+            report_days, shares = self.symbol_reports(symbol)
+            if not len(report_days):
                 logger.debug(f"[{symbol}] No shares data found, skipping enrichment")
                 df['shares_outstanding'] = np.nan
                 return df
             
-            # Convert dates for merging - normalize to date only (remove time + timezone)
-            df['date_dt'] = pd.to_datetime(df['date']).dt.normalize().dt.tz_localize(None)
-            df_sym_shares['date_dt'] = pd.to_datetime(df_sym_shares['date']).dt.normalize().dt.tz_localize(None)
-            
-            # Sort by date for merge_asof
-            df = df.sort_values('date_dt')
-            df_sym_shares = df_sym_shares.sort_values('date_dt')
+            # Normalize trade dates to date only (remove time + timezone), like the report dates
+            trade_days = pd.to_datetime(df['date']).dt.normalize().dt.tz_localize(None).to_numpy(dtype='datetime64[ns]')
             
-            # Merge using merge_asof: for each trade date, find the most recent shares report <= that date
-            df = pd.merge_asof(df, df_sym_shares[['date_dt', 'shares_outstanding']], 
-                              on='date_dt', direction='backward')
+            # As-of join: for each trade date, the most recent shares report <= that date
+            idx = np.searchsorted(report_days, trade_days, side='right') - 1
+            values = shares[np.maximum(idx, 0)]
             
             # If first date is before all shares reports, backward-fill with earliest report
-            if df['shares_outstanding'].isna().any():
-                earliest_shares = df_sym_shares.iloc[0]['shares_outstanding']
-                df['shares_outstanding'] = df['shares_outstanding'].fillna(earliest_shares)
-            
-            df = df.drop(columns=['date_dt'])
+            values = np.where((idx < 0) | np.isnan(values), shares[0], values)
+            df['shares_outstanding'] = values
             
             logger.debug(f"[{symbol}] Enriched with shares data ({df['shares_outstanding'].notna().sum()} non-null)")
             return df
@@ -87,6 +125,29 @@ class SharesEnricher:
 class MetricsComputer:
     """Computes ATR, TR, filter flags."""
 
+    @staticmethod
+    def true_range(high: np.ndarray, low: np.ndarray, close: np.ndarray, prev_close: float = np.nan) -> np.ndarray:
+        """
+        TR = max(H-L, |H-PC|, |L-PC|) over arrays.
+        `prev_close` is the close before the first row; NaN makes the first TR H-L.
+        """
+        pc = np.concatenate(([prev_close], close[:-1]))
+        # fmax skips NaN like DataFrame.max(axis=1)
+        return np.fmax(high - low, np.fmax(np.abs(high - pc), np.abs(low - pc)))
+
+    @staticmethod
+    def rolling_mean(values: np.ndarray, period: int, history: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Mean of each full trailing `period` window (NaN until one is full, or if it holds a NaN).
+        `history` holds the period-1 values before values[0] (NaN-padded when there are fewer).
+        """
+        if history is None:
+            history = np.full(period - 1, np.nan)
+        x = np.concatenate((np.asarray(history, dtype=np.float64), values))
+        if len(x) < period:
+            return np.full(len(values), np.nan)
+        return sliding_window_view(x, period).mean(axis=1)[len(x) - period + 1 - len(values):]
+
     @staticmethod
     def compute_true_range(df: pd.DataFrame) -> pd.Series:
         """
@@ -96,30 +157,22 @@ class MetricsComputer:
         if len(df) < 2:
             return pd.Series(np.nan, index=df.index)
         
-        high = df['high']
-        low = df['low']
-        close = df['close'].shift(1)  # Previous close
-        
-        tr1 = high - low
-        tr2 = (high - close).abs()
-        tr3 = (low - close).abs()
-        
-        tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-        
-        # First row: H-L (no previous close)
-        tr.iloc[0] = high.iloc[0] - low.iloc[0]
-        
-        return tr
+        tr = MetricsComputer.true_range(
+            df['high'].to_numpy(dtype=np.float64),
+            df['low'].to_numpy(dtype=np.float64),
+            df['close'].to_numpy(dtype=np.float64),
+        )
+        return pd.Series(tr, index=df.index)
 
     @staticmethod
     def compute_atr(tr: pd.Series, period: int = 14) -> pd.Series:
         """Compute Average True Range (ATR) using SMA."""
-        return tr.rolling(window=period).mean()
+        return pd.Series(MetricsComputer.rolling_mean(tr.to_numpy(dtype=np.float64), period), index=tr.index)
 
     @staticmethod
     def compute_avg_volume(volume: pd.Series, period: int = 14) -> pd.Series:
         """Compute rolling average volume."""
-        return volume.rolling(window=period).mean()
+        return pd.Series(MetricsComputer.rolling_mean(volume.to_numpy(dtype=np.float64), period), index=volume.index)
 
     @staticmethod
     def compute_filter_flags(df: pd.DataFrame) -> pd.DataFrame:
@@ -136,10 +189,13 @@ class MetricsComputer:
         return df
 
     @staticmethod
-    def enrich_daily_data(symbol: str, df: pd.DataFrame) -> pd.DataFrame:
+    def enrich_daily_data(symbol: str, df: pd.DataFrame, state: Optional[Dict] = None) -> pd.DataFrame:
         """
         Compute enrichment metrics for daily data.
-        Adds: tr, atr_14.
+        Adds: tr, atr_14, avg_volume_14.
+        
+        With `state` (see indicator_state), `df` holds only the rows after the
+        state's last row and the rolling windows continue from it.
         
         Note: Filter flags are computed on-demand during database sync,
         not stored in parquet files to keep them lean.
@@ -150,92 +206,256 @@ class MetricsComputer:
         # Sort by date
         df = df.sort_values('date').reset_index(drop=True)
         
+        high, low, close, volume = (df[c].to_numpy(dtype=np.float64) for c in ('high', 'low', 'close', 'volume'))
+        if state is None:
+            tr = MetricsComputer.true_range(high, low, close) if len(df) >= 2 else np.full(len(df), np.nan)
+            tr_history = volume_history = None
+        else:
+            tr = MetricsComputer.true_range(high, low, close, state['close'])
+            tr_history, volume_history = state['tr'], state['volume']
+        
         # Compute True Range and ATR
-        df['tr'] = MetricsComputer.compute_true_range(df)
-        df['atr_14'] = MetricsComputer.compute_atr(df['tr'], period=ENRICHMENT_CONFIG['atr_period'])
+        df['tr'] = tr
+        df['atr_14'] = MetricsComputer.rolling_mean(tr, ENRICHMENT_CONFIG['atr_period'], tr_history)
         
         # Compute rolling average volume (14-day)
-        df['avg_volume_14'] = MetricsComputer.compute_avg_volume(df['volume'], period=14)
+        df['avg_volume_14'] = MetricsComputer.rolling_mean(volume, ENRICHMENT_CONFIG['volume_period'], volume_history)
         
         return df
 
+    @staticmethod
+    def indicator_state(table: pa.Table) -> Dict:
+        """Trailing state of an enriched, date-sorted table: what enrich_daily_data needs to continue it."""
+        def tail(name: str, n: int) -> List[float]:
+            values = table[name].slice(max(table.num_rows - n, 0)).to_numpy() if n else np.array([])
+            return [float(v) for v in np.concatenate((np.full(n - len(values), np.nan), values))]
 
-class EnrichmentPipeline:
-    """End-to-end enrichment pipeline."""
-
-    def __init__(self):
-        """Initialize enrichers."""
-        self.shares_enricher = SharesEnricher()
-        self.metrics_computer = MetricsComputer()
-        self.stats = {
-            "total_symbols": 0,
-            "successful": 0,
-            "failed": 0,
-            "total_rows_processed": 0,
+        last = table.num_rows - 1
+        return {
+            "rows": table.num_rows,
+            "date": str(pd.Timestamp(table['date'][last].as_py())),
+            "close": table['close'][last].as_py(),
+            "tr": tail('tr', ENRICHMENT_CONFIG['atr_period'] - 1),
+            "volume": tail('volume', ENRICHMENT_CONFIG['volume_period'] - 1),
         }
 
-    def enrich_symbol(self, symbol: str) -> bool:
-        """Enrich daily data for one symbol."""
-        filepath = get_symbol_daily_path(symbol)
-        
-        if not filepath.exists():
-            logger.debug(f"[{symbol}] Daily file not found, skipping")
-            return True
-        
-        try:
-            # Load daily data
-            df = pd.read_parquet(filepath)
-            original_rows = len(df)
-            
-            # Enrich with shares
-            df = self.shares_enricher.enrich_symbol(symbol, df)
-            
-            # Compute metrics
-            df = self.metrics_computer.enrich_daily_data(symbol, df)
+
+def resume_row(table: pa.Table, state: Optional[Dict], shares_key: str, columns: List[str]) -> int:
+    """
+    Number of leading rows of `table` that are already enriched and end where
+    `state` ends (0 = recompute everything). Rows the fetcher rewrote have no
+    TR, so a revision before the state's last row forces a full recompute.
+    """
+    if not state or state.get("shares") != shares_key:
+        return 0
+    n = state["rows"]
+    if n < 2 or n > table.num_rows or any(c not in table.column_names for c in columns):
+        return 0
+    if len(state["tr"]) != ENRICHMENT_CONFIG['atr_period'] - 1 or len(state["volume"]) != ENRICHMENT_CONFIG['volume_period'] - 1:
+        return 0
+    if np.isnan(table['tr'].slice(0, n).to_numpy()).any():
+        return 0
+    dates = table['date'].slice(n - 1)
+    if len(dates) > 1 and not pc.all(pc.greater_equal(dates.slice(1), dates.slice(0, len(dates) - 1))).as_py():
+        return 0
+    if str(pd.Timestamp(dates[0].as_py())) != state["date"] or table['close'][n - 1].as_py() != state["close"]:
+        return 0
+    return n
+
+
+def _replace_rows(table: pa.Table, start: int, df_new: pd.DataFrame) -> pa.Table:
+    """`table` with rows [start:] replaced by `df_new` (the same rows, enriched)."""
+    new = pa.Table.from_pandas(df_new, preserve_index=False)
+    columns = [
+        pa.chunked_array(table[name].slice(0, start).chunks + new[name].cast(table[name].type).chunks, type=table[name].type)
+        for name in table.column_names
+    ]
+    return pa.Table.from_arrays(columns, schema=table.schema)
+
+
+def enrich_file(filepath: Path, symbol: str, shares_enricher: SharesEnricher, state: Optional[Dict] = None) -> Dict:
+    """
+    Enrich one daily parquet file in place.
+    Returns {"symbol", "ok", "mode" (full/incremental/unchanged/missing/failed), "rows", "computed", "state"}.
+    """
+    result = {"symbol": symbol, "ok": True, "mode": "missing", "rows": 0, "computed": 0, "state": None}
+    if not filepath.exists():
+        logger.debug(f"[{symbol}] Daily file not found, skipping")
+        return result
+    
+    try:
+        # Load daily data
+        table = pq.read_table(filepath)
+        rows = table.num_rows
+        shares_key = shares_enricher.shares_key(symbol)
+        required = METRIC_COLUMNS + ([] if shares_enricher.df_shares.empty else ['shares_outstanding'])
+        start = resume_row(table, state, shares_key, required)
+        
+        if start == rows:
+            result.update(mode="unchanged", rows=rows, state=state)
+            return result
+        
+        if start:
+            # Only the appended rows go through pandas: shares and metrics continue from the
+            # saved state. The earlier rows were validated when they were enriched.
+            df_new = table.slice(start).to_pandas()
+            df_new = shares_enricher.enrich_symbol(symbol, df_new)
+            df_new = MetricsComputer.enrich_daily_data(symbol, df_new, state)
+            DataValidator.validate_bars(df_new, symbol, frequency='daily')
+            table = _replace_rows(table, start, df_new)
+            pq.write_table(table, filepath, compression='snappy')
+            DataValidator.validate_file_size(filepath)
+            mode = "incremental"
+        else:
+            df = shares_enricher.enrich_symbol(symbol, table.to_pandas())
+            df = MetricsComputer.enrich_daily_data(symbol, df)
             
             # Validate before write
             DataValidator.validate_daily_schema(df)
             DataValidator.validate_no_critical_nans(df, ['date', 'close', 'volume'])
             
             # Write back
-            df.to_parquet(filepath, index=False, compression='snappy')
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_table(table, filepath, compression='snappy')
             
             # Post-write validation
             DataValidator.post_write_check(filepath, symbol, frequency='daily')
-            
-            logger.debug(f"[{symbol}] Enriched {original_rows} rows")
-            self.stats["successful"] += 1
-            self.stats["total_rows_processed"] += original_rows
-            
-            return True
+            mode = "full"
         
-        except Exception as e:
-            logger.error(f"[{symbol}] Enrichment failed: {e}")
+        new_state = MetricsComputer.indicator_state(table)
+        new_state["shares"] = shares_key
+        result.update(mode=mode, rows=rows, computed=rows - start, state=new_state)
+        logger.debug(f"[{symbol}] Enriched {rows - start} of {rows} rows ({mode})")
+    
+    except Exception as e:
+        logger.error(f"[{symbol}] Enrichment failed: {e}")
+        result.update(ok=False, mode="failed")
+    return result
+
+
+def load_state(path: Path) -> Dict[str, Dict]:
+    """Per-symbol indicator state saved by the last run ({} if none)."""
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        logger.warning(f"Could not read enrichment state {path}: {e}; recomputing all symbols")
+        return {}
+
+
+def save_state(path: Path, states: Dict[str, Dict]):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(states, sort_keys=True))
+    os.replace(tmp, path)
+
+
+# Worker-process globals. With fork the parent's SharesEnricher is inherited
+# as-is; with spawn _init_worker loads the shares file once per process.
+_worker_shares: Optional[SharesEnricher] = None
+
+
+def _init_worker(shares_file: Optional[Path]):
+    global _worker_shares
+    if _worker_shares is None:
+        _worker_shares = SharesEnricher(shares_file)
+
+
+def _enrich_chunk(daily_dir: Path, symbols: List[str], states: Dict[str, Dict]) -> List[Dict]:
+    return [enrich_file(daily_dir / f"{s}.parquet", s, _worker_shares, states.get(s)) for s in symbols]
+
+
+class EnrichmentPipeline:
+    """End-to-end enrichment pipeline."""
+
+    def __init__(self, daily_dir: Optional[Path] = None, shares_file: Optional[Path] = None,
+                 state_path: Optional[Path] = None, workers: Optional[int] = None):
+        """Initialize enrichers."""
+        self.daily_dir = Path(daily_dir or DAILY_DIR)
+        self.shares_file = shares_file
+        self.state_path = Path(state_path or ENRICHMENT_CONFIG["state_path"])
+        self.workers = workers or ENRICHMENT_CONFIG["workers"]
+        self.shares_enricher = SharesEnricher(shares_file)
+        self.metrics_computer = MetricsComputer()
+        self.states = load_state(self.state_path)
+        self.stats = {
+            "total_symbols": 0,
+            "successful": 0,
+            "failed": 0,
+            "total_rows_processed": 0,
+            "rows_computed": 0,
+            "full": 0,
+            "incremental": 0,
+            "unchanged": 0,
+        }
+
+    def _record(self, result: Dict) -> bool:
+        symbol = result["symbol"]
+        if not result["ok"]:
             self.stats["failed"] += 1
+            self.states.pop(symbol, None)
             return False
+        if result["mode"] != "missing":
+            self.stats["successful"] += 1
+            self.stats[result["mode"]] += 1
+            self.stats["total_rows_processed"] += result["rows"]
+            self.stats["rows_computed"] += result["computed"]
+            self.states[symbol] = result["state"]
+        return True
+
+    def enrich_symbol(self, symbol: str) -> bool:
+        """Enrich daily data for one symbol."""
+        result = enrich_file(self.daily_dir / f"{symbol}.parquet", symbol, self.shares_enricher, self.states.get(symbol))
+        return self._record(result)
 
     def enrich_all_symbols(self, symbols: Optional[List[str]] = None) -> Dict:
         """
         Enrich all symbols.
         
         Args:
-            symbols: List of symbols to enrich. If None, enrich all in DAILY_DIR.
+            symbols: List of symbols to enrich. If None, enrich all in the daily directory.
         """
+        global _worker_shares
         if symbols is None:
-            symbols = sorted([f.stem.upper() for f in DAILY_DIR.glob("*.parquet")])
+            symbols = sorted([f.stem.upper() for f in self.daily_dir.glob("*.parquet")])
         
         self.stats["total_symbols"] = len(symbols)
         
-        logger.info(f"Starting enrichment for {len(symbols)} symbols")
+        chunk = ENRICHMENT_CONFIG["symbols_per_task"]
+        chunks = [symbols[i:i + chunk] for i in range(0, len(symbols), chunk)]
+        workers = min(self.workers, len(chunks))
+        logger.info(f"Starting enrichment for {len(symbols)} symbols ({max(workers, 1)} processes)")
         
-        for i, symbol in enumerate(symbols):
-            if (i + 1) % 100 == 0:
-                logger.info(f"Progress: {i+1}/{len(symbols)} ({100*(i+1)/len(symbols):.1f}%)")
-            
-            self.enrich_symbol(symbol)
+        done = 0
+        try:
+            if workers <= 1:
+                for symbol in symbols:
+                    done += 1
+                    if done % 100 == 0:
+                        logger.info(f"Progress: {done}/{len(symbols)} ({100*done/len(symbols):.1f}%)")
+                    self.enrich_symbol(symbol)
+            else:
+                _worker_shares = self.shares_enricher  # inherited by forked workers
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.shares_file,)) as pool:
+                    futures = [
+                        pool.submit(_enrich_chunk, self.daily_dir, c, {s: self.states[s] for s in c if s in self.states})
+                        for c in chunks
+                    ]
+                    for future in as_completed(futures):
+                        for result in future.result():
+                            self._record(result)
+                        done += 1
+                        logger.info(f"Progress: {min(done * chunk, len(symbols))}/{len(symbols)} symbols")
+        finally:
+            _worker_shares = None
+            save_state(self.state_path, self.states)
         
         logger.info(f"Enrichment complete: {self.stats['successful']} successful, "
-                   f"{self.stats['failed']} failed")
+                   f"{self.stats['failed']} failed ({self.stats['incremental']} incremental, "
+                   f"{self.stats['unchanged']} unchanged, {self.stats['full']} full; "
+                   f"{self.stats['rows_computed']:,} rows computed)")
         
         return self.stats
 
@@ -148,18 +148,7 @@ class DataValidator:
             
             # Load and validate schema
             df = pd.read_parquet(filepath)
-            
-            if frequency == "daily":
-                DataValidator.validate_daily_schema(df)
-                DataValidator.validate_no_critical_nans(df, ['date', 'close', 'volume'])
-            elif frequency == "5min":
-                DataValidator.validate_5min_schema(df)
-                DataValidator.validate_no_critical_nans(df, ['datetime', 'close', 'volume'])
-            
-            # Check numeric ranges
-            is_valid, warnings = DataValidator.validate_numeric_ranges(df, symbol)
-            for warning in warnings:
-                logger.warning(f"[{symbol}] {warning}")
+            DataValidator.validate_bars(df, symbol, frequency)
             
             # logger.debug(f"[{symbol}] OK Validation passed for {symbol}.parquet ({frequency})")
             return True
@@ -168,6 +157,22 @@ class DataValidator:
             logger.error(f"[{symbol}] FAIL Validation failed for {symbol}.parquet: {e}")
             raise
 
+    @staticmethod
+    def validate_bars(df: pd.DataFrame, symbol: str, frequency: str = "daily") -> bool:
+        """Schema, critical NaN and range checks on a bars frame (a whole file or just the rows being appended)."""
+        if frequency == "daily":
+            DataValidator.validate_daily_schema(df)
+            DataValidator.validate_no_critical_nans(df, ['date', 'close', 'volume'])
+        elif frequency == "5min":
+            DataValidator.validate_5min_schema(df)
+            DataValidator.validate_no_critical_nans(df, ['datetime', 'close', 'volume'])
+        
+        # Check numeric ranges
+        is_valid, warnings = DataValidator.validate_numeric_ranges(df, symbol)
+        for warning in warnings:
+            logger.warning(f"[{symbol}] {warning}")
+        return True
+
 
 class DailySyncValidator:
     """High-level validation for entire sync operation."""
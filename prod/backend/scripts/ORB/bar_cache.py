@@ -0,0 +1,259 @@
+"""
+Shared per-symbol OHLCV access for universe builders and enrichers.
+
+Every builder used to re-read a symbol's daily / 5-min parquet and rebuild the
+`date_et` / `time` columns on each load. `load_daily` and `load_5min` go
+through one process-wide LRU cache (bounded by bytes) of decoded frames:
+
+  daily   `date` as tz-naive timestamps (as before)
+  5-min   rows grouped by ET trading day (file order kept within a day) plus
+          precomputed columns
+              date_et   datetime.date (ET)
+              time      datetime.time (ET)
+              day       int32, days since 1970-01-01 (ET)
+              minute    int16, minute of the ET day (570 = 09:30)
+
+Cached frames are keyed by file path + mtime, so rewritten parquet files are
+picked up. A `<SYMBOL>.parquet` path that also has an append-only store
+directory next to it (`symbol=<SYMBOL>/`, see intraday_store.py) is read
+through the store (deduped, flat file included) and keyed by the store's
+file list instead. Callers get a shallow copy: adding columns is fine, editing values
+in place is not.
+
+Optionally each parquet file is mirrored once as an uncompressed Arrow IPC
+file and later loads memory-map it instead of decoding parquet (faster cold
+starts across processes). Enable by setting ORB_BAR_IPC_DIR. Store-backed
+symbols are not mirrored.
+
+Environment:
+    ORB_BAR_CACHE_MB   cache budget in MB (default 1024, 0 disables caching)
+    ORB_BAR_IPC_DIR    directory for Arrow IPC mirrors (default: off)
+"""
+import os
+from collections import OrderedDict
+from datetime import date
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+try:
+    from . import intraday_store
+except ImportError:
+    import intraday_store
+
+NS_PER_DAY = 86_400 * 1_000_000_000
+NS_PER_MINUTE = 60 * 1_000_000_000
+OBJECT_CELL_BYTES = 48  # rough size of a boxed date/time per row, for the byte budget
+STORE_TS_COLUMN = {'daily': 'date', '5min': 'datetime'}
+
+
+def _in_store(path: Path) -> bool:
+    """True when <root>/<SYMBOL>.parquet has an append-only store directory next to it."""
+    return intraday_store.symbol_dir(path.parent, path.stem).is_dir()
+
+
+def _exists(path: Path) -> bool:
+    return path.exists() or _in_store(path)
+
+
+def _version(path: Path):
+    return intraday_store.version(path.parent, path.stem) if _in_store(path) else path.stat().st_mtime_ns
+
+
+def _schema(path: Path) -> pa.Schema:
+    return intraday_store.schema(path.parent, path.stem) if _in_store(path) else pq.read_schema(path)
+
+
+def datetime_filters(path: Path, column: str, start: Optional[date] = None, end: Optional[date] = None) -> Optional[list]:
+    """Parquet predicate for ``start <= column < end + 1 day`` (row-group pruning on read).
+
+    Bounds are midnights in the column's own timezone (ET for 5-min, UTC for daily).
+    """
+    if start is None and end is None:
+        return None
+    tz = getattr(_schema(path).field(column).type, 'tz', None)
+    filters = []
+    if start is not None:
+        filters.append((column, '>=', pd.Timestamp(start).tz_localize(tz)))
+    if end is not None:
+        filters.append((column, '<', (pd.Timestamp(end) + pd.Timedelta(days=1)).tz_localize(tz)))
+    return filters
+
+
+def _frame_bytes(df: pd.DataFrame) -> int:
+    n_object = sum(dtype == object for dtype in df.dtypes)
+    return int(df.memory_usage(index=True, deep=False).sum()) + OBJECT_CELL_BYTES * len(df) * n_object
+
+
+def _prepare_daily(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    if 'date' not in df.columns or df.empty:
+        return None
+    # Ensure date is timezone-naive for comparison
+    df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
+    return df
+
+
+def _prepare_5min(df: pd.DataFrame) -> Optional[pd.DataFrame]:
+    ts_col = 'datetime' if 'datetime' in df.columns else 'timestamp'
+    if df.empty or ts_col not in df.columns:
+        return None
+    df[ts_col] = pd.to_datetime(df[ts_col])
+    wall = df[ts_col].dt.tz_localize(None) if df[ts_col].dt.tz is not None else df[ts_col]
+    ns = wall.to_numpy(dtype='datetime64[ns]').view('int64')
+    day = ns // NS_PER_DAY
+    if len(day) > 1 and (np.diff(day) < 0).any():
+        # Group rows by day once; within a day the file order is kept
+        order = np.argsort(day, kind='stable')
+        df = df.iloc[order].reset_index(drop=True)
+        day = day[order]
+        ns = ns[order]
+    df['date_et'] = df[ts_col].dt.date
+    df['time'] = df[ts_col].dt.time
+    df['day'] = day.astype(np.int32)
+    df['minute'] = ((ns % NS_PER_DAY) // NS_PER_MINUTE).astype(np.int16)
+    return df
+
+
+class BarCache:
+    """LRU of decoded per-symbol frames, bounded by (approximate) bytes."""
+
+    def __init__(self, max_bytes: int, ipc_dir: Optional[Path] = None):
+        self.max_bytes = max_bytes
+        self.ipc_dir = Path(ipc_dir) if ipc_dir else None
+        self._frames = OrderedDict()  # (kind, path) -> (mtime_ns, frame, nbytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self):
+        self._frames.clear()
+        self.bytes = 0
+
+    def _read_table(self, path: Path, filters: Optional[list] = None, kind: str = '5min') -> pa.Table:
+        if _in_store(path):
+            return intraday_store.read_table(path.parent, path.stem, STORE_TS_COLUMN[kind], filters=filters)
+        if filters is not None or self.ipc_dir is None:
+            return pq.read_table(path, filters=filters)
+        mirror = self.ipc_dir / path.parent.name / f"{path.stem}.arrow"
+        if not mirror.exists() or mirror.stat().st_mtime_ns < path.stat().st_mtime_ns:
+            table = pq.read_table(path)
+            mirror.parent.mkdir(parents=True, exist_ok=True)
+            tmp = mirror.with_name(mirror.name + f".{os.getpid()}.tmp")
+            with pa.OSFile(str(tmp), 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            tmp.replace(mirror)
+        with pa.memory_map(str(mirror), 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _load(self, path: Path, prepare, filters: Optional[list] = None, kind: str = '5min') -> Optional[pd.DataFrame]:
+        try:
+            return prepare(self._read_table(path, filters, kind).to_pandas())
+        except Exception:
+            return None
+
+    def get(self, kind: str, path: Path, prepare) -> Optional[pd.DataFrame]:
+        """Full decoded frame for one file (cached)."""
+        if not _exists(path):
+            return None
+        key = (kind, str(path))
+        mtime = _version(path)
+        entry = self._frames.get(key)
+        if entry is not None and entry[0] == mtime:
+            self._frames.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        if entry is not None:
+            self._evict(key)
+
+        df = self._load(path, prepare, kind=kind)
+        if df is None:
+            return None
+        nbytes = _frame_bytes(df)
+        if nbytes <= self.max_bytes:
+            self._frames[key] = (mtime, df, nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                self._evict(next(iter(self._frames)))
+        return df
+
+    def cached(self, kind: str, path: Path) -> bool:
+        entry = self._frames.get((kind, str(path)))
+        return entry is not None and _exists(path) and entry[0] == _version(path)
+
+    def _evict(self, key):
+        _, _, nbytes = self._frames.pop(key)
+        self.bytes -= nbytes
+
+
+_CACHE: Optional[BarCache] = None
+
+
+def get_cache() -> BarCache:
+    """Process-wide cache (configured from the environment on first use)."""
+    global _CACHE
+    if _CACHE is None:
+        max_bytes = int(float(os.environ.get("ORB_BAR_CACHE_MB", "1024")) * 1024 * 1024)
+        _CACHE = BarCache(max_bytes, os.environ.get("ORB_BAR_IPC_DIR") or None)
+    return _CACHE
+
+
+def load_daily(path: Path, start: Optional[date] = None, end: Optional[date] = None) -> Optional[pd.DataFrame]:
+    """Daily bars for one symbol file, optionally limited to [start, end].
+
+    A range that is not cached yet is read with parquet predicate pushdown
+    (and not cached); full loads are cached and ranges are then sliced from them.
+    """
+    cache = get_cache()
+    path = Path(path)
+    if (start is not None or end is not None) and not cache.cached('daily', path):
+        if not _exists(path):
+            return None
+        try:
+            filters = datetime_filters(path, 'date', start, end)
+        except Exception:
+            return None
+        return cache._load(path, _prepare_daily, filters, kind='daily')
+    df = cache.get('daily', path, _prepare_daily)
+    if df is None:
+        return None
+    if start is not None or end is not None:
+        mask = np.ones(len(df), dtype=bool)
+        if start is not None:
+            mask &= (df['date'] >= pd.Timestamp(start)).to_numpy()
+        if end is not None:
+            mask &= (df['date'] < pd.Timestamp(end) + pd.Timedelta(days=1)).to_numpy()
+        return df[mask].copy(deep=False)
+    return df.copy(deep=False)
+
+
+def load_5min(path: Path, start: Optional[date] = None, end: Optional[date] = None) -> Optional[pd.DataFrame]:
+    """5-min bars for one symbol file (grouped by ET day, with date_et/time/day/minute).
+
+    Same caching rules as load_daily.
+    """
+    cache = get_cache()
+    path = Path(path)
+    if (start is not None or end is not None) and not cache.cached('5min', path):
+        if not _exists(path):
+            return None
+        try:
+            ts_col = 'datetime' if 'datetime' in _schema(path).names else 'timestamp'
+            filters = datetime_filters(path, ts_col, start, end)
+        except Exception:
+            return None
+        return cache._load(path, _prepare_5min, filters, kind='5min')
+    df = cache.get('5min', path, _prepare_5min)
+    if df is None:
+        return None
+    if start is not None or end is not None:
+        day = df['day'].to_numpy()
+        lo = (pd.Timestamp(start) - pd.Timestamp(0)).days if start is not None else np.iinfo(np.int32).min
+        hi = (pd.Timestamp(end) - pd.Timestamp(0)).days if end is not None else np.iinfo(np.int32).max
+        # Rows are grouped by ascending day, so the range is one contiguous slice
+        return df.iloc[np.searchsorted(day, lo, 'left'):np.searchsorted(day, hi, 'right')].copy(deep=False)
+    return df.copy(deep=False)
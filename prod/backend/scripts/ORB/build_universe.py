@@ -22,7 +22,7 @@ sys.path.insert(0, ".")
 
 import argparse
 from pathlib import Path
-from datetime import date, time, datetime
+from datetime import date, time, datetime, timedelta
 from typing import Optional, List, Dict
 import pandas as pd
 import numpy as np
@@ -31,6 +31,23 @@ import duckdb
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing
 import gc
+from zoneinfo import ZoneInfo
+
+from scripts.ORB import bar_cache
+from scripts.ORB.bar_store import BAR_COLUMNS, bars_to_columns, convert_universe_file, is_columnar
+from scripts.ORB.sim_kernel import NS_PER_DAY, segment_first_true, time_to_ns
+from scripts.ORB.universe_store import (
+    advance_high_water_mark,
+    dataset_path,
+    high_water_mark,
+    is_dataset,
+    partition_universe_file,
+    read_manifest,
+    write_universe_days,
+)
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 
 # Data dirs
 DATA_DIR = Path(__file__).resolve().parents[4] / "data"
@@ -41,8 +58,15 @@ OUT_DIR.mkdir(parents=True, exist_ok=True)
 
 OR_START = time(9, 30)
 OR_END = time(16, 0)    # 4:00 PM ET closing time
+OR_START_NS = time_to_ns(OR_START)
+OR_END_NS = time_to_ns(OR_END)
+ET = ZoneInfo("America/New_York")
 
 
+BARS_FORMATS = ("columnar", "json")
+SCAN_MODES = ("single", "yearly")
+LAYOUTS = ("file", "dataset")
+
 ALL_CATEGORIES = [
     "micro",
     "small",
@@ -76,38 +100,20 @@ def list_trading_days(start: str, end: str) -> List[date]:
     return result
 
 
-def load_daily(symbol: str) -> Optional[pd.DataFrame]:
-    p = DATA_DIR_DAILY / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if 'date' not in df.columns or df.empty:
-            return None
-        # Ensure date is timezone-naive for comparison
-        df['date'] = pd.to_datetime(df['date']).dt.tz_localize(None)
-        return df
-    except Exception:
-        return None
+def last_completed_session(now: Optional[datetime] = None) -> date:
+    """Latest ET date whose regular session has closed (today after 16:00 ET, else yesterday)."""
+    now = now.astimezone(ET) if now is not None else datetime.now(ET)
+    return now.date() if now.time() >= OR_END else now.date() - timedelta(days=1)
 
 
-def load_5min_full(symbol: str) -> Optional[pd.DataFrame]:
-    """Load full 5-min history for a symbol."""
-    p = DATA_DIR_5MIN / f"{symbol}.parquet"
-    if not p.exists():
-        return None
-    try:
-        df = pd.read_parquet(p)
-        if df.empty or 'datetime' not in df.columns:
-            return None
-        
-        # Pre-calculate date and time columns for fast filtering
-        df['datetime'] = pd.to_datetime(df['datetime'])
-        df['date_et'] = df['datetime'].dt.date
-        df['time'] = df['datetime'].dt.time
-        return df
-    except Exception:
-        return None
+def load_daily(symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> Optional[pd.DataFrame]:
+    """Daily bars (tz-naive `date`), full history or only [start, end]. Cached, see bar_cache.py."""
+    return bar_cache.load_daily(DATA_DIR_DAILY / f"{symbol}.parquet", start, end)
+
+
+def load_5min_full(symbol: str, start: Optional[date] = None, end: Optional[date] = None) -> Optional[pd.DataFrame]:
+    """5-min history (with date_et/time/day/minute), full or only [start, end]. Cached, see bar_cache.py."""
+    return bar_cache.load_5min(DATA_DIR_5MIN / f"{symbol}.parquet", start, end)
 
 
 def extract_or(bars: pd.DataFrame) -> Optional[dict]:
@@ -155,16 +161,73 @@ def serialize_bars(bars: pd.DataFrame) -> str:
     return bars_clean.to_json(orient='records')
 
 
-def process_symbol_bulk(symbol: str, start_date: date, end_date: date, min_price: float, min_volume: int) -> List[dict]:
-    """Process a single symbol for the entire date range (Efficient I/O)."""
+def group_bars_by_day(df_5min: pd.DataFrame):
+    """Split a symbol's 5-min history into per-day blocks in one pass.
+
+    Returns:
+        (bars, day_keys, bounds, tod_ns): bars reordered so each ET trading day is
+        contiguous (file order kept within a day), the sorted day numbers
+        (days since epoch), block boundaries (day i = bars.iloc[bounds[i]:bounds[i+1]])
+        and each bar's ET time of day in ns.
+    """
+    dt = pd.to_datetime(df_5min['datetime'])
+    if getattr(dt.dt, 'tz', None) is not None:
+        dt = dt.dt.tz_localize(None)  # ET wall-clock, same as .dt.date / .dt.time
+    ns = dt.to_numpy(dtype='datetime64[ns]').view('int64')
+    day = ns // NS_PER_DAY
+
+    bars = df_5min
+    if len(day) > 1 and (np.diff(day) < 0).any():
+        order = np.argsort(day, kind='stable')
+        bars = df_5min.iloc[order]
+        day = day[order]
+        ns = ns[order]
+
+    day_keys, first_idx = np.unique(day, return_index=True)
+    bounds = np.append(first_idx, len(day)).astype(np.int64)
+    return bars, day_keys, bounds, ns % NS_PER_DAY
+
+
+def opening_range_index(tod_ns: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """Row of each day's opening-range bar (vectorised extract_or), or -1 if none.
+
+    Exact 9:30 bar first (first in file order); otherwise the earliest bar
+    inside regular hours (9:30-16:00 ET).
+    """
+    exact = segment_first_true(tod_ns == OR_START_NS, bounds)
+    rth = (tod_ns >= OR_START_NS) & (tod_ns <= OR_END_NS)
+    no_rth = np.iinfo(np.int64).max
+    earliest = np.minimum.reduceat(np.where(rth, tod_ns, no_rth), bounds[:-1]) if len(tod_ns) else np.empty(0, dtype=np.int64)
+    first_rth = segment_first_true(rth & (tod_ns == np.repeat(earliest, np.diff(bounds))), bounds)
+    rel = np.where(exact >= 0, exact, np.where(earliest < no_rth, first_rth, -1))
+    return np.where(rel >= 0, bounds[:-1] + rel, -1)
+
+
+def process_symbol_bulk(
+    symbol: str,
+    start_date: date,
+    end_date: date,
+    min_price: float,
+    min_volume: int,
+    bars_format: str = "columnar",
+) -> List[dict]:
+    """Process a single symbol for the entire date range (Efficient I/O).
+
+    The 5-min history is split into days once; OR, direction and RVOL are
+    computed for every day together, and only days passing all filters are
+    sliced and serialised.
+
+    bars_format: 'columnar' writes typed bar_* list columns (see bar_store.py);
+    'json' writes the legacy bars_json string.
+    """
     candidates = []
     
-    # 1. Load Data
-    df_daily = load_daily(symbol)
+    # 1. Load Data (only the requested range is read from disk)
+    df_daily = load_daily(symbol, start_date, end_date)
     if df_daily is None:
         return []
         
-    df_5min = load_5min_full(symbol)
+    df_5min = load_5min_full(symbol, start_date, end_date)
     if df_5min is None:
         return []
 
@@ -177,85 +240,236 @@ def process_symbol_bulk(symbol: str, start_date: date, end_date: date, min_price
     if df_daily_range.empty:
         return []
 
-    # 3. Iterate Days
-    for _, daily_row in df_daily_range.iterrows():
-        trading_date = daily_row['date'].date()
-        
-        # Metrics
-        atr_14 = float(daily_row['atr_14']) if pd.notna(daily_row['atr_14']) else None
-        avg_vol = float(daily_row['avg_volume_14']) if pd.notna(daily_row['avg_volume_14']) else None
-        shares = int(daily_row['shares_outstanding']) if pd.notna(daily_row['shares_outstanding']) else None
-        
-        # Pre-filters (Fast)
-        if not atr_14 or atr_14 < 0.50:
-            continue
-        if not avg_vol or avg_vol < min_volume:
-            continue
-            
-        # Get 5-min bars for this day (In-Memory Slice)
-        day_bars = df_5min[df_5min['date_et'] == trading_date].copy()
-        if day_bars.empty:
-            continue
-            
-        # Extract OR
-        or_data = extract_or(day_bars)
-        if not or_data:
-            continue
-            
-        # Price Filter
-        if or_data['or_open'] < min_price:
-            continue
-            
-        # Direction
-        if or_data['or_close'] > or_data['or_open']:
-            direction = 1
-        elif or_data['or_close'] < or_data['or_open']:
-            direction = -1
-        else:
-            continue
-            
-        # RVOL
-        rvol = compute_rvol(or_data['or_volume'], avg_vol)
-        if rvol < 1.0:
-            continue
-            
-        # Build Candidate
+    # 3. Pre-filters (Fast): ATR and average volume (NaN fails both)
+    atr = df_daily_range['atr_14'].to_numpy(dtype=float)
+    avg_vol = df_daily_range['avg_volume_14'].to_numpy(dtype=float)
+    keep = (atr >= 0.50) & (avg_vol >= min_volume) & (avg_vol != 0)
+
+    # 4. Locate each day's 5-min block and OR bar (one pass over the symbol)
+    bars, day_keys, bounds, tod_ns = group_bars_by_day(df_5min)
+    or_row_by_day = opening_range_index(tod_ns, bounds)
+
+    daily_days = df_daily_range['date'].to_numpy(dtype='datetime64[D]').view('int64')
+    pos = np.minimum(np.searchsorted(day_keys, daily_days), max(len(day_keys) - 1, 0))
+    has_day = (day_keys[pos] == daily_days) if len(day_keys) else np.zeros(len(daily_days), dtype=bool)
+    or_row = np.where(has_day, or_row_by_day[pos] if len(day_keys) else -1, -1)
+    keep &= or_row >= 0
+
+    # 5. OR metrics, price filter, direction and RVOL for all days at once
+    take = np.maximum(or_row, 0)
+    or_open = bars['open'].to_numpy(dtype=float)[take]
+    or_high = bars['high'].to_numpy(dtype=float)[take]
+    or_low = bars['low'].to_numpy(dtype=float)[take]
+    or_close = bars['close'].to_numpy(dtype=float)[take]
+    or_volume = bars['volume'].to_numpy(dtype=float)[take]
+
+    direction = np.sign(or_close - or_open).astype(int)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rvol = np.where(avg_vol > 0, (or_volume * 78.0) / avg_vol, 0.0)
+    keep &= (or_open >= min_price) & (direction != 0) & (rvol >= 1.0)
+
+    # 6. Build candidates (only survivors are sliced/serialised)
+    closes = df_daily_range['close'].to_numpy(dtype=float)
+    shares_col = df_daily_range['shares_outstanding'].to_numpy(dtype=float)
+    trade_dates = df_daily_range['date'].dt.date.to_numpy()
+    for i in np.flatnonzero(keep):
+        lo, hi = bounds[pos[i]], bounds[pos[i] + 1]
+        day_bars = bars.iloc[lo:hi]
+        shares = int(shares_col[i]) if pd.notna(shares_col[i]) else None
         candidate = {
-            'trade_date': trading_date,
+            'trade_date': trade_dates[i],
             'ticker': symbol,
-            'direction': direction,
-            'rvol': rvol,
-            'or_open': or_data['or_open'],
-            'or_high': or_data['or_high'],
-            'or_low': or_data['or_low'],
-            'or_close': or_data['or_close'],
-            'or_volume': or_data['or_volume'],
-            'atr_14': atr_14,
-            'avg_volume_14': avg_vol,
-            'prev_close': float(daily_row['close']), # Approx prev close logic simplified
+            'direction': int(direction[i]),
+            'rvol': float(rvol[i]),
+            'or_open': float(or_open[i]),
+            'or_high': float(or_high[i]),
+            'or_low': float(or_low[i]),
+            'or_close': float(or_close[i]),
+            'or_volume': float(or_volume[i]),
+            'atr_14': float(atr[i]),
+            'avg_volume_14': float(avg_vol[i]),
+            'prev_close': float(closes[i]), # Approx prev close logic simplified
             'shares_outstanding': shares,
-            'bars_json': serialize_bars(day_bars),
         }
+        if bars_format == "json":
+            candidate['bars_json'] = serialize_bars(day_bars)
+        else:
+            candidate.update(bars_to_columns(day_bars))
         candidates.append(candidate)
         
     return candidates
 
 
+def candidate_schema(bars_format: str = "columnar") -> pa.Schema:
+    """Arrow schema of the candidate batches returned by scan_symbol_arrow."""
+    fields = [
+        ('trade_date', pa.date32()),
+        ('ticker', pa.string()),
+        ('direction', pa.int64()),
+        ('rvol', pa.float64()),
+        ('or_open', pa.float64()),
+        ('or_high', pa.float64()),
+        ('or_low', pa.float64()),
+        ('or_close', pa.float64()),
+        ('or_volume', pa.float64()),
+        ('atr_14', pa.float64()),
+        ('avg_volume_14', pa.float64()),
+        ('prev_close', pa.float64()),
+        ('shares_outstanding', pa.float64()),  # null = unknown (matches the NaN pandas produced before)
+    ]
+    if bars_format == "json":
+        fields.append(('bars_json', pa.string()))
+    else:
+        fields.append(('bar_t', pa.list_(pa.int64())))
+        fields.extend((c, pa.list_(pa.float64())) for c in BAR_COLUMNS[1:])
+    return pa.schema(fields)
+
+
+def scan_symbol_arrow(
+    symbol: str,
+    start_date: date,
+    end_date: date,
+    min_price: float,
+    min_volume: int,
+    bars_format: str = "columnar",
+) -> Optional[pa.RecordBatch]:
+    """process_symbol_bulk over the full range, returned as one Arrow record batch.
+
+    Record batches cross the process boundary as raw column buffers, which is
+    far cheaper than pickling a list of dicts holding per-bar arrays.
+    """
+    candidates = process_symbol_bulk(symbol, start_date, end_date, min_price, min_volume, bars_format)
+    if not candidates:
+        return None
+    return pa.RecordBatch.from_pylist(candidates, schema=candidate_schema(bars_format))
+
+
+def rank_candidates(df_all: pd.DataFrame, categories: List[str], top_n: int = 50) -> Dict[str, List[pd.DataFrame]]:
+    """Top-N by RVOL per trade date, separately for each share-count category."""
+    results = {k: [] for k in categories}
+    
+    # Group by date to rank
+    for trade_date, group in df_all.groupby('trade_date'):
+        # Sort by RVOL
+        group = group.sort_values('rvol', ascending=False)
+
+        if 'all' in results:
+            top_all = group.head(top_n).copy()
+            top_all['rvol_rank'] = range(1, len(top_all) + 1)
+            results['all'].append(top_all)
+
+        if 'unknown' in results:
+            unknown = group[pd.isna(group['shares_outstanding'])]
+            top_unknown = unknown.head(top_n).copy()
+            top_unknown['rvol_rank'] = range(1, len(top_unknown) + 1)
+            results['unknown'].append(top_unknown)
+
+        if 'micro_unknown' in results:
+            micro_unknown = group[(group['shares_outstanding'] < 50_000_000) | (pd.isna(group['shares_outstanding']))]
+            top_micro_unknown = micro_unknown.head(top_n).copy()
+            top_micro_unknown['rvol_rank'] = range(1, len(top_micro_unknown) + 1)
+            results['micro_unknown'].append(top_micro_unknown)
+
+        if 'micro' in results:
+            micro = group[group['shares_outstanding'] < 50_000_000]
+            top_micro = micro.head(top_n).copy()
+            top_micro['rvol_rank'] = range(1, len(top_micro) + 1)
+            results['micro'].append(top_micro)
+
+        if 'small' in results:
+            small = group[(group['shares_outstanding'] >= 50_000_000) & (group['shares_outstanding'] < 150_000_000)]
+            top_small = small.head(top_n).copy()
+            top_small['rvol_rank'] = range(1, len(top_small) + 1)
+            results['small'].append(top_small)
+
+        if 'large' in results:
+            large = group[group['shares_outstanding'] >= 150_000_000]
+            top_large = large.head(top_n).copy()
+            top_large['rvol_rank'] = range(1, len(top_large) + 1)
+            results['large'].append(top_large)
+
+        if 'micro_small_unknown' in results:
+            msu = group[(group['shares_outstanding'] < 150_000_000) | (pd.isna(group['shares_outstanding']))]
+            top_msu = msu.head(top_n).copy()
+            top_msu['rvol_rank'] = range(1, len(top_msu) + 1)
+            results['micro_small_unknown'].append(top_msu)
+
+    return results
+
+
+def save_universe(
+    results: Dict[str, List[pd.DataFrame]],
+    universe_files: Dict[str, Path],
+    bars_format: str = "columnar",
+    layout: str = "file",
+    build: Optional[dict] = None,
+):
+    """Merge ranked candidates into the universe files (replacing overlapping dates).
+
+    layout 'dataset' writes year/month partitioned directories instead (see
+    universe_store.py): new days become new part files, nothing is rewritten.
+    """
+    for cat, dfs in results.items():
+        if not dfs:
+            continue
+        
+        new_df = pd.concat(dfs, ignore_index=True)
+        file_path = universe_files[cat]
+        
+        if layout == "dataset":
+            write_universe_days(dataset_path(file_path), new_df, build=build)
+        elif file_path.exists():
+            try:
+                if bars_format == "columnar" and not is_columnar(pq.read_schema(file_path)):
+                    # Upgrade legacy bars_json file so old and new rows share one schema
+                    convert_universe_file(file_path)
+                existing = pd.read_parquet(file_path)
+                # Remove overlapping dates from existing to avoid dupes
+                existing = existing[~existing['trade_date'].isin(new_df['trade_date'])]
+                combined = pd.concat([existing, new_df], ignore_index=True)
+                combined = combined.sort_values(['trade_date', 'rvol_rank'])
+                combined.to_parquet(file_path)
+            except Exception:
+                new_df.to_parquet(file_path)
+        else:
+            new_df.to_parquet(file_path)
+            
+        print(f"  ✓ {cat}: Saved {len(new_df)} rows")
+
+
 def build_universe_bulk(
-    start: str,
-    end: str,
+    start: Optional[str],
+    end: Optional[str],
     min_price: float,
     min_volume: int,
     workers: int = 1,
     top_n: int = 50,
     categories: Optional[List[str]] = None,
+    bars_format: str = "columnar",
+    scan_mode: str = "single",
+    layout: str = "file",
+    incremental: bool = False,
 ):
-    """Build universe using efficient symbol-centric processing in yearly chunks."""
-    start_dt = pd.Timestamp(start).date()
-    end_dt = pd.Timestamp(end).date()
-    
-    # Generate yearly chunks
-    years = range(start_dt.year, end_dt.year + 1)
+    """Build universe using efficient symbol-centric processing.
+
+    scan_mode 'single' reads each symbol's parquet once for the whole range and
+    ranks/saves year by year afterwards; 'yearly' is the legacy per-year scan
+    (lower peak memory, but every file is re-opened for each year).
+
+    incremental=True writes partitioned datasets and only scans the days after
+    the earliest high-water mark of the selected categories (start is then
+    optional). Existing single-file universes are partitioned on first use.
+    Datasets never go past the last completed session: a day still trading
+    would be stored under the high-water mark and never rebuilt.
+    """
+    if bars_format not in BARS_FORMATS:
+        raise ValueError(f"Invalid bars_format: {bars_format}. Allowed: {BARS_FORMATS}")
+    if scan_mode not in SCAN_MODES:
+        raise ValueError(f"Invalid scan_mode: {scan_mode}. Allowed: {SCAN_MODES}")
+    if layout not in LAYOUTS:
+        raise ValueError(f"Invalid layout: {layout}. Allowed: {LAYOUTS}")
+    if incremental:
+        layout = "dataset"
     
     all_universe_files = {
         "micro": OUT_DIR / "universe_micro.parquet",
@@ -275,127 +489,126 @@ def build_universe_bulk(
         raise ValueError(f"Invalid categories: {invalid}. Allowed: {ALL_CATEGORIES}")
 
     universe_files = {k: all_universe_files[k] for k in categories}
+    build = {"min_price": min_price, "min_volume": min_volume, "top_n": top_n, "bars_format": bars_format}
+
+    if incremental:
+        marks = []
+        for cat, file_path in universe_files.items():
+            dataset_dir = dataset_path(file_path)
+            if not is_dataset(dataset_dir) and file_path.exists():
+                print(f"Partitioning {file_path.name} -> {dataset_dir.name}/ (one-off)")
+                partition_universe_file(file_path, dataset_dir)
+            stored = read_manifest(dataset_dir).get("build")
+            if stored and stored != build:
+                print(f"  ! {cat}: built with {stored}, extending with {build}")
+            hwm = high_water_mark(dataset_dir)
+            print(f"  {cat}: high-water mark {hwm or '-'}")
+            marks.append(hwm)
+        if all(m is not None for m in marks):
+            start = str(min(marks) + timedelta(days=1))
+        elif start is None:
+            raise ValueError("--start is required when a category has no existing universe")
+    session_end = last_completed_session()
+    if end is None:
+        end = str(session_end)
+    elif layout == "dataset" and pd.Timestamp(end).date() > session_end:
+        print(f"End {end} clamped to {session_end} (last completed session)")
+        end = str(session_end)
+
+    start_dt = pd.Timestamp(start).date()
+    end_dt = pd.Timestamp(end).date()
+    if start_dt > end_dt:
+        print(f"Universe already up to date (through {end_dt})")
+        return
+    
+    # Generate yearly chunks
+    years = range(start_dt.year, end_dt.year + 1)
     
     symbols = [p.stem for p in DATA_DIR_DAILY.glob("*.parquet")]
     print(f"Processing {len(symbols)} symbols from {start} to {end}")
-    print(f"Workers: {workers}")
+    print(f"Workers: {workers} | Scan mode: {scan_mode}")
 
-    for year in years:
-        year_start = max(start_dt, date(year, 1, 1))
-        year_end = min(end_dt, date(year, 12, 31))
-        
-        if year_start > year_end:
-            continue
-            
-        print(f"\n=== Processing Year {year} ({year_start} to {year_end}) ===")
-        
-        # 1. Collect all candidates for the year
-        all_candidates = []
+    table = None
+    scanned_through = None  # last day that produced any candidate (i.e. had data)
+    if scan_mode == "single":
+        # 1. One pass per symbol over the full range; candidates come back as Arrow batches
+        batches = []
         with ProcessPoolExecutor(max_workers=workers) as executor:
             futures = {
-                executor.submit(process_symbol_bulk, sym, year_start, year_end, min_price, min_volume): sym 
+                executor.submit(scan_symbol_arrow, sym, start_dt, end_dt, min_price, min_volume, bars_format): sym
                 for sym in symbols
             }
-            
-            for future in tqdm(as_completed(futures), total=len(symbols), desc=f"Scanning {year}"):
+            for future in tqdm(as_completed(futures), total=len(symbols), desc="Scanning"):
                 try:
-                    res = future.result()
-                    if res:
-                        all_candidates.extend(res)
+                    batch = future.result()
+                    if batch is not None:
+                        batches.append(batch)
                 except Exception as e:
                     pass # logger.error(f"Error: {e}")
+        table = pa.Table.from_batches(batches, schema=candidate_schema(bars_format))
+        del batches
+        print(f"Collected {table.num_rows} candidates")
+        year_of = pc.year(table['trade_date'])
+
+    for year in years:
+        year_start = max(start_dt, date(year, 1, 1))
+        year_end = min(end_dt, date(year, 12, 31))
         
-        if not all_candidates:
-            print(f"No candidates found for {year}")
+        if year_start > year_end:
             continue
             
-        # 2. Group by Date and Rank
-        print(f"Ranking {len(all_candidates)} candidates...")
-        df_all = pd.DataFrame(all_candidates)
+        print(f"\n=== Processing Year {year} ({year_start} to {year_end}) ===")
         
-        # Categorize
-        results = {k: [] for k in universe_files.keys()}
+        if table is not None:
+            # 2a. Slice this year out of the single-pass scan
+            df_all = table.filter(pc.equal(year_of, year)).to_pandas()
+        else:
+            # 2b. Collect all candidates for the year
+            all_candidates = []
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = {
+                    executor.submit(process_symbol_bulk, sym, year_start, year_end, min_price, min_volume, bars_format): sym 
+                    for sym in symbols
+                }
+                
+                for future in tqdm(as_completed(futures), total=len(symbols), desc=f"Scanning {year}"):
+                    try:
+                        res = future.result()
+                        if res:
+                            all_candidates.extend(res)
+                    except Exception as e:
+                        pass # logger.error(f"Error: {e}")
+            df_all = pd.DataFrame(all_candidates)
+            del all_candidates
         
-        # Group by date to rank
-        for trade_date, group in df_all.groupby('trade_date'):
-            # Sort by RVOL
-            group = group.sort_values('rvol', ascending=False)
-
-            if 'all' in results:
-                top_all = group.head(top_n).copy()
-                top_all['rvol_rank'] = range(1, len(top_all) + 1)
-                results['all'].append(top_all)
-
-            if 'unknown' in results:
-                unknown = group[pd.isna(group['shares_outstanding'])]
-                top_unknown = unknown.head(top_n).copy()
-                top_unknown['rvol_rank'] = range(1, len(top_unknown) + 1)
-                results['unknown'].append(top_unknown)
-
-            if 'micro_unknown' in results:
-                micro_unknown = group[(group['shares_outstanding'] < 50_000_000) | (pd.isna(group['shares_outstanding']))]
-                top_micro_unknown = micro_unknown.head(top_n).copy()
-                top_micro_unknown['rvol_rank'] = range(1, len(top_micro_unknown) + 1)
-                results['micro_unknown'].append(top_micro_unknown)
-
-            if 'micro' in results:
-                micro = group[group['shares_outstanding'] < 50_000_000]
-                top_micro = micro.head(top_n).copy()
-                top_micro['rvol_rank'] = range(1, len(top_micro) + 1)
-                results['micro'].append(top_micro)
-
-            if 'small' in results:
-                small = group[(group['shares_outstanding'] >= 50_000_000) & (group['shares_outstanding'] < 150_000_000)]
-                top_small = small.head(top_n).copy()
-                top_small['rvol_rank'] = range(1, len(top_small) + 1)
-                results['small'].append(top_small)
-
-            if 'large' in results:
-                large = group[group['shares_outstanding'] >= 150_000_000]
-                top_large = large.head(top_n).copy()
-                top_large['rvol_rank'] = range(1, len(top_large) + 1)
-                results['large'].append(top_large)
-
-            if 'micro_small_unknown' in results:
-                msu = group[(group['shares_outstanding'] < 150_000_000) | (pd.isna(group['shares_outstanding']))]
-                top_msu = msu.head(top_n).copy()
-                top_msu['rvol_rank'] = range(1, len(top_msu) + 1)
-                results['micro_small_unknown'].append(top_msu)
-
-        # 3. Save/Append
-        for cat, dfs in results.items():
-            if not dfs:
-                continue
-            
-            new_df = pd.concat(dfs, ignore_index=True)
-            file_path = universe_files[cat]
+        if df_all.empty:
+            print(f"No candidates found for {year}")
+            continue
             
-            if file_path.exists():
-                try:
-                    existing = pd.read_parquet(file_path)
-                    # Remove overlapping dates from existing to avoid dupes
-                    existing = existing[~existing['trade_date'].isin(new_df['trade_date'])]
-                    combined = pd.concat([existing, new_df], ignore_index=True)
-                    combined = combined.sort_values(['trade_date', 'rvol_rank'])
-                    combined.to_parquet(file_path)
-                except Exception:
-                    new_df.to_parquet(file_path)
-            else:
-                new_df.to_parquet(file_path)
-                
-            print(f"  ✓ {cat}: Saved {len(new_df)} rows")
+        scanned_through = max(df_all['trade_date'])
+
+        # 3. Group by Date and Rank
+        print(f"Ranking {len(df_all)} candidates...")
+        results = rank_candidates(df_all, list(universe_files.keys()), top_n)
+
+        # 4. Save/Append
+        save_universe(results, universe_files, bars_format, layout=layout, build=build)
             
         # Clear memory
-        del all_candidates
         del df_all
         del results
         gc.collect()
 
+    if layout == "dataset" and scanned_through is not None:
+        # Categories with no rows on the last days must not rescan them next time
+        for file_path in universe_files.values():
+            advance_high_water_mark(dataset_path(file_path), scanned_through, build)
+
 
 def main():
     ap = argparse.ArgumentParser(description='Build ORB universe (ATR ≥ 0.50) efficiently')
-    ap.add_argument('--start', type=str, required=True, help='Start date (YYYY-MM-DD)')
-    ap.add_argument('--end', type=str, required=True, help='End date (YYYY-MM-DD)')
+    ap.add_argument('--start', type=str, default=None, help='Start date (YYYY-MM-DD); optional with --incremental')
+    ap.add_argument('--end', type=str, default=None, help='End date (YYYY-MM-DD, default: last completed session)')
     ap.add_argument('--min-price', type=float, default=5.0, help='Minimum share price (default: $5.00)')
     ap.add_argument('--min-volume', type=int, default=1_000_000, help='Minimum avg volume (default: 1M)')
     ap.add_argument('--top-n', type=int, default=50, help='Top N candidates per day (default: 50)')
@@ -408,7 +621,17 @@ def main():
     )
     ap.add_argument('--workers', type=int, default=max(1, multiprocessing.cpu_count() - 1),
                     help='Parallel workers (default: CPU count - 1)')
+    ap.add_argument('--bars-format', choices=BARS_FORMATS, default='columnar',
+                    help='Intraday bar storage: typed list columns (default) or legacy bars_json')
+    ap.add_argument('--scan-mode', choices=SCAN_MODES, default='single',
+                    help='single: read each symbol once for the whole range (default); yearly: legacy per-year rescans')
+    ap.add_argument('--layout', choices=LAYOUTS, default='file',
+                    help='file: one parquet per universe (default); dataset: year/month partitioned directory')
+    ap.add_argument('--incremental', action='store_true',
+                    help='Only scan days after each universe\'s high-water mark and append them (implies --layout dataset)')
     args = ap.parse_args()
+    if not args.incremental and not args.start:
+        ap.error('--start is required unless --incremental is set')
 
     build_universe_bulk(
         args.start,
@@ -418,6 +641,10 @@ def main():
         args.workers,
         top_n=args.top_n,
         categories=args.categories,
+        bars_format=args.bars_format,
+        scan_mode=args.scan_mode,
+        layout=args.layout,
+        incremental=args.incremental,
     )
 
 
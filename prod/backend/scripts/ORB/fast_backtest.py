@@ -21,6 +21,10 @@ from tqdm import tqdm
 import json
 
 from scripts.ORB.analyse_run import write_run_summary_md
+from scripts.ORB.bar_store import UniverseBars, candidate_bars, load_candidate_bars, scan_universe
+from scripts.ORB.sim_kernel import (
+    EXIT_STOP, NS_PER_DAY, NS_PER_SECOND, bar_time_ns, find_entry_exit, find_entry_exit_batch, ns_to_time, time_to_ns,
+)
 from core.config import settings
 
 # Position sizing defaults (Permanent Reality Lock)
@@ -39,6 +43,13 @@ ORB_RUNS_DIR = DATA_DIR / "backtest" / "orb" / "runs"
 ORB_RUNS_DIR.mkdir(parents=True, exist_ok=True)
 
 OR_START = time(9, 30)
+OR_START_NS = time_to_ns(OR_START)
+
+# 'numpy' = array-scan kernel (default); 'loop' = legacy iterrows walk kept for parity checks
+SIM_ENGINES = ("numpy", "loop")
+# run_strategy only: scan every candidate in one pass, then a per-day compounding pass
+BATCH_ENGINE = "batch"
+RUN_ENGINES = SIM_ENGINES + (BATCH_ENGINE,)
 
 
 def resolve_run_dir(run_name: str, *, compound: bool) -> Path:
@@ -52,6 +63,18 @@ def resolve_run_dir(run_name: str, *, compound: bool) -> Path:
     return ORB_RUNS_DIR / group / run_name
 
 
+def parse_entry_cutoff(entry_cutoff: str):
+    """'HH:MM' -> time (None if unset or malformed)."""
+    if not entry_cutoff:
+        return None
+    try:
+        h, m = map(int, entry_cutoff.split(":"))
+        return time(h, m)
+    except ValueError:
+        print(f"Warning: Invalid entry cutoff format {entry_cutoff}")
+        return None
+
+
 def deserialize_bars(bars_data) -> pd.DataFrame:
     """Deserialize bars from list or JSON string."""
     if isinstance(bars_data, str):
@@ -84,7 +107,9 @@ def simulate_trade(
     comm_min: float = 0.99,
     free_exits: bool = False,
     max_share_cap: int = None,
-    limit_retest: bool = False
+    limit_retest: bool = False,
+    entry_cutoff: time = None,
+    engine: str = "numpy"
 ) -> dict:
     """Simulate trade execution with stop, EOD exit, and spread costs.
     
@@ -93,36 +118,108 @@ def simulate_trade(
         spread_pct: Percentage cost added to entry and subtracted from exit (half-spread).
         max_share_cap: Absolute maximum number of shares per trade (e.g. 199).
         max_pct_volume: Max percentage of daily volume allowed for position size (0.01 = 1%).
+        entry_cutoff: Cancel the entry order if it has not filled by this bar time.
+        engine: 'numpy' (array-scan kernel, default) or 'loop' (legacy per-bar walk, for parity checks).
     """
+    if engine not in SIM_ENGINES:
+        raise ValueError(f"Unknown sim engine: {engine} (expected one of {SIM_ENGINES})")
+
+    def get_execution_price(base_price, is_buy):
+        return _execution_price(base_price, is_buy, spread_pct, min_tick)
+
+    if engine == "loop":
+        fill = _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price)
+    else:
+        fill = _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price)
+
+    if not fill['entered']:
+        return {'entered': False, 'exit_reason': fill['exit_reason']}
+
+    return _build_trade_result(
+        bars, direction,
+        fill['entry_price'], fill['entry_time'],
+        fill['exit_price'], fill['exit_time'], fill['exit_reason'],
+        position_size=position_size,
+        leverage=leverage,
+        apply_leverage=apply_leverage,
+        max_pct_volume=max_pct_volume,
+        comm_share=comm_share,
+        comm_min=comm_min,
+        free_exits=free_exits,
+        max_share_cap=max_share_cap,
+    )
+
+
+def _execution_price(base_price, is_buy, spread_pct, min_tick):
+    # Spread is effectively: Max(Percentage, Minimum Tick)
+    spread_amt = max(base_price * spread_pct, min_tick)
+    if is_buy:
+        return base_price + spread_amt
+    else:
+        return base_price - spread_amt
+
+
+def _find_fill_numpy(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price) -> dict:
+    """Array-scan entry/exit detection (see scripts/ORB/sim_kernel.py)."""
+    t_ns = bar_time_ns(bars)
+    post_or = t_ns > OR_START_NS
+    if not post_or.any():
+        return {'entered': False, 'exit_reason': 'NO_BARS'}
+
+    high = bars['high'].to_numpy(dtype=float)[post_or]
+    low = bars['low'].to_numpy(dtype=float)[post_or]
+    t_post = t_ns[post_or]
+    entry_idx, exit_idx, reason = find_entry_exit(
+        high, low, t_post, direction, entry_level, stop_level,
+        limit_retest=limit_retest,
+        cutoff_ns=time_to_ns(entry_cutoff) if entry_cutoff else None,
+    )
+    if entry_idx < 0:
+        return {'entered': False, 'exit_reason': reason}
+
+    if limit_retest:
+        # Limit fill at the entry level (no spread penalty on entry).
+        entry_price = float(entry_level)
+    else:
+        entry_price = get_execution_price(entry_level, is_buy=(direction == 1))
+
+    if reason == EXIT_STOP:
+        # Long Stop: Sell at Bid / Short Stop: Buy at Ask
+        exit_price = get_execution_price(stop_level, is_buy=(direction != 1))
+    else:
+        raw_close = float(bars['close'].to_numpy()[post_or][-1])
+        exit_price = get_execution_price(raw_close, is_buy=(direction != 1))
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': ns_to_time(t_post[entry_idx]),
+        'exit_price': exit_price,
+        'exit_time': ns_to_time(t_post[exit_idx]),
+        'exit_reason': reason,
+    }
+
+
+def _find_fill_loop(bars, direction, entry_level, stop_level, limit_retest, entry_cutoff, get_execution_price) -> dict:
+    """Legacy per-bar iterrows() walk. Kept for parity checks against the NumPy kernel."""
     trade_bars = bars[bars['time'] > OR_START].copy()
     if trade_bars.empty:
         return {'entered': False, 'exit_reason': 'NO_BARS'}
     
-    # Calculate volume cap
-    total_daily_volume = bars['volume'].sum()
-    max_allowed_shares = total_daily_volume * max_pct_volume
-    
     in_trade = False
     entry_price = None
     entry_time = None
     exit_price = None
     exit_time = None
     exit_reason = None
-    
-    # Adjust entry/stop levels for spread and tick logic
-    # Spread is effectively: Max(Percentage, Minimum Tick)
-    
-    # Helper to calculate execution price with spread impact
-    def get_execution_price(base_price, is_buy):
-        # Base spread amount
-        spread_amt = max(base_price * spread_pct, min_tick)
-        if is_buy:
-            return base_price + spread_amt
-        else:
-            return base_price - spread_amt
 
     triggered = False
     for _, bar in trade_bars.iterrows():
+        # Check Entry Cutoff (only if not in trade)
+        if not in_trade and entry_cutoff and bar['time'] >= entry_cutoff:
+            # Cancel order if not filled by cutoff (an armed limit retest is cancelled too)
+            return {'entered': False, 'exit_reason': 'CUTOFF_CANCEL'}
+
         if not in_trade:
             if not limit_retest:
                 # Standard breakout entry (assume marketable execution).
@@ -181,7 +278,87 @@ def simulate_trade(
     
     if not in_trade:
         return {'entered': False, 'exit_reason': 'NO_ENTRY'}
+
+    return {
+        'entered': True,
+        'entry_price': entry_price,
+        'entry_time': entry_time,
+        'exit_price': exit_price,
+        'exit_time': exit_time,
+        'exit_reason': exit_reason,
+    }
+
+
+def _build_trade_result(
+    bars: pd.DataFrame,
+    direction: int,
+    entry_price: float,
+    entry_time,
+    exit_price: float,
+    exit_time,
+    exit_reason: str,
+    position_size: float,
+    leverage: float,
+    apply_leverage: bool,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+) -> dict:
+    """Size the position and compute P&L/commission for a filled trade."""
+    first_bar, last_bar = bars.iloc[0], bars.iloc[-1]
+    sized = _size_position(
+        direction, entry_price, exit_price,
+        total_daily_volume=bars['volume'].sum(),
+        position_size=position_size,
+        leverage=leverage,
+        apply_leverage=apply_leverage,
+        max_pct_volume=max_pct_volume,
+        comm_share=comm_share,
+        comm_min=comm_min,
+        free_exits=free_exits,
+        max_share_cap=max_share_cap,
+    )
+    day_change_pct = round((float(last_bar['close']) - float(first_bar['open'])) / float(first_bar['open']) * 100.0, 2)
     
+    return {
+        'entered': True,
+        'entry_price': round(entry_price, 4),
+        'entry_time': entry_time.strftime('%H:%M'),
+        'exit_price': round(exit_price, 4),
+        'exit_time': exit_time.strftime('%H:%M'),
+        'exit_reason': exit_reason,
+        'pnl_pct': sized['pnl_pct'],
+        'dollar_pnl': sized['dollar_pnl'],
+        'base_dollar_pnl': sized['base_dollar_pnl'],
+        'commission': sized['commission'],
+        'day_change_pct': day_change_pct,
+        'position_size': sized['position_size'],
+        'is_capped': sized['is_capped'],
+        'cap_ratio': sized['cap_ratio'],
+        'shares': sized['shares'],
+    }
+
+
+def _size_position(
+    direction: int,
+    entry_price: float,
+    exit_price: float,
+    total_daily_volume: float,
+    position_size: float,
+    leverage: float,
+    apply_leverage: bool,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+) -> dict:
+    """Share count, commission and (rounded) P&L for a filled trade. Needs no bars."""
+    # Calculate volume cap
+    max_allowed_shares = total_daily_volume * max_pct_volume
+
     direction_sign = 1 if direction == 1 else -1
     price_move = (exit_price - entry_price) * direction_sign
     
@@ -229,21 +406,11 @@ def simulate_trade(
     # Keep Base PnL as Unleveraged Return for stats consistency, but NET of fees now
     base_dollar_pnl = net_dollar_pnl / leverage if apply_leverage else net_dollar_pnl
     
-    first_bar, last_bar = bars.iloc[0], bars.iloc[-1]
-    day_change_pct = round((float(last_bar['close']) - float(first_bar['open'])) / float(first_bar['open']) * 100.0, 2)
-    
     return {
-        'entered': True,
-        'entry_price': round(entry_price, 4),
-        'entry_time': entry_time.strftime('%H:%M'),
-        'exit_price': round(exit_price, 4),
-        'exit_time': exit_time.strftime('%H:%M'),
-        'exit_reason': exit_reason,
         'pnl_pct': round(net_pnl_pct, 2),
         'dollar_pnl': round(net_dollar_pnl, 2),
         'base_dollar_pnl': round(base_dollar_pnl, 2),
         'commission': round(total_comm, 2),
-        'day_change_pct': day_change_pct,
         'position_size': round(actual_margin_used, 2),
         'is_capped': is_capped,
         'cap_ratio': round(actual_shares / target_shares, 2) if target_shares > 0 else 1.0,
@@ -251,98 +418,34 @@ def simulate_trade(
     }
 
 
-def run_strategy(
-    universe_path: Path,
-    min_atr: float,
-    min_volume: int,
-    top_n: int,
-    side_filter: str,
-    run_name: str,
-    compound: bool = False,
-    risk_per_trade: float = 0.01,
-    verbose: bool = False,
-    max_pct_volume: float = 1.0,
-    initial_capital: float = INITIAL_CAPITAL,
-    regime_file: str = None,
-    start_date: str = None,
-    end_date: str = None,
-    dow_filter: str = None,  # 'skip_midweek', 'skip_tue'
-    risk_scale: float = 1.0, # 1.0 = 100% allocation, 0.5 = 50% allocation (cash buffer)
-    stop_atr_scale: float = 0.10, # Stop loss as fraction of ATR (0.10 = 10% of ATR)
-    spread_pct: float = None, # Override global spread pct
-    free_exits: bool = False, # If True, assume Limit Order exits with 0 commission
-    max_share_cap: int = None,
-    leverage: float = LEVERAGE,
-    comm_share: float = 0.005,
-    comm_min: float = 0.99,
-    limit_retest: bool = False,
-    sizing_mode: str = "equal", # 'equal' or 'risk'
-    risk_per_trade_pct: float = 0.01 # used if sizing_mode='risk'
+def _simulate_universe_rows(
+    df_filtered: pd.DataFrame,
+    universe_bars,
+    *,
+    compound: bool,
+    initial_capital: float,
+    leverage: float,
+    risk_scale: float,
+    stop_atr_scale: float,
+    spread_pct: float,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+    limit_retest: bool,
+    sizing_mode: str,
+    risk_per_trade_pct: float,
+    regime_data: dict = None,
+    dow_filter: str = None,
+    entry_cutoff: time = None,
+    sim_engine: str = "numpy",
 ):
-    """Run strategy on pre-built universe."""
-    
-    # Use global DEFAULT if no override provided
-    run_spread_pct = spread_pct if spread_pct is not None else SPREAD_PCT
+    """Per-day, per-row simulation via simulate_trade (sim_engine='numpy' or 'loop').
 
-    # Load Regime Data if present
-    regime_data = None
-    if regime_file:
-        print(f"Loading regime filter: {regime_file}")
-        try:
-            regime_df = pd.read_parquet(regime_file)
-            regime_df['date'] = pd.to_datetime(regime_df['date']).dt.normalize()
-            regime_data = regime_df.set_index('date')['is_bullish'].to_dict()
-        except Exception as e:
-            print(f"Warning: Failed to load regime file: {e}")
-
-    print(f"Loading universe: {universe_path}")
-    df_universe = pd.read_parquet(universe_path)
-
-    # Standardize column names (handle 'date' vs 'trade_date', 'symbol' vs 'ticker')
-    if 'date' in df_universe.columns and 'trade_date' not in df_universe.columns:
-        df_universe = df_universe.rename(columns={'date': 'trade_date'})
-    if 'symbol' in df_universe.columns and 'ticker' not in df_universe.columns:
-        df_universe = df_universe.rename(columns={'symbol': 'ticker'})
-
-    print(f"  Total candidates: {len(df_universe):,}")
-
-    # Optional date range filter (inclusive). Expects YYYY-MM-DD.
-    if start_date or end_date:
-        df_universe = df_universe.copy()
-        df_universe['trade_date'] = pd.to_datetime(df_universe['trade_date']).dt.date
-        if start_date:
-            start_dt = pd.to_datetime(start_date).date()
-            df_universe = df_universe[df_universe['trade_date'] >= start_dt]
-        if end_date:
-            end_dt = pd.to_datetime(end_date).date()
-            df_universe = df_universe[df_universe['trade_date'] <= end_dt]
-        print(f"  After date filter ({start_date or '...'} -> {end_date or '...'}): {len(df_universe):,}")
-    
-    # Apply runtime filters (ATR/volume thresholds can be tighter than universe build)
-    df_filtered = df_universe[
-        (df_universe['atr_14'] >= min_atr) &
-        (df_universe['avg_volume_14'] >= min_volume)
-    ].copy()
-    print(f"  After runtime filters (ATR >= {min_atr}, Vol >= {min_volume:,}): {len(df_filtered):,}")
-    
-    # Apply side filter
-    if side_filter == 'long':
-        df_filtered = df_filtered[df_filtered['direction'] == 1].copy()
-        print(f"  After LONG-only filter: {len(df_filtered):,}")
-    elif side_filter == 'short':
-        df_filtered = df_filtered[df_filtered['direction'] == -1].copy()
-        print(f"  After SHORT-only filter: {len(df_filtered):,}")
-    
-    # Re-rank by RVOL per day and take Top-N
-    df_filtered = df_filtered.sort_values(['trade_date', 'rvol'], ascending=[True, False])
-    df_filtered = df_filtered.groupby('trade_date').head(top_n).reset_index(drop=True)
-    print(f"  After Top-{top_n} per day: {len(df_filtered):,}")
-    
-    if df_filtered.empty:
-        print("No candidates after filters.")
-        return
-    
-    # Simulate trades
+    Returns:
+        (results, equity_curve, yearly_results, final_equity)
+    """
     results = []
     equity_curve = []
     yearly_results = []  # Track yearly performance
@@ -452,7 +555,7 @@ def run_strategy(
         allocation_per_trade = allocation_pool / num_trades_today if num_trades_today > 0 else 0
         
         for _, row in day_df.iterrows():
-            bars = deserialize_bars(row['bars_json'])
+            bars = candidate_bars(row, universe_bars, with_time=(sim_engine == "loop"))
             
             # Determine entry and stop
             # Entry: Break of OR High (Long) or OR Low (Short)
@@ -495,14 +598,16 @@ def run_strategy(
                 position_size=position_size, 
                 leverage=leverage,
                 apply_leverage=apply_lev,
-                spread_pct=run_spread_pct,
+                spread_pct=spread_pct,
                 max_pct_volume=max_pct_volume,
                 min_tick=0.01,
                 comm_share=comm_share,
                 comm_min=comm_min,
                 free_exits=free_exits,
                 max_share_cap=max_share_cap,
-                limit_retest=limit_retest
+                limit_retest=limit_retest,
+                entry_cutoff=entry_cutoff,
+                engine=sim_engine
             )
             
             trade_pnl = sim.get('dollar_pnl', 0.0) or 0.0
@@ -569,6 +674,487 @@ def run_strategy(
             'year_pnl': year_pnl,
             'year_return_pct': (year_pnl / year_start_equity) * 100 if year_start_equity > 0 else 0,
         })
+
+    return results, equity_curve, yearly_results, current_equity
+
+
+def _is_skip_day(current_date_ts: pd.Timestamp, regime_data: dict, dow_filter: str) -> bool:
+    """Day-of-week and bearish-regime skip rules (same as the per-row loop in run_strategy)."""
+    dow = current_date_ts.dayofweek
+    if dow_filter == 'skip_midweek' and dow in (1, 2, 3):
+        return True
+    if dow_filter == 'skip_tue' and dow == 1:
+        return True
+    if regime_data:
+        ts_norm = current_date_ts.normalize()
+        if ts_norm in regime_data and not regime_data[ts_norm]:
+            return True
+    return False
+
+
+def _hhmm(t_ns: int) -> str:
+    minutes = int(t_ns) // (60 * NS_PER_SECOND)
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def _simulate_universe_batch(
+    df_filtered: pd.DataFrame,
+    universe_bars,
+    *,
+    compound: bool,
+    initial_capital: float,
+    leverage: float,
+    risk_scale: float,
+    stop_atr_scale: float,
+    spread_pct: float,
+    max_pct_volume: float,
+    comm_share: float,
+    comm_min: float,
+    free_exits: bool,
+    max_share_cap: int,
+    limit_retest: bool,
+    sizing_mode: str,
+    risk_per_trade_pct: float,
+    regime_data: dict = None,
+    dow_filter: str = None,
+    entry_cutoff: time = None,
+    verbose: bool = True,
+):
+    """Simulate every candidate at once (sim_engine='batch').
+
+    Entry/stop/EOD bars for all candidates come from one find_entry_exit_batch
+    call over the packed post-OR bars. Only sizing and the compounding equity
+    recurrence remain sequential, in a cheap per-day pass over plain floats.
+    Produces the same trades, equity curve and yearly results as the per-row loop.
+
+    Returns:
+        (df_trades, equity_curve, yearly_results, final_equity)
+    """
+    n = len(df_filtered)
+    # Pack the selected candidates' bars into flat arrays
+    if universe_bars is not None:
+        packed = universe_bars.take(df_filtered['bar_row'].to_numpy())
+    else:
+        packed = UniverseBars.from_frames([candidate_bars(row, with_time=False) for _, row in df_filtered.iterrows()])
+
+    offsets = packed.offsets
+    has_bars = np.diff(offsets) > 0
+    seg_first = np.minimum(offsets[:-1], max(len(packed.open) - 1, 0))
+    seg_last = np.maximum(offsets[1:] - 1, 0)
+    volume_cum = np.concatenate([[0.0], np.cumsum(packed.volume)])
+    total_volume = (volume_cum[offsets[1:]] - volume_cum[offsets[:-1]]).tolist()
+    day_open = packed.open[seg_first].tolist() if len(packed.open) else [0.0] * n
+    day_close = packed.close[seg_last].tolist() if len(packed.close) else [0.0] * n
+
+    # Post-OR view of the same candidates
+    t_day = packed.t_ns % NS_PER_DAY
+    post_or = t_day > OR_START_NS
+    post_offsets = np.concatenate([[0], np.cumsum(post_or)])[offsets]
+    post_t = t_day[post_or]
+    post_close = packed.close[post_or]
+
+    # Python floats so entry/stop/sizing arithmetic matches the per-row path exactly
+    direction = df_filtered['direction'].to_numpy()
+    or_high = df_filtered['or_high'].tolist()
+    or_low = df_filtered['or_low'].tolist()
+    atr = df_filtered['atr_14'].tolist()
+    dirs = direction.tolist()
+    entry_levels = [h if d == 1 else l for d, h, l in zip(dirs, or_high, or_low)]
+    stop_levels = [
+        (e - stop_atr_scale * a) if d == 1 else (e + stop_atr_scale * a)
+        for d, e, a in zip(dirs, entry_levels, atr)
+    ]
+
+    entry_idx, exit_idx, reasons = find_entry_exit_batch(
+        post_offsets, packed.high[post_or], packed.low[post_or], post_t,
+        direction, np.asarray(entry_levels, dtype=float), np.asarray(stop_levels, dtype=float),
+        limit_retest=limit_retest,
+        cutoff_ns=time_to_ns(entry_cutoff) if entry_cutoff else None,
+    )
+    post_start = post_offsets[:-1]
+    has_post = np.diff(post_offsets) > 0
+    entry_abs = np.where(entry_idx >= 0, post_start + entry_idx, 0)
+    exit_abs = np.where(exit_idx >= 0, post_start + exit_idx, 0)
+    entry_t = post_t[entry_abs].tolist() if len(post_t) else [0] * n
+    exit_t = post_t[exit_abs].tolist() if len(post_t) else [0] * n
+    eod_close = post_close[np.maximum(post_offsets[1:] - 1, 0)].tolist() if len(post_close) else [0.0] * n
+    entered = ((entry_idx >= 0) & has_post & has_bars).tolist()
+    reasons = np.where(has_post, reasons, 'NO_BARS').tolist()
+    is_stop = [r == EXIT_STOP for r in reasons]
+
+    sim_cols = {k: [None] * n for k in (
+        'exit_price', 'entry_time', 'exit_time', 'pnl_pct', 'day_change_pct',
+        'dollar_pnl', 'base_dollar_pnl', 'position_size',
+    )}
+    is_capped = [False] * n
+    cap_ratio = [1.0] * n
+    shares = [0] * n
+    comm_total = [0.0] * n
+    keep = np.ones(n, dtype=bool)
+
+    equity_curve = []
+    yearly_results = []
+    current_equity = initial_capital
+    current_year = None
+    year_start_equity = initial_capital
+
+    # df_filtered is sorted by trade_date, so each day is a contiguous block
+    dates = df_filtered['trade_date']
+    day_codes, day_keys = pd.factorize(dates, sort=True)
+    day_bounds = np.searchsorted(day_codes, np.arange(len(day_keys) + 1))
+
+    for d, trade_date in enumerate(day_keys):
+        start, end = int(day_bounds[d]), int(day_bounds[d + 1])
+        current_date_ts = pd.to_datetime(trade_date)
+        skip_day = _is_skip_day(current_date_ts, regime_data, dow_filter)
+
+        # Check for year change - just for reporting, NO RESET
+        trade_year = current_date_ts.year
+        if compound and current_year is not None and trade_year != current_year:
+            year_pnl = current_equity - year_start_equity
+            yearly_results.append({
+                'year': current_year,
+                'start_equity': year_start_equity,
+                'end_equity': current_equity,
+                'year_pnl': year_pnl,
+                'year_return_pct': (year_pnl / year_start_equity) * 100 if year_start_equity > 0 else 0,
+            })
+            year_start_equity = current_equity
+        current_year = trade_year
+
+        if skip_day:
+            keep[start:end] = False
+            equity_curve.append({
+                 'date': trade_date,
+                 'trades': 0,
+                 'entered': 0,
+                 'winners': 0,
+                 'losers': 0,
+                 'total_base_pnl': 0.0,
+                 'total_leveraged_pnl': 0.0,
+                 'daily_pnl': 0.0,
+                 'equity': current_equity 
+            })
+            continue
+
+        day_equity_start = current_equity
+        day_pnl = 0.0
+        num_trades_today = end - start
+        allocation_pool = current_equity * leverage * risk_scale
+        allocation_per_trade = allocation_pool / num_trades_today if num_trades_today > 0 else 0
+
+        for i in range(start, end):
+            if not entered[i]:
+                continue
+            dir_i = dirs[i]
+            entry_level = entry_levels[i]
+            stop_level = stop_levels[i]
+
+            if compound:
+                stop_dist_abs = abs(entry_level - stop_level)
+                if sizing_mode == 'risk' and stop_dist_abs > 0:
+                    position_size = min((current_equity * risk_per_trade_pct) / stop_dist_abs * entry_level,
+                                        current_equity * leverage)
+                else:
+                    position_size = allocation_per_trade
+                apply_lev = False
+            else:
+                position_size = initial_capital
+                apply_lev = True
+
+            if limit_retest:
+                entry_price = float(entry_level)
+            else:
+                entry_price = _execution_price(entry_level, dir_i == 1, spread_pct, 0.01)
+            exit_base = stop_level if is_stop[i] else eod_close[i]
+            exit_price = _execution_price(exit_base, dir_i != 1, spread_pct, 0.01)
+
+            sized = _size_position(
+                dir_i, entry_price, exit_price,
+                total_daily_volume=total_volume[i],
+                position_size=position_size,
+                leverage=leverage,
+                apply_leverage=apply_lev,
+                max_pct_volume=max_pct_volume,
+                comm_share=comm_share,
+                comm_min=comm_min,
+                free_exits=free_exits,
+                max_share_cap=max_share_cap,
+            )
+            if compound:
+                day_pnl += sized['dollar_pnl']
+
+            sim_cols['exit_price'][i] = round(exit_price, 4)
+            sim_cols['entry_time'][i] = _hhmm(entry_t[i])
+            sim_cols['exit_time'][i] = _hhmm(exit_t[i])
+            sim_cols['pnl_pct'][i] = sized['pnl_pct']
+            sim_cols['day_change_pct'][i] = round((day_close[i] - day_open[i]) / day_open[i] * 100.0, 2)
+            sim_cols['dollar_pnl'][i] = sized['dollar_pnl']
+            sim_cols['base_dollar_pnl'][i] = sized['base_dollar_pnl']
+            sim_cols['position_size'][i] = sized['position_size']
+            is_capped[i] = sized['is_capped']
+            cap_ratio[i] = sized['cap_ratio']
+            shares[i] = sized['shares']
+            comm_total[i] = sized['commission']
+
+        # Update equity at end of day (for compounding)
+        if compound:
+            current_equity = day_equity_start + day_pnl
+            if current_equity <= 0:
+                if verbose:
+                    print(f"\n[ALERT] Account blown on {trade_date}! Equity: ${current_equity:.2f}")
+                current_equity = 0.01  # minimum to continue
+
+        equity_curve.append({
+            'date': trade_date,
+            'equity': round(current_equity, 2),
+            'day_pnl': round(day_pnl, 2),
+        })
+
+    if compound and current_year is not None:
+        year_pnl = current_equity - year_start_equity
+        yearly_results.append({
+            'year': current_year,
+            'start_equity': year_start_equity,
+            'end_equity': current_equity,
+            'year_pnl': year_pnl,
+            'year_return_pct': (year_pnl / year_start_equity) * 100 if year_start_equity > 0 else 0,
+        })
+
+    dollar_pnl = [p if p is not None else 0.0 for p in sim_cols['dollar_pnl']]
+    trades = {
+        'trade_date': dates.tolist(),
+        'ticker': df_filtered['ticker'].tolist(),
+        'side': ['LONG' if d == 1 else 'SHORT' for d in dirs],
+        'rvol_rank': df_filtered['rvol_rank'].tolist(),
+        'rvol': [round(r, 2) for r in df_filtered['rvol'].tolist()],
+        'or_open': df_filtered['or_open'].tolist(),
+        'or_high': or_high,
+        'or_low': or_low,
+        'or_close': df_filtered['or_close'].tolist(),
+        'or_volume': df_filtered['or_volume'].tolist(),
+        'entry_price': entry_levels,
+        'stop_price': stop_levels,
+        'exit_price': sim_cols['exit_price'],
+        'exit_reason': reasons,
+        'entry_time': sim_cols['entry_time'],
+        'exit_time': sim_cols['exit_time'],
+        'pnl_pct': sim_cols['pnl_pct'],
+        'day_change_pct': sim_cols['day_change_pct'],
+        'stop_distance_pct': [round(abs(e - s) / e * 100.0, 3) for e, s in zip(entry_levels, stop_levels)],
+        'leverage': [LEVERAGE] * n,
+        'dollar_pnl': sim_cols['dollar_pnl'],
+        'base_dollar_pnl': sim_cols['base_dollar_pnl'],
+        'position_size': sim_cols['position_size'],
+        'atr_14': atr,
+        'avg_volume_14': df_filtered['avg_volume_14'].tolist(),
+        'prev_close': df_filtered['prev_close'].tolist(),
+        'is_capped': is_capped,
+        'cap_ratio': cap_ratio,
+        'shares': shares,
+        'comm_total': comm_total,
+        'pnl_net': dollar_pnl,
+        # Gross = Net + Comm
+        'pnl_gross': [p + c for p, c in zip(dollar_pnl, comm_total)],
+    }
+    df_trades = pd.DataFrame(trades)[keep].reset_index(drop=True)
+    return df_trades, equity_curve, yearly_results, current_equity
+
+
+def select_candidates(
+    df_universe: pd.DataFrame,
+    min_atr: float,
+    min_volume: int,
+    top_n: int,
+    side_filter: str,
+    start_date: str = None,
+    end_date: str = None,
+    verbose: bool = True,
+) -> pd.DataFrame:
+    """Apply date/ATR/volume/side filters and keep the Top-N by RVOL per day."""
+    log = print if verbose else (lambda *args, **kwargs: None)
+
+    # Standardize column names (handle 'date' vs 'trade_date', 'symbol' vs 'ticker')
+    if 'date' in df_universe.columns and 'trade_date' not in df_universe.columns:
+        df_universe = df_universe.rename(columns={'date': 'trade_date'})
+    if 'symbol' in df_universe.columns and 'ticker' not in df_universe.columns:
+        df_universe = df_universe.rename(columns={'symbol': 'ticker'})
+
+    log(f"  Total candidates: {len(df_universe):,}")
+
+    # Optional date range filter (inclusive). Expects YYYY-MM-DD.
+    if start_date or end_date:
+        df_universe = df_universe.copy()
+        df_universe['trade_date'] = pd.to_datetime(df_universe['trade_date']).dt.date
+        if start_date:
+            start_dt = pd.to_datetime(start_date).date()
+            df_universe = df_universe[df_universe['trade_date'] >= start_dt]
+        if end_date:
+            end_dt = pd.to_datetime(end_date).date()
+            df_universe = df_universe[df_universe['trade_date'] <= end_dt]
+        log(f"  After date filter ({start_date or '...'} -> {end_date or '...'}): {len(df_universe):,}")
+    
+    # Apply runtime filters (ATR/volume thresholds can be tighter than universe build)
+    df_filtered = df_universe[
+        (df_universe['atr_14'] >= min_atr) &
+        (df_universe['avg_volume_14'] >= min_volume)
+    ].copy()
+    log(f"  After runtime filters (ATR >= {min_atr}, Vol >= {min_volume:,}): {len(df_filtered):,}")
+    
+    # Apply side filter
+    if side_filter == 'long':
+        df_filtered = df_filtered[df_filtered['direction'] == 1].copy()
+        log(f"  After LONG-only filter: {len(df_filtered):,}")
+    elif side_filter == 'short':
+        df_filtered = df_filtered[df_filtered['direction'] == -1].copy()
+        log(f"  After SHORT-only filter: {len(df_filtered):,}")
+    
+    # Re-rank by RVOL per day and take Top-N
+    df_filtered = df_filtered.sort_values(['trade_date', 'rvol'], ascending=[True, False])
+    df_filtered = df_filtered.groupby('trade_date').head(top_n).reset_index(drop=True)
+    log(f"  After Top-{top_n} per day: {len(df_filtered):,}")
+    return df_filtered
+
+
+def summarise_trades(df_trades: pd.DataFrame) -> dict:
+    """Entered count, win rate (%), profit factor and total P&L for a trades frame."""
+    entered = df_trades[df_trades['exit_reason'] != 'NO_ENTRY']
+    total_entered = len(entered)
+    winners = entered[entered['pnl_pct'] > 0]
+    losers = entered[entered['pnl_pct'] < 0]
+    win_rate = (len(winners) / total_entered * 100) if total_entered else 0
+    total_pnl_base = entered['base_dollar_pnl'].sum()
+    total_pnl_leveraged = entered['dollar_pnl'].sum()
+    
+    # Profit factor
+    gross_profit = winners['base_dollar_pnl'].sum() if not winners.empty else 0
+    gross_loss = abs(losers['base_dollar_pnl'].sum()) if not losers.empty else 0
+    profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (gross_profit if gross_profit > 0 else 0)
+    return {
+        'entered': total_entered,
+        'win_rate': win_rate,
+        'profit_factor': profit_factor,
+        'total_pnl_base': total_pnl_base,
+        'total_pnl_leveraged': total_pnl_leveraged,
+    }
+
+
+def run_strategy(
+    universe_path: Path,
+    min_atr: float,
+    min_volume: int,
+    top_n: int,
+    side_filter: str,
+    run_name: str,
+    compound: bool = False,
+    risk_per_trade: float = 0.01,
+    verbose: bool = False,
+    max_pct_volume: float = 1.0,
+    initial_capital: float = INITIAL_CAPITAL,
+    regime_file: str = None,
+    start_date: str = None,
+    end_date: str = None,
+    dow_filter: str = None,  # 'skip_midweek', 'skip_tue'
+    risk_scale: float = 1.0, # 1.0 = 100% allocation, 0.5 = 50% allocation (cash buffer)
+    stop_atr_scale: float = 0.10, # Stop loss as fraction of ATR (0.10 = 10% of ATR)
+    spread_pct: float = None, # Override global spread pct
+    free_exits: bool = False, # If True, assume Limit Order exits with 0 commission
+    max_share_cap: int = None,
+    leverage: float = LEVERAGE,
+    comm_share: float = 0.005,
+    comm_min: float = 0.99,
+    limit_retest: bool = False,
+    sizing_mode: str = "equal", # 'equal' or 'risk'
+    risk_per_trade_pct: float = 0.01, # used if sizing_mode='risk'
+    sim_engine: str = "numpy", # 'numpy' (default), 'loop' (legacy, parity checks) or 'batch' (whole universe at once)
+    entry_cutoff: str = None, # 'HH:MM' - cancel entries not filled by this time
+):
+    """Run strategy on pre-built universe."""
+    if sim_engine not in RUN_ENGINES:
+        raise ValueError(f"Unknown sim engine: {sim_engine} (expected one of {RUN_ENGINES})")
+    
+    # Use global DEFAULT if no override provided
+    run_spread_pct = spread_pct if spread_pct is not None else SPREAD_PCT
+
+    cutoff_time = parse_entry_cutoff(entry_cutoff)
+    if cutoff_time:
+        print(f"Entry Cutoff Active: Orders cancel if not filled by {cutoff_time}")
+
+    # Load Regime Data if present
+    regime_data = None
+    if regime_file:
+        print(f"Loading regime filter: {regime_file}")
+        try:
+            regime_df = pd.read_parquet(regime_file)
+            regime_df['date'] = pd.to_datetime(regime_df['date']).dt.normalize()
+            regime_data = regime_df.set_index('date')['is_bullish'].to_dict()
+        except Exception as e:
+            print(f"Warning: Failed to load regime file: {e}")
+
+    print(f"Loading universe: {universe_path}")
+    # Date/ATR/volume/side filters are pushed down to the parquet scan; bars are not read yet
+    df_universe = scan_universe(
+        universe_path, start_date=start_date, end_date=end_date,
+        min_atr=min_atr, min_volume=min_volume, side=side_filter,
+    )
+
+    df_filtered = select_candidates(
+        df_universe, min_atr, min_volume, top_n, side_filter,
+        start_date=start_date, end_date=end_date,
+    )
+    
+    if df_filtered.empty:
+        print("No candidates after filters.")
+        return
+
+    # Bar payloads only for the Top-N rows that survived ranking.
+    # Columnar universes return a UniverseBars handle; legacy files keep bars_json
+    df_filtered, universe_bars = load_candidate_bars(universe_path, df_filtered)
+    
+    if sim_engine == BATCH_ENGINE:
+        print(f"Simulating trades in one batch (Stop: {stop_atr_scale*100:.1f}% ATR, mode={'COMPOUND' if compound else 'FIXED'}, vol_cap={max_pct_volume*100:.1f}%, start_equity=${initial_capital:,.2f})...")
+        results, equity_curve, yearly_results, current_equity = _simulate_universe_batch(
+            df_filtered, universe_bars,
+            compound=compound,
+            initial_capital=initial_capital,
+            leverage=leverage,
+            risk_scale=risk_scale,
+            stop_atr_scale=stop_atr_scale,
+            spread_pct=run_spread_pct,
+            max_pct_volume=max_pct_volume,
+            comm_share=comm_share,
+            comm_min=comm_min,
+            free_exits=free_exits,
+            max_share_cap=max_share_cap,
+            limit_retest=limit_retest,
+            sizing_mode=sizing_mode,
+            risk_per_trade_pct=risk_per_trade_pct,
+            regime_data=regime_data,
+            dow_filter=dow_filter,
+            entry_cutoff=cutoff_time,
+        )
+    else:
+        results, equity_curve, yearly_results, current_equity = _simulate_universe_rows(
+            df_filtered, universe_bars,
+            compound=compound,
+            initial_capital=initial_capital,
+            leverage=leverage,
+            risk_scale=risk_scale,
+            stop_atr_scale=stop_atr_scale,
+            spread_pct=run_spread_pct,
+            max_pct_volume=max_pct_volume,
+            comm_share=comm_share,
+            comm_min=comm_min,
+            free_exits=free_exits,
+            max_share_cap=max_share_cap,
+            limit_retest=limit_retest,
+            sizing_mode=sizing_mode,
+            risk_per_trade_pct=risk_per_trade_pct,
+            regime_data=regime_data,
+            dow_filter=dow_filter,
+            entry_cutoff=cutoff_time,
+            sim_engine=sim_engine,
+        )
     
     # Save trades
     df_trades = pd.DataFrame(results)
@@ -592,6 +1178,8 @@ def run_strategy(
         "comm_min": float(comm_min),
         "free_exits": bool(free_exits),
         "limit_retest": bool(limit_retest),
+        "sim_engine": sim_engine,
+        "entry_cutoff": str(cutoff_time) if cutoff_time else None,
     }
     (run_dir / "run_config.json").write_text(json.dumps(run_config, indent=2), encoding="utf-8")
 
@@ -635,17 +1223,12 @@ def run_strategy(
     write_run_summary_md(run_dir)
     
     # Summary stats
-    total_entered = len(entered)
-    winners = entered[entered['pnl_pct'] > 0]
-    losers = entered[entered['pnl_pct'] < 0]
-    win_rate = (len(winners) / total_entered * 100) if total_entered else 0
-    total_pnl_base = entered['base_dollar_pnl'].sum()
-    total_pnl_leveraged = entered['dollar_pnl'].sum()
-    
-    # Profit factor
-    gross_profit = winners['base_dollar_pnl'].sum() if not winners.empty else 0
-    gross_loss = abs(losers['base_dollar_pnl'].sum()) if not losers.empty else 0
-    profit_factor = (gross_profit / gross_loss) if gross_loss > 0 else (gross_profit if gross_profit > 0 else 0)
+    stats = summarise_trades(df_trades)
+    total_entered = stats['entered']
+    win_rate = stats['win_rate']
+    profit_factor = stats['profit_factor']
+    total_pnl_base = stats['total_pnl_base']
+    total_pnl_leveraged = stats['total_pnl_leveraged']
     
     print(f"\n{'='*60}")
     print(f"Run: {run_name}")
@@ -700,6 +1283,8 @@ def main():
     ap.add_argument('--end-date', type=str, default=None, help='End date (YYYY-MM-DD), inclusive')
     ap.add_argument('--sizing-mode', type=str, default='equal', choices=['equal', 'risk'], help='Position sizing mode')
     ap.add_argument('--risk-pct', type=float, default=0.01, help='Risk per trade as decimal (0.01 = 1%%)')
+    ap.add_argument('--entry-cutoff', type=str, default=None, help='Entry cutoff time (HH:MM). Cancel orders if no entry by this time.')
+    ap.add_argument('--sim-engine', type=str, default='numpy', choices=list(RUN_ENGINES), help='Trade simulator: numpy kernel (default), legacy loop (parity checks) or batch (whole universe in one pass)')
     
     args = ap.parse_args()
     
@@ -741,7 +1326,9 @@ def main():
         start_date=args.start_date,
         end_date=args.end_date,
         sizing_mode=args.sizing_mode,
-        risk_per_trade_pct=args.risk_pct
+        risk_per_trade_pct=args.risk_pct,
+        sim_engine=args.sim_engine,
+        entry_cutoff=args.entry_cutoff,
     )
 
 
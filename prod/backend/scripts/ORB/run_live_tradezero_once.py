@@ -33,6 +33,13 @@ async def main_async(scan: bool, generate: bool, execute: bool) -> int:
     strategy = get_strategy_config()
     executor = get_executor()
 
+    # TradeZero: log in in the background while scan/generate run, so execution finds a warm session
+    broker = (getattr(settings, "EXECUTION_BROKER", "") or "").lower().strip()
+    if broker == "tradezero" and not settings.TRADEZERO_DRY_RUN:
+        from execution.tradezero.session_pool import get_session_pool
+
+        get_session_pool().start()
+
     if scan:
         scan_res = await scan_orb_candidates(
             top_n=int(strategy["top_n"]),
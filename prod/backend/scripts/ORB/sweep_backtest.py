@@ -0,0 +1,323 @@
+"""
+Parallel parameter sweep for the ORB fast backtester.
+
+Loads the universe once, copies its bar arrays into shared memory and fans a
+parameter grid out over a process pool. Each combination runs the batch engine
+(fast_backtest.run_strategy(sim_engine="batch") without writing a run folder)
+and contributes one row to a consolidated parquet:
+final equity, return, max drawdown, win rate, profit factor, trade counts.
+
+Sweepable parameters (each flag takes one or more values; the grid is the
+cartesian product): stop_atr_scale, top_n, min_atr, min_volume, leverage,
+spread_pct, entry_cutoff, sizing_mode.
+
+The results file is rewritten after every finished combination, so an
+interrupted sweep resumes by re-running the same command: combinations already
+in the file are skipped.
+
+Usage:
+    cd prod/backend
+    python scripts/ORB/sweep_backtest.py --universe universe_micro_small.parquet \\
+        --stop-atr-scale 0.05 0.10 0.20 --top-n 5 10 20 --min-atr 0.25 0.50 \\
+        --entry-cutoff none 10:00 10:30 --workers 8 --out sweep_micro_small.parquet
+"""
+import sys
+sys.path.insert(0, ".")
+
+import argparse
+import itertools
+import json
+import os
+import time as time_mod
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from scripts.ORB.bar_store import (
+    UniverseBars,
+    attach_universe_bars,
+    candidate_bars,
+    load_candidate_bars,
+    scan_universe,
+    share_universe_bars,
+)
+from scripts.ORB.fast_backtest import (
+    DATA_DIR,
+    INITIAL_CAPITAL,
+    LEVERAGE,
+    ORB_RUNS_DIR,
+    ORB_UNIVERSE_DIR,
+    SPREAD_PCT,
+    _simulate_universe_batch,
+    parse_entry_cutoff,
+    select_candidates,
+    summarise_trades,
+)
+
+SWEEP_DIR = ORB_RUNS_DIR / "sweeps"
+
+GRID_PARAMS = (
+    "stop_atr_scale", "top_n", "min_atr", "min_volume",
+    "leverage", "spread_pct", "entry_cutoff", "sizing_mode",
+)
+
+# Per-process state populated by _init_worker
+_WORKER: Dict = {}
+
+
+def build_grid(values: Dict[str, list]) -> List[dict]:
+    """Cartesian product of the per-parameter value lists, in GRID_PARAMS order."""
+    names = list(GRID_PARAMS)
+    return [dict(zip(names, combo)) for combo in itertools.product(*(values[n] for n in names))]
+
+
+def max_drawdown_pct(equity: np.ndarray) -> float:
+    """Largest peak-to-trough drop of an equity series, in % (negative)."""
+    if len(equity) == 0:
+        return 0.0
+    peak = np.maximum.accumulate(equity)
+    return float(((equity - peak) / peak).min() * 100)
+
+
+def combo_id(combo: dict, fixed: dict) -> str:
+    """Stable key for resume: grid values plus the fixed run settings."""
+    return json.dumps({**fixed, **combo}, sort_keys=True, default=str)
+
+
+def evaluate_combo(df_universe: pd.DataFrame, bars: UniverseBars, combo: dict, fixed: dict) -> dict:
+    """Run one grid point with the batch engine and return its summary row."""
+    started = time_mod.perf_counter()
+    initial_capital = fixed["initial_capital"]
+    row = {**combo, "combo_id": combo_id(combo, fixed)}
+
+    df_filtered = select_candidates(
+        df_universe, combo["min_atr"], combo["min_volume"], combo["top_n"], fixed["side"],
+        start_date=fixed["start_date"], end_date=fixed["end_date"], verbose=False,
+    )
+    if df_filtered.empty:
+        row.update(
+            final_equity=initial_capital, total_return_pct=0.0, max_dd_pct=0.0, win_rate=0.0,
+            profit_factor=0.0, candidates=0, entered=0, elapsed_s=time_mod.perf_counter() - started,
+        )
+        return row
+
+    df_trades, equity_curve, _, final_equity = _simulate_universe_batch(
+        df_filtered, bars,
+        compound=fixed["compound"],
+        initial_capital=initial_capital,
+        leverage=combo["leverage"],
+        risk_scale=1.0,
+        stop_atr_scale=combo["stop_atr_scale"],
+        spread_pct=combo["spread_pct"],
+        max_pct_volume=fixed["max_pct_volume"],
+        comm_share=fixed["comm_share"],
+        comm_min=fixed["comm_min"],
+        free_exits=fixed["free_exits"],
+        max_share_cap=fixed["max_share_cap"],
+        limit_retest=fixed["limit_retest"],
+        sizing_mode=combo["sizing_mode"],
+        risk_per_trade_pct=fixed["risk_pct"],
+        entry_cutoff=parse_entry_cutoff(combo["entry_cutoff"]),
+        verbose=False,
+    )
+    stats = summarise_trades(df_trades)
+
+    if fixed["compound"]:
+        equity = np.array([day["equity"] for day in equity_curve], dtype=float)
+    else:
+        # Fixed sizing never updates equity during the run; rebuild it from daily P&L
+        daily_pnl = df_trades.groupby("trade_date")["dollar_pnl"].sum()
+        equity = initial_capital + daily_pnl.cumsum().to_numpy(dtype=float)
+        final_equity = initial_capital + float(stats["total_pnl_leveraged"])
+    # Start the curve at the initial capital so a losing first day counts as drawdown
+    equity = np.r_[initial_capital, equity]
+
+    row.update(
+        final_equity=round(float(final_equity), 2),
+        total_return_pct=round((final_equity - initial_capital) / initial_capital * 100.0, 2),
+        max_dd_pct=round(max_drawdown_pct(equity), 2),
+        win_rate=round(float(stats["win_rate"]), 2),
+        profit_factor=round(float(stats["profit_factor"]), 3),
+        candidates=len(df_filtered),
+        entered=int(stats["entered"]),
+        elapsed_s=round(time_mod.perf_counter() - started, 3),
+    )
+    return row
+
+
+def _init_worker(df_universe: pd.DataFrame, spec: dict, fixed: dict):
+    blocks, bars = attach_universe_bars(spec)
+    _WORKER.update(df=df_universe, bars=bars, blocks=blocks, fixed=fixed)
+
+
+def _run_worker(combo: dict) -> dict:
+    return evaluate_combo(_WORKER["df"], _WORKER["bars"], combo, _WORKER["fixed"])
+
+
+def load_sweep_universe(universe_path: Path, grid: List[dict], side: str,
+                        start_date: str = None, end_date: str = None):
+    """Read the universe once, only the rows any grid point could select (filters pushed down).
+
+    Returns (df, bars) with df.bar_row indexing the repacked bars.
+    """
+    df = scan_universe(
+        universe_path,
+        start_date=start_date,
+        end_date=end_date,
+        min_atr=min(c["min_atr"] for c in grid),
+        min_volume=min(c["min_volume"] for c in grid),
+        side=side,
+    )
+    if 'date' in df.columns and 'trade_date' not in df.columns:
+        df = df.rename(columns={'date': 'trade_date'})
+    if 'symbol' in df.columns and 'ticker' not in df.columns:
+        df = df.rename(columns={'symbol': 'ticker'})
+    df, bars = load_candidate_bars(universe_path, df)
+
+    if bars is None:
+        # Legacy bars_json universe: decode once here instead of in every combination
+        bars = UniverseBars.from_frames([candidate_bars(row, with_time=False) for _, row in df.iterrows()])
+        df = df.drop(columns=["bars_json"])
+    df["bar_row"] = np.arange(len(df), dtype=np.int64)
+    return df, bars
+
+
+def _write_results(rows: List[dict], out_path: Path):
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    pd.DataFrame(rows).to_parquet(tmp, index=False)
+    tmp.replace(out_path)
+
+
+def run_sweep(universe_path: Path, grid: List[dict], fixed: dict, out_path: Path, workers: int = 1,
+              log=print) -> List[dict]:
+    """Run every grid point not already in `out_path` and return all result rows.
+
+    The results parquet is rewritten after each finished combination, so an
+    interrupted sweep picks up where it stopped when called again.
+    """
+    # Resume: keep finished rows, run only the missing combinations
+    rows: List[dict] = []
+    if out_path.exists():
+        rows = pd.read_parquet(out_path).to_dict("records")
+    done = {r["combo_id"] for r in rows}
+    pending = [c for c in grid if combo_id(c, fixed) not in done]
+    log(f"Grid: {len(grid)} combinations ({len(grid) - len(pending)} already in {out_path.name}, {len(pending)} to run)")
+    if not pending:
+        return rows
+
+    log(f"Loading universe once: {universe_path}")
+    df_universe, bars = load_sweep_universe(
+        universe_path, grid, fixed["side"], start_date=fixed["start_date"], end_date=fixed["end_date"],
+    )
+    log(f"  Candidates after loosest filters: {len(df_universe):,} ({len(bars.t_ns):,} bars)")
+
+    started = time_mod.perf_counter()
+    if workers <= 1:
+        for i, combo in enumerate(pending, 1):
+            rows.append(evaluate_combo(df_universe, bars, combo, fixed))
+            _write_results(rows, out_path)
+            log(f"  [{i}/{len(pending)}] {combo} -> ${rows[-1]['final_equity']:,.2f}")
+    else:
+        blocks, spec = share_universe_bars(bars)
+        del bars
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(df_universe, spec, fixed),
+            ) as pool:
+                futures = {pool.submit(_run_worker, combo): combo for combo in pending}
+                for i, fut in enumerate(as_completed(futures), 1):
+                    rows.append(fut.result())
+                    _write_results(rows, out_path)
+                    log(f"  [{i}/{len(pending)}] {futures[fut]} -> ${rows[-1]['final_equity']:,.2f}")
+        finally:
+            for shm in blocks:
+                shm.close()
+                shm.unlink()
+
+    elapsed = time_mod.perf_counter() - started
+    log(f"\nRan {len(pending)} combinations in {elapsed:,.1f}s ({elapsed / len(pending):.2f}s each)")
+    return rows
+
+
+def _parse_cutoff_arg(value: str):
+    return None if value.lower() in ("none", "off", "") else value
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Parallel parameter sweep over fast_backtest (batch engine)")
+    ap.add_argument('--universe', type=str, required=True, help='Universe parquet filename')
+    ap.add_argument('--out', type=str, default=None, help='Results parquet (in runs/sweeps/ unless a path). Default: sweep_<universe>.parquet')
+    ap.add_argument('--workers', type=int, default=max(1, (os.cpu_count() or 2) - 1), help='Worker processes (1 = run in-process)')
+
+    # Grid (one or more values each)
+    ap.add_argument('--stop-atr-scale', type=float, nargs='+', default=[0.10])
+    ap.add_argument('--top-n', type=int, nargs='+', default=[20])
+    ap.add_argument('--min-atr', type=float, nargs='+', default=[0.50])
+    ap.add_argument('--min-volume', type=int, nargs='+', default=[100_000])
+    ap.add_argument('--leverage', type=float, nargs='+', default=[LEVERAGE])
+    ap.add_argument('--spread-pct', type=float, nargs='+', default=[SPREAD_PCT])
+    ap.add_argument('--entry-cutoff', type=_parse_cutoff_arg, nargs='+', default=[None], help="HH:MM values; 'none' = no cutoff")
+    ap.add_argument('--sizing-mode', type=str, nargs='+', default=['equal'], choices=['equal', 'risk'])
+
+    # Fixed settings
+    ap.add_argument('--side', choices=['long', 'short', 'both'], default='both')
+    ap.add_argument('--no-compound', action='store_false', dest='compound')
+    ap.set_defaults(compound=True)
+    ap.add_argument('--initial-capital', type=float, default=INITIAL_CAPITAL)
+    ap.add_argument('--max-pct-volume', type=float, default=0.01)
+    ap.add_argument('--comm-share', type=float, default=0.005)
+    ap.add_argument('--comm-min', type=float, default=0.99)
+    ap.add_argument('--free-exits', action='store_true')
+    ap.add_argument('--max-share-cap', type=int, default=None)
+    ap.add_argument('--limit-retest', action='store_true')
+    ap.add_argument('--risk-pct', type=float, default=0.01, help='Risk per trade for sizing_mode=risk')
+    ap.add_argument('--start-date', type=str, default=None)
+    ap.add_argument('--end-date', type=str, default=None)
+    args = ap.parse_args()
+
+    universe_path = ORB_UNIVERSE_DIR / args.universe
+    if not universe_path.exists():
+        legacy_path = DATA_DIR / "backtest" / args.universe
+        if legacy_path.exists():
+            universe_path = legacy_path
+        else:
+            print(f"Universe not found: {universe_path}")
+            return
+
+    out_name = args.out or f"sweep_{universe_path.stem}.parquet"
+    out_path = Path(out_name) if Path(out_name).parent != Path(".") else SWEEP_DIR / out_name
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fixed = {
+        "universe_file": universe_path.name,
+        "side": args.side,
+        "compound": args.compound,
+        "initial_capital": args.initial_capital,
+        "max_pct_volume": args.max_pct_volume,
+        "comm_share": args.comm_share,
+        "comm_min": args.comm_min,
+        "free_exits": args.free_exits,
+        "max_share_cap": args.max_share_cap,
+        "limit_retest": args.limit_retest,
+        "risk_pct": args.risk_pct,
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+    }
+    grid = build_grid({name: getattr(args, name) for name in GRID_PARAMS})
+
+    rows = run_sweep(universe_path, grid, fixed, out_path, workers=args.workers)
+    if not rows:
+        return
+
+    df_results = pd.DataFrame(rows).sort_values("final_equity", ascending=False)
+    cols = list(GRID_PARAMS) + ["final_equity", "max_dd_pct", "win_rate", "profit_factor", "entered"]
+    print("\nTop 10 by final equity:")
+    print(df_results[cols].head(10).to_string(index=False))
+    print(f"\nResults: {out_path}")
+
+
+if __name__ == "__main__":
+    main()
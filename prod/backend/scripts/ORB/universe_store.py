@@ -0,0 +1,181 @@
+"""
+Partitioned (hive year/month) storage for ORB universes.
+
+A single-file universe has to be read and rewritten in full to add one day.
+A universe dataset is a directory instead:
+
+    universe_micro/
+        _manifest.json                      high-water mark + build settings
+        year=2025/month=12/part-20251201_20251209.parquet
+        year=2025/month=12/part-20251210_20251210.parquet
+
+Appending days after the high-water mark only writes new part files; dates
+that overlap existing data rewrite just the affected month.
+`bar_store.read_universe` accepts the directory wherever a universe file was
+accepted and returns the same frame (sorted by trade_date, rvol_rank; no
+`year`/`month` columns).
+
+Usage (one-shot migration of an existing universe file):
+    cd prod/backend
+    python scripts/ORB/universe_store.py --partition universe_micro.parquet
+"""
+import sys
+sys.path.insert(0, ".")
+
+import argparse
+import json
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+DATA_DIR = Path(__file__).resolve().parents[4] / "data"
+ORB_UNIVERSE_DIR = DATA_DIR / "backtest" / "orb" / "universe"
+
+MANIFEST_NAME = "_manifest.json"
+PARTITION_KEYS = ("year", "month")
+
+
+def dataset_path(file_path: Path) -> Path:
+    """universe_micro.parquet -> universe_micro (dataset directory)."""
+    return file_path.with_suffix("") if file_path.suffix == ".parquet" else file_path
+
+
+def is_dataset(path: Path) -> bool:
+    return Path(path).is_dir()
+
+
+def read_manifest(path: Path) -> dict:
+    p = Path(path) / MANIFEST_NAME
+    if not p.exists():
+        return {}
+    return json.loads(p.read_text())
+
+
+def high_water_mark(path: Path) -> Optional[date]:
+    """Last trade_date stored in a universe dataset (None if empty/missing)."""
+    hwm = read_manifest(path).get("high_water_mark")
+    return date.fromisoformat(hwm) if hwm else None
+
+
+def _write_manifest(path: Path, hwm: Optional[date], rows: int, build: Optional[dict]):
+    manifest = read_manifest(path)
+    manifest.update({
+        "high_water_mark": hwm.isoformat() if hwm else None,
+        "rows": rows,
+        "updated_at": datetime.now().isoformat(timespec="seconds"),
+    })
+    if build:
+        manifest["build"] = build
+    tmp = path / (MANIFEST_NAME + ".tmp")
+    tmp.write_text(json.dumps(manifest, indent=2, default=str))
+    tmp.replace(path / MANIFEST_NAME)
+
+
+def _to_table(df: pd.DataFrame) -> pa.Table:
+    df = df.drop(columns=[c for c in PARTITION_KEYS if c in df.columns])
+    if "shares_outstanding" in df.columns:
+        # int64 when a chunk has no unknowns, float64 otherwise; pin one type across parts
+        df = df.assign(shares_outstanding=df["shares_outstanding"].astype("float64"))
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def _part_name(dates: pd.Series) -> str:
+    return f"part-{min(dates):%Y%m%d}_{max(dates):%Y%m%d}.parquet"
+
+
+def write_universe_days(path: Path, df: pd.DataFrame, build: Optional[dict] = None) -> int:
+    """Add ranked candidate rows to a universe dataset, replacing any dates already stored.
+
+    Months whose new dates all lie after the stored data get a new part file
+    (no read); months with overlapping dates are rewritten. Returns rows written.
+    """
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    if df.empty:
+        return 0
+
+    old_hwm = high_water_mark(path)
+    sort_cols = ["trade_date", "rvol_rank"] if "rvol_rank" in df.columns else ["trade_date"]
+    trade_dates = pd.to_datetime(df["trade_date"])
+    for (year, month), part in df.groupby([trade_dates.dt.year, trade_dates.dt.month]):
+        part_dir = path / f"year={year}" / f"month={month:02d}"
+        part = part.sort_values(sort_cols)
+        existing_files = sorted(part_dir.glob("*.parquet")) if part_dir.exists() else []
+
+        if existing_files and (old_hwm is None or min(part["trade_date"]) <= old_hwm):
+            # Overlap/backfill: rewrite the month as one file
+            existing = pd.concat([pd.read_parquet(f) for f in existing_files], ignore_index=True)
+            existing = existing[~existing["trade_date"].isin(part["trade_date"])]
+            merged = pd.concat([existing, part], ignore_index=True).sort_values(sort_cols)
+            tmp = part_dir / "_rewrite.parquet.tmp"
+            pq.write_table(_to_table(merged), tmp)
+            for f in existing_files:
+                f.unlink()
+            tmp.replace(part_dir / _part_name(merged["trade_date"]))
+            continue
+
+        # New days after the high-water mark: append a part file, nothing is read
+        part_dir.mkdir(parents=True, exist_ok=True)
+        pq.write_table(_to_table(part), part_dir / _part_name(part["trade_date"]))
+
+    advance_high_water_mark(path, max(df["trade_date"]), build)
+    return len(df)
+
+
+def advance_high_water_mark(path: Path, through: date, build: Optional[dict] = None):
+    """Record that every day up to `through` has been scanned (even days that added no rows)."""
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    hwm = max(high_water_mark(path) or date.min, through)
+    rows = ds.dataset(path, format="parquet", partitioning="hive").count_rows() if any(path.rglob("*.parquet")) else 0
+    _write_manifest(path, hwm, rows, build)
+
+
+def read_universe_table(path: Path, columns: Optional[List[str]] = None) -> pa.Table:
+    """Read a universe dataset as one table sorted by (trade_date, rvol_rank), without partition keys."""
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    names = [n for n in dataset.schema.names if n not in PARTITION_KEYS]
+    if columns is not None:
+        names = [n for n in names if n in columns]
+    table = dataset.to_table(columns=names)
+    sort_keys = [(k, "ascending") for k in ("trade_date", "rvol_rank") if k in table.schema.names]
+    return table.sort_by(sort_keys) if sort_keys else table
+
+
+def dataset_schema(path: Path) -> pa.Schema:
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    return pa.schema([f for f in dataset.schema if f.name not in PARTITION_KEYS])
+
+
+def partition_universe_file(src: Path, dst: Optional[Path] = None) -> int:
+    """Split a single-file universe into a dataset directory. Returns rows written."""
+    dst = dst or dataset_path(src)
+    if is_dataset(dst) and any(dst.rglob("*.parquet")):
+        raise FileExistsError(f"{dst} already holds a universe dataset")
+    df = pd.read_parquet(src)
+    return write_universe_days(dst, df, build=read_manifest(dst).get("build"))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Convert universe parquet files into year/month partitioned datasets")
+    ap.add_argument("--partition", nargs="+", required=True, help="Universe parquet filenames (relative to ORB universe dir) or paths")
+    args = ap.parse_args()
+
+    for name in args.partition:
+        src = ORB_UNIVERSE_DIR / name
+        if not src.exists():
+            src = Path(name)
+        if not src.is_file():
+            print(f"Universe file not found: {name}")
+            continue
+        n = partition_universe_file(src)
+        print(f"  {src.name} -> {dataset_path(src).name}/ ({n} rows)")
+
+
+if __name__ == "__main__":
+    main()
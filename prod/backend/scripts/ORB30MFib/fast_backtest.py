@@ -34,6 +34,7 @@ import pandas as pd
 from tqdm import tqdm
 
 from scripts.ORB.analyse_run import write_run_summary_md
+from scripts.ORB.bar_store import candidate_bars, read_universe
 from core.config import settings
 
 
@@ -617,7 +618,7 @@ def run_strategy(
     max_entry_minutes: int,
 ):
     print(f"Loading universe: {universe_path}")
-    df_universe = pd.read_parquet(universe_path)
+    df_universe, universe_bars = read_universe(universe_path)
     print(f"  Total candidates: {len(df_universe):,}")
 
     df_filtered = df_universe[(df_universe["atr_14"] >= min_atr) & (df_universe["avg_volume_14"] >= min_volume)].copy()
@@ -671,7 +672,7 @@ def run_strategy(
         allocation_per_trade = current_equity / num_trades_today if num_trades_today > 0 else 0.0
 
         for _, row in day_df.iterrows():
-            bars = deserialize_bars(row["bars_json"])
+            bars = candidate_bars(row, universe_bars)
 
             if compound:
                 position_size = allocation_per_trade
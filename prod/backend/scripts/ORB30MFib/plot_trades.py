@@ -2,7 +2,7 @@
 
 Reads:
 - Run artefacts: `data/backtest/orb_30m_fib/runs/**/<run-name>/simulated_trades.parquet`
-- Universe parquet (for `bars_json`): `data/backtest/orb/universe/<universe>.parquet`
+- Universe parquet (for the candidate's 5-min bars): `data/backtest/orb/universe/<universe>.parquet`
 
 Writes:
 - PNGs into: `<run_dir>/trade_charts/`
@@ -29,26 +29,14 @@ import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
+from scripts.ORB.bar_store import candidate_bars, read_universe
+
 
 DATA_DIR = Path(__file__).resolve().parents[4] / "data"
 ORB_UNIVERSE_DIR = DATA_DIR / "backtest" / "orb" / "universe"
 FIB_RUNS_DIR = DATA_DIR / "backtest" / "orb_30m_fib" / "runs"
 
 
-def _deserialize_bars(bars_data) -> pd.DataFrame:
-    if isinstance(bars_data, str):
-        data = json.loads(bars_data)
-        df = pd.DataFrame(data)
-        df["datetime"] = pd.to_datetime(df["datetime"])
-    else:
-        df = pd.DataFrame(bars_data, columns=["datetime", "open", "high", "low", "close", "volume"])
-        df["datetime"] = pd.to_datetime(df["datetime"])
-
-    df = df.sort_values("datetime").copy()
-    df = df.set_index("datetime")
-    return df
-
-
 def _find_run_dir(run_name: str, run_dir: Optional[str] = None) -> Path:
     if run_dir:
         p = Path(run_dir)
@@ -262,7 +250,7 @@ def main():
         return
 
     print(f"Loading universe: {universe_path}")
-    df_universe = pd.read_parquet(universe_path)
+    df_universe, universe_bars = read_universe(universe_path)
 
     if not pd.api.types.is_datetime64_any_dtype(df_universe["trade_date"]):
         df_universe["trade_date"] = pd.to_datetime(df_universe["trade_date"])
@@ -280,8 +268,8 @@ def main():
             print(f"No universe row for {ticker} {trade_date}")
             continue
 
-        bars = _deserialize_bars(candidate.iloc[0]["bars_json"])
-        day_bars = bars.copy()
+        day_bars = candidate_bars(candidate.iloc[0], universe_bars, with_time=False)
+        day_bars = day_bars.sort_values("datetime").set_index("datetime")
 
         fname = f"{ticker}_{trade_date}_{trade.get('exit_reason','NA')}.png"
         out_path = out_dir / fname
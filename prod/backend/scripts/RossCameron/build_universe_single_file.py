@@ -29,6 +29,8 @@ import duckdb
 from concurrent.futures import ProcessPoolExecutor, as_completed
 import multiprocessing
 
+from scripts.ORB import bar_cache
+
 # Data dirs
 DATA_DIR = Path(__file__).resolve().parents[4] / "data"
 DATA_DIR_5MIN = DATA_DIR / "processed" / "5min"
@@ -62,27 +64,25 @@ def list_trading_days(start: str, end: str) -> list:
 
 
 def load_daily_symbol(symbol: str) -> pd.DataFrame:
-    """Load daily bars for one symbol."""
-    p = DATA_DIR_DAILY / f"{symbol}.parquet"
-    if not p.exists():
+    """Load daily bars for one symbol (decoded once per process, see bar_cache.py)."""
+    df = bar_cache.load_daily(DATA_DIR_DAILY / f"{symbol}.parquet")
+    if df is None:
         return pd.DataFrame()
     try:
-        df = pd.read_parquet(p)
-        df['date'] = pd.to_datetime(df['date']).dt.date
+        df['date'] = df['date'].dt.date
         return df.sort_values('date').reset_index(drop=True)
     except Exception:
         return pd.DataFrame()
 
 
 def load_5min_symbol(symbol: str) -> pd.DataFrame:
-    """Load 5-min bars for one symbol."""
-    p = DATA_DIR_5MIN / f"{symbol}.parquet"
-    if not p.exists():
+    """Load 5-min bars for one symbol (decoded once per process, see bar_cache.py)."""
+    df = bar_cache.load_5min(DATA_DIR_5MIN / f"{symbol}.parquet")
+    if df is None:
         return pd.DataFrame()
     try:
-        df = pd.read_parquet(p)
-        df['date'] = df['timestamp'].dt.date
-        df['time'] = df['timestamp'].dt.time
+        # date_et/time are precomputed by the cache
+        df = df.rename(columns={'date_et': 'date'})
         return df.sort_values('timestamp').reset_index(drop=True)
     except Exception:
         return pd.DataFrame()
@@ -0,0 +1,90 @@
+"""Benchmark the daily-bar parquet sync: per-row ORM path vs the bulk columnar upsert.
+
+Writes a synthetic dataset (one <SYMBOL>.parquet of daily bars per symbol,
+5,000 symbols by default) and syncs it into two fresh SQLite databases: once
+with the ORM loop sync_daily_bars_from_parquet used before (iterrows, one
+DailyBar per row, delete + re-insert, commit every 10 symbols) and once with
+services.daily_bar_sync.bulk_sync_daily_bars. Checks both databases hold the
+same rows, then appends one new bar to every file and times the incremental
+("nightly") run of each path.
+
+Usage (from prod/backend):
+  python scripts/bench_daily_bar_sync.py --symbols 5000
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, ".")
+
+from services.daily_bar_sync import bulk_sync_daily_bars
+from tests.fixtures.daily_bars import append_day, legacy_orm_sync, make_dataset, same_rows, sqlite_engine, table_rows
+
+LOOKBACK_DAYS = 30
+
+
+def run_benchmark(n_symbols: int = 5000, n_days: int = 60, workdir: Optional[Path] = None) -> dict:
+    """Full and incremental sync of a synthetic dataset with both paths (SQLite files in `workdir`)."""
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory(prefix="bench_daily_sync_")
+        workdir = Path(tmp.name)
+    try:
+        paths = make_dataset(workdir / "daily", n_symbols, n_days)
+        cutoff = datetime.now() - timedelta(days=LOOKBACK_DAYS + 20)
+        orm_engine, bulk_engine = sqlite_engine(workdir / "orm.db"), sqlite_engine(workdir / "bulk.db")
+
+        result = {"symbols": n_symbols}
+        for phase in ("full", "incremental"):
+            if phase == "incremental":
+                append_day(paths)
+                cutoff = cutoff + timedelta(days=1)
+            started = time.perf_counter()
+            orm_rows = legacy_orm_sync(orm_engine, paths, cutoff)
+            orm_sec = time.perf_counter() - started
+            stats = bulk_sync_daily_bars(paths, bulk_engine, cutoff)
+            result[phase] = {
+                "rows_read": stats.rows_read,
+                "orm_sec": round(orm_sec, 2),
+                "orm_rows_written": orm_rows,
+                "orm_rows_per_sec": round(orm_rows / orm_sec, 1) if orm_sec else None,
+                "bulk": stats.as_dict(),
+                "speedup": round(orm_sec / stats.elapsed_sec, 1) if stats.elapsed_sec else None,
+                "identical": same_rows(table_rows(orm_engine), table_rows(bulk_engine)),
+            }
+        resync = bulk_sync_daily_bars(paths, bulk_engine, cutoff)
+        result["resync_rows_written"] = resync.rows_written
+        return result
+    finally:
+        if tmp is not None:
+            tmp.cleanup()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--symbols", type=int, default=5000)
+    ap.add_argument("--days", type=int, default=60, help="Bars per synthetic file")
+    ap.add_argument("--workdir", type=Path, default=None, help="Keep the dataset and databases here")
+    args = ap.parse_args(argv)
+
+    result = run_benchmark(args.symbols, args.days, args.workdir)
+    print(f"{'phase':<13}{'rows read':>11}{'ORM s':>9}{'ORM rows/s':>12}{'bulk s':>9}{'bulk rows/s':>13}{'written':>9}{'speedup':>9}  identical")
+    for phase in ("full", "incremental"):
+        r = result[phase]
+        b = r["bulk"]
+        print(
+            f"{phase:<13}{r['rows_read']:>11,}{r['orm_sec']:>9.1f}{r['orm_rows_per_sec']:>12,.0f}"
+            f"{b['elapsed_sec']:>9.2f}{b['rows_per_sec']:>13,.0f}{b['rows_written']:>9,}{r['speedup']:>8}x  {r['identical']}"
+        )
+    print(f"re-sync of unchanged files wrote {result['resync_rows_written']} rows")
+    return 0 if all(result[p]["identical"] for p in ("full", "incremental")) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
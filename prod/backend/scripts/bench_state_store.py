@@ -0,0 +1,310 @@
+"""Benchmark DuckDBStateStore calls/sec: a connection per call vs the shared per-process connection.
+
+Seeds two trading-state files with the same signals (today's, ET, so the
+active/pending readers return rows) and runs the same call mix on each:
+
+- legacy: what DuckDBStateStore did before (every call ran ensure_tables on a
+  fresh duckdb.connect + PRAGMA, then opened another connection for the query
+  and built its rows with fetchdf().iterrows()),
+- shared: state/duckdb_store.py (one connection per file, a cursor per
+  thread, schema created once, Arrow result sets).
+
+Then runs the mix from several threads at once (the API, scheduler jobs and
+broker worker share the store). Checks both paths return the same rows and
+leave the same state behind.
+
+Usage (from prod/backend):
+  python scripts/bench_state_store.py --signals 500 --calls 200 --threads 4
+"""
+from __future__ import annotations
+
+import argparse
+import math
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+sys.path.insert(0, ".")
+
+import duckdb
+import pandas as pd
+
+from state import duckdb_store
+from state.duckdb_store import ET, DuckDBStateStore
+from tests.fixtures.signals import make_signals
+
+OPS = ("get_latest_signal_for_symbol", "list_signals", "list_active_signals", "get_pending_signals",
+       "update_signal_status", "mark_stop_submitted")
+
+
+# --------------------------------------------------------------------------- legacy path
+
+class LegacyStateStore:
+    """The read/update paths of DuckDBStateStore before the shared connection."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def _connect(self) -> duckdb.DuckDBPyConnection:
+        con = duckdb.connect(str(self.path))
+        con.execute("PRAGMA threads=4")
+        return con
+
+    def ensure_tables(self) -> None:
+        con = self._connect()
+        try:
+            duckdb_store._create_schema(con)
+        finally:
+            con.close()
+
+    def _df(self, sql: str, params: Optional[list] = None) -> pd.DataFrame:
+        self.ensure_tables()
+        con = self._connect()
+        try:
+            return con.execute(sql, params or []).fetchdf()
+        finally:
+            con.close()
+
+    def get_latest_signal_for_symbol(self, target_date: date, symbol: str) -> Optional[dict]:
+        df = self._df(duckdb_store.SQL_LATEST_SIGNAL, [target_date, symbol.upper().strip()])
+        if df.empty:
+            return None
+        row = df.iloc[0]
+        return {
+            "id": int(row["id"]),
+            "symbol": str(row["symbol"]).upper().strip(),
+            "side": str(row["side"]).upper().strip(),
+            "entry_price": float(row["entry_price"]) if row.get("entry_price") is not None else None,
+            "stop_price": float(row["stop_price"]) if row.get("stop_price") is not None else None,
+            "status": str(row["status"]).upper().strip(),
+            "order_id": row.get("order_id"),
+            "stop_submitted": bool(row.get("stop_submitted")),
+            "stop_submitted_at": row.get("stop_submitted_at"),
+        }
+
+    def _signal_rows(self, df: pd.DataFrame) -> list[dict]:
+        out = []
+        for _, row in df.iterrows():
+            out.append(
+                {
+                    "id": int(row["id"]),
+                    "timestamp": row.get("ts"),
+                    "symbol": str(row["symbol"] or "").upper().strip(),
+                    "side": str(row["side"] or "").upper().strip(),
+                    "confidence": float(row["confidence"]) if row.get("confidence") is not None else None,
+                    "entry_price": float(row["entry_price"]) if row.get("entry_price") is not None else None,
+                    "status": str(row["status"] or "").upper().strip(),
+                    "filled_price": float(row["filled_price"]) if row.get("filled_price") is not None else None,
+                    "filled_time": row.get("filled_time"),
+                    "rejection_reason": row.get("rejection_reason"),
+                }
+            )
+        return out
+
+    def list_signals(self, limit: int = 50, offset: int = 0) -> list[dict]:
+        return self._signal_rows(self._df(duckdb_store.SQL_LIST_SIGNALS, [int(limit), int(offset)]))
+
+    def list_active_signals(self, limit: int = 200) -> list[dict]:
+        today = datetime.now(ET).date()
+        return self._signal_rows(self._df(duckdb_store.SQL_ACTIVE_SIGNALS, [today, int(limit)]))
+
+    def get_pending_signals(self) -> list[dict]:
+        out = []
+        for _, row in self._df(duckdb_store.SQL_PENDING_SIGNALS).iterrows():
+            out.append(
+                {
+                    "id": int(row["id"]),
+                    "symbol": str(row["symbol"]).upper().strip(),
+                    "side": str(row["side"]).upper().strip(),
+                    "entry_price": float(row["entry_price"]),
+                    "stop_price": float(row["stop_price"]),
+                    "confidence": float(row["confidence"]),
+                    "timestamp": row["timestamp"].isoformat() if row.get("timestamp") is not None else None,
+                }
+            )
+        return out
+
+    def update_signal_status(self, signal_id: int, status: str, order_id: Optional[str] = None,
+                             filled_price: Optional[float] = None, rejection_reason: Optional[str] = None) -> bool:
+        self.ensure_tables()
+        con = self._connect()
+        try:
+            if not con.execute(duckdb_store.SQL_SIGNAL_EXISTS, [int(signal_id)]).fetchone():
+                return False
+            filled_time = datetime.utcnow() if filled_price is not None else None
+            con.execute(duckdb_store.SQL_UPDATE_SIGNAL_STATUS,
+                        [str(status), order_id, filled_price, filled_time, rejection_reason, int(signal_id)])
+            return True
+        finally:
+            con.close()
+
+    def mark_stop_submitted(self, signal_id: int) -> bool:
+        self.ensure_tables()
+        con = self._connect()
+        try:
+            con.execute(duckdb_store.SQL_MARK_STOP_SUBMITTED, [datetime.utcnow(), int(signal_id)])
+            return True
+        finally:
+            con.close()
+
+
+# --------------------------------------------------------------------------- dataset / calls
+
+def seed(path: Path, n_signals: int) -> date:
+    today = datetime.now(ET).date()
+    DuckDBStateStore(path).insert_signals(today, make_signals(n_signals))
+    return today
+
+
+def call(store, op: str, i: int, today: date, n_signals: int):
+    sid = i % n_signals + 1
+    if op == "get_latest_signal_for_symbol":
+        return store.get_latest_signal_for_symbol(today, f"S{i % n_signals:04d}")
+    if op == "list_signals":
+        return store.list_signals(limit=50, offset=(i * 50) % max(n_signals - 50, 1))
+    if op == "list_active_signals":
+        return store.list_active_signals(limit=200)
+    if op == "get_pending_signals":
+        return store.get_pending_signals()[:50]
+    if op == "update_signal_status":
+        # PENDING -> PARTIAL -> PENDING keeps the readers' row sets stable
+        return store.update_signal_status(sid, "PARTIAL" if i % 2 == 0 else "PENDING", filled_price=None)
+    if op == "mark_stop_submitted":
+        return store.mark_stop_submitted(sid)
+    raise ValueError(op)
+
+
+def _plain(v):
+    if v is None or v is pd.NaT or (isinstance(v, float) and math.isnan(v)):
+        return None
+    if isinstance(v, pd.Timestamp):
+        return v.to_pydatetime()
+    return v
+
+
+def normalise(result):
+    """Legacy rows carry NaN/NaT/pd.Timestamp where the new ones carry None/datetime."""
+    if isinstance(result, list):
+        return [normalise(r) for r in result]
+    if isinstance(result, dict):
+        return {k: _plain(v) for k, v in result.items() if k != "stop_submitted_at"}
+    return result
+
+
+def time_op(store, op: str, calls: int, today: date, n_signals: int) -> tuple[float, list]:
+    results = []
+    t0 = time.perf_counter()
+    for i in range(calls):
+        results.append(call(store, op, i, today, n_signals))
+    return calls / (time.perf_counter() - t0), results
+
+
+def time_threads(make_store: Callable[[], object], threads: int, calls: int, today: date, n_signals: int) -> dict:
+    """Mixed call rate with `threads` workers, each running `calls` calls on its own store instance.
+
+    Failed calls are counted, not raised: concurrent duckdb.connect calls on
+    one file can fail with "Unique file handle conflict".
+    """
+    errors: list[str] = []
+
+    def worker(w: int):
+        store = make_store()
+        for i in range(calls):
+            op = ("get_latest_signal_for_symbol", "list_active_signals", "get_pending_signals")[i % 3]
+            try:
+                call(store, op, w * calls + i, today, n_signals)
+            except Exception as e:
+                errors.append(f"{type(e).__name__}: {e}")
+
+    pool = [threading.Thread(target=worker, args=(w,)) for w in range(threads)]
+    t0 = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - t0
+    return {"per_sec": threads * calls / elapsed, "errors": len(errors), "first_error": errors[0] if errors else None}
+
+
+def state_rows(path: Path) -> list[tuple]:
+    con = duckdb.connect(str(path), read_only=True)
+    try:
+        return con.execute(
+            "SELECT id, symbol, status, order_id, COALESCE(stop_submitted, FALSE) FROM signals ORDER BY id"
+        ).fetchall()
+    finally:
+        con.close()
+
+
+# --------------------------------------------------------------------------- benchmark
+
+def run_benchmark(n_signals: int = 500, calls: int = 200, threads: int = 4, workdir: Optional[Path] = None) -> dict:
+    tmp = None
+    if workdir is None:
+        tmp = tempfile.TemporaryDirectory()
+        workdir = Path(tmp.name)
+    try:
+        legacy_path, shared_path = workdir / "legacy_state.duckdb", workdir / "shared_state.duckdb"
+        for p in (legacy_path, shared_path):
+            p.unlink(missing_ok=True)
+            Path(str(p) + ".wal").unlink(missing_ok=True)
+        today = seed(shared_path, n_signals)
+        duckdb_store.close_shared_connections()  # flush and release the file before copying it
+        shutil.copyfile(shared_path, legacy_path)
+
+        legacy, shared = LegacyStateStore(legacy_path), DuckDBStateStore(shared_path)
+        result = {"signals": n_signals, "calls": calls, "threads": threads, "ops": {}}
+        identical = True
+        for op in OPS:
+            legacy_rate, legacy_out = time_op(legacy, op, calls, today, n_signals)
+            shared_rate, shared_out = time_op(shared, op, calls, today, n_signals)
+            same = normalise(legacy_out) == normalise(shared_out)
+            identical &= same
+            result["ops"][op] = {"legacy_per_sec": legacy_rate, "shared_per_sec": shared_rate,
+                                 "speedup": round(shared_rate / max(legacy_rate, 1e-9), 1), "identical": same}
+
+        duckdb_store.close_shared_connections()
+        identical &= state_rows(legacy_path) == state_rows(shared_path)
+
+        legacy_mt = time_threads(lambda: LegacyStateStore(legacy_path), threads, calls // 3 or 1, today, n_signals)
+        shared_mt = time_threads(lambda: DuckDBStateStore(shared_path), threads, calls // 3 or 1, today, n_signals)
+        result["threaded"] = {"legacy": legacy_mt, "shared": shared_mt,
+                              "speedup": round(shared_mt["per_sec"] / max(legacy_mt["per_sec"], 1e-9), 1)}
+        result["connections_opened"] = duckdb_store.shared_connection(shared_path).opens
+        result["identical"] = identical
+        return result
+    finally:
+        duckdb_store.close_shared_connections()
+        if tmp is not None:
+            tmp.cleanup()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--signals", type=int, default=500, help="Signals seeded for today")
+    ap.add_argument("--calls", type=int, default=200, help="Calls per operation (and per thread in the mixed run)")
+    ap.add_argument("--threads", type=int, default=4)
+    ap.add_argument("--workdir", type=Path, default=None, help="Keep the state files here")
+    args = ap.parse_args(argv)
+
+    result = run_benchmark(args.signals, args.calls, args.threads, args.workdir)
+    print(f"{result['signals']} signals, {result['calls']} calls per operation")
+    print(f"{'operation':<31}{'legacy/s':>10}{'shared/s':>10}{'speedup':>9}  identical")
+    for op, r in result["ops"].items():
+        print(f"{op:<31}{r['legacy_per_sec']:>10.0f}{r['shared_per_sec']:>10.0f}{r['speedup']:>8}x  {r['identical']}")
+    r = result["threaded"]
+    print(f"{'mixed, ' + str(result['threads']) + ' threads':<31}{r['legacy']['per_sec']:>10.0f}{r['shared']['per_sec']:>10.0f}"
+          f"{r['speedup']:>8}x  failed calls: legacy {r['legacy']['errors']}, shared {r['shared']['errors']}")
+    if r["legacy"]["first_error"]:
+        print(f"  legacy: {r['legacy']['first_error']}")
+    print(f"shared connections opened: {result['connections_opened']}, identical: {result['identical']}")
+    return 0 if result["identical"] and not r["shared"]["errors"] else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,260 @@
+"""Benchmark TradeZero table extraction: per-element WebDriver reads vs one execute_script.
+
+Loads the saved portfolio panel (tests/fixtures/tradezero_tables.html) from a
+local file in headless Chrome, so it runs offline and without a TradeZero login.
+For each table it times the legacy extraction (find_elements per row, text per
+cell, as the client did before) against the single-script read used by
+TradeZero.get_portfolio / get_active_orders / get_inactive_orders, counts the
+WebDriver round-trips of each, checks both return the same rows, and checks the
+MutationObserver change feed reports a changed table only after a DOM mutation.
+
+Usage (from prod/backend):
+  python scripts/bench_tradezero_tables.py --iterations 20
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+import pandas as pd
+
+from execution.tradezero.tables import (
+    ACTIVE_ORDERS_HEADERS,
+    ACTIVE_ORDERS_TABLE,
+    INACTIVE_ORDERS_HEADERS,
+    INACTIVE_ORDERS_TABLE,
+    PORTFOLIO_TABLE,
+    TableChangeFeed,
+    parse_active_orders,
+    parse_inactive_orders,
+    parse_portfolio,
+    read_table,
+)
+
+FIXTURE = Path(__file__).resolve().parents[1] / "tests" / "fixtures" / "tradezero_tables.html"
+
+
+# --------------------------------------------------------------------------- legacy reads
+# The per-element extraction TradeZero.get_* used before (tab clicks and waits left out).
+
+def _safe_float(txt):
+    try:
+        return float(txt.replace(",", "").replace("$", "").strip())
+    except Exception:
+        return 0.0
+
+
+def legacy_portfolio(driver) -> pd.DataFrame:
+    from selenium.webdriver.common.by import By
+
+    try:
+        empty_msg = driver.find_element(By.XPATH, '//*[@id="opTable-1"]/tbody/tr/td').text
+        if "no open positions" in empty_msg.lower():
+            return pd.DataFrame()
+    except Exception:
+        pass
+    table = driver.find_element(By.ID, "opTable-1")
+    out = []
+    for r in table.find_elements(By.CSS_SELECTOR, "tbody tr"):
+        tds = r.find_elements(By.CSS_SELECTOR, "td")
+        if not tds or len(tds) < 3:
+            continue
+        if "no open positions" in (tds[0].text or "").lower():
+            return pd.DataFrame()
+        symbol = (tds[0].text or "").strip().upper()
+        if not symbol:
+            continue
+        qty = _safe_float(tds[2].text)
+        if qty <= 0:
+            continue
+        out.append({
+            "symbol": symbol,
+            "qty": qty,
+            "last_price": _safe_float(tds[3].text) if len(tds) >= 4 else 0.0,
+            "avg_price": _safe_float(tds[4].text) if len(tds) >= 5 else 0.0,
+            "unrealized_pnl": _safe_float(tds[6].text) if len(tds) >= 7 else 0.0,
+        })
+    return pd.DataFrame(out)
+
+
+def legacy_active_orders(driver) -> pd.DataFrame:
+    from selenium.webdriver.common.by import By
+
+    if not driver.find_elements(By.XPATH, '//*[@id="aoTable-1"]/tbody/tr[@order-id]'):
+        return pd.DataFrame()
+    table = driver.find_element(By.ID, "aoTable-1")
+    header_cells = driver.find_elements(By.CSS_SELECTOR, ACTIVE_ORDERS_HEADERS)
+    headers = [((h.get_attribute("textContent") or "").strip() or f"col_{i}") for i, h in enumerate(header_cells)]
+    out = []
+    for r in table.find_elements(By.CSS_SELECTOR, "tbody tr"):
+        order_id = (r.get_attribute("order-id") or "").strip()
+        tds = r.find_elements(By.CSS_SELECTOR, "td")
+        if not tds or len(tds) == 1:
+            continue
+        cell_texts = [((td.get_attribute("textContent") or "").strip()) for td in tds]
+        row_dict = {}
+        if headers and len(headers) == len(cell_texts):
+            row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
+        symbol = (tds[2].get_attribute("textContent") or "").strip().upper() if len(tds) >= 3 else ""
+        qty_txt = (tds[4].get_attribute("textContent") or "").replace(",", "").strip() if len(tds) >= 5 else "0"
+        try:
+            qty = float(qty_txt)
+        except Exception:
+            qty = 0.0
+        row_dict.update({"ref_number": order_id, "symbol": symbol, "qty": qty})
+        side_key = next((k for k in row_dict.keys() if "side" in k.lower()), "side")
+        row_dict["side"] = row_dict.get(side_key, "")
+        out.append(row_dict)
+    return pd.DataFrame(out)
+
+
+def legacy_inactive_orders(driver) -> pd.DataFrame:
+    from selenium.webdriver.common.by import By
+
+    if not driver.find_elements(By.XPATH, '//*[@id="ioTable-1"]/tbody/tr'):
+        return pd.DataFrame()
+    table = driver.find_element(By.ID, "ioTable-1")
+    header_cells = driver.find_elements(By.CSS_SELECTOR, INACTIVE_ORDERS_HEADERS)
+    headers = [((h.text or "").strip() or f"col_{i}") for i, h in enumerate(header_cells)]
+    out = []
+    for r in table.find_elements(By.CSS_SELECTOR, "tbody tr"):
+        order_id = (r.get_attribute("order-id") or "").strip()
+        tds = r.find_elements(By.CSS_SELECTOR, "td")
+        if not tds:
+            continue
+        if len(tds) == 1:
+            if (tds[0].text or "").strip():
+                return pd.DataFrame()
+            continue
+        cell_texts = [((td.text or "").strip()) for td in tds]
+        if headers and len(headers) == len(cell_texts):
+            row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
+        elif headers and len(headers) < len(cell_texts):
+            row_dict = {headers[i]: cell_texts[i] for i in range(len(headers))}
+            for j in range(len(headers), len(cell_texts)):
+                row_dict[f"col_{j}"] = cell_texts[j]
+        else:
+            row_dict = {f"col_{i}": cell_texts[i] for i in range(len(cell_texts))}
+        symbol = (tds[2].text or "").strip().upper() if len(tds) >= 3 else ""
+        qty_txt = (tds[4].text or "" if len(tds) >= 5 else "").replace(",", "").strip()
+        try:
+            qty = float(qty_txt)
+        except Exception:
+            qty = 0.0
+        row_dict.update({"ref_number": order_id, "symbol": symbol, "qty": qty})
+        out.append(row_dict)
+    return pd.DataFrame(out)
+
+
+# --------------------------------------------------------------------------- benchmark
+
+TABLES: list[tuple[str, Callable, Callable]] = [
+    ("portfolio", legacy_portfolio, lambda d: pd.DataFrame(parse_portfolio(read_table(d, PORTFOLIO_TABLE)))),
+    (
+        "active_orders",
+        legacy_active_orders,
+        lambda d: pd.DataFrame(parse_active_orders(read_table(d, ACTIVE_ORDERS_TABLE, ACTIVE_ORDERS_HEADERS, False))),
+    ),
+    (
+        "inactive_orders",
+        legacy_inactive_orders,
+        lambda d: pd.DataFrame(parse_inactive_orders(read_table(d, INACTIVE_ORDERS_TABLE, INACTIVE_ORDERS_HEADERS))),
+    ),
+]
+
+
+def _count_round_trips(driver) -> list:
+    """Wrap driver.execute (every WebDriver command, element commands included) with a counter."""
+    counter = [0]
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        counter[0] += 1
+        return execute(driver_command, params)
+
+    driver.execute = counted
+    return counter
+
+
+def _timed(fn: Callable, driver, counter: list, iterations: int) -> tuple[pd.DataFrame, float, int]:
+    start_calls = counter[0]
+    started = time.perf_counter()
+    for _ in range(iterations):
+        df = fn(driver)
+    ms = (time.perf_counter() - started) * 1000 / iterations
+    return df, ms, (counter[0] - start_calls) // iterations
+
+
+def _change_feed_check(driver) -> dict:
+    feed = TableChangeFeed(driver)
+    feed.stamps()
+    scrape = read_table(driver, ACTIVE_ORDERS_TABLE, ACTIVE_ORDERS_HEADERS, False)
+    unchanged_before = feed.unchanged(ACTIVE_ORDERS_TABLE, scrape["stamp"])
+    driver.execute_script(
+        "document.querySelector('#aoTable-1 tbody tr td:nth-child(5)').textContent = '999';"
+    )
+    time.sleep(0.05)  # observer callbacks run as a microtask after the script returns
+    unchanged_after = feed.unchanged(ACTIVE_ORDERS_TABLE, scrape["stamp"])
+    portfolio = read_table(driver, PORTFOLIO_TABLE)
+    return {
+        "unchanged_before_mutation": unchanged_before,
+        "unchanged_after_mutation": unchanged_after,
+        "other_table_unchanged": feed.unchanged(PORTFOLIO_TABLE, portfolio["stamp"]),
+    }
+
+
+def run_benchmark(iterations: int = 10, fixture: Path = FIXTURE, driver=None) -> dict:
+    """Run the comparison on `fixture`; starts (and quits) headless Chrome unless a driver is given."""
+    own_driver = driver is None
+    if own_driver:
+        from selenium import webdriver
+
+        options = webdriver.ChromeOptions()
+        options.add_argument("--headless=new")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--no-sandbox")
+        driver = webdriver.Chrome(options=options)
+    try:
+        driver.get(Path(fixture).resolve().as_uri())
+        counter = _count_round_trips(driver)
+        tables = {}
+        for name, legacy, fast in TABLES:
+            legacy_df, legacy_ms, legacy_calls = _timed(legacy, driver, counter, iterations)
+            fast_df, fast_ms, fast_calls = _timed(fast, driver, counter, iterations)
+            tables[name] = {
+                "rows": len(fast_df),
+                "identical": legacy_df.equals(fast_df),
+                "legacy_ms": round(legacy_ms, 2),
+                "script_ms": round(fast_ms, 2),
+                "legacy_round_trips": legacy_calls,
+                "script_round_trips": fast_calls,
+                "speedup": round(legacy_ms / fast_ms, 1) if fast_ms else None,
+            }
+        return {"iterations": iterations, "tables": tables, "change_feed": _change_feed_check(driver)}
+    finally:
+        if own_driver:
+            driver.quit()
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--iterations", type=int, default=10)
+    ap.add_argument("--fixture", type=Path, default=FIXTURE)
+    args = ap.parse_args(argv)
+
+    result = run_benchmark(args.iterations, args.fixture)
+    print(f"{'table':<16}{'rows':>6}{'legacy ms':>12}{'script ms':>12}{'speedup':>9}{'round-trips':>16}  identical")
+    for name, t in result["tables"].items():
+        trips = f"{t['legacy_round_trips']} -> {t['script_round_trips']}"
+        print(
+            f"{name:<16}{t['rows']:>6}{t['legacy_ms']:>12.1f}{t['script_ms']:>12.1f}"
+            f"{t['speedup']:>8}x{trips:>16}  {t['identical']}"
+        )
+    print(f"change feed: {result['change_feed']}")
+    return 0 if all(t["identical"] for t in result["tables"].values()) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
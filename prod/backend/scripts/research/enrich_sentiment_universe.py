@@ -2,7 +2,7 @@
 Enrich Sentiment Universe (Research)
 ====================================
 Takes the raw sentiment universe (Date, Ticker, Score) and enriches it with:
-1. 5-min Price Data (bars_json)
+1. 5-min Price Data (columnar bar_* lists, or legacy bars_json)
 2. Daily Metrics (ATR, AvgVol, Shares)
 
 Attribution Modes:
@@ -23,9 +23,11 @@ from datetime import time, datetime, timedelta
 # Add project root to path
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
 sys.path.insert(0, str(PROJECT_ROOT))
+sys.path.insert(0, str(PROJECT_ROOT / "prod" / "backend"))  # build_universe imports scripts.ORB.*
 
 try:
     from prod.backend.scripts.ORB.build_universe import load_5min_full, load_daily, serialize_bars, extract_or
+    from prod.backend.scripts.ORB.bar_store import bars_to_columns
 except ImportError as e:
     print(f"Import Error: {e}")
     sys.exit(1)
@@ -109,6 +111,8 @@ def main():
     parser.add_argument('--mode', type=str, default='rolling_24h',
                         choices=['rolling_24h', 'premarket'],
                         help="News attribution mode: rolling_24h (09:30 yesterday - 09:30 today) or premarket (midnight - 09:30 today)")
+    parser.add_argument('--bars-format', type=str, default='columnar', choices=['columnar', 'json'],
+                        help="Intraday bar storage: typed bar_* list columns (default) or legacy bars_json")
     args = parser.parse_args()
     
     if not INPUT_SCORED_NEWS.exists():
@@ -149,7 +153,8 @@ def main():
         print(f"Candidates: {len(base_df)}")
         
         # Init Enrichment Columns
-        base_df['bars_json'] = None
+        if args.bars_format == 'json':
+            base_df['bars_json'] = None
         base_df['atr_14'] = np.nan
         base_df['avg_volume_14'] = np.nan
         base_df['shares_outstanding'] = np.nan
@@ -214,7 +219,10 @@ def main():
                 
                 # Enrich
                 row_dict = row.to_dict()
-                row_dict['bars_json'] = serialize_bars(day_bars)
+                if args.bars_format == 'json':
+                    row_dict['bars_json'] = serialize_bars(day_bars)
+                else:
+                    row_dict.update(bars_to_columns(day_bars))
                 row_dict['atr_14'] = daily_row.get('atr_14', np.nan)
                 row_dict['avg_volume_14'] = daily_row.get('avg_volume_14', np.nan)
                 row_dict['shares_outstanding'] = daily_row.get('shares_outstanding', np.nan)
@@ -1,7 +1,8 @@
 """Close all open portfolio positions in TradeZero.
 
 Behavior:
-- Log into TradeZero (non-headless) using existing settings.
+- Log into TradeZero (non-headless) using existing settings, through a one-session
+  TradeZeroSessionPool (so the session is health-probed before use).
 - Fetch portfolio via tz.get_portfolio(). For each position:
   - If qty > 0: try MARKET SELL qty. If rejected with R78 (market orders not allowed), fallback to LIMIT SELL at bid.
   - If qty < 0: try MARKET COVER qty. If rejected with R78, fallback to LIMIT COVER at ask.
@@ -18,6 +19,7 @@ from typing import Optional
 
 from core.config import settings
 from execution.tradezero.client import TradeZero, Order
+from execution.tradezero.session_pool import TradeZeroSessionPool
 
 
 def _print_df(title: str, df) -> None:
@@ -67,12 +69,17 @@ def main() -> int:
         return 2
 
     print("Launching TradeZero (headless=False) ...")
-    tz = TradeZero(
-        user_name=settings.TRADEZERO_USERNAME,
-        password=settings.TRADEZERO_PASSWORD,
-        headless=False,
-        home_url=getattr(settings, "TRADEZERO_HOME_URL", None),
+    pool = TradeZeroSessionPool(
+        factory=lambda: TradeZero(
+            user_name=settings.TRADEZERO_USERNAME,
+            password=settings.TRADEZERO_PASSWORD,
+            headless=False,
+            home_url=getattr(settings, "TRADEZERO_HOME_URL", None),
+        ),
+        size=1,
     )
+    session = pool.acquire()  # logged in and health-probed
+    tz = session.client
 
     try:
         portfolio = tz.get_portfolio()
@@ -182,10 +189,7 @@ def main() -> int:
         _print_df("Final Portfolio", final)
 
     finally:
-        try:
-            tz.exit()
-        except Exception:
-            pass
+        pool.close()
 
     return 0
 
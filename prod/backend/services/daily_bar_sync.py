@@ -0,0 +1,249 @@
+"""
+Bulk daily-bar sync: per-symbol parquet files -> daily_bars, set-based.
+
+The ORM sync read each file, built a DailyBar object per row, deleted and
+re-inserted the symbol's whole window and committed every 10 symbols. Here
+symbols are handled in batches:
+
+1. read: each file's bar columns are loaded through Arrow (only the needed
+   columns; rows before the cutoff are dropped in Arrow) and the batch is
+   concatenated into one frame.
+2. diff: one query returns the rows already stored in the window for the
+   batch. Bars after a symbol's stored max(date) are new; older bars are
+   compared column by column (metrics included) and only changed rows are kept.
+3. write: the new and changed rows go out in one INSERT ... ON CONFLICT
+   (symbol, date) DO UPDATE per batch, in one transaction.
+
+ATR(14) / avg volume(14) are computed per symbol over the window, vectorised,
+and stored on the latest bar only (NULL on older bars), as the ORM sync did.
+A second run over unchanged files therefore writes nothing, and a nightly run
+writes one row per symbol plus the row whose metrics moved to the new bar.
+
+Bars that disappeared from a file are not deleted (the ORM path dropped
+them by re-inserting the window).
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+from sqlalchemy import select
+
+from db.models import DailyBar
+
+PRICE_COLUMNS = ["open", "high", "low", "close", "volume"]
+VALUE_COLUMNS = PRICE_COLUMNS + ["vwap", "atr_14", "avg_volume_14"]
+METRICS_PERIOD = 14
+DEFAULT_BATCH_SYMBOLS = 500
+
+
+@dataclass
+class SyncStats:
+    """Counters and timings of one bulk sync."""
+
+    symbols: int = 0
+    skipped: int = 0
+    rows_read: int = 0
+    rows_new: int = 0
+    rows_changed: int = 0
+    metrics_updated: int = 0
+    read_sec: float = 0.0
+    diff_sec: float = 0.0
+    write_sec: float = 0.0
+    elapsed_sec: float = 0.0
+
+    @property
+    def rows_written(self) -> int:
+        return self.rows_new + self.rows_changed
+
+    @property
+    def rows_per_sec(self) -> float:
+        """Rows read (and diffed / written) per second of wall time."""
+        return self.rows_read / self.elapsed_sec if self.elapsed_sec else 0.0
+
+    def as_dict(self) -> dict:
+        out = asdict(self)
+        out.update(rows_written=self.rows_written, rows_per_sec=round(self.rows_per_sec, 1))
+        for k in ("read_sec", "diff_sec", "write_sec", "elapsed_sec"):
+            out[k] = round(out[k], 3)
+        return out
+
+
+def read_daily_file(path: Path, cutoff: datetime) -> Optional[pa.Table]:
+    """
+    Bars of one symbol file on/after `cutoff` as an Arrow table
+    [date, open, high, low, close, volume, vwap] (date naive UTC, prices float64);
+    None when the file has no price columns or no date (a 'date' column or a datetime index).
+    """
+    pf = pq.ParquetFile(path)
+    schema = pf.schema_arrow
+    names = set(schema.names)
+    if not all(c in names for c in PRICE_COLUMNS):
+        return None
+    date_col = "date" if "date" in names else None
+    if date_col is None:
+        index_cols = [c for c in ((schema.pandas_metadata or {}).get("index_columns") or []) if isinstance(c, str)]
+        date_col = next((c for c in index_cols if pa.types.is_timestamp(schema.field(c).type)), None)
+    if date_col is None or not pa.types.is_timestamp(schema.field(date_col).type):
+        return None
+
+    has_vwap = "vwap" in names
+    table = pf.read(columns=[date_col] + PRICE_COLUMNS + (["vwap"] if has_vwap else []), use_threads=False)
+    # tz-aware dates become their UTC wall time (midnight UTC for daily bars); naive dates are kept as is
+    dates = table.column(date_col).cast(pa.timestamp("us"))
+    keep = pc.greater_equal(dates, pa.scalar(cutoff, pa.timestamp("us")))
+    columns = [dates] + [table.column(c).cast(pa.float64()) for c in PRICE_COLUMNS]
+    columns.append(table.column("vwap").cast(pa.float64()) if has_vwap else pa.nulls(table.num_rows, pa.float64()))
+    return pa.table(columns, names=["date"] + PRICE_COLUMNS + ["vwap"]).filter(keep)
+
+
+def _read_one(item: tuple[str, Path], cutoff: datetime):
+    symbol, path = item
+    try:
+        return symbol, read_daily_file(path, cutoff)
+    except Exception as e:
+        print(f"Error reading {symbol}: {e}")
+        return symbol, None
+
+
+def read_batch(files: list[tuple[str, Path]], cutoff: datetime, stats: SyncStats, pool: Optional[ThreadPoolExecutor] = None) -> pd.DataFrame:
+    """One frame [symbol, date, open..vwap] for a batch of (symbol, path); files are read on `pool` when given."""
+    results = pool.map(_read_one, files, [cutoff] * len(files)) if pool else (_read_one(f, cutoff) for f in files)
+    tables = []
+    for symbol, table in results:
+        if table is None:
+            stats.skipped += 1
+        elif table.num_rows:
+            tables.append(table.append_column("symbol", pa.array([symbol] * table.num_rows, pa.string())))
+    if not tables:
+        return pd.DataFrame(columns=["symbol", "date"] + PRICE_COLUMNS + ["vwap"])
+    df = pa.concat_tables(tables).to_pandas()
+    return df.drop_duplicates(["symbol", "date"], keep="last").sort_values(["symbol", "date"], ignore_index=True)
+
+
+def add_metrics(df: pd.DataFrame, period: int = METRICS_PERIOD) -> pd.DataFrame:
+    """atr_14 / avg_volume_14 on each symbol's latest bar (NaN elsewhere), from the bars in `df`."""
+    g = df.groupby("symbol", sort=False)
+    prev_close = g["close"].shift(1)
+    tr = np.fmax(df["high"] - df["low"], np.fmax((df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()))
+    atr = tr.groupby(df["symbol"], sort=False).rolling(period, min_periods=period).mean().reset_index(level=0, drop=True)
+    avg_vol = g["volume"].rolling(period, min_periods=period).mean().reset_index(level=0, drop=True)
+    counts = g["date"].transform("size")
+    latest = g.cumcount(ascending=False) == 0
+
+    df = df.assign(atr_14=np.nan, avg_volume_14=np.nan)
+    # compute_atr needs period + 1 bars (the first TR has no previous close)
+    df.loc[latest & (counts >= period + 1), "atr_14"] = atr
+    df.loc[latest & (counts >= period), "avg_volume_14"] = avg_vol
+    return df
+
+
+def _existing(conn, symbols: list, cutoff: datetime) -> pd.DataFrame:
+    t = DailyBar.__table__
+    rows = conn.execute(
+        select(t.c.symbol, t.c.date, *[t.c[c] for c in VALUE_COLUMNS])
+        .where(t.c.symbol.in_(symbols), t.c.date >= cutoff)
+    ).all()
+    df = pd.DataFrame(rows, columns=["symbol", "date"] + VALUE_COLUMNS)
+    df["date"] = pd.to_datetime(df["date"])
+    return df
+
+
+def diff_rows(incoming: pd.DataFrame, existing: pd.DataFrame) -> tuple[pd.DataFrame, int, int]:
+    """Rows of `incoming` that are new or differ from `existing`; plus (new, changed) counts."""
+    if existing.empty:
+        return incoming, len(incoming), 0
+    max_date = existing.groupby("symbol")["date"].max().rename("stored_max")
+    merged = incoming.merge(max_date, on="symbol", how="left")
+    new = merged["stored_max"].isna() | (merged["date"] > merged["stored_max"])
+
+    old = incoming[~new.to_numpy()].merge(existing, on=["symbol", "date"], how="left", suffixes=("", "_db"), indicator=True)
+    differs = old["_merge"] == "left_only"
+    for c in VALUE_COLUMNS:
+        a, b = old[c], old[f"{c}_db"].astype(float)
+        differs |= ~((a == b) | (a.isna() & b.isna()))
+    changed = old.loc[differs.to_numpy(), incoming.columns]
+    return pd.concat([incoming[new.to_numpy()], changed], ignore_index=True), int(new.sum()), len(changed)
+
+
+def _upsert_statement(conn):
+    dialect = conn.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Bulk upsert not supported for {dialect}")
+    stmt = insert(DailyBar.__table__)
+    return stmt.on_conflict_do_update(
+        index_elements=["symbol", "date"],
+        set_={c: stmt.excluded[c] for c in VALUE_COLUMNS},
+    )
+
+
+def _records(df: pd.DataFrame) -> list[dict]:
+    cols = ["symbol", "date"] + VALUE_COLUMNS
+    values = [df["symbol"].tolist(), [d.to_pydatetime() for d in df["date"]]]
+    for c in VALUE_COLUMNS:
+        arr = df[c].to_numpy(dtype=float)
+        values.append([None if v != v else v for v in arr.tolist()])  # NaN -> NULL
+    return [dict(zip(cols, row)) for row in zip(*values)]
+
+
+def _sync_batch(batch: list[tuple[str, Path]], engine, cutoff: datetime, stats: SyncStats, pool: Optional[ThreadPoolExecutor]):
+    t0 = time.perf_counter()
+    incoming = read_batch(batch, cutoff, stats, pool)
+    stats.rows_read += len(incoming)
+    t1 = time.perf_counter()
+    stats.read_sec += t1 - t0
+    if incoming.empty:
+        return
+    incoming = add_metrics(incoming)
+    stats.metrics_updated += int(incoming["atr_14"].notna().sum())
+
+    with engine.begin() as conn:
+        to_write, n_new, n_changed = diff_rows(incoming, _existing(conn, incoming["symbol"].unique().tolist(), cutoff))
+        t2 = time.perf_counter()
+        stats.diff_sec += t2 - t1
+        if not to_write.empty:
+            conn.execute(_upsert_statement(conn), _records(to_write))
+        stats.write_sec += time.perf_counter() - t2
+    stats.rows_new += n_new
+    stats.rows_changed += n_changed
+
+
+def bulk_sync_daily_bars(
+    files: Iterable[Path],
+    engine,
+    cutoff: datetime,
+    batch_symbols: int = DEFAULT_BATCH_SYMBOLS,
+    read_workers: Optional[int] = None,
+) -> SyncStats:
+    """
+    Sync `files` (<SYMBOL>.parquet) into daily_bars on `engine` for bars on/after `cutoff`.
+    Files are read on `read_workers` threads (Arrow releases the GIL; default min(8, CPUs)).
+    """
+    started = time.perf_counter()
+    cutoff = cutoff.replace(tzinfo=None)  # bar dates are stored naive
+    files = [(Path(p).stem, Path(p)) for p in files]
+    stats = SyncStats(symbols=len(files))
+    workers = read_workers or min(8, os.cpu_count() or 1)
+    pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bar-sync") if workers > 1 else None
+
+    try:
+        for i in range(0, len(files), batch_symbols):
+            _sync_batch(files[i:i + batch_symbols], engine, cutoff, stats, pool)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    stats.elapsed_sec = time.perf_counter() - started
+    return stats
@@ -127,10 +127,17 @@ def compute_avg_volume(bars: list[dict], period: int = 14) -> Optional[float]:
 async def sync_daily_bars_from_parquet(lookback_days: int = 30) -> dict:
     """
     Sync daily bars from local Parquet files to database.
+
+    Bulk path (services/daily_bar_sync.py): batches of symbols are read through
+    Arrow, diffed against the stored window and only new / changed rows are
+    written with one INSERT ... ON CONFLICT per batch.
     
     Returns:
         Dict with sync stats
     """
+    from db.database import engine
+    from services.daily_bar_sync import bulk_sync_daily_bars
+
     db = SessionLocal()
     
     try:
@@ -159,106 +166,21 @@ async def sync_daily_bars_from_parquet(lookback_days: int = 30) -> dict:
         
         cutoff_date = datetime.now(ET) - timedelta(days=lookback_days + 20) # Buffer
         
-        synced_count = 0
-        metrics_updated = 0
-        
-        for i, p_file in enumerate(files_to_process):
-            symbol = p_file.stem
-            if i % 100 == 0:
-                print(f"Processing {i}/{len(files_to_process)}: {symbol}")
-                
-            try:
-                df = pd.read_parquet(p_file)
-                
-                # Ensure columns exist
-                required_cols = ['open', 'high', 'low', 'close', 'volume']
-                if not all(col in df.columns for col in required_cols):
-                    print(f"Skipping {symbol}: missing columns")
-                    continue
-                
-                # Handle index as date if needed, or 'date' column
-                if 'date' in df.columns:
-                    df['timestamp'] = pd.to_datetime(df['date'])
-                elif isinstance(df.index, pd.DatetimeIndex):
-                    df['timestamp'] = df.index
-                else:
-                    # Try to find a date column
-                    print(f"Skipping {symbol}: no date column")
-                    continue
-                
-                # Filter by date
-                df = df[df['timestamp'] >= cutoff_date.replace(tzinfo=None)]
-                
-                if df.empty:
-                    continue
-                
-                # Convert to list of dicts for processing
-                bars = []
-                for _, row in df.iterrows():
-                    bars.append({
-                        "timestamp": row['timestamp'],
-                        "open": row['open'],
-                        "high": row['high'],
-                        "low": row['low'],
-                        "close": row['close'],
-                        "volume": row['volume'],
-                        "vwap": row.get('vwap')
-                    })
-                
-                # Compute metrics
-                atr_14 = compute_atr(bars, 14)
-                avg_vol_14 = compute_avg_volume(bars, 14)
-                
-                # Upsert to DB
-                # First delete existing in range to avoid duplicates/conflicts
-                min_date = df['timestamp'].min()
-                db.execute(
-                    delete(DailyBar).where(
-                        and_(
-                            DailyBar.symbol == symbol,
-                            DailyBar.date >= min_date
-                        )
-                    )
-                )
-                
-                for bar in bars:
-                    is_latest = (bar == bars[-1])
-                    db_bar = DailyBar(
-                        symbol=symbol,
-                        date=bar["timestamp"],
-                        open=bar["open"],
-                        high=bar["high"],
-                        low=bar["low"],
-                        close=bar["close"],
-                        volume=bar["volume"],
-                        vwap=bar.get("vwap"),
-                        atr_14=atr_14 if is_latest else None,
-                        avg_volume_14=avg_vol_14 if is_latest else None
-                    )
-                    db.add(db_bar)
-                
-                synced_count += len(bars)
-                if atr_14 is not None:
-                    metrics_updated += 1
-                    
-                # Commit every 10 symbols
-                if i % 10 == 0:
-                    db.commit()
-                    
-            except Exception as e:
-                print(f"Error processing {symbol}: {e}")
-                db.rollback()
-        
-        db.commit()
+        # Blocking reads / writes run off the event loop
+        stats = await asyncio.to_thread(bulk_sync_daily_bars, files_to_process, engine, cutoff_date)
+        print(
+            f"Synced {stats.rows_written} rows ({stats.rows_new} new, {stats.rows_changed} changed) "
+            f"of {stats.rows_read} read in {stats.elapsed_sec:.1f}s ({stats.rows_per_sec:,.0f} rows/s)"
+        )
         return {
             "status": "success",
             "symbols_processed": len(files_to_process),
-            "bars_synced": synced_count,
-            "metrics_updated": metrics_updated
+            "bars_synced": stats.rows_written,
+            "metrics_updated": stats.metrics_updated,
+            **{k: v for k, v in stats.as_dict().items() if k not in ("symbols", "metrics_updated")},
         }
         
     except Exception as e:
-        db.rollback()
         return {"status": "error", "error": str(e)}
     
     finally:
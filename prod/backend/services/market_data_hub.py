@@ -0,0 +1,301 @@
+"""
+Shared in-memory market data for the API.
+
+The live P&L scanner route, the scanner pages and every /ws/live client used
+to fetch from Alpaca on their own: a new StockHistoricalDataClient per
+request, and positions + account polled once per second *per websocket*.
+The hub is the one place those reads go through:
+
+    hub = get_market_data_hub()
+    quotes = await hub.get_quotes(["AAPL", "TSLA"])          # {symbol: {bid, ask, mid, timestamp}}
+    bars = await hub.get_minute_bars(symbols, start)          # {symbol: DataFrame indexed by ET timestamp}
+    async for snapshot in hub.live_updates():                 # {positions, account, updated_at, version}
+        ...
+
+- Quotes and minute bars are cached per symbol with a TTL. A request only
+  goes upstream for the symbols that are stale, as one batched call, and
+  concurrent requests wait for the same refresh instead of issuing their own.
+  Minute bars are refreshed incrementally from the last cached bar.
+- Positions + account are polled by a single background task while at least
+  one websocket is subscribed; each client reads the latest shared snapshot.
+
+Upstream calls therefore scale with the number of symbols (and the poll
+interval), not with the number of connected clients. Counters are served at
+GET /api/system/market-data.
+"""
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime
+from typing import AsyncIterator, Callable, Optional
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ET = ZoneInfo("America/New_York")
+
+# quote_fetcher(symbols) -> {symbol: {"bid", "ask", "timestamp"}}
+# bar_fetcher(symbols, start, end) -> {symbol: DataFrame[open, high, low, close, volume] indexed by ET timestamp}
+# live_fetcher() -> (positions, account)
+QuoteFetcher = Callable[[list], dict]
+BarFetcher = Callable[[list, datetime, datetime], dict]
+LiveFetcher = Callable[[], tuple]
+
+
+def fetch_alpaca_quotes(symbols: list) -> dict:
+    """Latest quotes for `symbols` in one request."""
+    from alpaca.data.requests import StockLatestQuoteRequest
+    from execution.alpaca_client import get_data_client
+
+    quotes = get_data_client().get_stock_latest_quote(StockLatestQuoteRequest(symbol_or_symbols=symbols))
+    return {
+        sym: {"bid": float(q.bid_price or 0), "ask": float(q.ask_price or 0), "timestamp": q.timestamp}
+        for sym, q in quotes.items()
+    }
+
+
+def fetch_alpaca_minute_bars(symbols: list, start: datetime, end: datetime) -> dict:
+    """1-min bars in [start, end] for `symbols` in one request."""
+    from alpaca.data.requests import StockBarsRequest
+    from alpaca.data.timeframe import TimeFrame
+    from execution.alpaca_client import get_data_client
+
+    df = get_data_client().get_stock_bars(
+        StockBarsRequest(symbol_or_symbols=symbols, timeframe=TimeFrame.Minute, start=start, end=end)
+    ).df
+    if df.empty:
+        return {}
+    df = df.reset_index()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], utc=True).dt.tz_convert(ET)
+    return {
+        sym: g.set_index("timestamp")[["open", "high", "low", "close", "volume"]]
+        for sym, g in df.groupby("symbol")
+    }
+
+
+def fetch_alpaca_live() -> tuple:
+    """Positions + account from the Alpaca trading API (the /ws/live payload)."""
+    from execution.alpaca_client import get_alpaca_client
+
+    client = get_alpaca_client()
+    positions = [
+        {
+            "ticker": pos.symbol,
+            "side": "LONG" if float(pos.qty) > 0 else "SHORT",
+            "shares": abs(int(pos.qty)),
+            "entry_price": float(pos.avg_entry_price),
+            "current_price": float(pos.current_price),
+            "pnl": float(pos.unrealized_pl),
+            "pnl_pct": float(pos.unrealized_plpc) * 100,
+        }
+        for pos in client.get_all_positions()
+    ]
+    account = client.get_account()
+    account_data = {
+        "equity": float(account.equity),
+        "cash": float(account.cash),
+        "buying_power": float(account.buying_power),
+        "day_pnl": float(account.equity) - float(account.last_equity),
+    }
+    return positions, account_data
+
+
+class MarketDataHub:
+    """TTL caches for quotes / minute bars and one shared positions + account poller."""
+
+    def __init__(
+        self,
+        quote_fetcher: QuoteFetcher = fetch_alpaca_quotes,
+        bar_fetcher: BarFetcher = fetch_alpaca_minute_bars,
+        live_fetcher: LiveFetcher = fetch_alpaca_live,
+        quote_ttl_sec: Optional[float] = None,
+        bar_ttl_sec: Optional[float] = None,
+        live_poll_sec: Optional[float] = None,
+    ):
+        self.quote_fetcher = quote_fetcher
+        self.bar_fetcher = bar_fetcher
+        self.live_fetcher = live_fetcher
+        self.quote_ttl_sec = settings.MARKET_DATA_QUOTE_TTL_SEC if quote_ttl_sec is None else quote_ttl_sec
+        self.bar_ttl_sec = settings.MARKET_DATA_BAR_TTL_SEC if bar_ttl_sec is None else bar_ttl_sec
+        self.live_poll_sec = settings.MARKET_DATA_LIVE_POLL_SEC if live_poll_sec is None else live_poll_sec
+
+        self._quotes: dict[str, tuple[float, dict]] = {}  # symbol -> (fetched monotonic, quote)
+        self._bars: dict[tuple, tuple[float, pd.DataFrame]] = {}  # (symbol, start) -> (fetched monotonic, bars)
+        self._quote_lock: Optional[asyncio.Lock] = None
+        self._bar_lock: Optional[asyncio.Lock] = None
+
+        self._live: Optional[dict] = None
+        self._live_changed: Optional[asyncio.Condition] = None
+        self._live_task: Optional[asyncio.Task] = None
+        self._subscribers = 0
+
+        self.upstream_calls: Counter = Counter()
+        self.upstream_symbols: Counter = Counter()
+        self.cache_hits: Counter = Counter()
+
+    # Locks / conditions are created lazily so they bind to the running event loop
+    def _locks(self):
+        if self._quote_lock is None:
+            self._quote_lock = asyncio.Lock()
+            self._bar_lock = asyncio.Lock()
+            self._live_changed = asyncio.Condition()
+
+    # ------------------------------------------------------------------ quotes
+
+    async def get_quotes(self, symbols: list, max_age_sec: Optional[float] = None) -> dict:
+        """{symbol: {bid, ask, mid, timestamp}} for the symbols Alpaca has a quote for."""
+        self._locks()
+        ttl = self.quote_ttl_sec if max_age_sec is None else max_age_sec
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        if self._stale(self._quotes, symbols, ttl):
+            async with self._quote_lock:
+                # Re-check: a refresh that finished while we waited may already cover us
+                stale = self._stale(self._quotes, symbols, ttl)
+                if stale:
+                    await self._refresh_quotes(stale)
+        else:
+            self.cache_hits["quotes"] += 1
+        return {s: self._quotes[s][1] for s in symbols if s in self._quotes}
+
+    async def _refresh_quotes(self, symbols: list):
+        self.upstream_calls["quotes"] += 1
+        self.upstream_symbols["quotes"] += len(symbols)
+        try:
+            fetched = await asyncio.to_thread(self.quote_fetcher, symbols)
+        except Exception as e:
+            logger.warning(f"Quote refresh failed for {len(symbols)} symbols: {e}")
+            return
+        now = time.monotonic()
+        for sym, q in fetched.items():
+            bid, ask = q.get("bid") or 0.0, q.get("ask") or 0.0
+            mid = (bid + ask) / 2 if bid and ask else None
+            self._quotes[sym] = (now, {**q, "mid": mid})
+
+    # ------------------------------------------------------------------ bars
+
+    async def get_minute_bars(self, symbols: list, start: datetime, max_age_sec: Optional[float] = None) -> dict:
+        """{symbol: 1-min bars from `start` up to now}, refreshed incrementally once older than the TTL."""
+        self._locks()
+        ttl = self.bar_ttl_sec if max_age_sec is None else max_age_sec
+        symbols = list(dict.fromkeys(s.upper() for s in symbols if s))
+        keys = [(s, start) for s in symbols]
+        if self._stale(self._bars, keys, ttl):
+            async with self._bar_lock:
+                stale = self._stale(self._bars, keys, ttl)
+                if stale:
+                    await self._refresh_bars([k[0] for k in stale], start)
+        else:
+            self.cache_hits["bars"] += 1
+        out = {}
+        for key in keys:
+            entry = self._bars.get(key)
+            if entry is not None and not entry[1].empty:
+                out[key[0]] = entry[1]
+        return out
+
+    async def _refresh_bars(self, symbols: list, start: datetime):
+        # Fetch from the oldest last-cached bar (inclusive, it may have been partial) for all stale symbols
+        cached = [self._bars.get((s, start)) for s in symbols]
+        resume = [c[1].index.max() for c in cached if c is not None and not c[1].empty]
+        since = min(resume) if resume and len(resume) == len(symbols) else start
+        self.upstream_calls["bars"] += 1
+        self.upstream_symbols["bars"] += len(symbols)
+        try:
+            fetched = await asyncio.to_thread(self.bar_fetcher, symbols, since, datetime.now(ET))
+        except Exception as e:
+            logger.warning(f"Bar refresh failed for {len(symbols)} symbols: {e}")
+            return
+        now = time.monotonic()
+        for sym in symbols:
+            new = fetched.get(sym)
+            old = self._bars.get((sym, start))
+            if new is None or new.empty:
+                # Nothing new (or the fetch came back empty): keep what is cached
+                new = old[1] if old is not None else pd.DataFrame()
+            elif old is not None and not old[1].empty:
+                merged = pd.concat([old[1], new])
+                new = merged[~merged.index.duplicated(keep="last")].sort_index()
+            self._bars[(sym, start)] = (now, new)
+
+    @staticmethod
+    def _stale(cache: dict, keys: list, ttl: float) -> list:
+        cutoff = time.monotonic() - ttl
+        return [k for k in keys if k not in cache or cache[k][0] < cutoff]
+
+    # ------------------------------------------------------------------ positions + account
+
+    async def live_updates(self) -> AsyncIterator[dict]:
+        """
+        Yield every new positions + account snapshot (the newest only, if a client is slow).
+        The shared poller runs while at least one consumer is iterating.
+        """
+        self._locks()
+        self._subscribers += 1
+        if self._live_task is None or self._live_task.done():
+            self._live_task = asyncio.create_task(self._poll_live(), name="market-data-live")
+        seen = -1
+        try:
+            while True:
+                async with self._live_changed:
+                    await self._live_changed.wait_for(lambda: self._live is not None and self._live["version"] != seen)
+                    snapshot = self._live
+                seen = snapshot["version"]
+                yield snapshot
+        finally:
+            self._subscribers -= 1
+            if self._subscribers == 0 and self._live_task is not None:
+                self._live_task.cancel()
+                self._live_task = None
+
+    async def _poll_live(self):
+        version = self._live["version"] if self._live else 0
+        while True:
+            started = time.monotonic()
+            self.upstream_calls["live"] += 1
+            try:
+                positions, account = await asyncio.to_thread(self.live_fetcher)
+                snapshot = {"positions": positions, "account": account, "error": None}
+            except Exception as e:
+                logger.error(f"Error fetching data: {e}")
+                snapshot = {"positions": None, "account": None, "error": str(e)}
+            version += 1
+            snapshot.update(version=version, updated_at=datetime.now(ET).isoformat(),
+                            fetch_ms=round((time.monotonic() - started) * 1000, 1))
+            async with self._live_changed:
+                self._live = snapshot
+                self._live_changed.notify_all()
+            await asyncio.sleep(max(0.0, self.live_poll_sec - (time.monotonic() - started)))
+
+    def latest_live(self) -> Optional[dict]:
+        """Most recent positions + account snapshot (None before the first poll)."""
+        return self._live
+
+    def stats(self) -> dict:
+        return {
+            "quote_ttl_sec": self.quote_ttl_sec,
+            "bar_ttl_sec": self.bar_ttl_sec,
+            "live_poll_sec": self.live_poll_sec,
+            "cached_quotes": len(self._quotes),
+            "cached_bar_series": len(self._bars),
+            "live_subscribers": self._subscribers,
+            "live_version": self._live["version"] if self._live else 0,
+            "upstream_calls": dict(self.upstream_calls),
+            "upstream_symbols": dict(self.upstream_symbols),
+            "cache_hits": dict(self.cache_hits),
+        }
+
+
+_hub: Optional[MarketDataHub] = None
+
+
+def get_market_data_hub() -> MarketDataHub:
+    """Get or create the market data hub singleton."""
+    global _hub
+    if _hub is None:
+        _hub = MarketDataHub()
+    return _hub
@@ -463,16 +463,13 @@ async def get_todays_candidates_with_live_pnl(top_n: int = 20) -> list[dict]:
     Get today's candidates with live prices and unrealized P&L.
     
     For each candidate:
-    1. Fetch current price from Alpaca
+    1. Current price from the shared market data hub (cached Alpaca quotes)
     2. Determine if entry would have been triggered (price crossed entry level)
     3. Calculate unrealized P&L (or realized if stop was hit)
     
     Position sizing: $1000 capital, 1% risk, 2x max leverage
     """
-    from alpaca.data.historical import StockHistoricalDataClient
-    from alpaca.data.requests import StockLatestQuoteRequest, StockBarsRequest
-    from alpaca.data.timeframe import TimeFrame
-    from core.config import settings
+    from services.market_data_hub import get_market_data_hub
 
     today = datetime.now(ET).date()
     
@@ -487,35 +484,11 @@ async def get_todays_candidates_with_live_pnl(top_n: int = 20) -> list[dict]:
 
         symbols = [str(c.get("symbol", "")).upper().strip() for c in candidates if c.get("symbol")]
         
-        # Fetch current prices from Alpaca
-        data_client = StockHistoricalDataClient(
-            api_key=settings.ALPACA_API_KEY,
-            secret_key=settings.ALPACA_SECRET_KEY,
-        )
-        
-        # Get latest quotes
-        try:
-            quotes_request = StockLatestQuoteRequest(symbol_or_symbols=symbols)
-            quotes = data_client.get_stock_latest_quote(quotes_request)
-        except Exception as e:
-            print(f"Failed to get quotes: {e}")
-            quotes = {}
-        
-        # Get today's bars to check for entry/stop triggers
-        now = datetime.now(ET)
+        # Latest quotes + today's minute bars (entry/stop triggers), shared with every other caller
+        hub = get_market_data_hub()
         start = datetime.combine(today, time(9, 35)).replace(tzinfo=ET)
-        
-        try:
-            bars_request = StockBarsRequest(
-                symbol_or_symbols=symbols,
-                timeframe=TimeFrame.Minute,
-                start=start,
-                end=now,
-            )
-            all_bars = data_client.get_stock_bars(bars_request)
-        except Exception as e:
-            print(f"Failed to get bars: {e}")
-            all_bars = {}
+        quotes = await hub.get_quotes(symbols)
+        all_bars = await hub.get_minute_bars(symbols, start)
         
         results = []
         
@@ -528,8 +501,7 @@ async def get_todays_candidates_with_live_pnl(top_n: int = 20) -> list[dict]:
             # Get current price
             current_price = None
             if symbol in quotes:
-                q = quotes[symbol]
-                current_price = float(q.ask_price + q.bid_price) / 2 if q.ask_price and q.bid_price else None
+                current_price = quotes[symbol]["mid"]
             
             # Check entry/stop triggers from intraday bars
             entered = False
@@ -540,7 +512,7 @@ async def get_todays_candidates_with_live_pnl(top_n: int = 20) -> list[dict]:
             exit_reason = None
             
             if symbol in all_bars:
-                bars_df = all_bars[symbol].df if hasattr(all_bars[symbol], 'df') else pd.DataFrame(all_bars[symbol])
+                bars_df = all_bars[symbol]
                 if not bars_df.empty:
                     for idx, bar in bars_df.iterrows():
                         if not entered:
@@ -8,6 +8,11 @@ Automates:
 4. 9:36 AM ET - Auto signal generation + execution (OR breakout)
 5. 4:05 PM ET - Daily P&L logging
 6. Sunday 7:00 PM ET - Weekly database cleanup
+
+Jobs run on the API's event loop, so executor calls (alpaca-py HTTP, TradeZero
+Selenium) are awaited through the broker worker thread instead of being called
+directly (see execution/broker_worker.py). The kill switch is only a flag file
+and is checked directly, never queued behind a slow broker command.
 """
 import logging
 from datetime import datetime, timedelta
@@ -17,6 +22,7 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 
 from execution.order_executor import flatten_eod, get_executor
+from execution.broker_worker import broker_call
 from services.market_calendar import get_market_calendar, is_early_close_today
 from core.config import settings
 
@@ -96,7 +102,7 @@ async def job_flatten_eod():
         logger.warning("⚠️ EARLY CLOSE DAY - Flattening positions before 1 PM close")
     
     try:
-        result = flatten_eod()
+        result = await broker_call(flatten_eod)
         logger.info(f"✅ EOD flatten complete: {result}")
         return result
     except Exception as e:
@@ -203,43 +209,46 @@ async def job_premarket_check():
     logger.info("🌅 Pre-market check at 9:25 AM ET")
     
     try:
-        executor = get_executor()
-        
         # Check account status
-        account = executor.get_account()
+        account = await broker_call("get_account")
         if account.get("trading_blocked"):
             logger.error("⚠️ Trading is BLOCKED on this account!")
             return {"status": "blocked", "account": account}
         
         # Check kill switch
-        if executor.is_kill_switch_active():
+        if get_executor().is_kill_switch_active():
             logger.warning("⚠️ Kill switch is ACTIVE - trading disabled")
             return {"status": "kill_switch_active"}
         
+        # TradeZero: re-login now if the warm session would expire before the close,
+        # so no login/MFA lands on the 09:35 entry burst
+        session = None
+        if hasattr(get_executor(), "refresh_session"):
+            now = datetime.now(ET)
+            close = now.replace(hour=16, minute=0, second=0, microsecond=0)
+            session = await broker_call("refresh_session", horizon_sec=max(0.0, (close - now).total_seconds()))
+
         logger.info(f"✅ Account ready - Equity: ${account.get('equity', 0):,.2f}")
-        return {"status": "ready", "account": account}
+        return {"status": "ready", "account": account, "session": session}
     
     except Exception as e:
         logger.error(f"❌ Pre-market check failed: {e}")
         raise
 
 
-def job_morning_cleanup():
+async def job_morning_cleanup():
     """
     9:30 AM ET - Morning Cleanup.
     Cancels any stale orders and flattens overnight positions to ensure clean slate.
     """
-    from execution.order_executor import get_executor
-    
     logger.info("🧹 MORNING CLEANUP triggered at 9:30 AM ET - Ensuring clean slate")
     
     try:
-        executor = get_executor()
         # 1. Cancel open orders
-        cancelled = executor.cancel_all_orders()
+        cancelled = await broker_call("cancel_all_orders")
         logger.info(f"   Cleared pending orders: {cancelled}")
         # 2. Flatten positions
-        closed = executor.close_all_positions()
+        closed = await broker_call("close_all_positions")
         logger.info(f"   Flattened overnight positions: {closed}")
         return {"status": "success", "orders_cancelled": cancelled, "positions_closed": closed}
     except Exception as e:
@@ -296,8 +305,9 @@ async def job_auto_execute_orb():
     2. Fetch LIVE equity from Alpaca (for compounding)
     3. Run ORB scanner → generate signals → execute orders
     """
+    from datetime import time
     from services.signal_engine import run_signal_generation, get_pending_signals, calculate_position_size
-    from execution.order_executor import get_executor
+    from execution.entry_pipeline import prepare_entries
     from core.config import get_strategy_config
     
     logger.info("🚀 AUTO-EXECUTE ORB triggered at 9:36 AM ET")
@@ -307,10 +317,8 @@ async def job_auto_execute_orb():
     logger.info(f"🎯 Strategy: {strategy['name']} ({strategy['description']})")
     logger.info(f"   Top-N: {strategy['top_n']}, Direction: {strategy['direction']}, Risk/Trade: {strategy['risk_per_trade']*100:.1f}%")
     
-    executor = get_executor()
-    
     # Check kill switch first
-    if executor.is_kill_switch_active():
+    if get_executor().is_kill_switch_active():
         logger.warning("⚠️ Kill switch ACTIVE - skipping auto-execution")
         return {"status": "blocked", "reason": "kill_switch_active"}
     
@@ -324,7 +332,7 @@ async def job_auto_execute_orb():
     try:
         # Fetch LIVE equity from Alpaca — this is key for compounding!
         # As you profit, equity grows → position sizes grow automatically
-        account = executor.get_account()
+        account = await broker_call("get_account")
         equity = float(account.get("equity", 10000))
         logger.info(f"💰 Live account equity: ${equity:,.2f} (compounding base)")
         
@@ -353,7 +361,7 @@ async def job_auto_execute_orb():
             return {"status": "already_executed", "signals_generated": signals_generated}
         
         # Get current account for position sizing
-        account = executor.get_account()
+        account = await broker_call("get_account")
         equity = float(account.get("equity", 1500))
         buying_power = float(account.get("buying_power", equity))
         
@@ -365,57 +373,47 @@ async def job_auto_execute_orb():
         # Cap each position by buying power / number of positions
         max_position_value = buying_power / strategy["top_n"]
         
-        orders_placed = 0
+        # Size + validate every signal first, then submit the whole burst in one broker command
+        orders, skipped = prepare_entries(pending, equity, max_position_value, calculate_position_size)
         orders_failed = 0
+        for row in skipped:
+            orders_failed += 1
+            logger.warning(f"⚠️ Skipped {row['symbol']} - {row['reason']}")
+        
+        # OR close (09:35 ET) is the origin of the submit-latency histogram
+        or_close = datetime.combine(today, time(9, 35), tzinfo=ET)
+        burst = await broker_call(
+            "place_entry_orders",
+            orders,
+            origin=or_close,
+            max_delay_sec=settings.ENTRY_MAX_DELAY_SEC,
+        )
+        latency = burst["latency"]
+        
+        orders_placed = 0
         results = []
-        executed_symbols = set()  # Track executed symbols to prevent duplicates
-        
-        for signal in pending:
-                # Skip if we already executed this symbol today
-                if signal["symbol"] in executed_symbols:
-                    logger.info(f"⏭️ Skipping duplicate: {signal['symbol']}")
-                    continue
-                
-                # Calculate shares based on risk with buying power constraint
-                # Note: max_position_value is derived from buying_power (already leveraged)
-                # So we pass leverage=1.0 to avoid double-leveraging
-                shares = calculate_position_size(
-                    entry_price=signal["entry_price"],
-                    stop_price=signal["stop_price"],
-                    account_equity=equity,
-                    max_position_value=max_position_value,
-                    leverage=1.0,
-                )
-                
-                if shares > 0:
-                    order_result = executor.place_entry_order(
-                        symbol=signal["symbol"],
-                        side=signal["side"],
-                        shares=shares,
-                        entry_price=signal["entry_price"],
-                        stop_price=signal["stop_price"],
-                        signal_id=signal["id"],
-                    )
-                    results.append(order_result)
-                    
-                    if order_result.get("status") == "submitted":
-                        orders_placed += 1
-                        executed_symbols.add(signal["symbol"])
-                        logger.info(f"✅ Placed {signal['side']} order: {signal['symbol']} x{shares}")
-                    else:
-                        orders_failed += 1
-                        # Log 'reason' if available, otherwise fallback to 'error' or 'unknown'
-                        error_msg = order_result.get("reason") or order_result.get("error") or "unknown error"
-                        logger.warning(f"❌ Failed order: {signal['symbol']} - {error_msg}")
-                else:
-                    orders_failed += 1
-                    logger.warning(f"⚠️ Skipped {signal['symbol']} - calculated 0 shares")
+        for order, order_result in zip(orders, burst["results"]):
+            if order_result.get("status") == "duplicate":
+                logger.info(f"⏭️ Skipping duplicate: {order.symbol}")
+                continue
+            results.append(order_result)
+            if order_result.get("status") == "submitted":
+                orders_placed += 1
+                logger.info(f"✅ Placed {order.side} order: {order.symbol} x{order.shares}")
+            else:
+                orders_failed += 1
+                # Log 'reason' if available, otherwise fallback to 'error' or 'unknown'
+                error_msg = order_result.get("reason") or order_result.get("error") or "unknown error"
+                logger.warning(f"❌ Failed order: {order.symbol} - {error_msg}")
+        
+        logger.info(f"⏱️ Entry latency histogram (since OR close): {latency['histogram']}")
         
         logger.info(f"""
         ========== AUTO-EXECUTE COMPLETE ==========
         Signals Generated: {signals_generated}
         Orders Placed:     {orders_placed}
         Orders Failed:     {orders_failed}
+        Last Order Ack:    {latency['last_ack_ms'] / 1000:.1f}s after OR close
         ============================================
         """)
         
@@ -425,6 +423,7 @@ async def job_auto_execute_orb():
             "orders_placed": orders_placed,
             "orders_failed": orders_failed,
             "results": results,
+            "latency": latency,
         }
 
     except Exception as e:
@@ -440,7 +439,6 @@ async def job_tradezero_protective_stop_watcher():
     """
     from datetime import time
     from core.config import settings
-    from execution.order_executor import get_executor
 
     # Only relevant for TradeZero live mode.
     if (getattr(settings, "EXECUTION_BROKER", "") or "").lower() != "tradezero":
@@ -463,7 +461,7 @@ async def job_tradezero_protective_stop_watcher():
         return {"status": "skipped", "reason": "unsupported_executor"}
 
     try:
-        return executor.ensure_protective_stops()
+        return await broker_call("ensure_protective_stops")
     except Exception as e:
         logger.error("❌ Protective stop watcher failed: %s", e)
         return {"status": "error", "error": str(e)}
@@ -477,8 +475,7 @@ async def job_daily_summary():
     logger.info("📊 Daily summary at 4:05 PM ET")
     
     try:
-        executor = get_executor()
-        account = executor.get_account()
+        account = await broker_call("get_account")
         
         logger.info(f"""
         ========== DAILY SUMMARY ==========
@@ -214,15 +214,14 @@ async def run_signal_generation(
         Dict with status and generated signals
     """
     from services.orb_scanner import get_todays_candidates
-    from execution.order_executor import get_executor
+    from execution.broker_worker import broker_call
     
     # Get strategy config for defaults
     strategy = get_strategy_config()
     
     try:
         # Auto-fetch equity and buying power from Alpaca if not provided
-        executor = get_executor()
-        account = executor.get_account()
+        account = await broker_call("get_account")
         
         if account_equity is None:
             account_equity = float(account.get("equity", 10000))
@@ -32,11 +32,10 @@ def get_trading_client() -> TradingClient:
 
 
 def get_data_client() -> StockHistoricalDataClient:
-    """Get Alpaca data client for historical data."""
-    return StockHistoricalDataClient(
-        api_key=settings.ALPACA_API_KEY,
-        secret_key=settings.ALPACA_API_SECRET
-    )
+    """Get the shared Alpaca data client for historical data."""
+    from execution.alpaca_client import get_data_client as shared_data_client
+
+    return shared_data_client()
 
 
 async def fetch_tradeable_assets(
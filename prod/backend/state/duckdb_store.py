@@ -1,12 +1,17 @@
 from __future__ import annotations
 
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime, date
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from zoneinfo import ZoneInfo
 
 import duckdb
+import pyarrow as pa
 
 from core.config import settings
 
@@ -35,6 +40,357 @@ class StateSignal:
     timestamp: Optional[str]
 
 
+# --------------------------------------------------------------------------- schema
+
+SCHEMA_DDL = [
+    """
+    CREATE TABLE IF NOT EXISTS opening_ranges (
+        date DATE NOT NULL,
+        symbol VARCHAR NOT NULL,
+
+        or_open DOUBLE,
+        or_high DOUBLE,
+        or_low DOUBLE,
+        or_close DOUBLE,
+        or_volume BIGINT,
+
+        direction INTEGER,
+        rvol DOUBLE,
+        atr DOUBLE,
+        avg_volume BIGINT,
+
+        passed_filters BOOLEAN,
+        rank INTEGER,
+        entry_price DOUBLE,
+        stop_price DOUBLE,
+
+        signal_generated BOOLEAN DEFAULT FALSE,
+        order_placed BOOLEAN DEFAULT FALSE,
+        created_at TIMESTAMP,
+
+        PRIMARY KEY(date, symbol)
+    )
+    """,
+    "CREATE SEQUENCE IF NOT EXISTS signals_id_seq",
+    """
+    CREATE TABLE IF NOT EXISTS signals (
+        id BIGINT PRIMARY KEY DEFAULT nextval('signals_id_seq'),
+        signal_date DATE NOT NULL,
+        timestamp TIMESTAMP,
+        symbol VARCHAR NOT NULL,
+        side VARCHAR NOT NULL,
+        confidence DOUBLE,
+        entry_price DOUBLE,
+        stop_price DOUBLE,
+        status VARCHAR NOT NULL,
+        order_id VARCHAR,
+        filled_price DOUBLE,
+        filled_time TIMESTAMP,
+        rejection_reason VARCHAR,
+        created_at TIMESTAMP,
+        UNIQUE(signal_date, symbol)
+    )
+    """,
+]
+
+# Schema evolution (DuckDB doesn't support IF NOT EXISTS on ADD COLUMN).
+# We keep this best-effort so existing DBs can be upgraded in place.
+SCHEMA_UPGRADES = [
+    "ALTER TABLE signals ADD COLUMN stop_submitted BOOLEAN DEFAULT FALSE",
+    "ALTER TABLE signals ADD COLUMN stop_submitted_at TIMESTAMP",
+]
+
+
+def _create_schema(con: duckdb.DuckDBPyConnection) -> None:
+    for ddl in SCHEMA_DDL:
+        con.execute(ddl)
+    for ddl in SCHEMA_UPGRADES:
+        try:
+            con.execute(ddl)
+        except Exception:
+            pass
+
+
+# --------------------------------------------------------------------------- statements
+# Fixed SQL text for the hot paths. DuckDB's Python client binds `?` parameters
+# on a statement it prepares per execute (it has no handle to keep one across
+# calls), so the win here is never paying for connect + schema checks again.
+
+SQL_LATEST_SIGNAL = """
+    SELECT
+        id,
+        symbol,
+        side,
+        entry_price,
+        stop_price,
+        status,
+        order_id,
+        COALESCE(stop_submitted, FALSE) AS stop_submitted,
+        stop_submitted_at,
+        created_at
+    FROM signals
+    WHERE signal_date = ? AND symbol = ?
+    ORDER BY created_at DESC
+    LIMIT 1
+"""
+
+SQL_MARK_STOP_SUBMITTED = """
+    UPDATE signals
+    SET stop_submitted = TRUE,
+        stop_submitted_at = ?
+    WHERE id = ?
+"""
+
+SQL_INSERT_OPENING_RANGE = """
+    INSERT INTO opening_ranges (
+        date, symbol,
+        or_open, or_high, or_low, or_close, or_volume,
+        direction, rvol, atr, avg_volume,
+        passed_filters, rank, entry_price, stop_price,
+        signal_generated, order_placed, created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+SQL_CANDIDATES = """
+    SELECT symbol, direction, entry_price, stop_price, rvol, atr, or_high, or_low, rank
+    FROM opening_ranges
+    WHERE date = ? AND passed_filters = TRUE {direction}
+    ORDER BY rank ASC NULLS LAST
+    LIMIT ?
+"""
+
+SQL_EXISTING_SIGNAL_SYMBOLS = """
+    SELECT symbol
+    FROM signals
+    WHERE signal_date = ?
+      AND status NOT IN ('REJECTED', 'CANCELLED')
+"""
+
+SQL_RESET_TERMINAL_SIGNAL = """
+    UPDATE signals
+    SET
+        timestamp = ?,
+        side = ?,
+        confidence = ?,
+        entry_price = ?,
+        stop_price = ?,
+        status = 'PENDING',
+        order_id = NULL,
+        filled_price = NULL,
+        filled_time = NULL,
+        rejection_reason = NULL,
+        created_at = ?
+    WHERE signal_date = ?
+      AND symbol = ?
+      AND status IN ('REJECTED', 'CANCELLED')
+"""
+
+# Use the UNIQUE(signal_date, symbol) constraint to dedupe.
+# DuckDB supports ON CONFLICT DO NOTHING.
+SQL_INSERT_SIGNAL = """
+    INSERT INTO signals (
+        signal_date, timestamp, symbol, side, confidence,
+        entry_price, stop_price, status,
+        order_id, filled_price, filled_time, rejection_reason,
+        created_at
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(signal_date, symbol) DO NOTHING
+"""
+
+SQL_PENDING_SIGNALS = """
+    SELECT id, symbol, side, entry_price, stop_price,
+           COALESCE(confidence, 1.0) AS confidence,
+           timestamp
+    FROM signals
+    WHERE status = 'PENDING'
+      AND order_id IS NULL
+    ORDER BY timestamp DESC NULLS LAST
+"""
+
+_SIGNAL_LIST_COLUMNS = """
+    SELECT
+        id,
+        COALESCE(timestamp, created_at) AS ts,
+        symbol,
+        side,
+        confidence,
+        entry_price,
+        status,
+        filled_price,
+        filled_time,
+        rejection_reason
+    FROM signals
+"""
+
+SQL_LIST_SIGNALS = _SIGNAL_LIST_COLUMNS + """
+    ORDER BY ts DESC NULLS LAST, id DESC
+    LIMIT ? OFFSET ?
+"""
+
+SQL_ACTIVE_SIGNALS = _SIGNAL_LIST_COLUMNS + """
+    WHERE signal_date = ?
+      AND status IN ('PENDING', 'PARTIAL')
+    ORDER BY ts DESC NULLS LAST, id DESC
+    LIMIT ?
+"""
+
+SQL_SIGNAL_EXISTS = "SELECT id FROM signals WHERE id = ?"
+
+SQL_UPDATE_SIGNAL_STATUS = """
+    UPDATE signals
+    SET status = ?,
+        order_id = COALESCE(?, order_id),
+        filled_price = COALESCE(?, filled_price),
+        filled_time = COALESCE(?, filled_time),
+        rejection_reason = COALESCE(?, rejection_reason)
+    WHERE id = ?
+"""
+
+
+# --------------------------------------------------------------------------- shared connection
+
+class SharedConnection:
+    """One DuckDB connection per state file, shared by every DuckDBStateStore in the process.
+
+    Each thread runs its queries on its own cursor (a DuckDB cursor is a
+    separate connection to the same database, safe to use alongside the
+    others). The schema is created the first time the file is opened.
+
+    DuckDB lets only one process hold a database file for writing, so once
+    no call has used the connection for `idle_close_sec` it is closed and the
+    file lock released; CLI scripts (manual_execute, execute_one_signal, ...)
+    can then open the state while the API is running, as they could when
+    every call opened its own connection. `idle_close_sec <= 0` keeps it open.
+    """
+
+    def __init__(self, path: Path, idle_close_sec: float = 5.0):
+        self.path = Path(path)
+        self.idle_close_sec = float(idle_close_sec)
+        self.opens = 0  # connections opened (the schema is only created on the first)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._con: Optional[duckdb.DuckDBPyConnection] = None
+        self._cursors: "weakref.WeakSet[duckdb.DuckDBPyConnection]" = weakref.WeakSet()
+        self._generation = 0
+        self._active = 0
+        self._last_used = 0.0
+        self._timer: Optional[threading.Timer] = None
+        self._schema_ready = False
+
+    def _open(self) -> None:
+        con = duckdb.connect(str(self.path))
+        # Safer defaults for single-process local usage
+        con.execute("PRAGMA threads=4")
+        if not self._schema_ready:
+            _create_schema(con)
+            self._schema_ready = True
+        self._con = con
+        self._generation += 1
+        self.opens += 1
+
+    @contextmanager
+    def cursor(self) -> Iterator[duckdb.DuckDBPyConnection]:
+        """This thread's cursor on the shared connection, opening it if needed."""
+        with self._lock:
+            if self._con is None:
+                self._open()
+            cur = getattr(self._local, "cursor", None)
+            if cur is None or self._local.generation != self._generation:
+                cur = self._con.cursor()
+                self._cursors.add(cur)
+                self._local.cursor, self._local.generation = cur, self._generation
+            self._active += 1
+        try:
+            yield cur
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._last_used = time.monotonic()
+                if self._active == 0 and self.idle_close_sec > 0 and self._timer is None:
+                    self._schedule_idle_close(self.idle_close_sec)
+
+    def _schedule_idle_close(self, delay: float) -> None:
+        self._timer = threading.Timer(delay, self._close_if_idle)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _close_if_idle(self) -> None:
+        with self._lock:
+            self._timer = None
+            if self._con is None or self._active:
+                return
+            remaining = self._last_used + self.idle_close_sec - time.monotonic()
+            if remaining > 0:
+                self._schedule_idle_close(remaining)
+                return
+            self._close()
+
+    def _close(self) -> None:
+        for cur in list(self._cursors):
+            try:
+                cur.close()
+            except Exception:
+                pass
+        self._cursors = weakref.WeakSet()
+        if self._con is not None:
+            self._con.close()
+            self._con = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._con is not None
+
+    def close(self) -> None:
+        """Close the connection now (the next call reopens it)."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._close()
+
+
+_shared: dict[str, SharedConnection] = {}
+_shared_lock = threading.Lock()
+
+
+def shared_connection(path: Path) -> SharedConnection:
+    """The process-wide SharedConnection for a state file."""
+    key = str(Path(path).resolve())
+    with _shared_lock:
+        shared = _shared.get(key)
+        if shared is None:
+            idle = float(getattr(settings, "DUCKDB_STATE_IDLE_CLOSE_SEC", 5.0))
+            shared = _shared[key] = SharedConnection(Path(path), idle_close_sec=idle)
+        return shared
+
+
+def close_shared_connections() -> None:
+    """Close every shared state connection (app shutdown, tests)."""
+    with _shared_lock:
+        shared = list(_shared.values())
+        _shared.clear()
+    for s in shared:
+        s.close()
+
+
+def _arrow(result: duckdb.DuckDBPyConnection) -> pa.Table:
+    # `to_arrow_table` on newer DuckDB releases, `fetch_arrow_table` before.
+    fetch = getattr(result, "to_arrow_table", None) or result.fetch_arrow_table
+    return fetch()
+
+
+def _float(v) -> Optional[float]:
+    return float(v) if v is not None else None
+
+
+def _int(v) -> Optional[int]:
+    return int(v) if v is not None else None
+
+
+def _upper(v) -> str:
+    return str(v or "").upper().strip()
+
+
 class DuckDBStateStore:
     """DuckDB-backed trading state store.
 
@@ -43,491 +399,238 @@ class DuckDBStateStore:
     - signals: generated signals + execution status
 
     This avoids SQLite/Postgres/SQLAlchemy for live runs.
+
+    Stores are cheap to create: every instance for the same file runs on one
+    SharedConnection. The `*_table` readers return the query result as an
+    Arrow table; the list/dict readers are built from those.
     """
 
     def __init__(self, path: Optional[Path] = None):
         self.path = Path(path) if path is not None else _state_db_path()
         self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._shared = shared_connection(self.path)
 
-    def _connect(self) -> duckdb.DuckDBPyConnection:
-        con = duckdb.connect(str(self.path))
-        # Safer defaults for single-process local usage
-        con.execute("PRAGMA threads=4")
-        return con
+    def _cursor(self):
+        return self._shared.cursor()
 
     def ensure_tables(self) -> None:
-        con = self._connect()
-        try:
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS opening_ranges (
-                    date DATE NOT NULL,
-                    symbol VARCHAR NOT NULL,
-
-                    or_open DOUBLE,
-                    or_high DOUBLE,
-                    or_low DOUBLE,
-                    or_close DOUBLE,
-                    or_volume BIGINT,
-
-                    direction INTEGER,
-                    rvol DOUBLE,
-                    atr DOUBLE,
-                    avg_volume BIGINT,
-
-                    passed_filters BOOLEAN,
-                    rank INTEGER,
-                    entry_price DOUBLE,
-                    stop_price DOUBLE,
-
-                    signal_generated BOOLEAN DEFAULT FALSE,
-                    order_placed BOOLEAN DEFAULT FALSE,
-                    created_at TIMESTAMP,
-
-                    PRIMARY KEY(date, symbol)
-                )
-                """
-            )
-
-            con.execute("CREATE SEQUENCE IF NOT EXISTS signals_id_seq")
-
-            con.execute(
-                """
-                CREATE TABLE IF NOT EXISTS signals (
-                    id BIGINT PRIMARY KEY DEFAULT nextval('signals_id_seq'),
-                    signal_date DATE NOT NULL,
-                    timestamp TIMESTAMP,
-                    symbol VARCHAR NOT NULL,
-                    side VARCHAR NOT NULL,
-                    confidence DOUBLE,
-                    entry_price DOUBLE,
-                    stop_price DOUBLE,
-                    status VARCHAR NOT NULL,
-                    order_id VARCHAR,
-                    filled_price DOUBLE,
-                    filled_time TIMESTAMP,
-                    rejection_reason VARCHAR,
-                    created_at TIMESTAMP,
-                    UNIQUE(signal_date, symbol)
-                )
-                """
-            )
-
-            # Schema evolution (DuckDB doesn't support IF NOT EXISTS on ADD COLUMN).
-            # We keep this best-effort so existing DBs can be upgraded in place.
-            for ddl in [
-                "ALTER TABLE signals ADD COLUMN stop_submitted BOOLEAN DEFAULT FALSE",
-                "ALTER TABLE signals ADD COLUMN stop_submitted_at TIMESTAMP",
-            ]:
-                try:
-                    con.execute(ddl)
-                except Exception:
-                    pass
-        finally:
-            con.close()
+        """Create the schema if needed (done once per process, on first use)."""
+        with self._cursor():
+            pass
 
     def get_latest_signal_for_symbol(self, target_date: date, symbol: str) -> Optional[dict]:
         """Fetch the latest signal row for a symbol on a given date."""
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            sym = str(symbol or "").upper().strip()
-            if not sym:
-                return None
-            df = con.execute(
-                """
-                SELECT
-                    id,
-                    symbol,
-                    side,
-                    entry_price,
-                    stop_price,
-                    status,
-                    order_id,
-                    COALESCE(stop_submitted, FALSE) AS stop_submitted,
-                    stop_submitted_at,
-                    created_at
-                FROM signals
-                WHERE signal_date = ? AND symbol = ?
-                ORDER BY created_at DESC
-                LIMIT 1
-                """,
-                [target_date, sym],
-            ).fetchdf()
-            if df is None or df.empty:
-                return None
-            row = df.iloc[0]
-            return {
-                "id": int(row["id"]),
-                "symbol": str(row["symbol"]).upper().strip(),
-                "side": str(row["side"]).upper().strip(),
-                "entry_price": float(row["entry_price"]) if row.get("entry_price") is not None else None,
-                "stop_price": float(row["stop_price"]) if row.get("stop_price") is not None else None,
-                "status": str(row["status"]).upper().strip(),
-                "order_id": row.get("order_id"),
-                "stop_submitted": bool(row.get("stop_submitted")),
-                "stop_submitted_at": row.get("stop_submitted_at"),
-            }
-        finally:
-            con.close()
+        sym = _upper(symbol)
+        if not sym:
+            return None
+        with self._cursor() as cur:
+            row = cur.execute(SQL_LATEST_SIGNAL, [target_date, sym]).fetchone()
+        if row is None:
+            return None
+        sid, symbol, side, entry, stop, status, order_id, stop_submitted, stop_submitted_at, _ = row
+        return {
+            "id": int(sid),
+            "symbol": _upper(symbol),
+            "side": _upper(side),
+            "entry_price": _float(entry),
+            "stop_price": _float(stop),
+            "status": _upper(status),
+            "order_id": order_id,
+            "stop_submitted": bool(stop_submitted),
+            "stop_submitted_at": stop_submitted_at,
+        }
 
     def mark_stop_submitted(self, signal_id: int) -> bool:
         """Mark a signal as having had a protective stop submitted."""
-        self.ensure_tables()
-        con = self._connect()
         try:
-            con.execute(
-                """
-                UPDATE signals
-                SET stop_submitted = TRUE,
-                    stop_submitted_at = ?
-                WHERE id = ?
-                """,
-                [datetime.utcnow(), int(signal_id)],
-            )
+            with self._cursor() as cur:
+                cur.execute(SQL_MARK_STOP_SUBMITTED, [datetime.utcnow(), int(signal_id)])
             return True
         except Exception:
             return False
-        finally:
-            con.close()
 
     def replace_opening_ranges(self, target_date: date, candidates: list[dict]) -> None:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            con.execute("DELETE FROM opening_ranges WHERE date = ?", [target_date])
-
-            now_ts = datetime.utcnow()
-            rows = []
-            for c in candidates:
-                rows.append(
-                    (
-                        target_date,
-                        str(c.get("symbol") or "").upper().strip(),
-                        c.get("or_open"),
-                        c.get("or_high"),
-                        c.get("or_low"),
-                        c.get("or_close"),
-                        int(c.get("or_volume")) if c.get("or_volume") is not None else None,
-                        int(c.get("direction")) if c.get("direction") is not None else None,
-                        float(c.get("rvol")) if c.get("rvol") is not None else None,
-                        float(c.get("atr")) if c.get("atr") is not None else None,
-                        int(c.get("avg_volume")) if c.get("avg_volume") is not None else None,
-                        bool(c.get("passed_filters")) if c.get("passed_filters") is not None else False,
-                        int(c.get("rank")) if c.get("rank") is not None else None,
-                        float(c.get("entry_price")) if c.get("entry_price") is not None else None,
-                        float(c.get("stop_price")) if c.get("stop_price") is not None else None,
-                        bool(c.get("signal_generated")) if c.get("signal_generated") is not None else False,
-                        bool(c.get("order_placed")) if c.get("order_placed") is not None else False,
-                        now_ts,
-                    )
+        now_ts = datetime.utcnow()
+        rows = []
+        for c in candidates:
+            rows.append(
+                (
+                    target_date,
+                    _upper(c.get("symbol")),
+                    c.get("or_open"),
+                    c.get("or_high"),
+                    c.get("or_low"),
+                    c.get("or_close"),
+                    _int(c.get("or_volume")),
+                    _int(c.get("direction")),
+                    _float(c.get("rvol")),
+                    _float(c.get("atr")),
+                    _int(c.get("avg_volume")),
+                    bool(c.get("passed_filters")) if c.get("passed_filters") is not None else False,
+                    _int(c.get("rank")),
+                    _float(c.get("entry_price")),
+                    _float(c.get("stop_price")),
+                    bool(c.get("signal_generated")) if c.get("signal_generated") is not None else False,
+                    bool(c.get("order_placed")) if c.get("order_placed") is not None else False,
+                    now_ts,
                 )
+            )
 
+        with self._cursor() as cur:
+            cur.execute("DELETE FROM opening_ranges WHERE date = ?", [target_date])
             if rows:
-                con.executemany(
-                    """
-                    INSERT INTO opening_ranges (
-                        date, symbol,
-                        or_open, or_high, or_low, or_close, or_volume,
-                        direction, rvol, atr, avg_volume,
-                        passed_filters, rank, entry_price, stop_price,
-                        signal_generated, order_placed, created_at
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    rows,
-                )
-        finally:
-            con.close()
+                cur.executemany(SQL_INSERT_OPENING_RANGE, rows)
+
+    def candidates_table(self, top_n: int, direction: str) -> pa.Table:
+        """Today's ranked candidates that passed the filters, as an Arrow table."""
+        dir_norm = (direction or "both").strip().lower()
+        dir_sql = {"long": "AND direction = 1", "short": "AND direction = -1"}.get(dir_norm, "")
+        today = datetime.now(ET).date()
+        with self._cursor() as cur:
+            return _arrow(cur.execute(SQL_CANDIDATES.format(direction=dir_sql), [today, int(top_n)]))
 
     def get_todays_candidates(self, top_n: int, direction: str) -> list[dict]:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            today = datetime.now(ET).date()
-            base = "SELECT * FROM opening_ranges WHERE date = ? AND passed_filters = TRUE"
-            params = [today]
-
-            dir_norm = (direction or "both").strip().lower()
-            if dir_norm == "long":
-                base += " AND direction = 1"
-            elif dir_norm == "short":
-                base += " AND direction = -1"
-
-            base += " ORDER BY rank ASC NULLS LAST LIMIT ?"
-            params.append(int(top_n))
-
-            df = con.execute(base, params).fetchdf()
-            if df is None or df.empty:
-                return []
-
-            out: list[dict] = []
-            for _, row in df.iterrows():
-                out.append(
-                    {
-                        "symbol": str(row.get("symbol") or "").upper().strip(),
-                        "direction": int(row.get("direction")) if row.get("direction") is not None else None,
-                        "entry_price": float(row.get("entry_price")) if row.get("entry_price") is not None else None,
-                        "stop_price": float(row.get("stop_price")) if row.get("stop_price") is not None else None,
-                        "rvol": float(row.get("rvol")) if row.get("rvol") is not None else None,
-                        "atr": float(row.get("atr")) if row.get("atr") is not None else None,
-                        "or_high": float(row.get("or_high")) if row.get("or_high") is not None else None,
-                        "or_low": float(row.get("or_low")) if row.get("or_low") is not None else None,
-                        "rank": int(row.get("rank")) if row.get("rank") is not None else None,
-                    }
-                )
-            return out
-        finally:
-            con.close()
+        out: list[dict] = []
+        for row in self.candidates_table(top_n, direction).to_pylist():
+            out.append(
+                {
+                    "symbol": _upper(row["symbol"]),
+                    "direction": _int(row["direction"]),
+                    "entry_price": _float(row["entry_price"]),
+                    "stop_price": _float(row["stop_price"]),
+                    "rvol": _float(row["rvol"]),
+                    "atr": _float(row["atr"]),
+                    "or_high": _float(row["or_high"]),
+                    "or_low": _float(row["or_low"]),
+                    "rank": _int(row["rank"]),
+                }
+            )
+        return out
 
     def mark_signals_generated(self, target_date: date, symbols: list[str]) -> None:
         if not symbols:
             return
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            syms = [str(s).upper().strip() for s in symbols if s]
-            con.execute(
+        syms = [_upper(s) for s in symbols if s]
+        with self._cursor() as cur:
+            cur.execute(
                 "UPDATE opening_ranges SET signal_generated = TRUE WHERE date = ? AND symbol IN (SELECT * FROM UNNEST(?))",
                 [target_date, syms],
             )
-        finally:
-            con.close()
 
     def list_existing_signal_symbols(self, target_date: date) -> set[str]:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            # Only treat non-terminal signals as "existing" so REJECTED/CANCELLED can be regenerated.
-            df = con.execute(
-                """
-                SELECT symbol
-                FROM signals
-                WHERE signal_date = ?
-                  AND status NOT IN ('REJECTED', 'CANCELLED')
-                """,
-                [target_date],
-            ).fetchdf()
-            if df is None or df.empty:
-                return set()
-            return {str(s).upper().strip() for s in df["symbol"].dropna().tolist()}
-        finally:
-            con.close()
+        # Only treat non-terminal signals as "existing" so REJECTED/CANCELLED can be regenerated.
+        with self._cursor() as cur:
+            symbols = _arrow(cur.execute(SQL_EXISTING_SIGNAL_SYMBOLS, [target_date])).column("symbol")
+        return {_upper(s) for s in symbols.drop_null().to_pylist()}
 
     def insert_signals(self, target_date: date, signals: list[dict]) -> None:
         if not signals:
             return
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            now_ts = datetime.utcnow()
-
-            # If a symbol already exists for the day but is terminal (REJECTED/CANCELLED),
-            # reset it so it can be executed again.
-            for s in signals:
-                sym = str(s.get("symbol") or "").upper().strip()
-                if not sym:
-                    continue
-                con.execute(
-                    """
-                    UPDATE signals
-                    SET
-                        timestamp = ?,
-                        side = ?,
-                        confidence = ?,
-                        entry_price = ?,
-                        stop_price = ?,
-                        status = 'PENDING',
-                        order_id = NULL,
-                        filled_price = NULL,
-                        filled_time = NULL,
-                        rejection_reason = NULL,
-                        created_at = ?
-                    WHERE signal_date = ?
-                      AND symbol = ?
-                      AND status IN ('REJECTED', 'CANCELLED')
-                    """,
-                    [
-                        datetime.utcnow(),
-                        str(s.get("side") or "").upper().strip(),
-                        float(s.get("confidence")) if s.get("confidence") is not None else None,
-                        float(s.get("entry_price")) if s.get("entry_price") is not None else None,
-                        float(s.get("stop_price")) if s.get("stop_price") is not None else None,
-                        now_ts,
-                        target_date,
-                        sym,
-                    ],
-                )
+        now_ts = datetime.utcnow()
 
-            rows = []
-            for s in signals:
-                rows.append(
-                    (
-                        target_date,
-                        datetime.utcnow(),
-                        str(s.get("symbol") or "").upper().strip(),
-                        str(s.get("side") or "").upper().strip(),
-                        float(s.get("confidence")) if s.get("confidence") is not None else None,
-                        float(s.get("entry_price")) if s.get("entry_price") is not None else None,
-                        float(s.get("stop_price")) if s.get("stop_price") is not None else None,
-                        "PENDING",
-                        None,
-                        None,
-                        None,
-                        None,
-                        now_ts,
-                    )
-                )
+        # If a symbol already exists for the day but is terminal (REJECTED/CANCELLED),
+        # reset it so it can be executed again.
+        resets = []
+        for s in signals:
+            sym = _upper(s.get("symbol"))
+            if not sym:
+                continue
+            resets.append(
+                [
+                    datetime.utcnow(),
+                    _upper(s.get("side")),
+                    _float(s.get("confidence")),
+                    _float(s.get("entry_price")),
+                    _float(s.get("stop_price")),
+                    now_ts,
+                    target_date,
+                    sym,
+                ]
+            )
 
-            # Use the UNIQUE(signal_date, symbol) constraint to dedupe.
-            # DuckDB supports ON CONFLICT DO NOTHING.
-            con.executemany(
-                """
-                INSERT INTO signals (
-                    signal_date, timestamp, symbol, side, confidence,
-                    entry_price, stop_price, status,
-                    order_id, filled_price, filled_time, rejection_reason,
-                    created_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(signal_date, symbol) DO NOTHING
-                """,
-                rows,
+        rows = []
+        for s in signals:
+            rows.append(
+                (
+                    target_date,
+                    datetime.utcnow(),
+                    _upper(s.get("symbol")),
+                    _upper(s.get("side")),
+                    _float(s.get("confidence")),
+                    _float(s.get("entry_price")),
+                    _float(s.get("stop_price")),
+                    "PENDING",
+                    None,
+                    None,
+                    None,
+                    None,
+                    now_ts,
+                )
             )
-        finally:
-            con.close()
+
+        with self._cursor() as cur:
+            for params in resets:
+                cur.execute(SQL_RESET_TERMINAL_SIGNAL, params)
+            cur.executemany(SQL_INSERT_SIGNAL, rows)
+
+    def pending_signals_table(self) -> pa.Table:
+        """PENDING signals without an order, newest first, as an Arrow table."""
+        with self._cursor() as cur:
+            return _arrow(cur.execute(SQL_PENDING_SIGNALS))
 
     def get_pending_signals(self) -> list[dict]:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            df = con.execute(
-                """
-                SELECT id, symbol, side, entry_price, stop_price,
-                       COALESCE(confidence, 1.0) AS confidence,
-                       timestamp
-                FROM signals
-                WHERE status = 'PENDING'
-                  AND order_id IS NULL
-                ORDER BY timestamp DESC NULLS LAST
-                """
-            ).fetchdf()
-            if df is None or df.empty:
-                return []
-
-            out: list[dict] = []
-            for _, row in df.iterrows():
-                out.append(
-                    {
-                        "id": int(row["id"]),
-                        "symbol": str(row["symbol"]).upper().strip(),
-                        "side": str(row["side"]).upper().strip(),
-                        "entry_price": float(row["entry_price"]),
-                        "stop_price": float(row["stop_price"]),
-                        "confidence": float(row["confidence"]),
-                        "timestamp": row["timestamp"].isoformat() if row.get("timestamp") is not None else None,
-                    }
-                )
-            return out
-        finally:
-            con.close()
+        out: list[dict] = []
+        for row in self.pending_signals_table().to_pylist():
+            ts = row["timestamp"]
+            out.append(
+                {
+                    "id": int(row["id"]),
+                    "symbol": _upper(row["symbol"]),
+                    "side": _upper(row["side"]),
+                    "entry_price": _float(row["entry_price"]),
+                    "stop_price": _float(row["stop_price"]),
+                    "confidence": float(row["confidence"]),
+                    "timestamp": ts.isoformat() if ts is not None else None,
+                }
+            )
+        return out
+
+    def signals_table(self, limit: int = 50, offset: int = 0) -> pa.Table:
+        """Most recent signals (any date/status), as an Arrow table."""
+        with self._cursor() as cur:
+            return _arrow(cur.execute(SQL_LIST_SIGNALS, [int(limit), int(offset)]))
+
+    def active_signals_table(self, limit: int = 200) -> pa.Table:
+        """Today's PENDING/PARTIAL signals, as an Arrow table."""
+        today = datetime.now(ET).date()
+        with self._cursor() as cur:
+            return _arrow(cur.execute(SQL_ACTIVE_SIGNALS, [today, int(limit)]))
+
+    @staticmethod
+    def _signal_rows(table: pa.Table) -> list[dict]:
+        out: list[dict] = []
+        for row in table.to_pylist():
+            out.append(
+                {
+                    "id": int(row["id"]),
+                    "timestamp": row["ts"],
+                    "symbol": _upper(row["symbol"]),
+                    "side": _upper(row["side"]),
+                    "confidence": _float(row["confidence"]),
+                    "entry_price": _float(row["entry_price"]),
+                    "status": _upper(row["status"]),
+                    "filled_price": _float(row["filled_price"]),
+                    "filled_time": row["filled_time"],
+                    "rejection_reason": row["rejection_reason"],
+                }
+            )
+        return out
 
     def list_signals(self, limit: int = 50, offset: int = 0) -> list[dict]:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            df = con.execute(
-                """
-                SELECT
-                    id,
-                    COALESCE(timestamp, created_at) AS ts,
-                    symbol,
-                    side,
-                    confidence,
-                    entry_price,
-                    status,
-                    filled_price,
-                    filled_time,
-                    rejection_reason
-                FROM signals
-                ORDER BY ts DESC NULLS LAST, id DESC
-                LIMIT ? OFFSET ?
-                """,
-                [int(limit), int(offset)],
-            ).fetchdf()
-            if df is None or df.empty:
-                return []
-
-            out: list[dict] = []
-            for _, row in df.iterrows():
-                ts = row.get("ts")
-                filled_time = row.get("filled_time")
-                out.append(
-                    {
-                        "id": int(row["id"]),
-                        "timestamp": ts,
-                        "symbol": str(row["symbol"] or "").upper().strip(),
-                        "side": str(row["side"] or "").upper().strip(),
-                        "confidence": float(row["confidence"]) if row.get("confidence") is not None else None,
-                        "entry_price": float(row["entry_price"]) if row.get("entry_price") is not None else None,
-                        "status": str(row["status"] or "").upper().strip(),
-                        "filled_price": float(row["filled_price"]) if row.get("filled_price") is not None else None,
-                        "filled_time": filled_time,
-                        "rejection_reason": row.get("rejection_reason"),
-                    }
-                )
-            return out
-        finally:
-            con.close()
+        return self._signal_rows(self.signals_table(limit, offset))
 
     def list_active_signals(self, limit: int = 200) -> list[dict]:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            today = datetime.now(ET).date()
-            df = con.execute(
-                """
-                SELECT
-                    id,
-                    COALESCE(timestamp, created_at) AS ts,
-                    symbol,
-                    side,
-                    confidence,
-                    entry_price,
-                    status,
-                    filled_price,
-                    filled_time,
-                    rejection_reason
-                FROM signals
-                WHERE signal_date = ?
-                  AND status IN ('PENDING', 'PARTIAL')
-                ORDER BY ts DESC NULLS LAST, id DESC
-                LIMIT ?
-                """,
-                [today, int(limit)],
-            ).fetchdf()
-            if df is None or df.empty:
-                return []
-
-            out: list[dict] = []
-            for _, row in df.iterrows():
-                ts = row.get("ts")
-                filled_time = row.get("filled_time")
-                out.append(
-                    {
-                        "id": int(row["id"]),
-                        "timestamp": ts,
-                        "symbol": str(row["symbol"] or "").upper().strip(),
-                        "side": str(row["side"] or "").upper().strip(),
-                        "confidence": float(row["confidence"]) if row.get("confidence") is not None else None,
-                        "entry_price": float(row["entry_price"]) if row.get("entry_price") is not None else None,
-                        "status": str(row["status"] or "").upper().strip(),
-                        "filled_price": float(row["filled_price"]) if row.get("filled_price") is not None else None,
-                        "filled_time": filled_time,
-                        "rejection_reason": row.get("rejection_reason"),
-                    }
-                )
-            return out
-        finally:
-            con.close()
+        return self._signal_rows(self.active_signals_table(limit))
 
     def update_signal_status(
         self,
@@ -537,25 +640,15 @@ class DuckDBStateStore:
         filled_price: Optional[float] = None,
         rejection_reason: Optional[str] = None,
     ) -> bool:
-        self.ensure_tables()
-        con = self._connect()
-        try:
-            existing = con.execute("SELECT id FROM signals WHERE id = ?", [int(signal_id)]).fetchone()
+        with self._cursor() as cur:
+            existing = cur.execute(SQL_SIGNAL_EXISTS, [int(signal_id)]).fetchone()
             if not existing:
                 return False
 
             filled_time = datetime.utcnow() if filled_price is not None else None
 
-            con.execute(
-                """
-                UPDATE signals
-                SET status = ?,
-                    order_id = COALESCE(?, order_id),
-                    filled_price = COALESCE(?, filled_price),
-                    filled_time = COALESCE(?, filled_time),
-                    rejection_reason = COALESCE(?, rejection_reason)
-                WHERE id = ?
-                """,
+            cur.execute(
+                SQL_UPDATE_SIGNAL_STATUS,
                 [
                     str(status),
                     order_id,
@@ -566,5 +659,3 @@ class DuckDBStateStore:
                 ],
             )
             return True
-        finally:
-            con.close()
@@ -0,0 +1,134 @@
+"""Synthetic daily-bar parquet files and the legacy ORM sync, shared by
+tests/test_daily_bar_sync.py and scripts/bench_daily_bar_sync.py."""
+from __future__ import annotations
+
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import and_, create_engine, delete, select
+from sqlalchemy.orm import sessionmaker
+
+from db.models import DailyBar
+from services.daily_bar_sync import VALUE_COLUMNS
+
+
+# --------------------------------------------------------------------------- dataset
+
+def make_dataset(directory: Path, n_symbols: int, n_days: int = 60, end: Optional[datetime] = None, seed: int = 7) -> list[Path]:
+    """One parquet of `n_days` business-day bars (naive midnight `date` column) per symbol."""
+    directory.mkdir(parents=True, exist_ok=True)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    dates = pd.bdate_range(end=end, periods=n_days)
+    rng = np.random.default_rng(seed)
+    paths = []
+    for i in range(n_symbols):
+        close = 5 + rng.random() * 50 + np.cumsum(rng.normal(0, 0.3, n_days))
+        close = np.maximum(close, 1.0)
+        spread = np.abs(rng.normal(0.4, 0.2, n_days))
+        df = pd.DataFrame({
+            "date": dates,
+            "open": close + rng.normal(0, 0.1, n_days),
+            "high": close + spread,
+            "low": close - spread,
+            "close": close,
+            "volume": rng.integers(100_000, 5_000_000, n_days).astype(float),
+            "vwap": close + rng.normal(0, 0.05, n_days),
+        })
+        path = directory / f"S{i:05d}.parquet"
+        df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+def append_day(paths: list[Path], seed: int = 8):
+    """Append the next business day's bar to every file (a nightly update)."""
+    rng = np.random.default_rng(seed)
+    for path in paths:
+        df = pd.read_parquet(path)
+        last = df.iloc[-1]
+        close = max(1.0, last["close"] + rng.normal(0, 0.3))
+        row = {"date": last["date"] + pd.offsets.BDay(1), "open": close, "high": close + 0.3, "low": close - 0.3,
+               "close": close, "volume": float(rng.integers(100_000, 5_000_000)), "vwap": close}
+        pd.concat([df, pd.DataFrame([row])], ignore_index=True).to_parquet(path, index=False)
+
+
+# --------------------------------------------------------------------------- legacy ORM path
+# The per-row loop sync_daily_bars_from_parquet ran before (active-ticker filter and prints left out).
+
+def _compute_atr(bars: list[dict], period: int = 14) -> Optional[float]:
+    if len(bars) < period + 1:
+        return None
+    df = pd.DataFrame(bars).sort_values("timestamp").reset_index(drop=True)
+    prev_close = df["close"].shift(1)
+    tr = pd.concat([df["high"] - df["low"], (df["high"] - prev_close).abs(), (df["low"] - prev_close).abs()], axis=1).max(axis=1)
+    latest = tr.rolling(window=period, min_periods=period).mean().iloc[-1]
+    return float(latest) if pd.notna(latest) else None
+
+
+def _compute_avg_volume(bars: list[dict], period: int = 14) -> Optional[float]:
+    if len(bars) < period:
+        return None
+    df = pd.DataFrame(bars).sort_values("timestamp").reset_index(drop=True)
+    latest = df["volume"].rolling(window=period, min_periods=period).mean().iloc[-1]
+    return float(latest) if pd.notna(latest) else None
+
+
+def legacy_orm_sync(engine, paths: list[Path], cutoff_date: datetime) -> int:
+    db = sessionmaker(bind=engine, autoflush=False)()
+    synced = 0
+    try:
+        for i, p_file in enumerate(paths):
+            symbol = p_file.stem
+            df = pd.read_parquet(p_file)
+            df["timestamp"] = pd.to_datetime(df["date"])
+            df = df[df["timestamp"] >= cutoff_date.replace(tzinfo=None)]
+            if df.empty:
+                continue
+            bars = []
+            for _, row in df.iterrows():
+                bars.append({
+                    "timestamp": row["timestamp"], "open": row["open"], "high": row["high"], "low": row["low"],
+                    "close": row["close"], "volume": row["volume"], "vwap": row.get("vwap"),
+                })
+            atr_14 = _compute_atr(bars, 14)
+            avg_vol_14 = _compute_avg_volume(bars, 14)
+            db.execute(delete(DailyBar).where(and_(DailyBar.symbol == symbol, DailyBar.date >= df["timestamp"].min())))
+            for bar in bars:
+                is_latest = bar == bars[-1]
+                db.add(DailyBar(
+                    symbol=symbol, date=bar["timestamp"], open=bar["open"], high=bar["high"], low=bar["low"],
+                    close=bar["close"], volume=bar["volume"], vwap=bar.get("vwap"),
+                    atr_14=atr_14 if is_latest else None, avg_volume_14=avg_vol_14 if is_latest else None,
+                ))
+            synced += len(bars)
+            if i % 10 == 0:
+                db.commit()
+        db.commit()
+    finally:
+        db.close()
+    return synced
+
+
+# --------------------------------------------------------------------------- databases
+
+def sqlite_engine(path: Path):
+    engine = create_engine(f"sqlite:///{path}")
+    DailyBar.__table__.create(engine)
+    return engine
+
+
+def table_rows(engine) -> pd.DataFrame:
+    t = DailyBar.__table__
+    with engine.connect() as conn:
+        rows = conn.execute(select(t.c.symbol, t.c.date, *[t.c[c] for c in VALUE_COLUMNS]).order_by(t.c.symbol, t.c.date)).all()
+    return pd.DataFrame(rows, columns=["symbol", "date"] + VALUE_COLUMNS)
+
+
+def same_rows(a: pd.DataFrame, b: pd.DataFrame) -> bool:
+    if len(a) != len(b) or not (a[["symbol", "date"]].values == b[["symbol", "date"]].values).all():
+        return False
+    x, y = a[VALUE_COLUMNS].astype(float).to_numpy(), b[VALUE_COLUMNS].astype(float).to_numpy()
+    return bool(np.allclose(x, y, rtol=1e-12, atol=1e-9, equal_nan=True))
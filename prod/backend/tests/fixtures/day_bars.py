@@ -0,0 +1,49 @@
+"""Random-walk 5-min session bars and a columnar universe built from them, shared by
+tests/test_sim_kernel.py, tests/test_bar_store.py, tests/test_sweep_backtest.py and
+tests/test_fast_backtest.py."""
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from scripts.ORB.bar_store import bars_to_columns
+
+
+def make_day_bars(rng, day=datetime(2024, 3, 1)):
+    # random-walk 5-min bars 09:30 -> 15:55
+    n = 78
+    start = day.replace(hour=9, minute=30)
+    close = 10.0 + np.cumsum(rng.normal(0, 0.08, n))
+    open_ = np.r_[close[0], close[:-1]]
+    high = np.maximum(open_, close) + rng.uniform(0, 0.1, n)
+    low = np.minimum(open_, close) - rng.uniform(0, 0.1, n)
+    df = pd.DataFrame({
+        'datetime': [start + timedelta(minutes=5 * i) for i in range(n)],
+        'open': open_,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.integers(1_000, 50_000, n),
+    })
+    df['time'] = df['datetime'].dt.time
+    return df
+
+
+def make_universe(path, n_days=8, per_day=6, seed=0):
+    """Columnar universe: per_day candidates a day, OR bar first, ranked by RVOL."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for d in range(n_days):
+        day = datetime(2024, 3, 1) + timedelta(days=d)
+        for rank in range(1, per_day + 1):
+            bars = make_day_bars(rng, day).drop(columns="time")
+            first = bars.iloc[0]
+            rows.append({
+                "trade_date": day.date(), "ticker": f"T{d}_{rank}", "direction": 1 if (d + rank) % 2 else -1,
+                "rvol": 10.0 / rank, "rvol_rank": rank, "atr_14": float(rng.uniform(0.2, 1.5)),
+                "avg_volume_14": float(rng.uniform(5e4, 2e6)), "prev_close": float(first["open"]),
+                "or_open": float(first["open"]), "or_high": float(first["high"]), "or_low": float(first["low"]),
+                "or_close": float(first["close"]), "or_volume": int(first["volume"]), **bars_to_columns(bars),
+            })
+    pd.DataFrame(rows).to_parquet(path)
+    return path
@@ -0,0 +1,204 @@
+"""Local fake of Alpaca's bars endpoint and a checking writer, shared by
+tests/test_alpaca_batch_fetch.py and scripts/bench_alpaca_fetch.py."""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import zlib
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from scripts.DataPipeline.batch_fetch import TIMEFRAMES
+
+API_KEY, SECRET_KEY = "bench-key", "bench-secret"
+FREQUENCY_OF = {tf: freq for freq, tf in TIMEFRAMES.items()}
+
+
+# --------------------------------------------------------------------------- fake server
+
+@lru_cache(maxsize=None)
+def _session_offsets(timeframe: str) -> np.ndarray:
+    """Bar offsets from ET midnight: 00:00 for daily, 04:00-19:55 every 5 minutes for 5-min."""
+    if timeframe == "1Day":
+        return np.array([0], dtype="timedelta64[ns]")
+    return (np.arange(4 * 60, 20 * 60, 5) * 60_000_000_000).astype("timedelta64[ns]")
+
+
+@lru_cache(maxsize=20_000)
+def synthetic_bars(symbol: str, timeframe: str, start: str, end: str) -> tuple:
+    """Deterministic bars of `symbol` with start <= t < end (RFC 3339 UTC), as Alpaca bar dicts."""
+    if symbol.startswith("ZZ"):  # delisted / no data
+        return ()
+    t0, t1 = pd.Timestamp(start), pd.Timestamp(end)
+    days = pd.bdate_range(t0.tz_convert(None).normalize() - pd.Timedelta(days=1), t1.tz_convert(None).normalize())
+    stamps = (days.values[:, None] + _session_offsets(timeframe)[None, :]).ravel()
+    ts = pd.DatetimeIndex(stamps).tz_localize("America/New_York", ambiguous="NaT", nonexistent="NaT").tz_convert("UTC")
+    ts = ts[(ts >= t0) & (ts < t1)]
+    if not len(ts):
+        return ()
+    seed = zlib.crc32(symbol.encode())
+    minutes = ts.asi8 // 60_000_000_000
+    close = np.round(10 + seed % 90 + np.sin(minutes / 97.0 + seed) * 2, 4)
+    volume = (1000 + (minutes * 7 + seed) % 50_000).astype(int)
+    stamps = ts.strftime("%Y-%m-%dT%H:%M:%SZ")
+    return tuple(
+        {"t": t, "o": c - 0.01, "h": c + 0.05, "l": c - 0.05, "c": c, "v": int(v), "n": int(v // 10), "vw": c}
+        for t, c, v in zip(stamps, close.tolist(), volume.tolist())
+    )
+
+
+class FakeAlpacaServer:
+    """
+    Local stand-in for https://data.alpaca.markets (GET /v2/stocks/bars only).
+
+    rate_limit=(n, window_sec) answers 429 once more than n requests arrive in a
+    window; fail_every=k answers 500 to every k-th request; latency_sec is added
+    to every response. Symbols starting with "ZZ" have no bars. `log` holds one
+    entry per request (symbols, timeframe, start, end, page_token, status).
+    """
+
+    def __init__(self, latency_sec: float = 0.0, rate_limit: Optional[tuple[int, float]] = None, fail_every: int = 0):
+        self.latency_sec = latency_sec
+        self.rate_limit = rate_limit
+        self.fail_every = fail_every
+        self.log: list[dict] = []
+        self._lock = threading.Lock()
+        self._window_start = time.time()
+        self._window_count = 0
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self) -> "FakeAlpacaServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def start(self):
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+
+            def do_GET(self):
+                status, headers, body = fake.handle(self.path, self.headers)
+                self.send_response(status)
+                for k, v in headers.items():
+                    self.send_header(k, v)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-alpaca", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._httpd is not None:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+
+    def requests_for(self, symbol: str, status: int = 200) -> int:
+        return sum(1 for r in self.log if symbol in r["symbols"] and r["status"] == status)
+
+    def _rate_headers(self, now: float) -> tuple[bool, dict]:
+        if self.rate_limit is None:
+            return False, {}
+        limit, window = self.rate_limit
+        if now - self._window_start >= window:
+            self._window_start, self._window_count = now, 0
+        self._window_count += 1
+        headers = {
+            "X-RateLimit-Limit": str(limit),
+            "X-RateLimit-Remaining": str(max(0, limit - self._window_count)),
+            "X-RateLimit-Reset": f"{self._window_start + window:.3f}",
+        }
+        return self._window_count > limit, headers
+
+    def handle(self, path: str, headers) -> tuple[int, dict, bytes]:
+        url = urlparse(path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items()}
+        symbols = q.get("symbols", "").split(",")
+        entry = {"symbols": symbols, "timeframe": q.get("timeframe"), "start": q.get("start"), "end": q.get("end"),
+                 "page_token": q.get("page_token")}
+        if self.latency_sec:
+            time.sleep(self.latency_sec)
+
+        with self._lock:
+            n = len(self.log) + 1
+            throttled, rate_headers = self._rate_headers(time.time())
+            if url.path != "/v2/stocks/bars" or q.get("timeframe") not in FREQUENCY_OF:
+                status = 404
+            elif headers.get("APCA-API-KEY-ID") != API_KEY or headers.get("APCA-API-SECRET-KEY") != SECRET_KEY:
+                status = 403
+            elif throttled:
+                status = 429
+            elif self.fail_every and n % self.fail_every == 0:
+                status = 500
+            else:
+                status = 200
+            entry["status"] = status
+            self.log.append(entry)
+        if status != 200:
+            return status, rate_headers, json.dumps({"code": status, "message": "fake error"}).encode()
+
+        limit = min(int(q.get("limit", 1000)), 10_000)
+        offset = int(q.get("page_token") or 0)
+        page, seen = {}, 0
+        for symbol in sorted(set(symbols)):
+            bars = synthetic_bars(symbol, q["timeframe"], q["start"], q["end"])
+            lo, hi = max(0, offset - seen), min(len(bars), offset + limit - seen)
+            if lo < hi:
+                page[symbol] = bars[lo:hi]
+            seen += len(bars)
+        next_token = str(offset + limit) if offset + limit < seen else None
+        return 200, rate_headers, json.dumps({"bars": page, "next_page_token": next_token}).encode()
+
+
+# --------------------------------------------------------------------------- universe
+
+def universe(n_symbols: int) -> list[str]:
+    """n synthetic tickers; every 50th has no data (ZZ...)."""
+    return [f"ZZ{i:04d}" if i % 50 == 49 else f"S{i:04d}" for i in range(n_symbols)]
+
+
+class MemoryWriter:
+    """Writer that keeps (rows, close sum) per (frequency, symbol) for checking."""
+
+    def __init__(self):
+        self.written: dict[tuple[str, str], tuple[int, float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, frequency, symbol, table) -> bool:
+        close = table.column("close").to_numpy()
+        with self._lock:
+            rows, total = self.written.get((frequency, symbol), (0, 0.0))
+            self.written[(frequency, symbol)] = (rows + table.num_rows, total + float(close.sum()))
+        return True
+
+    def matches_server(self, symbols: list[str], ranges: dict[str, tuple[str, str]]) -> bool:
+        for frequency, (start, end) in ranges.items():
+            for symbol in symbols:
+                bars = synthetic_bars(symbol, TIMEFRAMES[frequency], f"{start}T00:00:00Z", f"{end}T00:00:00Z")
+                rows, total = self.written.get((frequency, symbol), (0, 0.0))
+                if rows != len(bars) or not np.isclose(total, sum(b["c"] for b in bars)):
+                    return False
+        return True
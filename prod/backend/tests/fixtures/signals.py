@@ -0,0 +1,10 @@
+"""Synthetic trading signals, shared by tests/test_state_store.py and scripts/bench_state_store.py."""
+
+
+def make_signals(n: int) -> list[dict]:
+    """n signals for symbols S0000.., alternating SHORT/LONG."""
+    return [
+        {"symbol": f"S{i:04d}", "side": "LONG" if i % 2 else "SHORT", "confidence": 0.5 + (i % 50) / 100,
+         "entry_price": 10.0 + i * 0.01, "stop_price": 9.5 + i * 0.01}
+        for i in range(n)
+    ]
@@ -0,0 +1,105 @@
+import pandas as pd
+
+from scripts.DataPipeline.batch_fetch import (
+    AdaptiveRateLimiter,
+    AlpacaBarsClient,
+    BatchBarFetcher,
+    FetchCheckpoint,
+    plan_requests,
+    resume_ranges,
+    to_5min_frame,
+    to_daily_frame,
+)
+from tests.fixtures.fake_alpaca import API_KEY, SECRET_KEY, FakeAlpacaServer, MemoryWriter, universe
+
+START, END = "2024-02-26", "2024-03-04"  # 5 trading days
+
+
+def _client(server, **kw):
+    kw.setdefault("retry_delay", 0.01)
+    return AlpacaBarsClient(API_KEY, SECRET_KEY, data_url=server.url, max_retries=6, **kw)
+
+
+def test_plan_groups_symbols_by_range_and_expected_bars():
+    ranges = {f"S{i:03d}": (START, END) for i in range(450)}
+    ranges.update(NEW=("2021-01-04", END), DONE=(END, END))
+
+    daily = plan_requests(ranges, "daily")
+    assert [len(t.symbols) for t in daily] == [200, 200, 1, 50]  # 200-symbol cap; NEW alone (own range)
+    five = plan_requests(ranges, "5min", bars_per_request=20_000)
+    assert five[0].symbols == ["NEW"]  # years of 5-min bars: its own request, scheduled first
+    assert all(len(t.symbols) == 20_000 // (5 * 192) for t in five[1:-1])
+    assert "DONE" not in {s for t in daily + five for s in t.symbols}
+
+
+def test_batched_fetch_survives_429s_and_500s(tmp_path):
+    symbols = universe(60)
+    ranges = {s: (START, END) for s in symbols}
+    with FakeAlpacaServer(rate_limit=(8, 0.5), fail_every=7) as server:
+        # Small requests, limiter set well above the server limit: forces throttling and retries
+        tasks = plan_requests(ranges, "5min", bars_per_request=2_000) + plan_requests(ranges, "daily")
+        client = _client(server, limiter=AdaptiveRateLimiter(6000, burst=10), page_limit=1_500)
+        writer = MemoryWriter()
+        stats = BatchBarFetcher(client, writer, FetchCheckpoint(tmp_path / "ckpt.json"), workers=4).run(tasks)
+        client.close()
+
+    assert writer.matches_server(symbols, {"daily": (START, END), "5min": (START, END)})
+    assert stats.symbols_written == 120 and stats.symbols_failed == 0
+    assert stats.throttled > 0 and stats.retries >= sum(r["status"] == 500 for r in server.log) > 0
+    assert stats.requests == len(server.log) < 2 * len(symbols)  # fewer than one per symbol and frequency, retries included
+    assert client.limiter.rate < client.limiter.max_rate  # backed off
+
+
+def test_interrupted_run_resumes_per_symbol(tmp_path):
+    symbols = universe(30)
+    ranges = {s: (START, END) for s in symbols}
+    broken = {"S0007", "S0021"}
+    checkpoint = FetchCheckpoint(tmp_path / "ckpt.json")
+
+    def flaky_writer(frequency, symbol, table):
+        if symbol in broken:
+            raise OSError("disk full")
+        return writer(frequency, symbol, table)
+
+    writer = MemoryWriter()
+    with FakeAlpacaServer() as server:
+        client = _client(server)
+        first = BatchBarFetcher(client, flaky_writer, checkpoint).run(plan_requests(ranges, "5min"))
+        assert sorted(s for _, s in first.failed) == sorted(broken)
+
+        # A fresh process: reload the checkpoint, only the failed symbols are fetched again
+        reloaded = FetchCheckpoint(tmp_path / "ckpt.json")
+        resumed = resume_ranges(ranges, "5min", reloaded)
+        tasks = plan_requests(resumed, "5min")
+        broken.clear()
+        n_before = len(server.log)
+        BatchBarFetcher(client, flaky_writer, reloaded).run(tasks)
+        client.close()
+
+    assert {s for t in tasks for s in t.symbols} == {"S0007", "S0021"}
+    assert len(server.log) - n_before == 1
+    assert writer.matches_server(symbols, {"5min": (START, END)})
+    assert resume_ranges(ranges, "5min", reloaded, has_data=lambda s: s != "S0001")["S0001"] == (START, END)
+
+    # The parquet moved past the checkpoint (e.g. a per-symbol run): resume from the parquet
+    stale = FetchCheckpoint(None)
+    stale.mark("5min", "S0007", "2024-02-28")
+    assert resume_ranges({"S0007": ("2024-03-01", END)}, "5min", stale)["S0007"] == ("2024-03-01", END)
+
+
+def test_frames_match_per_symbol_fetch_layout():
+    with FakeAlpacaServer() as server:
+        client = _client(server)
+        tables = {}
+        BatchBarFetcher(client, lambda f, s, t: tables.setdefault((f, s), t) is not None).run(
+            plan_requests({"AAA": (START, END)}, "daily") + plan_requests({"AAA": (START, END)}, "5min"))
+        client.close()
+
+    daily = to_daily_frame("AAA", tables[("daily", "AAA")])
+    assert list(daily.columns) == ["date", "symbol", "open", "high", "low", "close", "volume"]
+    assert str(daily["date"].dt.tz) == "UTC" and (daily["date"] == daily["date"].dt.normalize()).all()
+    five = to_5min_frame("AAA", tables[("5min", "AAA")])
+    assert list(five.columns) == ["datetime", "symbol", "open", "high", "low", "close", "volume", "trade_count", "vwap"]
+    assert str(five["datetime"].dt.tz) == "America/New_York"
+    assert five["datetime"].iloc[0] == pd.Timestamp("2024-02-26 04:00", tz="America/New_York")
+
@@ -0,0 +1,120 @@
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.ORB import bar_cache, intraday_store
+from scripts.ORB.bar_cache import BarCache, load_5min
+
+
+def make_5min(days, seed=0):
+    """ET 5-min bars 09:30 -> 15:55 for each day (tz-aware `datetime`, as the builders store them)."""
+    rng = np.random.default_rng(seed)
+    stamps = [ts for d in days for ts in pd.date_range(f"{d} 09:30", f"{d} 15:55", freq="5min", tz="America/New_York")]
+    close = 10.0 + rng.normal(0, 0.1, len(stamps)).cumsum()
+    return pd.DataFrame({
+        "datetime": stamps, "open": close, "high": close + 0.05, "low": close - 0.05,
+        "close": close, "volume": rng.integers(1_000, 9_000, len(stamps)),
+    })
+
+
+DAYS = ["2024-03-04", "2024-03-05", "2024-03-06", "2024-03-07"]
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = BarCache(max_bytes=64 * 1024 * 1024)
+    monkeypatch.setattr(bar_cache, "_CACHE", cache)
+    return cache
+
+
+def _rewrite(path, df):
+    before = path.stat().st_mtime_ns
+    df.to_parquet(path, index=False)
+    os.utime(path, ns=(before + 1_000_000_000, before + 1_000_000_000))  # coarse filesystem clocks
+
+
+def test_rewritten_file_and_store_append_invalidate_the_entry(tmp_path, cache):
+    path = tmp_path / "AAA.parquet"
+    make_5min(DAYS[:2]).to_parquet(path, index=False)
+    assert len(load_5min(path)) == 2 * 78
+    assert len(load_5min(path)) == 2 * 78 and cache.hits == 1
+
+    _rewrite(path, make_5min(DAYS[:3]))
+    assert len(load_5min(path)) == 3 * 78 and cache.misses == 2
+
+    # Store-backed symbol: keyed by the store's file list, so an append is picked up
+    intraday_store.append_bars(tmp_path, "BBB", make_5min(DAYS[:2]))
+    store_path = tmp_path / "BBB.parquet"
+    assert len(load_5min(store_path)) == 2 * 78
+    intraday_store.append_bars(tmp_path, "BBB", make_5min(DAYS[1:]))
+    df = load_5min(store_path)
+    assert len(df) == 4 * 78 and df["datetime"].is_unique
+
+
+def test_least_recently_used_frames_are_evicted_to_the_byte_budget(tmp_path, cache):
+    paths = []
+    for i, sym in enumerate(["A", "B", "C"]):
+        paths.append(tmp_path / f"{sym}.parquet")
+        make_5min(DAYS, seed=i).to_parquet(paths[-1], index=False)
+    one = bar_cache._frame_bytes(load_5min(paths[0]))
+    cache.clear()
+    cache.max_bytes = 2 * one + one // 2
+
+    load_5min(paths[0])
+    load_5min(paths[1])
+    load_5min(paths[0])  # A is now the most recently used
+    load_5min(paths[2])
+    assert cache.cached("5min", paths[0]) and cache.cached("5min", paths[2])
+    assert not cache.cached("5min", paths[1])
+    assert cache.bytes <= cache.max_bytes
+
+    cache.max_bytes = one // 2  # a frame larger than the whole budget is returned but not kept
+    cache.clear()
+    assert len(load_5min(paths[0])) == 4 * 78 and cache.bytes == 0
+
+
+def test_range_reads_match_between_pushdown_and_cached_slice(tmp_path, cache):
+    path = tmp_path / "AAA.parquet"
+    make_5min(DAYS).to_parquet(path, index=False)
+    start, end = date(2024, 3, 5), date(2024, 3, 6)
+
+    pushed = load_5min(path, start, end)
+    assert not cache.cached("5min", path)  # ranged reads of uncached files are not cached
+    load_5min(path)
+    sliced = load_5min(path, start, end)
+
+    assert sorted(set(sliced["date_et"])) == [start, end]
+    pd.testing.assert_frame_equal(pushed.reset_index(drop=True), sliced.reset_index(drop=True))
+
+
+def test_unsorted_file_is_grouped_by_day_keeping_file_order(tmp_path, cache):
+    df = make_5min(DAYS)
+    day_order = [2, 0, 3, 1]
+    shuffled = pd.concat([df.iloc[d * 78:(d + 1) * 78].iloc[::-1] for d in day_order], ignore_index=True)
+    path = tmp_path / "AAA.parquet"
+    shuffled.to_parquet(path, index=False)
+
+    out = load_5min(path)
+    assert list(out["date_et"].unique()) == [date.fromisoformat(d) for d in DAYS]
+    first_day = out[out["date_et"] == date(2024, 3, 4)]
+    assert first_day["datetime"].is_monotonic_decreasing  # within a day the file order is kept
+    assert (out["day"].diff().dropna() >= 0).all()
+    assert out["minute"].min() == 570 and out["minute"].max() == 955
+    expected = (out["datetime"].dt.tz_localize(None) - pd.Timestamp(0)).dt.days
+    assert (out["day"] == expected).all()
+
+
+def test_callers_get_shallow_copies(tmp_path, cache):
+    path = tmp_path / "AAA.parquet"
+    make_5min(DAYS).to_parquet(path, index=False)
+    first = load_5min(path)
+    first["extra"] = 1.0
+    ranged = load_5min(path, date(2024, 3, 5), date(2024, 3, 5))
+    ranged["signal"] = True
+
+    again = load_5min(path)
+    assert "extra" not in again.columns and "signal" not in again.columns
+    assert cache.hits == 2
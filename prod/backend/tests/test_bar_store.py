@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+from scripts.ORB.bar_store import (
+    bars_to_columns,
+    candidate_bars,
+    convert_universe_file,
+    load_candidate_bars,
+    read_universe,
+    scan_universe,
+)
+from scripts.ORB.build_universe import serialize_bars
+from scripts.ORB.fast_backtest import deserialize_bars
+from scripts.ORB.universe_store import dataset_path, partition_universe_file
+from tests.fixtures.day_bars import make_day_bars
+
+
+def test_columnar_universe_matches_bars_json(tmp_path):
+    rng = np.random.default_rng(11)
+    days = [make_day_bars(rng).drop(columns="time") for _ in range(20)]
+
+    legacy = tmp_path / "legacy.parquet"
+    native = tmp_path / "native.parquet"
+    pd.DataFrame({"ticker": [f"T{i}" for i in range(20)], "bars_json": [serialize_bars(b) for b in days]}).to_parquet(legacy)
+    pd.DataFrame([{"ticker": f"T{i}", **bars_to_columns(b)} for i, b in enumerate(days)]).to_parquet(native)
+    assert convert_universe_file(legacy) == 20
+
+    for path in (legacy, native):
+        df, bars = read_universe(path)
+        assert bars is not None and "bars_json" not in df.columns
+        for (_, row), day in zip(df.iterrows(), days):
+            expected = deserialize_bars(serialize_bars(day))
+            got = candidate_bars(row, bars)
+            pd.testing.assert_frame_equal(got[expected.columns], expected, check_dtype=False)
+
+
+def test_filtered_scan_with_lazy_bars_matches_full_read(tmp_path):
+    rng = np.random.default_rng(5)
+    dates = pd.date_range("2024-01-25", periods=12, freq="D").date
+    rows = []
+    for i in range(60):
+        day = make_day_bars(rng).drop(columns="time")
+        rows.append({
+            "trade_date": dates[i % 12], "ticker": f"T{i}", "direction": int(rng.choice([1, -1])),
+            "rvol": float(rng.uniform(1, 5)), "rvol_rank": i // 12 + 1, "atr_14": float(rng.uniform(0.2, 2)),
+            "avg_volume_14": float(rng.uniform(1e5, 5e6)), **bars_to_columns(day),
+        })
+    path = tmp_path / "universe.parquet"
+    pd.DataFrame(rows).to_parquet(path, row_group_size=10)
+    assert partition_universe_file(path) == 60  # spans two months
+
+    full, full_bars = read_universe(path)
+    expect = full[
+        (full["trade_date"] >= dates[3]) & (full["trade_date"] <= dates[9])
+        & (full["atr_14"] >= 0.5) & (full["avg_volume_14"] >= 1e6) & (full["direction"] == 1)
+    ]
+    for src in (path, dataset_path(path)):
+        df = scan_universe(src, start_date=str(dates[3]), end_date=str(dates[9]), min_atr=0.5, min_volume=1e6, side="long")
+        assert "bar_t" not in df.columns
+        assert sorted(df["ticker"]) == sorted(expect["ticker"])
+
+        picked = df.sample(frac=0.5, random_state=0)
+        picked, bars = load_candidate_bars(src, picked)
+        assert len(bars) == len(picked)
+        for _, row in picked.iterrows():
+            ref = full.index[full["ticker"] == row["ticker"]][0]
+            pd.testing.assert_frame_equal(bars.frame(int(row["bar_row"])), full_bars.frame(int(full.loc[ref, "bar_row"])))
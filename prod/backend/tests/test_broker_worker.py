@@ -0,0 +1,138 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from execution.broker_worker import BrokerWorker
+
+
+class FakeExecutor:
+    def __init__(self):
+        self.calls = []
+        self.gate = threading.Event()
+        self.kill_switch = False
+
+    def slow(self, tag):
+        self.gate.wait(5)
+        self.calls.append(tag)
+        return tag
+
+    def record(self, tag):
+        self.calls.append(tag)
+        return tag
+
+    def fail(self):
+        raise ValueError("order rejected")
+
+    def is_kill_switch_active(self):
+        return self.kill_switch
+
+
+@pytest.fixture
+def worker():
+    fake = FakeExecutor()
+    w = BrokerWorker(executor_factory=lambda: fake, name="test-broker-worker")
+    w.fake = fake
+    yield w
+    fake.gate.set()
+    w.stop()
+
+
+def test_commands_run_in_fifo_order_on_one_thread(worker):
+    threads = []
+
+    def on_worker():
+        threads.append(threading.current_thread().name)
+        return "e"
+
+    first = worker.submit("slow", "a")  # holds the worker until the gate opens
+    rest = [worker.submit("record", tag) for tag in "bcd"]
+    rest.append(worker.submit(on_worker))
+    time.sleep(0.05)
+    assert worker.fake.calls == [] and worker.stats()["queue_depth"] == 4
+
+    worker.fake.gate.set()
+    assert [f.result(timeout=5) for f in [first, *rest]] == ["a", "b", "c", "d", "e"]
+    assert worker.fake.calls == ["a", "b", "c", "d"]
+    assert threads == ["test-broker-worker"]
+
+
+def test_exceptions_reach_the_awaiting_caller(worker):
+    async def main():
+        with pytest.raises(ValueError, match="order rejected"):
+            await worker.call("fail")
+        with pytest.raises(AttributeError):
+            await worker.call("no_such_command")
+        return await worker.call("record", "after")  # the worker survives a failing command
+
+    assert asyncio.run(main()) == "after"
+
+
+def test_commands_from_the_worker_thread_run_inline(worker):
+    def nested():
+        return worker.submit("record", "inner").result(timeout=1)  # would deadlock if queued
+
+    assert worker.submit(nested).result(timeout=5) == "inner"
+
+
+def test_stats_count_calls_errors_and_latency(worker):
+    worker.fake.gate.set()
+    for tag in "xyz":
+        worker.submit("record", tag).result(timeout=5)
+    worker.submit("slow", "s").result(timeout=5)
+    with pytest.raises(ValueError):
+        worker.submit("fail").result(timeout=5)
+
+    stats = worker.stats()
+    assert stats["running"] and stats["queue_depth"] == 0
+    assert set(stats["commands"]) == {"record", "slow", "fail"}
+    record = stats["commands"]["record"]
+    assert record["count"] == 3 and record["errors"] == 0
+    assert 0 <= record["p50_run_ms"] <= record["p95_run_ms"] <= record["max_run_ms"]
+    assert stats["commands"]["fail"] == {**stats["commands"]["fail"], "count": 1, "errors": 1}
+
+    worker.stop()
+    assert not worker.stats()["running"]
+
+
+def test_kill_switch_routes_do_not_wait_for_the_worker(worker, monkeypatch, tmp_path):
+    pytest.importorskip("alpaca")  # api.routes.execution imports the Alpaca executor
+    from api.routes import execution as routes
+    from execution import broker_worker
+
+    class Executor(FakeExecutor):
+        kill_switch_file = tmp_path / "KILL_SWITCH"
+
+        def is_kill_switch_active(self):
+            return self.kill_switch_file.exists()
+
+        def activate_kill_switch(self):
+            self.kill_switch_file.touch()
+            return True
+
+        def deactivate_kill_switch(self):
+            self.kill_switch_file.unlink(missing_ok=True)
+            return True
+
+        def cancel_all_orders(self):
+            return {"cancelled": 0}
+
+    fake = Executor()
+    worker.executor_factory = lambda: fake
+    monkeypatch.setattr(routes, "get_executor", lambda: fake)
+    monkeypatch.setattr(broker_worker, "_worker", worker)
+    blocker = worker.submit("slow", "entry burst")  # a long browser command holds the queue
+
+    async def main():
+        status = await asyncio.wait_for(routes.get_kill_switch_status(), 0.5)
+        activate = asyncio.create_task(routes.activate_kill_switch())
+        await asyncio.sleep(0.05)
+        assert fake.kill_switch_file.exists()  # set before the queued cancel runs
+        assert not activate.done()
+        fake.gate.set()
+        return status, await asyncio.wait_for(activate, 5)
+
+    status, activated = asyncio.run(main())
+    assert status["active"] is False and activated["active"] is True
+    blocker.result(timeout=5)
@@ -0,0 +1,144 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from scripts.ORB import bar_cache, build_universe
+from scripts.ORB.bar_cache import BarCache
+from scripts.ORB.build_universe import (
+    build_universe_bulk,
+    compute_rvol,
+    extract_or,
+    last_completed_session,
+    process_symbol_bulk,
+    serialize_bars,
+)
+from scripts.ORB.universe_store import high_water_mark, read_universe_table
+
+DAYS = pd.bdate_range("2024-03-01", "2024-04-12")
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD"]
+
+
+def write_symbol(daily_dir, five_dir, symbol, seed):
+    """Daily bars (UTC midnights) and ET 5-min bars 04:00-19:55 with a few irregular days."""
+    rng = np.random.default_rng(seed)
+    frames = []
+    for i, day in enumerate(DAYS):
+        if i % 9 == 4:
+            continue  # no intraday data for this day
+        stamps = pd.date_range(f"{day:%Y-%m-%d} 04:00", f"{day:%Y-%m-%d} 19:55", freq="5min", tz="America/New_York")
+        if i % 7 == 3:
+            stamps = stamps[stamps.time != pd.Timestamp("09:30").time()]  # OR falls back to the first RTH bar
+        close = rng.uniform(4.0, 30.0) + rng.normal(0, 0.05, len(stamps)).cumsum()
+        volume = rng.integers(100, 2_000, len(stamps)).astype(float)
+        volume[(stamps.hour == 9) & (stamps.minute >= 30)] *= rng.uniform(1, 400)
+        frames.append(pd.DataFrame({
+            "datetime": stamps, "open": np.r_[close[0], close[:-1]], "high": close + 0.05,
+            "low": close - 0.05, "close": close, "volume": volume,
+        }))
+    five = pd.concat(frames, ignore_index=True)
+    five = five.iloc[rng.permutation(len(five))] if seed % 2 else five  # unsorted files too
+    five.to_parquet(five_dir / f"{symbol}.parquet", index=False)
+
+    n = len(DAYS)
+    pd.DataFrame({
+        "date": DAYS.tz_localize("UTC"),
+        "close": rng.uniform(5, 30, n),
+        "atr_14": rng.uniform(0.3, 2.0, n),
+        "avg_volume_14": rng.uniform(5e4, 3e6, n),
+        "shares_outstanding": np.where(rng.random(n) < 0.3, np.nan, rng.uniform(1e7, 3e8, n)),
+    }).to_parquet(daily_dir / f"{symbol}.parquet", index=False)
+
+
+@pytest.fixture
+def data(tmp_path, monkeypatch):
+    daily_dir, five_dir, out_dir = tmp_path / "daily", tmp_path / "5min", tmp_path / "universe"
+    for d in (daily_dir, five_dir, out_dir):
+        d.mkdir()
+    for seed, symbol in enumerate(SYMBOLS):
+        write_symbol(daily_dir, five_dir, symbol, seed)
+    monkeypatch.setattr(build_universe, "DATA_DIR_DAILY", daily_dir)
+    monkeypatch.setattr(build_universe, "DATA_DIR_5MIN", five_dir)
+    monkeypatch.setattr(build_universe, "OUT_DIR", out_dir)
+    monkeypatch.setattr(bar_cache, "_CACHE", BarCache(max_bytes=256 * 1024 * 1024))
+    return tmp_path
+
+
+def per_day_candidates(symbol, start, end, min_price, min_volume):
+    """The pre-vectorisation builder: one daily row and one 5-min slice at a time."""
+    df_daily = build_universe.load_daily(symbol)
+    df_5min = build_universe.load_5min_full(symbol)
+    rows = df_daily[(df_daily["date"] >= pd.Timestamp(start)) & (df_daily["date"] <= pd.Timestamp(end))]
+    out = []
+    for _, daily in rows.iterrows():
+        trading_date = daily["date"].date()
+        atr, avg_vol = daily["atr_14"], daily["avg_volume_14"]
+        if not atr >= 0.50 or not avg_vol >= min_volume:
+            continue
+        day_bars = df_5min[df_5min["date_et"] == trading_date]
+        or_data = extract_or(day_bars) if not day_bars.empty else None
+        if not or_data or or_data["or_open"] < min_price or or_data["or_close"] == or_data["or_open"]:
+            continue
+        rvol = compute_rvol(or_data["or_volume"], avg_vol)
+        if rvol < 1.0:
+            continue
+        out.append({
+            "trade_date": trading_date, "ticker": symbol,
+            "direction": 1 if or_data["or_close"] > or_data["or_open"] else -1, "rvol": rvol, **or_data,
+            "atr_14": float(atr), "avg_volume_14": float(avg_vol), "prev_close": float(daily["close"]),
+            "shares_outstanding": int(daily["shares_outstanding"]) if pd.notna(daily["shares_outstanding"]) else None,
+            "bars_json": serialize_bars(day_bars),
+        })
+    return out
+
+
+@pytest.mark.parametrize("symbol", SYMBOLS)
+def test_process_symbol_bulk_matches_the_per_day_path(data, symbol):
+    start, end = date(2024, 3, 4), date(2024, 4, 10)
+    bulk = process_symbol_bulk(symbol, start, end, min_price=5.0, min_volume=100_000, bars_format="json")
+    expected = per_day_candidates(symbol, start, end, 5.0, 100_000)
+    assert len(expected) > 3
+    pd.testing.assert_frame_equal(pd.DataFrame(bulk), pd.DataFrame(expected))
+
+
+def _universe(out_dir, name):
+    return read_universe_table(out_dir / name).to_pandas().drop(columns="bars_json")
+
+
+@pytest.mark.parametrize("scan_mode", ["single", "yearly"])
+def test_incremental_runs_match_one_full_build(data, monkeypatch, scan_mode):
+    monkeypatch.setattr(build_universe, "last_completed_session", lambda: date(2024, 4, 12))
+    kwargs = dict(min_price=5.0, min_volume=100_000, workers=1, top_n=3, categories=["all", "unknown"],
+                  bars_format="json", scan_mode=scan_mode)
+
+    build_universe_bulk("2024-03-01", "2024-04-12", layout="dataset", **kwargs)
+    full = {c: _universe(data / "universe", f"universe_{c}") for c in ("all", "unknown")}
+
+    for d in (data / "universe").iterdir():
+        d.rename(data / f"full_{d.name}")
+    build_universe_bulk("2024-03-01", "2024-03-15", incremental=True, **kwargs)
+    build_universe_bulk(None, "2024-03-29", incremental=True, **kwargs)
+    build_universe_bulk(None, "2024-03-29", incremental=True, **kwargs)  # already up to date
+    build_universe_bulk(None, None, incremental=True, **kwargs)
+
+    for cat, expected in full.items():
+        assert len(expected) > 10
+        pd.testing.assert_frame_equal(_universe(data / "universe", f"universe_{cat}"), expected)
+        assert high_water_mark(data / "universe" / f"universe_{cat}") == date(2024, 4, 12)
+
+
+def test_incremental_build_stops_at_the_last_completed_session(data, monkeypatch):
+    monkeypatch.setattr(build_universe, "last_completed_session", lambda: date(2024, 3, 20))
+    build_universe_bulk("2024-03-01", "2024-04-12", min_price=5.0, min_volume=100_000, workers=1, top_n=3,
+                        categories=["all"], bars_format="json", incremental=True)
+    stored = _universe(data / "universe", "universe_all")
+    assert max(stored["trade_date"]) <= date(2024, 3, 20)
+    assert high_water_mark(data / "universe" / "universe_all") <= date(2024, 3, 20)
+
+
+def test_last_completed_session_is_yesterday_until_the_close():
+    et = build_universe.ET
+    assert last_completed_session(datetime(2024, 3, 5, 11, 0, tzinfo=et)) == date(2024, 3, 4)
+    assert last_completed_session(datetime(2024, 3, 5, 16, 0, tzinfo=et)) == date(2024, 3, 5)
+    assert last_completed_session(datetime(2024, 3, 5, 2, 0, tzinfo=build_universe.ZoneInfo("UTC"))) == date(2024, 3, 4)
@@ -0,0 +1,49 @@
+import sys
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from core.config import settings
+
+# db.database builds the configured engine on import (Postgres by default); these tests bring their own SQLite engines
+if "db.database" not in sys.modules:
+    settings.DATABASE_URL = "sqlite://"
+
+from services.daily_bar_sync import bulk_sync_daily_bars  # noqa: E402
+from tests.fixtures.daily_bars import (  # noqa: E402
+    append_day,
+    legacy_orm_sync,
+    make_dataset,
+    same_rows,
+    sqlite_engine,
+    table_rows,
+)
+
+
+def test_bulk_sync_matches_orm_and_writes_only_changes(tmp_path):
+    paths = make_dataset(tmp_path / "daily", n_symbols=40, n_days=50)
+    # A tz-aware date column and a file without vwap are read too
+    df = pd.read_parquet(paths[0])
+    df.assign(date=df["date"].dt.tz_localize("UTC")).to_parquet(paths[0], index=False)
+    pd.read_parquet(paths[1]).drop(columns="vwap").to_parquet(paths[1], index=False)
+    (tmp_path / "daily" / "BAD.parquet").write_bytes(b"not parquet")
+
+    cutoff = datetime.now() - timedelta(days=50)
+    orm, bulk = sqlite_engine(tmp_path / "orm.db"), sqlite_engine(tmp_path / "bulk.db")
+    legacy_orm_sync(orm, paths[1:], cutoff)
+    stats = bulk_sync_daily_bars(paths + [tmp_path / "daily" / "BAD.parquet"], bulk, cutoff, batch_symbols=16)
+
+    rows = table_rows(bulk)
+    assert stats.skipped == 1 and stats.rows_written == stats.rows_read == len(rows)
+    assert same_rows(table_rows(orm), rows[rows["symbol"] != paths[0].stem].reset_index(drop=True))
+    assert rows.groupby("symbol")["atr_14"].count().eq(1).all()  # metrics on the latest bar only
+
+    assert bulk_sync_daily_bars(paths, bulk, cutoff).rows_written == 0
+
+    append_day(paths[1:])
+    legacy_orm_sync(orm, paths[1:], cutoff)
+    stats = bulk_sync_daily_bars(paths, bulk, cutoff)
+    assert stats.rows_new == 39 and stats.rows_changed == 39  # new bar + the previous latest losing its metrics
+    rows = table_rows(bulk)
+    assert same_rows(table_rows(orm), rows[rows["symbol"] != paths[0].stem].reset_index(drop=True))
+
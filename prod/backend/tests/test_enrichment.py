@@ -0,0 +1,102 @@
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from scripts.DataPipeline.enrichment import EnrichmentPipeline
+
+START = pd.Timestamp("2021-01-04", tz="UTC")
+# AAA: years of history, BBB: shorter than the 14-day windows, CCC: a single bar, ZZZ: no shares reports
+HISTORY = {"AAA": 400, "BBB": 9, "CCC": 1, "ZZZ": 60}
+
+
+def make_bars(n_days, start=START, seed=0, symbol="S"):
+    """Daily bars as AlpacaFetcher writes them (UTC midnight `date`, no metric columns)."""
+    rng = np.random.default_rng(seed)
+    close = np.maximum(5 + rng.random() * 50 + np.cumsum(rng.normal(0, 0.3, n_days)), 1.0)
+    spread = np.abs(rng.normal(0.4, 0.2, n_days))
+    return pd.DataFrame({
+        "date": pd.bdate_range(start, periods=n_days),
+        "symbol": symbol,
+        "open": close + rng.normal(0, 0.1, n_days),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(100_000, 5_000_000, n_days).astype(float),
+    })
+
+
+def make_shares(symbols, n_days, seed=3):
+    """Quarterly shares reports; the first one lands a few months into the history."""
+    rng = np.random.default_rng(seed)
+    reports = pd.date_range(START + pd.Timedelta(days=100), START + pd.Timedelta(days=int(n_days * 1.45)), freq="QE")
+    return pd.DataFrame({
+        "symbol": np.repeat(symbols, len(reports)),
+        "date": np.tile(reports.tz_localize(None).date, len(symbols)).astype(str),
+        "shares_outstanding": rng.integers(10_000_000, 2_000_000_000, len(symbols) * len(reports)).astype(float),
+    })
+
+
+def append_bars(path, df_new):
+    """AlpacaFetcher.write_daily_bars: concat, dedupe by date (newest wins), sort, rewrite."""
+    df = pd.concat([pd.read_parquet(path), df_new], ignore_index=True)
+    df = df.drop_duplicates(subset=["date"], keep="last").sort_values("date").reset_index(drop=True)
+    df.to_parquet(path, index=False, compression="snappy")
+
+
+def _enrich(root, workers=1, fresh=False):
+    state = root / "state.json"
+    if fresh:
+        state.unlink(missing_ok=True)
+    pipeline = EnrichmentPipeline(daily_dir=root / "daily", shares_file=root / "shares.parquet", state_path=state, workers=workers)
+    return pipeline.enrich_all_symbols()
+
+
+def _night(roots, night):
+    for i, (sym, n) in enumerate(HISTORY.items()):
+        day = pd.bdate_range(START, periods=n + night + 1)[-1]
+        for root in roots:
+            append_bars(root / "daily" / f"{sym}.parquet", make_bars(1, start=day, seed=100 * night + i, symbol=sym))
+
+
+def test_incremental_enrichment_matches_full_recompute(tmp_path):
+    inc, ref = tmp_path / "incremental", tmp_path / "full"
+    (inc / "daily").mkdir(parents=True)
+    for i, (sym, n) in enumerate(HISTORY.items()):
+        make_bars(n, seed=i, symbol=sym).to_parquet(inc / "daily" / f"{sym}.parquet", index=False)
+    shares = make_shares(["AAA", "BBB", "CCC"], 400)
+    shares.to_parquet(inc / "shares.parquet", index=False)
+    shutil.copytree(inc, ref)
+
+    stats = _enrich(inc, workers=2)  # worker processes
+    assert stats["full"] == 4 and stats["failed"] == 0
+
+    modes = []
+    for night in range(4):
+        _night([inc, ref], night)
+        if night == 2:
+            # The fetcher revised an already-enriched bar: AAA is recomputed in full
+            for root in (inc, ref):
+                path = root / "daily" / "AAA.parquet"
+                df = pd.read_parquet(path)
+                append_bars(path, df.iloc[[200], :7].assign(close=df["close"].iloc[200] + 1))
+        if night == 3:
+            # A new shares report for BBB changes every later row's shares
+            for root in (inc, ref):
+                extra = pd.DataFrame({"symbol": ["BBB"], "date": [str((START + pd.Timedelta(days=5)).date())], "shares_outstanding": [5e6]})
+                pd.concat([shares, extra]).to_parquet(root / "shares.parquet", index=False)
+
+        stats = _enrich(inc, workers=2 if night % 2 else 1)
+        assert stats["failed"] == 0 and stats["successful"] == 4
+        modes.append((stats["incremental"], stats["full"]))
+        _enrich(ref, fresh=True)
+
+        for sym in HISTORY:
+            got = pd.read_parquet(inc / "daily" / f"{sym}.parquet")
+            expected = pd.read_parquet(ref / "daily" / f"{sym}.parquet")
+            pd.testing.assert_frame_equal(got, expected, check_like=True, check_exact=True)
+
+    # CCC has one bar on the first night (no TR yet), AAA is revised on night 2, BBB gets a report on night 3
+    assert modes == [(3, 1), (4, 0), (3, 1), (3, 1)]
+    assert _enrich(inc)["unchanged"] == 4
+
@@ -0,0 +1,127 @@
+import threading
+import time
+from datetime import datetime, timedelta
+
+from execution.entry_pipeline import ET, EntryOrder, SubmitLatency, prepare_entries, submit_entries
+
+ORIGIN = datetime(2025, 3, 3, 9, 35, tzinfo=ET)
+
+
+def _signal(symbol, side="LONG", entry=10.0, stop=9.5, sid=None):
+    return {"id": sid, "symbol": symbol, "side": side, "entry_price": entry, "stop_price": stop}
+
+
+def _size(entry_price, stop_price, account_equity, max_position_value, leverage):
+    assert leverage == 1.0  # buying power is already leveraged
+    return int(min(account_equity * 0.01 / abs(entry_price - stop_price), max_position_value / entry_price))
+
+
+def _order(symbol, shares=10, sid=None):
+    return EntryOrder(symbol=symbol, side="LONG", shares=shares, entry_price=10.0, stop_price=9.5, signal_id=sid)
+
+
+def test_prepare_entries_sizes_validates_and_keeps_fallbacks():
+    signals = [
+        _signal(" aaa ", sid=1),
+        _signal("BBB", side="flat", sid=2),
+        _signal("CCC", entry=5000.0, stop=4999.0, sid=3),  # position cap leaves 0 shares
+        _signal("aaa", side="short", entry=10.0, stop=10.4, sid=4),  # second signal for AAA
+        _signal("DDD", side="short", entry=20.0, stop=21.0, sid=5),
+    ]
+    orders, skipped = prepare_entries(signals, equity=100_000.0, max_position_value=2_000.0, size=_size)
+
+    assert orders == [
+        EntryOrder("AAA", "LONG", 200, 10.0, 9.5, 1),
+        EntryOrder("AAA", "SHORT", 200, 10.0, 10.4, 4),
+        EntryOrder("DDD", "SHORT", 100, 20.0, 21.0, 5),
+    ]
+    assert skipped == [
+        {"symbol": "BBB", "reason": "unsupported side FLAT"},
+        {"symbol": "CCC", "reason": "calculated 0 shares"},
+    ]
+    assert orders[0].as_kwargs() == {"symbol": "AAA", "side": "LONG", "shares": 200, "entry_price": 10.0,
+                                     "stop_price": 9.5, "signal_id": 1}
+
+
+def test_second_signal_for_a_symbol_is_only_sent_when_the_first_fails():
+    orders = [_order("AAA", sid=1), _order("BBB", sid=2), _order("AAA", sid=3), _order("BBB", sid=4), _order("AAA", sid=5)]
+    sent = []
+
+    def submit(order):
+        sent.append(order.signal_id)
+        if order.signal_id == 1:
+            return {"status": "rejected", "symbol": order.symbol, "reason": "no locate"}
+        if order.signal_id == 3:
+            raise RuntimeError("browser timeout")
+        return {"status": "submitted", "symbol": order.symbol}
+
+    results, latency = submit_entries(orders, submit, origin=datetime.now(ET))
+    # AAA: 1 rejected -> 3 errors -> 5 submitted; BBB: 2 submitted, so 4 is never sent
+    assert sent == [1, 2, 3, 5]
+    assert [r["status"] for r in results] == ["rejected", "submitted", "error", "duplicate", "submitted"]
+    assert results[2]["reason"] == "browser timeout"
+    assert [s[0] for s in latency.samples] == ["AAA", "BBB", "AAA", "AAA"]
+
+
+def test_orders_started_after_the_entry_window_are_skipped():
+    sent = []
+
+    def slow_submit(order):
+        sent.append(order.symbol)
+        time.sleep(0.3)
+        return {"status": "submitted", "symbol": order.symbol}
+
+    orders = [_order("AAA"), _order("BBB"), _order("CCC")]
+    results, latency = submit_entries(orders, slow_submit, origin=datetime.now(ET), max_delay_sec=0.2)
+    assert sent == ["AAA"]
+    assert [r["status"] for r in results] == ["submitted", "skipped", "skipped"]
+    assert "entry window" in results[1]["reason"]
+    assert latency.summary()["orders"] == 1
+
+    late = datetime.now(ET) - timedelta(seconds=120)
+    results, _ = submit_entries(orders, slow_submit, origin=late, max_delay_sec=60)
+    assert {r["status"] for r in results} == {"skipped"} and sent == ["AAA"]
+
+    results, _ = submit_entries(orders[:1], slow_submit, origin=late, max_delay_sec=0)  # 0 = no cap
+    assert results[0]["status"] == "submitted"
+
+
+def test_parallel_submit_returns_results_in_the_order_given():
+    threads = set()
+
+    def submit(order):
+        threads.add(threading.get_ident())
+        time.sleep(0.05 * (5 - int(order.symbol[1:])))  # later orders finish first
+        return {"status": "submitted", "symbol": order.symbol}
+
+    orders = [_order(f"S{i}") for i in range(5)]
+    results, latency = submit_entries(orders, submit, workers=4, origin=datetime.now(ET))
+    assert [r["symbol"] for r in results] == [o.symbol for o in orders]
+    assert len(threads) > 1
+    assert sorted(s[0] for s in latency.samples) == [o.symbol for o in orders]
+
+
+def test_submit_latency_histogram_and_summary():
+    latency = SubmitLatency(ORIGIN)
+    for symbol, ack_ms, submit_sec, status in [
+        ("AAA", 120, 0.10, "submitted"),
+        ("BBB", 480, 0.30, "submitted"),
+        ("CCC", 1500, 0.90, "rejected"),
+        ("DDD", 75_000, 2.00, "submitted"),
+    ]:
+        latency.record(symbol, ORIGIN + timedelta(milliseconds=ack_ms), submit_sec, status)
+
+    histogram = latency.histogram()
+    assert list(histogram) == ["<=250ms", "<=500ms", "<=1000ms", "<=2000ms", "<=5000ms", "<=10000ms",
+                               "<=30000ms", "<=60000ms", ">60000ms"]
+    assert histogram == {**dict.fromkeys(histogram, 0), "<=250ms": 1, "<=500ms": 1, "<=2000ms": 1, ">60000ms": 1}
+
+    summary = latency.summary()
+    assert summary["origin"] == ORIGIN.isoformat()
+    assert (summary["orders"], summary["first_ack_ms"], summary["last_ack_ms"]) == (4, 120.0, 75_000.0)
+    assert (summary["submit_p50_ms"], summary["submit_p95_ms"], summary["submit_max_ms"]) == (900.0, 2000.0, 2000.0)
+    assert summary["per_order"][2] == {"symbol": "CCC", "ack_ms": 1500.0, "submit_ms": 900.0, "status": "rejected"}
+
+    empty = SubmitLatency(ORIGIN).summary()
+    assert empty["orders"] == 0 and empty["last_ack_ms"] == empty["submit_p95_ms"] == 0.0
+    assert sum(empty["histogram"].values()) == 0
@@ -0,0 +1,40 @@
+import pandas as pd
+import pytest
+
+from scripts.ORB import fast_backtest
+from tests.fixtures.day_bars import make_universe
+
+CONFIGS = {
+    "fixed_equal": {"compound": False},
+    "compound_equal": {"compound": True},
+    "compound_risk": {"compound": True, "sizing_mode": "risk", "risk_per_trade_pct": 0.02},
+    "cutoff": {"compound": True, "entry_cutoff": "10:00"},
+    "limit_retest": {"compound": True, "limit_retest": True, "stop_atr_scale": 0.2},
+    "fixed_risk_retest_cutoff": {"compound": False, "sizing_mode": "risk", "limit_retest": True, "entry_cutoff": "09:50"},
+}
+
+
+@pytest.fixture
+def run_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(fast_backtest, "resolve_run_dir", lambda name, compound: tmp_path / name)
+    monkeypatch.setattr(fast_backtest, "write_run_summary_md", lambda run_dir: None)
+    return tmp_path
+
+
+@pytest.mark.parametrize("config", CONFIGS.values(), ids=list(CONFIGS))
+def test_batch_engine_matches_per_row_engines(run_dirs, config):
+    universe = make_universe(run_dirs / "universe.parquet", n_days=10, per_day=6, seed=3)
+    trades = {}
+    for engine in ("batch", "numpy", "loop"):
+        fast_backtest.run_strategy(
+            universe, min_atr=0.25, min_volume=100_000, top_n=4, side_filter="both", run_name=engine,
+            initial_capital=1000.0, max_pct_volume=0.01, leverage=2.0, sim_engine=engine, **config,
+        )
+        trades[engine] = pd.read_parquet(run_dirs / engine / "simulated_trades.parquet")
+
+    assert (trades["batch"]["exit_reason"] != "NO_ENTRY").any()
+    pd.testing.assert_frame_equal(trades["batch"], trades["numpy"])
+    pd.testing.assert_frame_equal(trades["batch"], trades["loop"])
+    if config["compound"]:
+        curves = [pd.read_parquet(run_dirs / e / "equity_curve.parquet") for e in ("batch", "numpy")]
+        pd.testing.assert_frame_equal(*curves)
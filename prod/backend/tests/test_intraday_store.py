@@ -0,0 +1,97 @@
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+
+from data_access import historical
+from scripts.ORB import bar_cache, intraday_store
+
+SESSION = pd.timedelta_range("04:00:00", "19:55:00", freq="5min")  # 192 bars, pre- to post-market
+
+
+def make_bars(symbol, days, seed=0):
+    """Synthetic 5-min bars for `days`, in the layout AlpacaFetcher writes."""
+    stamps = (days.values[:, None] + SESSION.values[None, :]).ravel()
+    n = len(stamps)
+    rng = np.random.default_rng(seed)
+    close = np.maximum(20 + np.cumsum(rng.normal(0, 0.05, n)), 1.0)
+    spread = np.abs(rng.normal(0.05, 0.02, n))
+    return pd.DataFrame({
+        "datetime": pd.DatetimeIndex(stamps).tz_localize("America/New_York"),
+        "symbol": symbol,
+        "open": close + rng.normal(0, 0.01, n),
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.integers(100, 50_000, n).astype(float),
+        "trade_count": rng.integers(1, 500, n).astype(float),
+        "vwap": close,
+    })
+
+
+def _bars(days, seed=0, symbol="AAA"):
+    return make_bars(symbol, pd.bdate_range(*days) if isinstance(days, tuple) else days, seed=seed)
+
+
+def test_appends_dedupe_at_read_time_newest_wins(tmp_path):
+    history = _bars(("2024-12-23", "2025-01-03"))
+    history.to_parquet(intraday_store.flat_path(tmp_path, "AAA"), index=False)  # legacy flat file
+    revised = _bars(("2025-01-03", "2025-01-06"), seed=1)  # re-sends 01-03, adds 01-06
+    paths = intraday_store.append_bars(tmp_path, "AAA", revised)
+    assert [p.parent.name for p in paths] == ["year=2025"]
+    latest = _bars(("2025-01-06", "2025-01-06"), seed=2)
+    intraday_store.append_bars(tmp_path, "AAA", latest)
+
+    expected = (
+        pd.concat([history, revised, latest], ignore_index=True)
+        .drop_duplicates("datetime", keep="last").sort_values("datetime").reset_index(drop=True)
+    )
+    got = intraday_store.read_bars(tmp_path, "AAA")
+    pd.testing.assert_frame_equal(got, expected)
+    assert intraday_store.list_symbols(tmp_path) == ["AAA"]
+    assert intraday_store.part_counts(tmp_path, "AAA") == {2025: 2}
+
+    ranged = intraday_store.read_bars(tmp_path, "AAA", start=pd.Timestamp("2025-01-03"), end=pd.Timestamp("2025-01-03 23:59"))
+    pd.testing.assert_frame_equal(ranged, expected[expected["datetime"].dt.date == date(2025, 1, 3)].reset_index(drop=True))
+
+
+def test_compaction_and_migration_keep_the_same_bars(tmp_path):
+    _bars(("2024-12-16", "2024-12-31")).to_parquet(intraday_store.flat_path(tmp_path, "AAA"), index=False)
+    for night, day in enumerate(pd.bdate_range("2024-12-30", periods=6)):
+        intraday_store.append_bars(tmp_path, "AAA", _bars(pd.DatetimeIndex([day]), seed=night + 1))
+    before = intraday_store.read_bars(tmp_path, "AAA")
+
+    assert intraday_store.compact_symbol(tmp_path, "AAA", min_parts=8)["years"] == 0  # below threshold
+    with intraday_store.Compactor(tmp_path, min_parts=2) as compactor:
+        compactor.submit("AAA")
+    assert compactor.stats["parts"] == 6 and compactor.stats["errors"] == 0
+    assert intraday_store.part_counts(tmp_path, "AAA") == {2024: 0, 2025: 0}
+    pd.testing.assert_frame_equal(intraday_store.read_bars(tmp_path, "AAA"), before)
+
+    intraday_store.compact_symbol(tmp_path, "AAA", migrate=True)
+    assert not intraday_store.flat_path(tmp_path, "AAA").exists()
+    pd.testing.assert_frame_equal(intraday_store.read_bars(tmp_path, "AAA"), before)
+
+
+def test_readers_serve_store_backed_symbols(tmp_path, monkeypatch):
+    five = tmp_path / "5min"
+    five.mkdir()
+    _bars(("2025-01-02", "2025-01-03")).to_parquet(intraday_store.flat_path(five, "AAA"), index=False)
+    intraday_store.append_bars(five, "AAA", _bars(("2025-01-03", "2025-01-07"), seed=3))
+    intraday_store.append_bars(five, "BBB", _bars(("2025-01-06", "2025-01-07"), symbol="BBB"))
+    expected = intraday_store.read_bars(five, "AAA")
+    assert expected["datetime"].is_unique
+
+    # Backtest loader: whole history, then a date range (cached and uncached)
+    df = bar_cache.load_5min(five / "AAA.parquet")
+    assert len(df) == len(expected) and (df["datetime"].to_numpy() == expected["datetime"].to_numpy()).all()
+    assert set(bar_cache.load_5min(five / "BBB.parquet", start=date(2025, 1, 7))["date_et"]) == {date(2025, 1, 7)}
+    assert set(bar_cache.load_5min(five / "AAA.parquet", start=date(2025, 1, 6), end=date(2025, 1, 6))["date_et"]) == {date(2025, 1, 6)}
+
+    # Historical data access (API): range query and symbol listing
+    monkeypatch.setattr(historical, "PARQUET_BASE", str(tmp_path))
+    monkeypatch.setattr(historical, "DB_PATH", ":memory:")
+    got = historical.query_symbol_range("aaa", datetime(2025, 1, 3, 9, 30), datetime(2025, 1, 3, 16, 0), interval="5min")
+    assert len(got) == 79 and got["timestamp"].is_monotonic_increasing
+    assert historical.list_available_symbols("5min") == ["AAA", "BBB"]
+
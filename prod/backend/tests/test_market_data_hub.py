@@ -0,0 +1,98 @@
+import asyncio
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from services.market_data_hub import MarketDataHub
+
+ET = ZoneInfo("America/New_York")
+
+
+class FakeUpstream:
+    """Counts calls; quotes/bars are derived from the symbol so results are checkable."""
+
+    def __init__(self):
+        self.quote_calls, self.bar_calls, self.live_calls = [], [], 0
+
+    def quotes(self, symbols):
+        self.quote_calls.append(list(symbols))
+        return {s: {"bid": 10.0, "ask": 10.2, "timestamp": None} for s in symbols}
+
+    def bars(self, symbols, start, end):
+        self.bar_calls.append((list(symbols), start))
+        idx = pd.date_range(start, periods=3, freq="min")
+        return {s: pd.DataFrame({"open": 1.0, "high": 2.0, "low": 0.5, "close": 1.5, "volume": 100}, index=idx) for s in symbols}
+
+    def live(self):
+        self.live_calls += 1
+        return [{"ticker": "AAPL", "shares": 10}], {"equity": 1000.0 + self.live_calls}
+
+
+def test_concurrent_consumers_share_one_refresh():
+    up = FakeUpstream()
+    hub = MarketDataHub(up.quotes, up.bars, up.live, quote_ttl_sec=60, bar_ttl_sec=60, live_poll_sec=0.01)
+    symbols = [f"S{i}" for i in range(20)]
+    start = datetime(2024, 3, 5, 9, 35, tzinfo=ET)
+
+    async def run():
+        results = await asyncio.gather(*(hub.get_quotes(symbols) for _ in range(25)))
+        bars = await asyncio.gather(*(hub.get_minute_bars(symbols, start) for _ in range(25)))
+        more = await hub.get_quotes(symbols + ["NEW"])
+        return results, bars, more
+
+    results, bars, more = asyncio.run(run())
+    assert len(up.quote_calls) == 2 and up.quote_calls[1] == ["NEW"]  # only the uncached symbol goes upstream
+    assert len(up.bar_calls) == 1
+    assert all(r["S0"]["mid"] == 10.1 for r in results) and len(more) == 21
+    assert all(len(b) == 20 and len(b["S3"]) == 3 for b in bars)
+
+
+def test_minute_bars_refresh_incrementally():
+    up = FakeUpstream()
+    hub = MarketDataHub(up.quotes, up.bars, up.live, bar_ttl_sec=0)
+    start = datetime(2024, 3, 5, 9, 35, tzinfo=ET)
+
+    async def run():
+        await hub.get_minute_bars(["AAA"], start)
+        return await hub.get_minute_bars(["AAA"], start)
+
+    bars = asyncio.run(run())
+    assert up.bar_calls[1][1] == pd.Timestamp(start) + pd.Timedelta(minutes=2)  # resumes from the last cached bar
+    assert len(bars["AAA"]) == 5 and bars["AAA"].index.is_unique
+
+
+def test_empty_refresh_keeps_cached_bars():
+    up = FakeUpstream()
+    hub = MarketDataHub(up.quotes, up.bars, up.live, bar_ttl_sec=0)
+    start = datetime(2024, 3, 5, 9, 35, tzinfo=ET)
+
+    async def run():
+        await hub.get_minute_bars(["AAA", "BBB"], start)
+        hub.bar_fetcher = lambda symbols, since, end: {"AAA": pd.DataFrame()}  # BBB missing entirely
+        return await hub.get_minute_bars(["AAA", "BBB"], start)
+
+    bars = asyncio.run(run())
+    assert len(bars["AAA"]) == 3 and len(bars["BBB"]) == 3
+
+
+def test_live_poll_is_shared_by_all_subscribers():
+    up = FakeUpstream()
+    hub = MarketDataHub(up.quotes, up.bars, up.live, live_poll_sec=0.02)
+
+    async def client(received):
+        async for snapshot in hub.live_updates():
+            received.append(snapshot["version"])
+            if len(received) == 5:
+                return
+
+    async def run():
+        clients = [[] for _ in range(10)]
+        await asyncio.gather(*(client(r) for r in clients))
+        await asyncio.sleep(0.05)
+        return clients
+
+    clients = asyncio.run(run())
+    assert all(len(r) == 5 for r in clients)
+    assert up.live_calls <= 7  # one poll per interval, not one per client
+    assert hub.stats()["live_subscribers"] == 0 and hub._live_task is None  # poller stops with the last client
@@ -0,0 +1,49 @@
+from datetime import time
+
+import numpy as np
+import pandas as pd
+
+from scripts.ORB.fast_backtest import simulate_trade
+from scripts.ORB.sim_kernel import bar_time_ns, find_entry_exit, find_entry_exit_batch, time_to_ns
+from tests.fixtures.day_bars import make_day_bars
+
+
+def test_numpy_kernel_matches_legacy_loop():
+    rng = np.random.default_rng(7)
+    for _ in range(200):
+        bars = make_day_bars(rng)
+        direction = int(rng.choice([1, -1]))
+        or_bar = bars.iloc[0]
+        entry = float(or_bar['high'] if direction == 1 else or_bar['low'])
+        stop_dist = float(rng.uniform(0.01, 0.3))
+        stop = entry - stop_dist if direction == 1 else entry + stop_dist
+        for limit_retest in (False, True):
+            kwargs = dict(position_size=1500.0, max_pct_volume=0.01, limit_retest=limit_retest)
+            fast = simulate_trade(bars, direction, entry, stop, engine='numpy', **kwargs)
+            slow = simulate_trade(bars, direction, entry, stop, engine='loop', **kwargs)
+            assert fast == slow
+
+
+def test_no_post_or_bars():
+    rng = np.random.default_rng(1)
+    bars = make_day_bars(rng).iloc[:1]
+    assert simulate_trade(bars, 1, 100.0, 99.0) == {'entered': False, 'exit_reason': 'NO_BARS'}
+
+
+def test_batch_kernel_matches_scalar_kernel():
+    rng = np.random.default_rng(3)
+    days = [make_day_bars(rng).iloc[1:].iloc[: int(rng.integers(0, 77))] for _ in range(300)]
+    offsets = np.concatenate([[0], np.cumsum([len(d) for d in days])])
+    flat = pd.concat(days)
+    high, low = flat['high'].to_numpy(), flat['low'].to_numpy()
+    t_ns = bar_time_ns(flat)
+    direction = rng.choice([1, -1, 0], size=len(days))
+    entry = np.array([d['open'].iloc[0] if len(d) else 10.0 for d in days]) + rng.normal(0, 0.1, len(days))
+    stop = entry - direction * rng.uniform(0.01, 0.3, len(days))
+    for limit_retest in (False, True):
+        for cutoff_ns in (None, time_to_ns(time(10, 0))):
+            batch = find_entry_exit_batch(offsets, high, low, t_ns, direction, entry, stop, limit_retest, cutoff_ns)
+            for i, d in enumerate(days):
+                lo, hi = offsets[i], offsets[i + 1]
+                expected = find_entry_exit(high[lo:hi], low[lo:hi], t_ns[lo:hi], direction[i], entry[i], stop[i], limit_retest, cutoff_ns)
+                assert (batch[0][i], batch[1][i], batch[2][i]) == expected
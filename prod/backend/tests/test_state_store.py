@@ -0,0 +1,106 @@
+import threading
+import time
+from datetime import datetime
+
+import duckdb
+import pyarrow as pa
+import pytest
+
+from state import duckdb_store
+from state.duckdb_store import ET, DuckDBStateStore, SharedConnection
+from tests.fixtures.signals import make_signals
+
+
+@pytest.fixture(autouse=True)
+def _close_connections():
+    yield
+    duckdb_store.close_shared_connections()
+
+
+def test_signal_lifecycle_on_one_shared_connection(tmp_path):
+    path = tmp_path / "state.duckdb"
+    today = datetime.now(ET).date()
+    store = DuckDBStateStore(path)
+    store.replace_opening_ranges(today, [
+        {"symbol": "aaa", "direction": 1, "passed_filters": True, "rank": 2, "entry_price": 10.0, "stop_price": 9.5},
+        {"symbol": "bbb", "direction": -1, "passed_filters": True, "rank": 1, "entry_price": 5.0, "stop_price": 5.2},
+        {"symbol": "ccc", "direction": 1, "passed_filters": False, "rank": 3},
+    ])
+    assert [c["symbol"] for c in store.get_todays_candidates(5, "both")] == ["BBB", "AAA"]
+    long_only = store.get_todays_candidates(5, "long")
+    assert long_only == [{"symbol": "AAA", "direction": 1, "entry_price": 10.0, "stop_price": 9.5, "rvol": None,
+                          "atr": None, "or_high": None, "or_low": None, "rank": 2}]
+
+    store.insert_signals(today, make_signals(3))
+    assert store.list_existing_signal_symbols(today) == {"S0000", "S0001", "S0002"}
+    pending = store.get_pending_signals()
+    assert len(pending) == 3 and isinstance(pending[0]["timestamp"], str)
+
+    # Another instance (as every caller creates its own) sees the same state on the same connection
+    other = DuckDBStateStore(path)
+    assert other._shared is store._shared
+    sid = other.get_latest_signal_for_symbol(today, "s0001")["id"]
+    assert other.update_signal_status(sid, "FILLED", order_id="X1", filled_price=10.02)
+    assert not other.update_signal_status(10_000, "FILLED")
+    assert other.mark_stop_submitted(sid)
+
+    latest = store.get_latest_signal_for_symbol(today, "S0001")
+    assert latest["status"] == "FILLED" and latest["order_id"] == "X1" and latest["stop_submitted"]
+    rows = {r["symbol"]: r for r in store.list_signals(limit=10)}
+    assert rows["S0001"]["filled_price"] == 10.02 and isinstance(rows["S0001"]["filled_time"], datetime)
+    assert rows["S0000"]["filled_price"] is None and rows["S0000"]["filled_time"] is None
+    assert {r["symbol"] for r in store.list_active_signals()} == {"S0000", "S0002"}
+
+    table = store.signals_table(limit=10)
+    assert isinstance(table, pa.Table) and table.num_rows == 3
+    assert store._shared.opens == 1
+
+
+def test_threads_share_the_connection_with_their_own_cursors(tmp_path):
+    path = tmp_path / "state.duckdb"
+    today = datetime.now(ET).date()
+    DuckDBStateStore(path).insert_signals(today, make_signals(40))
+    errors, cursors = [], []
+
+    def worker(w):
+        store = DuckDBStateStore(path)
+        try:
+            for i in range(25):
+                assert store.get_latest_signal_for_symbol(today, f"S{(w * 25 + i) % 40:04d}") is not None
+                # Disjoint rows per thread: DuckDB rejects concurrent updates of one row ("Conflict on update")
+                store.update_signal_status(w * 10 + i % 10 + 1, "PARTIAL" if i % 2 else "PENDING")
+                assert len(store.list_active_signals()) == 40
+            with store._cursor() as cur:
+                cursors.append(cur)  # kept alive so ids can't be reused
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+    assert len({id(c) for c in cursors}) == 4
+    assert duckdb_store.shared_connection(path).opens == 1
+
+
+def test_idle_connection_releases_the_file(tmp_path):
+    path = tmp_path / "state.duckdb"
+    shared = SharedConnection(path, idle_close_sec=0.05)
+    with shared.cursor() as cur:
+        cur.execute("INSERT INTO signals (signal_date, symbol, side, status) VALUES (current_date, 'AAA', 'LONG', 'PENDING')")
+    assert shared.is_open
+    time.sleep(0.3)
+    assert not shared.is_open
+
+    # Another connection (a CLI script, here a read-only one) can open the file now
+    con = duckdb.connect(str(path), read_only=True)
+    assert con.execute("SELECT count(*) FROM signals").fetchone() == (1,)
+    con.close()
+
+    with shared.cursor() as cur:
+        assert cur.execute("SELECT symbol FROM signals").fetchall() == [("AAA",)]
+    assert shared.opens == 2
+    shared.close()
+
@@ -0,0 +1,97 @@
+from datetime import datetime
+
+import pandas as pd
+
+from scripts.ORB import sweep_backtest
+from scripts.ORB.sweep_backtest import GRID_PARAMS, build_grid, combo_id, load_sweep_universe, run_sweep
+from tests.fixtures.day_bars import make_universe
+
+FIXED = {
+    "universe_file": "universe.parquet", "side": "both", "compound": True, "initial_capital": 1000.0,
+    "max_pct_volume": 0.01, "comm_share": 0.005, "comm_min": 0.99, "free_exits": False, "max_share_cap": None,
+    "limit_retest": False, "risk_pct": 0.01, "start_date": None, "end_date": None,
+}
+
+
+def _grid():
+    return build_grid({
+        "stop_atr_scale": [0.05, 0.2], "top_n": [2, 5], "min_atr": [0.25], "min_volume": [100_000],
+        "leverage": [2.0], "spread_pct": [0.001], "entry_cutoff": [None, "10:00"], "sizing_mode": ["equal"],
+    })
+
+
+def _by_combo(rows):
+    return pd.DataFrame(rows).drop(columns="elapsed_s").sort_values("combo_id").reset_index(drop=True)
+
+
+def test_build_grid_is_the_cartesian_product_in_param_order():
+    grid = _grid()
+    assert len(grid) == 8
+    assert all(list(c) == list(GRID_PARAMS) for c in grid)
+    assert grid[0]["stop_atr_scale"] == 0.05 and grid[-1]["stop_atr_scale"] == 0.2
+    assert [c["entry_cutoff"] for c in grid[:2]] == [None, "10:00"]  # last parameter varies fastest
+    assert len({combo_id(c, FIXED) for c in grid}) == 8
+
+
+def test_resume_only_runs_combinations_missing_from_the_results(tmp_path, monkeypatch):
+    universe = make_universe(tmp_path / "universe.parquet")
+    grid = _grid()
+    full = run_sweep(universe, grid, FIXED, tmp_path / "full.parquet", log=lambda *a: None)
+    assert len(full) == 8 and sum(r["entered"] for r in full) > 0
+
+    # An interrupted sweep: three combinations made it to the results file
+    out = tmp_path / "resumed.parquet"
+    pd.DataFrame(full[:3]).to_parquet(out, index=False)
+    ran = []
+    evaluate = sweep_backtest.evaluate_combo
+
+    def counting(df, bars, combo, fixed):
+        ran.append(combo)
+        return evaluate(df, bars, combo, fixed)
+
+    monkeypatch.setattr(sweep_backtest, "evaluate_combo", counting)
+    resumed = run_sweep(universe, grid, FIXED, out, log=lambda *a: None)
+
+    assert ran == grid[3:]
+    pd.testing.assert_frame_equal(_by_combo(resumed), _by_combo(full))
+    pd.testing.assert_frame_equal(_by_combo(pd.read_parquet(out).to_dict("records")), _by_combo(full))
+    ran.clear()
+    assert len(run_sweep(universe, grid, FIXED, out, log=lambda *a: None)) == 8 and ran == []
+
+
+def test_process_pool_matches_single_worker(tmp_path):
+    universe = make_universe(tmp_path / "universe.parquet", seed=1)
+    grid = _grid()
+    serial = run_sweep(universe, grid, FIXED, tmp_path / "serial.parquet", workers=1, log=lambda *a: None)
+    pooled = run_sweep(universe, grid, FIXED, tmp_path / "pooled.parquet", workers=2, log=lambda *a: None)
+    pd.testing.assert_frame_equal(_by_combo(pooled), _by_combo(serial))
+
+
+def test_date_window_is_pushed_into_the_universe_scan(tmp_path):
+    universe = make_universe(tmp_path / "universe.parquet")
+    df, bars = load_sweep_universe(universe, _grid(), "both", start_date="2024-03-03", end_date="2024-03-05")
+    assert sorted(set(df["trade_date"].astype(str))) == ["2024-03-03", "2024-03-04", "2024-03-05"]
+    assert len(bars) == len(df)
+
+    # Same results as filtering the whole universe per combination
+    fixed = {**FIXED, "start_date": "2024-03-03", "end_date": "2024-03-05"}
+    windowed = run_sweep(universe, _grid(), fixed, tmp_path / "windowed.parquet", log=lambda *a: None)
+    whole = [sweep_backtest.evaluate_combo(*load_sweep_universe(universe, _grid(), "both"), combo, fixed) for combo in _grid()]
+    pd.testing.assert_frame_equal(_by_combo(windowed), _by_combo(whole))
+
+
+def test_drawdown_counts_a_losing_first_day(monkeypatch):
+    trades = pd.DataFrame({
+        "trade_date": [datetime(2024, 3, 1).date(), datetime(2024, 3, 4).date()],
+        "exit_reason": ["EOD", "EOD"], "pnl_pct": [-10.0, 5.0],
+        "base_dollar_pnl": [-100.0, 50.0], "dollar_pnl": [-100.0, 50.0],
+    })
+    curve = [{"date": "2024-03-01", "equity": 900.0}, {"date": "2024-03-04", "equity": 950.0}]
+    monkeypatch.setattr(sweep_backtest, "select_candidates", lambda *a, **k: trades)
+    monkeypatch.setattr(sweep_backtest, "_simulate_universe_batch", lambda *a, **k: (trades, curve, None, 950.0))
+    combo = _grid()[0]
+
+    for compound in (True, False):
+        row = sweep_backtest.evaluate_combo(None, None, combo, {**FIXED, "compound": compound})
+        assert row["final_equity"] == 950.0
+        assert row["max_dd_pct"] == -10.0
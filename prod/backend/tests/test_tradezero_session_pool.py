@@ -0,0 +1,198 @@
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("selenium")  # execution.tradezero imports the Selenium client
+
+from execution.tradezero.session_pool import TradeZeroSessionPool
+
+
+class FakeClient:
+    """Stands in for a logged-in TradeZero browser."""
+
+    def __init__(self, n):
+        self.n = n
+        self.healthy = True
+        self.relogin_ok = True
+        self.probes = 0
+        self.relogins = []
+        self.exited = False
+
+    def probe_session(self):
+        self.probes += 1
+        return {"healthy": self.healthy}
+
+    def relogin(self, fresh=False):
+        self.relogins.append(fresh)
+        if self.relogin_ok:
+            self.healthy = True
+        return self.relogin_ok
+
+    def exit(self):
+        self.exited = True
+
+
+class FakeFactory:
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.clients = []
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            client = FakeClient(len(self.clients) + 1)
+            self.clients.append(client)
+        if self.gate is not None:
+            self.gate.wait(5)  # Chrome + login + MFA
+        return client
+
+
+def _pool(factory=None, size=1, max_age_sec=3600.0, check_interval_sec=3600.0):
+    return TradeZeroSessionPool(factory or FakeFactory(), size=size, max_age_sec=max_age_sec,
+                                check_interval_sec=check_interval_sec)
+
+
+def test_concurrent_acquires_wait_for_a_pending_cold_start():
+    factory = FakeFactory(gate=threading.Event())
+    pool = _pool(factory, size=3)
+    got, errors = [], []
+
+    def acquire():
+        try:
+            got.append(pool.acquire(timeout=5))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=acquire) for _ in range(3)]
+    for t in threads:
+        t.start()
+    time.sleep(0.2)
+    assert len(factory.clients) == 1  # the others wait on the start in flight
+
+    factory.gate.set()
+    for t in threads:
+        t.join(5)
+    assert errors == [] and len(got) == 3
+    assert len({s.id for s in got}) == 3 and all(s.leased for s in got)
+    assert pool.stats()["cold_starts"] == len(factory.clients) == 3
+    pool.close()
+
+
+def test_dead_session_is_logged_back_in_or_discarded():
+    factory = FakeFactory()
+    pool = _pool(factory, check_interval_sec=0.0)  # probe on every acquire
+    assert pool.warm() == 1
+    first = factory.clients[0]
+
+    first.healthy = False
+    session = pool.acquire(timeout=1)
+    assert session.client is first and first.relogins == [False] and session.relogins == 1
+    pool.release(session)
+
+    first.healthy = False
+    first.relogin_ok = False
+    session = pool.acquire(timeout=1)
+    assert first.exited  # discarded, its browser quit
+    assert session.client is factory.clients[1]  # and replaced by a cold start
+    assert [s["id"] for s in pool.stats()["sessions"]] == [session.id]
+    pool.close()
+
+
+def test_ensure_fresh_swaps_to_a_warm_spare():
+    factory = FakeFactory()
+    pool = _pool(factory, size=2)
+    pool.warm()
+    held = pool.acquire(timeout=1)
+    spare = next(s for s in pool._sessions if s is not held)
+
+    assert pool.ensure_fresh(held) is held  # healthy, young: kept
+    held.logged_in_at -= 3000
+    assert pool.ensure_fresh(held, horizon_sec=700) is spare  # would expire before the horizon
+    assert spare.leased and not held.leased
+    assert held.client.relogins == [] and held.last_checked > 0  # repaired later by the maintenance thread
+    pool.close()
+
+
+def test_ensure_fresh_relogs_in_place_without_a_spare():
+    factory = FakeFactory()
+    pool = _pool(factory, size=1, check_interval_sec=0.0)
+    pool.warm()
+    held = pool.acquire(timeout=1)
+
+    held.logged_in_at -= 4000
+    assert pool.ensure_fresh(held) is held
+    assert held.client.relogins == [True] and held.age_sec() < 5  # fresh login
+
+    held.client.healthy = False
+    assert pool.ensure_fresh(held) is held
+    assert held.client.relogins == [True, False]
+    pool.close()
+
+
+def test_ensure_fresh_only_hands_out_spares_that_last_the_horizon():
+    factory = FakeFactory()
+    pool = _pool(factory, size=2)
+    pool.warm()
+    held = pool.acquire(timeout=1)
+    spare = next(s for s in pool._sessions if s is not held)
+
+    held.logged_in_at -= 3000
+    spare.logged_in_at -= 3000  # would not last the horizon either
+    assert pool.ensure_fresh(held, horizon_sec=700) is held
+    assert held.client.relogins == [True] and not spare.leased and spare.client.relogins == []
+    assert pool.ensure_fresh(held, horizon_sec=700) is held  # now lasts: no second re-login
+    assert held.client.relogins == [True]
+    pool.close()
+
+
+def test_horizon_longer_than_max_age_is_met_by_a_fresh_login():
+    factory = FakeFactory()
+    pool = _pool(factory, size=2)
+    pool.warm()
+    held = pool.acquire(timeout=1)
+
+    # 09:25 pre-market check: ~6.6h to the close, longer than this pool's 1h max age
+    for _ in range(3):
+        assert pool.ensure_fresh(held, horizon_sec=23_700) is held
+    assert held.client.relogins == [] and held.leases == 1
+    spare = next(s for s in pool._sessions if s is not held)
+    assert not spare.leased  # spare left alone
+
+    held.logged_in_at -= 600  # older than the slack: due, and the just-started spare lasts
+    assert pool.ensure_fresh(held, horizon_sec=23_700) is spare
+    pool.close()
+
+
+def test_maintenance_never_touches_leased_sessions():
+    factory = FakeFactory()
+    pool = _pool(factory, size=2, max_age_sec=3600.0, check_interval_sec=0.02)
+    pool.warm()
+    leased = pool.acquire(timeout=1)
+    idle = next(s for s in pool._sessions if s is not leased)
+    probes = leased.client.probes
+
+    for s in (leased, idle):
+        s.client.healthy = False
+    leased.logged_in_at -= 7200  # past max age too
+    pool.start()
+    time.sleep(0.3)
+    pool._stop.set()
+    pool._thread.join(5)
+
+    assert leased.client.probes == probes and leased.client.relogins == [] and leased.leased
+    assert idle.client.relogins and idle.client.healthy and not idle.busy
+    pool.close()
+
+
+def test_acquire_times_out_when_every_session_is_leased():
+    pool = _pool(size=1)
+    held = pool.acquire(timeout=1)
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        pool.acquire(timeout=0.2)
+    assert 0.15 < time.monotonic() - started < 2
+
+    threading.Timer(0.1, pool.release, args=(held,)).start()
+    assert pool.acquire(timeout=2) is held  # a release wakes the waiter
+    pool.close()
@@ -0,0 +1,101 @@
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("selenium")  # execution.tradezero imports the Selenium client
+
+from execution.tradezero.tables import (
+    ACTIVE_ORDERS_TABLE,
+    INACTIVE_ORDERS_TABLE,
+    PORTFOLIO_TABLE,
+    parse_active_orders,
+    parse_inactive_orders,
+    parse_portfolio,
+)
+
+FIXTURE = Path(__file__).parent / "fixtures" / "tradezero_tables.html"
+
+
+class _FixtureScrape(HTMLParser):
+    """What READ_TABLE_JS returns for one table of the fixture (headers from the table just before it)."""
+
+    def __init__(self, table_id):
+        super().__init__()
+        self.table_id = table_id
+        self.headers, self.rows = [], []
+        self._last_headers, self._in_table, self._text = [], False, None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "thead":
+            self._last_headers = []
+        elif tag == "table" and attrs.get("id") == self.table_id:
+            self._in_table, self.headers = True, self._last_headers
+        elif tag == "tr" and self._in_table:
+            self.rows.append({"order_id": (attrs.get("order-id") or "").strip(), "cells": []})
+        elif tag in ("td", "th"):
+            self._text = ""
+
+    def handle_data(self, data):
+        if self._text is not None:
+            self._text += data
+
+    def handle_endtag(self, tag):
+        if tag == "th":
+            self._last_headers.append(self._text.strip() or f"col_{len(self._last_headers)}")
+        elif tag == "td" and self._in_table:
+            self.rows[-1]["cells"].append(self._text.strip())
+        elif tag == "table":
+            self._in_table = False
+        if tag in ("td", "th"):
+            self._text = None
+
+
+def fixture_scrape(table_id):
+    parser = _FixtureScrape(table_id)
+    parser.feed(FIXTURE.read_text())
+    return {"headers": parser.headers, "rows": parser.rows, "stamp": None}
+
+
+def test_parse_fixture_tables():
+    portfolio = parse_portfolio(fixture_scrape(PORTFOLIO_TABLE))
+    assert len(portfolio) == 11  # the qty 0 row is not an open position
+    ocgn = next(p for p in portfolio if p["symbol"] == "OCGN")
+    assert ocgn == {"symbol": "OCGN", "qty": 1200.0, "last_price": 7.49, "avg_price": 7.79, "unrealized_pnl": -360.0}
+
+    active = parse_active_orders(fixture_scrape(ACTIVE_ORDERS_TABLE))
+    assert len(active) == 30
+    assert active[0]["ref_number"] == active[0]["Ref #"] == "A4100"
+    assert active[0]["side"] == active[0]["Side"] and isinstance(active[0]["qty"], float)
+
+    inactive = parse_inactive_orders(fixture_scrape(INACTIVE_ORDERS_TABLE))
+    assert len(inactive) == 60
+    assert any("col_10" in r for r in inactive)  # rows with more cells than headers keep the extras
+
+
+def test_parse_empty_states():
+    empty_portfolio = {"headers": [], "rows": [{"order_id": "", "cells": ["No open positions"]}]}
+    assert parse_portfolio(empty_portfolio) == []
+    assert parse_active_orders({"headers": [], "rows": [{"order_id": "", "cells": ["No active orders"]}]}) == []
+    assert parse_inactive_orders({"headers": [], "rows": [{"order_id": "", "cells": ["No orders"]}]}) == []
+    assert parse_portfolio(None) == [] and parse_active_orders(None) == []
+
+
+def test_script_extraction_benchmark():
+    from scripts.bench_tradezero_tables import run_benchmark
+
+    try:
+        result = run_benchmark(iterations=3)
+    except Exception as e:  # no Chrome / chromedriver on this machine
+        pytest.skip(f"headless Chrome unavailable: {e}")
+
+    for name, t in result["tables"].items():
+        assert t["identical"], name
+        assert t["script_round_trips"] == 1
+        assert t["legacy_round_trips"] > 10 * t["script_round_trips"]
+    assert result["change_feed"] == {
+        "unchanged_before_mutation": True,
+        "unchanged_after_mutation": False,
+        "other_table_unchanged": True,
+    }